@@ -0,0 +1,139 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Benchmark page image encoding profiles: bytes per page and encode time.
+
+Pages of the sample PDFs are rendered once at the OCR defaults (150 DPI, fit
+into 951x1268). Two kinds of encodes are measured per profile:
+
+- OCR page images (``image.jpg``), encoded from the rendered pixmap by
+  ``encode_page_pixmap`` (JPEG profiles only)
+- model input images, re-encoded from the stored default JPEG by
+  ``image.encode_image`` as classification/extraction/assessment do
+
+Sizes are compared against the current default (PyMuPDF JPEG). No AWS calls
+are made.
+
+Usage:
+    python benchmarks/image_encoding_benchmark.py
+    python benchmarks/image_encoding_benchmark.py --pdf ../../samples/Nuveen.pdf \\
+        --max-pages 20 --repeat 3
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import fitz  # noqa: E402
+from idp_common import image  # noqa: E402
+from idp_common.ocr.service import encode_page_pixmap  # noqa: E402
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "samples")
+DEFAULT_PDFS = [
+    "Nuveen.pdf",
+    "bank-statement-multipage.pdf",
+    "insurance_package_single.pdf",
+    "lending_package.pdf",
+]
+TARGET_SIZE = (951, 1268)
+DPI = 150
+
+# name -> (format, quality, color_mode)
+PROFILES = {
+    "jpeg-95": ("jpeg", 95, None),
+    "jpeg-85": ("jpeg", 85, None),
+    "jpeg-75": ("jpeg", 75, None),
+    "jpeg-85-gray": ("jpeg", 85, "grayscale"),
+    "jpeg-85-auto": ("jpeg", 85, "auto"),
+    "jpeg-75-auto": ("jpeg", 75, "auto"),
+    "webp-80": ("webp", 80, None),
+    "webp-80-auto": ("webp", 80, "auto"),
+    "webp-60-auto": ("webp", 60, "auto"),
+    "png-auto": ("png", None, "auto"),
+}
+
+
+def render_pixmaps(pdf_paths, max_pages):
+    """Render up to max_pages pages per PDF at the OCR default size."""
+    pixmaps = []
+    for path in pdf_paths:
+        document = fitz.open(path)
+        for page in list(document)[:max_pages]:
+            rect = page.rect
+            scale = min(
+                1.0,
+                TARGET_SIZE[0] / (rect.width * DPI / 72),
+                TARGET_SIZE[1] / (rect.height * DPI / 72),
+            )
+            zoom = DPI / 72 * scale
+            pixmaps.append(page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)))
+        document.close()
+    return pixmaps
+
+
+def measure(encode, inputs, repeat):
+    """Return (average bytes, average milliseconds) per input."""
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            total_bytes += len(encode(item))
+    elapsed = time.perf_counter() - start
+    count = len(inputs) * repeat
+    return total_bytes / count, elapsed / count * 1000
+
+
+def print_row(name, avg_bytes, avg_ms, baseline_bytes):
+    print(
+        f"{name:<16} {avg_bytes / 1024:>9.1f} "
+        f"{avg_bytes / baseline_bytes * 100:>9.1f}% {avg_ms:>9.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", nargs="+", help="PDFs to render (default: samples)")
+    parser.add_argument("--max-pages", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    pdf_paths = args.pdf or [os.path.join(SAMPLES_DIR, name) for name in DEFAULT_PDFS]
+    pixmaps = render_pixmaps(pdf_paths, args.max_pages)
+    stored = [pix.tobytes("jpeg") for pix in pixmaps]
+    print(f"Pages: {len(pixmaps)} from {len(pdf_paths)} PDFs")
+
+    header = f"{'profile':<16} {'KB/page':>9} {'vs default':>10} {'ms/page':>9}"
+
+    print("\nOCR page images (encoded from the rendered pixmap)")
+    print(header)
+    baseline_bytes, baseline_ms = measure(
+        lambda pix: pix.tobytes("jpeg"), pixmaps, args.repeat
+    )
+    print_row("default", baseline_bytes, baseline_ms, baseline_bytes)
+    for name, (image_format, quality, color_mode) in PROFILES.items():
+        if image_format != "jpeg":
+            continue
+        encoding_config = {"quality": quality, "color_mode": color_mode}
+        avg_bytes, avg_ms = measure(
+            lambda pix: encode_page_pixmap(pix, encoding_config), pixmaps, args.repeat
+        )
+        print_row(name, avg_bytes, avg_ms, baseline_bytes)
+
+    print("\nModel input images (re-encoded from the stored default JPEG)")
+    print(header)
+    print_row("default", baseline_bytes, 0.0, baseline_bytes)
+    for name, (image_format, quality, color_mode) in PROFILES.items():
+        avg_bytes, avg_ms = measure(
+            lambda data: image.encode_image(data, image_format, quality, color_mode),
+            stored,
+            args.repeat,
+        )
+        print_row(name, avg_bytes, avg_ms, baseline_bytes)
+
+
+if __name__ == "__main__":
+    main()
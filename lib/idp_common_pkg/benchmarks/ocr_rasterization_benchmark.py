@@ -0,0 +1,122 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Benchmark OCR page rasterization throughput (pages/sec).
+
+Compares the thread engine (pages rendered from a ThreadPoolExecutor sharing one
+PyMuPDF document, as OcrService does by default) against the process engine
+(ProcessPoolRasterizer, one document handle per worker process) across page
+counts and worker counts. No AWS calls are made.
+
+Usage:
+    python benchmarks/ocr_rasterization_benchmark.py
+    python benchmarks/ocr_rasterization_benchmark.py --pdf ../../samples/lending_package.pdf \\
+        --pages 10 50 100 --workers 1 2 4 8
+"""
+
+import argparse
+import concurrent.futures
+import os
+import tempfile
+import time
+
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import fitz  # noqa: E402
+from idp_common.ocr.rasterizer import ProcessPoolRasterizer  # noqa: E402
+from idp_common.ocr.service import render_page_image  # noqa: E402
+
+RESIZE_CONFIG = {"target_width": 951, "target_height": 1268}
+
+
+def build_pdf(path: str, num_pages: int, source_pdf: str = None) -> None:
+    """Write a PDF with num_pages pages, cycling source pages or drawing synthetic ones."""
+    output = fitz.open()
+    if source_pdf:
+        source = fitz.open(source_pdf)
+        while len(output) < num_pages:
+            remaining = num_pages - len(output)
+            output.insert_pdf(source, to_page=min(len(source), remaining) - 1)
+        source.close()
+    else:
+        for page_number in range(num_pages):
+            page = output.new_page(width=612, height=792)
+            for line in range(60):
+                page.insert_text(
+                    (36, 40 + line * 12),
+                    f"Page {page_number + 1} line {line + 1}: "
+                    "The quick brown fox jumps over the lazy dog 0123456789",
+                    fontsize=9,
+                )
+            for box in range(20):
+                page.draw_rect(
+                    fitz.Rect(36 + box * 27, 700, 60 + box * 27, 760),
+                    color=(0, 0, 0),
+                    fill=(box / 20, 0.5, 1 - box / 20),
+                )
+    output.save(path)
+    output.close()
+
+
+def run_thread_engine(path: str, num_pages: int, workers: int, dpi: int) -> float:
+    """Render all pages from a thread pool sharing one document; return seconds."""
+    document = fitz.open(path)
+
+    def render(page_index: int) -> bytes:
+        page = document.load_page(page_index)
+        return render_page_image(page, True, dpi, RESIZE_CONFIG, page_index + 1)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(render, range(num_pages)))
+    elapsed = time.perf_counter() - start
+    document.close()
+    return elapsed
+
+
+def run_process_engine(path: str, num_pages: int, workers: int, dpi: int) -> float:
+    """Render all pages with ProcessPoolRasterizer; return seconds (excludes pool startup)."""
+    with ProcessPoolRasterizer(
+        path, dpi=dpi, resize_config=RESIZE_CONFIG, max_workers=workers
+    ) as rasterizer:
+        # Warm up every worker so process spawn time is not counted
+        for future in [rasterizer.submit(0) for _ in range(workers)]:
+            future.result()
+        start = time.perf_counter()
+        futures = [rasterizer.submit(i) for i in range(num_pages)]
+        for future in futures:
+            future.result()
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", help="Source PDF to cycle pages from")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+
+    print(f"CPUs available: {os.cpu_count()}")
+    print(f"{'pages':>6} {'workers':>8} {'engine':>8} {'seconds':>9} {'pages/sec':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_pages in args.pages:
+            path = os.path.join(tmp_dir, f"bench_{num_pages}.pdf")
+            build_pdf(path, num_pages, args.pdf)
+            for workers in args.workers:
+                for engine, runner in (
+                    ("thread", run_thread_engine),
+                    ("process", run_process_engine),
+                ):
+                    elapsed = runner(path, num_pages, workers, args.dpi)
+                    print(
+                        f"{num_pages:>6} {workers:>8} {engine:>8} "
+                        f"{elapsed:>9.2f} {num_pages / elapsed:>10.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Benchmark Textract response to markdown conversion against textractor.
+
+Compares idp_common.ocr.textract_markdown.convert_textract_response with
+textractor's response_parser.parse(response).to_markdown(): checks that the
+markdown is identical and reports per-page time for both.
+
+Responses are either real Textract outputs (rawText.json files from an OCR run)
+or built from sample PDFs: LINE/WORD blocks come from the PDF text layer and
+LAYOUT, TABLE/CELL, KEY_VALUE_SET, SELECTION_ELEMENT and SIGNATURE blocks are
+derived from the page's text blocks, detected tables and "key: value" lines,
+so every block type the converter handles is exercised. No AWS calls are made.
+
+Usage:
+    python benchmarks/textract_markdown_benchmark.py
+    python benchmarks/textract_markdown_benchmark.py --pdf ../../samples/Nuveen.pdf \\
+        --features LAYOUT TABLES FORMS --repeat 5
+    python benchmarks/textract_markdown_benchmark.py --responses /path/to/pages
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+import uuid
+
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import fitz  # noqa: E402
+from idp_common.ocr import text_layer  # noqa: E402
+from idp_common.ocr.textract_markdown import convert_textract_response  # noqa: E402
+from textractor.parsers import response_parser  # noqa: E402
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "samples")
+DEFAULT_PDFS = [
+    "Nuveen.pdf",
+    "bank-statement-multipage.pdf",
+    "insurance_package_single.pdf",
+    "lending_package.pdf",
+]
+FEATURES = ("LAYOUT", "TABLES", "FORMS", "SIGNATURES")
+
+_ID_NAMESPACE = uuid.UUID("0b7e1f0a-3c55-4f43-9d8e-7a1c2b9e6d41")
+
+
+def _geometry(left, top, right, bottom):
+    return {
+        "BoundingBox": {
+            "Width": right - left,
+            "Height": bottom - top,
+            "Left": left,
+            "Top": top,
+        },
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": right, "Y": top},
+            {"X": right, "Y": bottom},
+            {"X": left, "Y": bottom},
+        ],
+    }
+
+
+def _bounds(block):
+    box = block["Geometry"]["BoundingBox"]
+    return (
+        box["Left"],
+        box["Top"],
+        box["Left"] + box["Width"],
+        box["Top"] + box["Height"],
+    )
+
+
+def _enclosing(blocks):
+    bounds = [_bounds(block) for block in blocks]
+    return _geometry(
+        min(b[0] for b in bounds),
+        min(b[1] for b in bounds),
+        max(b[2] for b in bounds),
+        max(b[3] for b in bounds),
+    )
+
+
+def _center_in(block, bounds):
+    left, top, right, bottom = _bounds(block)
+    x, y = (left + right) / 2, (top + bottom) / 2
+    return bounds[0] <= x <= bounds[2] and bounds[1] <= y <= bounds[3]
+
+
+def build_response(page: fitz.Page, features=FEATURES) -> dict:
+    """
+    Build an AnalyzeDocument-style response for a PDF page with the given features.
+
+    Derived from the text layer only, so pages without one yield an empty PAGE.
+    """
+    lines, _ = text_layer.extract_text_layer(page)
+    response = text_layer.to_textract_response(lines, page)
+    blocks = response["Blocks"]
+    page_block = blocks[0]
+    by_id = {block["Id"]: block for block in blocks}
+    line_blocks = [block for block in blocks if block["BlockType"] == "LINE"]
+    width, height = page.rect.width, page.rect.height
+    counter = [0]
+
+    def add(block_type, geometry, **fields):
+        counter[0] += 1
+        block = {
+            "BlockType": block_type,
+            "Confidence": 95.0,
+            "Geometry": geometry,
+            "Id": str(uuid.uuid5(_ID_NAMESPACE, f"{page.number}-{counter[0]}")),
+            "Page": 1,
+            **fields,
+        }
+        blocks.append(block)
+        by_id[block["Id"]] = block
+        page_block.setdefault("Relationships", [{"Type": "CHILD", "Ids": []}])
+        page_block["Relationships"][0]["Ids"].append(block["Id"])
+        return block
+
+    def words_of(line_block):
+        return [by_id[i] for i in line_block["Relationships"][0]["Ids"]]
+
+    def words_in(bounds):
+        return [
+            word
+            for line in line_blocks
+            for word in words_of(line)
+            if _center_in(word, bounds)
+        ]
+
+    table_bounds = []
+    if "TABLES" in features:
+        for table in page.find_tables().tables:
+            rect = fitz.Rect(table.bbox) * page.rotation_matrix
+            bounds = (
+                rect.x0 / width,
+                rect.y0 / height,
+                rect.x1 / width,
+                rect.y1 / height,
+            )
+            # Column extents, for grid positions covered by a merged cell
+            columns = {}
+            for row in table.rows:
+                for col_index, cell in enumerate(row.cells):
+                    if cell is not None:
+                        columns.setdefault(col_index, (cell[0], cell[2]))
+            cells, merged = [], []
+            for row_index, row in enumerate(table.rows, start=1):
+                owner = None
+                for col_index, cell in enumerate(row.cells, start=1):
+                    x0, x1 = columns.get(col_index - 1, (row.bbox[0], row.bbox[2]))
+                    cell_rect = (
+                        fitz.Rect(cell or (x0, row.bbox[1], x1, row.bbox[3]))
+                        * page.rotation_matrix
+                    )
+                    cell_bounds = (
+                        cell_rect.x0 / width,
+                        cell_rect.y0 / height,
+                        cell_rect.x1 / width,
+                        cell_rect.y1 / height,
+                    )
+                    words = words_in(cell_bounds) if cell is not None else []
+                    cell_block = add(
+                        "CELL",
+                        _geometry(*cell_bounds),
+                        RowIndex=row_index,
+                        ColumnIndex=col_index,
+                        RowSpan=1,
+                        ColumnSpan=1,
+                        EntityTypes=["COLUMN_HEADER"] if row_index == 1 else [],
+                    )
+                    if words:
+                        cell_block["Relationships"] = [
+                            {"Type": "CHILD", "Ids": [w["Id"] for w in words]}
+                        ]
+                    cells.append(cell_block)
+                    if cell is not None or owner is None:
+                        owner = {"ids": [cell_block["Id"]]}
+                        merged.append(owner)
+                    else:
+                        owner["ids"].append(cell_block["Id"])
+            if not cells:
+                continue
+            ids = [cell["Id"] for cell in cells]
+            for group in merged:
+                if len(group["ids"]) > 1:
+                    merged_cell = add(
+                        "MERGED_CELL",
+                        _enclosing([by_id[i] for i in group["ids"]]),
+                        Relationships=[{"Type": "CHILD", "Ids": group["ids"]}],
+                    )
+                    ids.append(merged_cell["Id"])
+            add(
+                "TABLE",
+                _geometry(*bounds),
+                EntityTypes=["STRUCTURED_TABLE"],
+                Relationships=[{"Type": "CHILD", "Ids": ids}],
+            )
+            table_bounds.append(bounds)
+
+    table_lines = [
+        line
+        for line in line_blocks
+        if any(_center_in(line, bounds) for bounds in table_bounds)
+    ]
+
+    if "FORMS" in features:
+        kv_index = 0
+        for line in line_blocks:
+            if line in table_lines:
+                continue
+            words = words_of(line)
+            split = next(
+                (i for i, w in enumerate(words[:-1]) if w["Text"].endswith(":")),
+                None,
+            )
+            if split is None:
+                continue
+            key_words, value_words = words[: split + 1], words[split + 1 :]
+            kv_index += 1
+            if kv_index % 4 == 0:
+                # Checkbox answer right after the key
+                left, top, right, bottom = _bounds(key_words[-1])
+                size = bottom - top
+                checkbox = add(
+                    "SELECTION_ELEMENT",
+                    _geometry(right + 0.002, top, right + 0.002 + size, bottom),
+                    SelectionStatus="SELECTED" if kv_index % 8 else "NOT_SELECTED",
+                )
+                value = add(
+                    "KEY_VALUE_SET",
+                    checkbox["Geometry"],
+                    EntityTypes=["VALUE"],
+                    Relationships=[{"Type": "CHILD", "Ids": [checkbox["Id"]]}],
+                )
+            else:
+                value = add(
+                    "KEY_VALUE_SET",
+                    _enclosing(value_words),
+                    EntityTypes=["VALUE"],
+                    Relationships=[
+                        {"Type": "CHILD", "Ids": [w["Id"] for w in value_words]}
+                    ],
+                )
+            add(
+                "KEY_VALUE_SET",
+                _enclosing(key_words),
+                EntityTypes=["KEY"],
+                Relationships=[
+                    {"Type": "VALUE", "Ids": [value["Id"]]},
+                    {"Type": "CHILD", "Ids": [w["Id"] for w in key_words]},
+                ],
+            )
+
+    if "SIGNATURES" in features:
+        for line in line_blocks:
+            if "signature" in line["Text"].lower():
+                left, top, right, bottom = _bounds(line)
+                add(
+                    "SIGNATURE",
+                    _geometry(
+                        left, bottom, min(left + 0.25, 1.0), min(bottom + 0.03, 1.0)
+                    ),
+                )
+
+    if "LAYOUT" in features:
+        _add_layouts(page, line_blocks, table_lines, table_bounds, add)
+
+    return response
+
+
+def _add_layouts(page, line_blocks, table_lines, table_bounds, add):
+    """Group lines into layout blocks following the PDF's text blocks."""
+    width, height = page.rect.width, page.rect.height
+    groups = []
+    for block in page.get_text("dict", sort=True)["blocks"]:
+        if block.get("type") != 0:
+            continue
+        rect = fitz.Rect(block["bbox"]) * page.rotation_matrix
+        bounds = (rect.x0 / width, rect.y0 / height, rect.x1 / width, rect.y1 / height)
+        members = [
+            line
+            for line in line_blocks
+            if line not in table_lines
+            and _center_in(line, bounds)
+            and not any(line in group for group in groups)
+        ]
+        if members:
+            groups.append(members)
+
+    layouts = []
+    for index, members in enumerate(groups):
+        text = " ".join(line["Text"] for line in members)
+        top = _bounds(members[0])[1]
+        if index == 0:
+            layout_type = "LAYOUT_TITLE"
+        elif top > 0.93 and len(text) < 12:
+            layout_type = "LAYOUT_PAGE_NUMBER"
+        elif top < 0.05:
+            layout_type = "LAYOUT_HEADER"
+        elif len(members) > 1 and all(
+            line["Text"][:1] in "•-–*·" or line["Text"][:2].rstrip(".").isdigit()
+            for line in members
+        ):
+            layout_type = "LAYOUT_LIST"
+        elif len(members) == 1 and len(text.split()) <= 5:
+            layout_type = "LAYOUT_SECTION_HEADER"
+        else:
+            layout_type = "LAYOUT_TEXT"
+        layouts.append((top, layout_type, members))
+
+    for bounds in table_bounds:
+        members = [line for line in table_lines if _center_in(line, bounds)]
+        layouts.append((bounds[1], "LAYOUT_TABLE", members, bounds))
+
+    for layout in sorted(layouts, key=lambda item: item[0]):
+        layout_type, members = layout[1], layout[2]
+        geometry = _geometry(*layout[3]) if len(layout) > 3 else _enclosing(members)
+        if layout_type == "LAYOUT_LIST":
+            items = [
+                add(
+                    "LAYOUT_TEXT",
+                    line["Geometry"],
+                    Relationships=[{"Type": "CHILD", "Ids": [line["Id"]]}],
+                )
+                for line in members
+            ]
+            add(
+                "LAYOUT_LIST",
+                geometry,
+                Relationships=[{"Type": "CHILD", "Ids": [i["Id"] for i in items]}],
+            )
+        else:
+            fields = {}
+            if members:
+                fields["Relationships"] = [
+                    {"Type": "CHILD", "Ids": [line["Id"] for line in members]}
+                ]
+            add(layout_type, geometry, **fields)
+
+
+def load_responses(args):
+    """Yield (name, response) pairs from rawText.json files or sample PDFs."""
+    if args.responses:
+        pattern = os.path.join(args.responses, "**", "*.json")
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            with open(path) as f:
+                response = json.load(f)
+            if "Blocks" in response:
+                yield path, response
+        return
+    for pdf in args.pdf or [os.path.join(SAMPLES_DIR, name) for name in DEFAULT_PDFS]:
+        document = fitz.open(pdf)
+        for page in document:
+            if args.max_pages and page.number >= args.max_pages:
+                break
+            yield (
+                f"{os.path.basename(pdf)}:{page.number + 1}",
+                build_response(page, args.features),
+            )
+        document.close()
+
+
+def compact_response(response):
+    """Drop polygons and round geometry so golden files stay small."""
+    blocks = []
+    for block in response["Blocks"]:
+        block = dict(block)
+        box = block["Geometry"]["BoundingBox"]
+        block["Geometry"] = {
+            "BoundingBox": {key: round(value, 5) for key, value in box.items()}
+        }
+        blocks.append(block)
+    return {"DocumentMetadata": response.get("DocumentMetadata", {}), "Blocks": blocks}
+
+
+def write_golden(directory, name, response, markdown):
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.basename(name).replace(".json", "").replace(".pdf:", "_page")
+    stem = os.path.join(directory, stem)
+    with open(f"{stem}.json", "w") as f:
+        json.dump(response, f, separators=(",", ":"))
+    with open(f"{stem}.md", "w") as f:
+        f.write(markdown)
+
+
+def textractor_markdown(response):
+    return response_parser.parse(response).to_markdown()
+
+
+def timed(func, response, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(response)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf", nargs="+", help="Sample PDFs to derive responses from")
+    parser.add_argument("--responses", help="Directory of Textract response JSON files")
+    parser.add_argument(
+        "--features", nargs="*", default=list(FEATURES), choices=FEATURES
+    )
+    parser.add_argument("--max-pages", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--show-diff", action="store_true", help="Print markdown of mismatched pages"
+    )
+    parser.add_argument(
+        "--write-golden",
+        metavar="DIR",
+        help="Write each response (compacted) and textractor's markdown to DIR",
+    )
+    args = parser.parse_args()
+
+    pages = mismatches = unstable = 0
+    textractor_total = converter_total = 0.0
+    print(
+        f"{'page':<40} {'blocks':>7} {'textractor ms':>14} {'converter ms':>13} {'match':>6}"
+    )
+    for name, response in load_responses(args):
+        if args.write_golden:
+            response = compact_response(response)
+        expected, textractor_time = timed(textractor_markdown, response, args.repeat)
+        (markdown, _), converter_time = timed(
+            convert_textract_response, response, args.repeat
+        )
+        if markdown == expected:
+            match = "yes"
+        elif any(textractor_markdown(response) != expected for _ in range(5)):
+            # textractor orders lines through a set of objects (hashed by address),
+            # so pages with ambiguous line order can vary from run to run
+            match = "varies"
+            unstable += 1
+        else:
+            match = "NO"
+            mismatches += 1
+        pages += 1
+        textractor_total += textractor_time
+        converter_total += converter_time
+        print(
+            f"{name[-40:]:<40} {len(response['Blocks']):>7} "
+            f"{textractor_time * 1000:>14.2f} {converter_time * 1000:>13.2f} "
+            f"{match:>6}"
+        )
+        if args.write_golden and match == "yes":
+            write_golden(args.write_golden, name, response, expected)
+        if match == "NO" and args.show_diff:
+            print(f"--- textractor\n{expected}\n--- converter\n{markdown}\n---")
+
+    if pages:
+        print(
+            f"\n{pages} pages, {mismatches} mismatches, {unstable} varying in "
+            f"textractor; per page: textractor "
+            f"{textractor_total / pages * 1000:.2f} ms, converter "
+            f"{converter_total / pages * 1000:.2f} ms, speedup "
+            f"{textractor_total / max(converter_total, 1e-9):.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
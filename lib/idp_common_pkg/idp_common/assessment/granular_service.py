@@ -20,6 +20,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, Generator, List, Optional, Tuple
 
 from idp_common import bedrock, image, metrics, s3, utils
+from idp_common.bedrock.streaming import StreamingJsonHandler
 from idp_common.config.models import IDPConfig
 from idp_common.config.schema_constants import (
     REF_FIELD,
@@ -146,6 +147,9 @@ class GranularAssessmentService:
         # Parallel processing is enabled when max_workers > 1
         self.enable_parallel = self.max_workers > 1
 
+        # Size the shared Bedrock connection pool for the assessment workers
+        bedrock.reserve_connections(self.max_workers)
+
         # Initialize caching for assessment tasks (similar to classification service)
         self.cache_table_name = cache_table or os.environ.get("TRACKING_TABLE")
         self.cache_table = None
@@ -852,7 +856,16 @@ class GranularAssessmentService:
                 f"Processing assessment task {task.task_id} with {len(task.attributes)} attributes"
             )
 
-            # Invoke Bedrock
+            # Invoke Bedrock, optionally streamed so each attribute is checked
+            # as it arrives and generation stops once the JSON object is complete
+            stream_handler = None
+            if self.config.assessment.streaming:
+                stream_handler = StreamingJsonHandler(
+                    schema={
+                        "properties": {name: {} for name in task.attributes},
+                        "additionalProperties": False,
+                    }
+                )
             response_with_metering = bedrock.invoke_model(
                 model_id=model_id,
                 system_prompt=system_prompt,
@@ -862,7 +875,13 @@ class GranularAssessmentService:
                 top_p=top_p,
                 max_tokens=max_tokens,
                 context="GranularAssessment",
+                stream_handler=stream_handler,
             )
+            if stream_handler is not None and stream_handler.field_errors:
+                logger.warning(
+                    f"Streamed assessment for task {task.task_id} has unexpected "
+                    f"attributes: {stream_handler.field_errors}"
+                )
 
             # Extract text from response
             assessment_text = bedrock.extract_text_from_response(response_with_metering)
@@ -1617,8 +1636,9 @@ class GranularAssessmentService:
             logger.info(f"Time taken to read text content: {t2 - t1:.2f} seconds")
 
             # Read page images with configurable dimensions (type-safe access)
-            target_width = self.config.assessment.image.target_width
-            target_height = self.config.assessment.image.target_height
+            image_config = self.config.assessment.image
+            target_width = image_config.target_width
+            target_height = image_config.target_height
 
             page_images = []
             for page_id in sorted_page_ids:
@@ -1627,9 +1647,16 @@ class GranularAssessmentService:
 
                 page = document.pages[page_id]
                 image_uri = page.image_uri
-                # Just pass the values directly - prepare_image handles empty strings/None
+                # Lazily converted pages have no image unless a stage needed one
+                if not image_uri:
+                    continue
                 image_content = image.prepare_image(
-                    image_uri, target_width, target_height
+                    image_uri,
+                    target_width,
+                    target_height,
+                    image_format=image_config.format,
+                    quality=image_config.quality,
+                    color_mode=image_config.color_mode,
                 )
                 page_images.append(image_content)
 
@@ -20,6 +20,7 @@ import time
 from typing import Any, Dict, List, Union
 
 from idp_common import bedrock, image, metrics, s3, utils
+from idp_common.bedrock.streaming import StreamingJsonHandler
 from idp_common.config.models import IDPConfig
 from idp_common.config.schema_constants import (
     SCHEMA_DESCRIPTION,
@@ -768,8 +769,9 @@ class AssessmentService:
             logger.info(f"Time taken to read text content: {t2 - t1:.2f} seconds")
 
             # Read page images with configurable dimensions (type-safe access)
-            target_width = self.config.assessment.image.target_width
-            target_height = self.config.assessment.image.target_height
+            image_config = self.config.assessment.image
+            target_width = image_config.target_width
+            target_height = image_config.target_height
 
             page_images = []
             for page_id in sorted_page_ids:
@@ -778,9 +780,16 @@ class AssessmentService:
 
                 page = document.pages[page_id]
                 image_uri = page.image_uri
-                # Just pass the values directly - prepare_image handles empty strings/None
+                # Lazily converted pages have no image unless a stage needed one
+                if not image_uri:
+                    continue
                 image_content = image.prepare_image(
-                    image_uri, target_width, target_height
+                    image_uri,
+                    target_width,
+                    target_height,
+                    image_format=image_config.format,
+                    quality=image_config.quality,
+                    color_mode=image_config.color_mode,
                 )
                 page_images.append(image_content)
 
@@ -852,7 +861,11 @@ class AssessmentService:
             # Time the model invocation
             request_start_time = time.time()
 
-            # Invoke Bedrock with the common library
+            # Invoke Bedrock with the common library, optionally streamed so
+            # generation stops once the JSON object is complete
+            stream_handler = None
+            if self.config.assessment.streaming:
+                stream_handler = StreamingJsonHandler()
             response_with_metering = bedrock.invoke_model(
                 model_id=model_id,
                 system_prompt=system_prompt,
@@ -862,6 +875,7 @@ class AssessmentService:
                 top_p=top_p,
                 max_tokens=max_tokens,
                 context="Assessment",
+                stream_handler=stream_handler,
             )
 
             total_duration = time.time() - request_start_time
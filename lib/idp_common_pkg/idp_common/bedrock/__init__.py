@@ -3,15 +3,61 @@
 
 """Bedrock integration module for IDP Common package."""
 
+from .batch import BedrockBatchJobService, BedrockBatchRunner, LocalBatchJobService
 from .client import BedrockClient, default_client, invoke_model
+from .connection_pool import get_connection_pool, reserve_connections
+from .embeddings import (
+    EmbeddingCache,
+    cosine_similarity_matrix,
+    get_embedding_cache,
+    most_similar,
+)
+from .prompt_cache import PromptCacheTracker, get_prompt_cache_tracker
+from .rate_limiter import BedrockRateLimiter, get_rate_limiter
+from .response_cache import LlmResponseCache, get_response_cache
+from .router import BedrockRouter, RouteTarget, get_router
+from .streaming import IncrementalJsonParser, StreamingJsonHandler
+from .token_estimator import (
+    ContextWindowExceededError,
+    TokenEstimator,
+    get_token_estimator,
+)
 
 # Add version info
 __version__ = "0.1.0"
 
 # Export the public API
-__all__ = ["BedrockClient", "invoke_model", "default_client"]
+__all__ = [
+    "BedrockClient",
+    "invoke_model",
+    "default_client",
+    "BedrockRateLimiter",
+    "get_rate_limiter",
+    "get_connection_pool",
+    "reserve_connections",
+    "LlmResponseCache",
+    "get_response_cache",
+    "BedrockBatchRunner",
+    "BedrockBatchJobService",
+    "LocalBatchJobService",
+    "PromptCacheTracker",
+    "get_prompt_cache_tracker",
+    "StreamingJsonHandler",
+    "IncrementalJsonParser",
+    "TokenEstimator",
+    "ContextWindowExceededError",
+    "get_token_estimator",
+    "BedrockRouter",
+    "RouteTarget",
+    "get_router",
+    "EmbeddingCache",
+    "get_embedding_cache",
+    "cosine_similarity_matrix",
+    "most_similar",
+]
 
 # Re-export key functions from the default client for backward compatibility
 extract_text_from_response = default_client.extract_text_from_response
 generate_embedding = default_client.generate_embedding
+generate_embeddings = default_client.generate_embeddings
 format_prompt = default_client.format_prompt
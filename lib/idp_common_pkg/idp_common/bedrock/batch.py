@@ -0,0 +1,590 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Bedrock batch inference for backlog processing.
+
+On-demand Converse calls are the most expensive and most throttled way to work
+through a large backlog. ``BedrockBatchRunner`` collects requests built exactly
+as ``BedrockClient.invoke_model`` would send them, writes them as JSONL
+model-invocation-job inputs (one job per model), waits for the jobs and returns
+each result in the usual ``{"response", "metering"}`` shape keyed by record ID,
+so callers parse batch results with the same code as on-demand results.
+
+Jobs are submitted through a ``BatchJobService``: ``BedrockBatchJobService``
+for Bedrock model invocation jobs, or ``LocalBatchJobService``, a file-based
+stand-in that answers records with a local function (for tests and dry runs).
+Submitted jobs are plain ``BatchJob`` records that serialize to dicts, so a
+caller can submit, persist the jobs, and collect the results in a later step.
+Requests invoked on demand are returned as a completed ``BatchJob`` that holds
+their results, so they survive the same round trip.
+
+Batch usage is metered as ``<context>/bedrock/<model>:batch``, the suffix used
+for service tiers, so batch pricing can be configured separately.
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from .client import BedrockClient, default_client
+
+logger = logging.getLogger(__name__)
+
+# Bedrock rejects jobs with fewer records; smaller groups are invoked on demand
+MIN_BATCH_RECORDS = 100
+MAX_BATCH_RECORDS = 50000
+
+DEFAULT_POLL_INTERVAL_SECONDS = 60
+
+COMPLETED_STATUSES = {"Completed", "PartiallyCompleted"}
+TERMINAL_STATUSES = COMPLETED_STATUSES | {"Failed", "Stopped", "Expired"}
+
+# Metering suffix for batch usage, like the priority and flex service tiers
+BATCH_METERING_SUFFIX = "batch"
+
+# Job ID of the pseudo-job holding the results of requests invoked on demand
+ON_DEMAND_JOB_ID = "on-demand"
+
+
+def _encode_bytes(value: Any) -> Any:
+    """Replace bytes with base64 strings, as the Converse JSON format expects."""
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, dict):
+        return {key: _encode_bytes(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_bytes(item) for item in value]
+    return value
+
+
+def to_batch_record(record_id: str, converse_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert Converse parameters to a model invocation job input record.
+
+    The model ID and service tier are job-level settings and are not part of
+    the record.
+
+    Args:
+        record_id: Unique ID of the record within the job
+        converse_params: Parameters built by BedrockClient.build_converse_params
+
+    Returns:
+        JSONL record with recordId and modelInput
+    """
+    model_input = {
+        key: value
+        for key, value in converse_params.items()
+        if key not in ("modelId", "serviceTier") and value is not None
+    }
+    return {"recordId": record_id, "modelInput": _encode_bytes(model_input)}
+
+
+def parse_batch_output(
+    record: Dict[str, Any],
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse a model invocation job output record.
+
+    Args:
+        record: JSONL output record
+
+    Returns:
+        Tuple of (record ID, Converse response or None, error message or None)
+    """
+    record_id = record.get("recordId", "")
+    error = record.get("error")
+    if error:
+        if isinstance(error, dict):
+            error = f"{error.get('errorCode', '')}: {error.get('errorMessage', '')}"
+        return record_id, None, str(error)
+    response = record.get("modelOutput")
+    if not isinstance(response, dict):
+        return record_id, None, "No model output in batch result"
+    return record_id, response, None
+
+
+@dataclass
+class BatchJob:
+    """
+    A submitted model invocation job and the records it contains.
+
+    Requests invoked on demand are held by a job with ID ``ON_DEMAND_JOB_ID``
+    that is already completed and carries their results.
+    """
+
+    job_id: str
+    model_id: str
+    record_contexts: Dict[str, str] = field(default_factory=dict)
+    status: str = "Submitted"
+    results: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "job_id": self.job_id,
+            "model_id": self.model_id,
+            "record_contexts": self.record_contexts,
+            "status": self.status,
+        }
+        if self.results is not None:
+            data["results"] = self.results
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BatchJob":
+        results = data.get("results")
+        return cls(
+            job_id=data["job_id"],
+            model_id=data["model_id"],
+            record_contexts=dict(data.get("record_contexts", {})),
+            status=data.get("status", "Submitted"),
+            results=dict(results) if results is not None else None,
+        )
+
+
+class BatchJobService(Protocol):
+    """Submits model invocation jobs and returns their output records."""
+
+    def submit(self, job_name: str, model_id: str, records: List[Dict]) -> str:
+        """Submit a job and return its ID."""
+        ...
+
+    def get_status(self, job_id: str) -> str:
+        """Return the job status (see TERMINAL_STATUSES)."""
+        ...
+
+    def get_output_records(self, job_id: str) -> List[Dict[str, Any]]:
+        """Return the output records of a finished job."""
+        ...
+
+
+def _split_s3_uri(s3_uri: str) -> Tuple[str, str]:
+    bucket, _, prefix = s3_uri[len("s3://") :].partition("/")
+    return bucket, prefix.strip("/")
+
+
+def _read_jsonl(body: str) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in body.splitlines() if line.strip()]
+
+
+class BedrockBatchJobService:
+    """Bedrock model invocation jobs with JSONL input and output in S3."""
+
+    def __init__(
+        self,
+        role_arn: str,
+        input_s3_uri: str,
+        output_s3_uri: str,
+        region: Optional[str] = None,
+        bedrock_client: Any = None,
+        s3_client: Any = None,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            role_arn: Service role Bedrock assumes to read input and write output
+            input_s3_uri: S3 prefix for job input files
+            output_s3_uri: S3 prefix for job output
+            region: AWS region (default: AWS_REGION env var)
+            bedrock_client: Optional boto3 bedrock client (for tests)
+            s3_client: Optional boto3 S3 client (for tests)
+        """
+        region = region or os.environ.get("AWS_REGION")
+        if bedrock_client is None or s3_client is None:
+            import boto3
+
+            bedrock_client = bedrock_client or boto3.client(
+                "bedrock", region_name=region
+            )
+            s3_client = s3_client or boto3.client("s3", region_name=region)
+        self.bedrock_client = bedrock_client
+        self.s3_client = s3_client
+        self.role_arn = role_arn
+        self.input_s3_uri = input_s3_uri.rstrip("/")
+        self.output_s3_uri = output_s3_uri.rstrip("/")
+
+    def submit(self, job_name: str, model_id: str, records: List[Dict]) -> str:
+        bucket, prefix = _split_s3_uri(self.input_s3_uri)
+        key = f"{prefix}/{job_name}.jsonl" if prefix else f"{job_name}.jsonl"
+        body = "\n".join(json.dumps(record) for record in records)
+        self.s3_client.put_object(Bucket=bucket, Key=key, Body=body.encode("utf-8"))
+
+        response = self.bedrock_client.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.role_arn,
+            modelId=model_id,
+            modelInvocationType="Converse",
+            inputDataConfig={
+                "s3InputDataConfig": {
+                    "s3Uri": f"s3://{bucket}/{key}",
+                    "s3InputFormat": "JSONL",
+                }
+            },
+            outputDataConfig={"s3OutputDataConfig": {"s3Uri": self.output_s3_uri}},
+        )
+        logger.info(
+            f"Submitted Bedrock batch job {job_name} with {len(records)} records "
+            f"for model {model_id}"
+        )
+        return response["jobArn"]
+
+    def get_status(self, job_id: str) -> str:
+        job = self.bedrock_client.get_model_invocation_job(jobIdentifier=job_id)
+        return job["status"]
+
+    def get_output_records(self, job_id: str) -> List[Dict[str, Any]]:
+        job = self.bedrock_client.get_model_invocation_job(jobIdentifier=job_id)
+        input_uri = job["inputDataConfig"]["s3InputDataConfig"]["s3Uri"]
+        output_uri = job["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"]
+        bucket, prefix = _split_s3_uri(output_uri)
+        # Output is written to <output prefix>/<job ID>/<input file name>.out
+        job_suffix = job_id.rsplit("/", 1)[-1]
+        file_name = input_uri.rsplit("/", 1)[-1]
+        parts = (prefix, job_suffix, f"{file_name}.out")
+        key = "/".join(part for part in parts if part)
+        response = self.s3_client.get_object(Bucket=bucket, Key=key)
+        return _read_jsonl(response["Body"].read().decode("utf-8"))
+
+
+class LocalBatchJobService:
+    """
+    File-based stand-in for Bedrock model invocation jobs.
+
+    Input and output JSONL files are written under a local directory, and each
+    record is answered by ``responder``, which receives the model ID and the
+    record's modelInput and returns a Converse response (or raises to produce an
+    error record). Jobs complete on their first status check.
+    """
+
+    def __init__(
+        self, directory: str, responder: Callable[[str, Dict[str, Any]], Dict]
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            directory: Directory for job input and output files
+            responder: Function returning the Converse response for a record
+        """
+        self.directory = directory
+        self.responder = responder
+
+    def _paths(self, job_id: str) -> Tuple[str, str, str]:
+        job_dir = os.path.join(self.directory, job_id)
+        return (
+            os.path.join(job_dir, "model"),
+            os.path.join(job_dir, "input.jsonl"),
+            os.path.join(job_dir, "input.jsonl.out"),
+        )
+
+    def submit(self, job_name: str, model_id: str, records: List[Dict]) -> str:
+        job_id = f"local-{job_name}"
+        model_path, input_path, _ = self._paths(job_id)
+        os.makedirs(os.path.dirname(input_path), exist_ok=True)
+        with open(model_path, "w") as f:
+            f.write(model_id)
+        with open(input_path, "w") as f:
+            f.write("\n".join(json.dumps(record) for record in records))
+        return job_id
+
+    def get_status(self, job_id: str) -> str:
+        model_path, input_path, output_path = self._paths(job_id)
+        if not os.path.exists(output_path):
+            with open(model_path) as f:
+                model_id = f.read()
+            with open(input_path) as f:
+                records = _read_jsonl(f.read())
+            outputs = []
+            for record in records:
+                output = dict(record)
+                try:
+                    output["modelOutput"] = self.responder(
+                        model_id, record["modelInput"]
+                    )
+                except Exception as e:
+                    output["error"] = {"errorCode": 400, "errorMessage": str(e)}
+                outputs.append(output)
+            with open(output_path, "w") as f:
+                f.write("\n".join(json.dumps(output) for output in outputs))
+        with open(output_path) as f:
+            outputs = _read_jsonl(f.read())
+        if any("error" in output for output in outputs):
+            return "PartiallyCompleted"
+        return "Completed"
+
+    def get_output_records(self, job_id: str) -> List[Dict[str, Any]]:
+        _, _, output_path = self._paths(job_id)
+        with open(output_path) as f:
+            return _read_jsonl(f.read())
+
+
+@dataclass
+class _PendingRequest:
+    record_id: str
+    context: str
+    invoke_kwargs: Dict[str, Any]
+    converse_params: Dict[str, Any]
+
+
+class BedrockBatchRunner:
+    """
+    Collects model requests and runs them as model invocation jobs.
+
+    Requests are grouped by model. Groups smaller than ``min_records`` are
+    invoked on demand, since Bedrock rejects jobs that small; larger groups are
+    split evenly into jobs of at most ``max_records``.
+    """
+
+    def __init__(
+        self,
+        service: BatchJobService,
+        bedrock_client: Optional[BedrockClient] = None,
+        min_records: int = MIN_BATCH_RECORDS,
+        max_records: int = MAX_BATCH_RECORDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        timeout: Optional[float] = None,
+        job_name_prefix: str = "idp-batch",
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            service: Service that runs the jobs
+            bedrock_client: Client used to build requests and for on-demand
+                fallback (default: the shared client)
+            min_records: Smallest group submitted as a job
+            max_records: Largest number of records per job
+            poll_interval: Seconds between job status checks
+            timeout: Seconds to wait for jobs before raising TimeoutError (None to
+                wait indefinitely)
+            job_name_prefix: Prefix of submitted job names
+            sleep: Sleep function, replaceable for tests
+        """
+        self.service = service
+        self.bedrock_client = bedrock_client or default_client
+        self.min_records = max(1, min_records)
+        self.max_records = max(1, max_records)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.job_name_prefix = job_name_prefix
+        self._sleep = sleep
+        self._pending: List[_PendingRequest] = []
+
+    def add(
+        self,
+        record_id: str,
+        model_id: str,
+        system_prompt: Any,
+        content: List[Dict[str, Any]],
+        temperature: Any = 0.0,
+        top_k: Any = 5,
+        top_p: Any = 0.1,
+        max_tokens: Any = None,
+        context: str = "Unspecified",
+    ) -> None:
+        """
+        Add a request, with the same arguments as BedrockClient.invoke_model.
+
+        Args:
+            record_id: Unique ID used to look up the result
+            model_id: The Bedrock model ID (a service tier suffix is ignored)
+            system_prompt: The system prompt as string or list of content objects
+            content: The content for the user message (can include text and images)
+            temperature: The temperature parameter for model inference
+            top_k: Optional top_k parameter
+            top_p: Optional top_p parameter
+            max_tokens: Optional max_tokens parameter
+            context: Metering context (e.g. "Classification")
+        """
+        invoke_kwargs = {
+            "model_id": model_id,
+            "system_prompt": system_prompt,
+            "content": content,
+            "temperature": temperature,
+            "top_k": top_k,
+            "top_p": top_p,
+            "max_tokens": max_tokens,
+        }
+        converse_params = self.bedrock_client.build_converse_params(**invoke_kwargs)
+        self._pending.append(
+            _PendingRequest(record_id, context, invoke_kwargs, converse_params)
+        )
+
+    def submit(self) -> List[BatchJob]:
+        """
+        Submit the added requests and clear them from the runner.
+
+        Requests too few for a job are invoked on demand now and returned as a
+        completed ``ON_DEMAND_JOB_ID`` job per model that holds their results.
+
+        Returns:
+            Submitted jobs
+        """
+        groups: Dict[str, List[_PendingRequest]] = {}
+        for request in self._pending:
+            groups.setdefault(request.converse_params["modelId"], []).append(request)
+        self._pending = []
+
+        jobs = []
+        for model_id, requests in groups.items():
+            chunks, on_demand = self._split_into_jobs(requests)
+            if on_demand:
+                logger.info(
+                    f"Invoking {len(on_demand)} requests for {model_id} on demand "
+                    f"(fewer than {self.min_records} records for a batch job)"
+                )
+                jobs.append(
+                    BatchJob(
+                        job_id=ON_DEMAND_JOB_ID,
+                        model_id=model_id,
+                        record_contexts={r.record_id: r.context for r in on_demand},
+                        status="Completed",
+                        results={r.record_id: self._invoke(r) for r in on_demand},
+                    )
+                )
+            for chunk in chunks:
+                job_name = f"{self.job_name_prefix}-{uuid.uuid4().hex[:12]}"
+                records = [
+                    to_batch_record(request.record_id, request.converse_params)
+                    for request in chunk
+                ]
+                job_id = self.service.submit(job_name, model_id, records)
+                jobs.append(
+                    BatchJob(
+                        job_id=job_id,
+                        model_id=model_id,
+                        record_contexts={r.record_id: r.context for r in chunk},
+                    )
+                )
+        return jobs
+
+    def _split_into_jobs(
+        self, requests: List[_PendingRequest]
+    ) -> Tuple[List[List[_PendingRequest]], List[_PendingRequest]]:
+        """
+        Split a model's requests into jobs and requests to invoke on demand.
+
+        Requests are spread evenly over the fewest jobs of at most max_records,
+        so no job is left with a handful of records. If even jobs would fall
+        below min_records (max_records under twice min_records), jobs are filled
+        to max_records and a remainder below min_records is invoked on demand.
+
+        Returns:
+            Tuple of (requests per job, requests to invoke on demand)
+        """
+        count = len(requests)
+        if count < self.min_records:
+            return [], requests
+        job_count = -(-count // self.max_records)
+        if count // job_count < self.min_records:
+            chunks = [
+                requests[start : start + self.max_records]
+                for start in range(0, count, self.max_records)
+            ]
+            if len(chunks[-1]) < self.min_records:
+                return chunks[:-1], chunks[-1]
+            return chunks, []
+        size, extra = divmod(count, job_count)
+        chunks = []
+        start = 0
+        for index in range(job_count):
+            end = start + size + (1 if index < extra else 0)
+            chunks.append(requests[start:end])
+            start = end
+        return chunks, []
+
+    def _invoke(self, request: _PendingRequest) -> Dict[str, Any]:
+        try:
+            return self.bedrock_client.invoke_model(
+                **request.invoke_kwargs, context=request.context
+            )
+        except Exception as e:
+            logger.error(f"On-demand request {request.record_id} failed: {str(e)}")
+            return {"error": str(e)}
+
+    def poll(self, jobs: List[BatchJob]) -> bool:
+        """
+        Update the status of unfinished jobs.
+
+        Returns:
+            True if every job has finished
+        """
+        for job in jobs:
+            if job.status not in TERMINAL_STATUSES:
+                job.status = self.service.get_status(job.job_id)
+        return all(job.status in TERMINAL_STATUSES for job in jobs)
+
+    def wait(self, jobs: List[BatchJob]) -> None:
+        """
+        Wait until every job has finished.
+
+        Raises:
+            TimeoutError: If the jobs do not finish within the timeout
+        """
+        start = time.monotonic()
+        while not self.poll(jobs):
+            if self.timeout is not None and time.monotonic() - start > self.timeout:
+                raise TimeoutError(
+                    f"Bedrock batch jobs not finished after {self.timeout} seconds"
+                )
+            self._sleep(self.poll_interval)
+
+    def collect(self, jobs: List[BatchJob]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the results of finished jobs, including on-demand requests.
+
+        Args:
+            jobs: Finished jobs from ``submit`` (or ``BatchJob.from_dict``)
+
+        Returns:
+            Mapping of record ID to {"response", "metering"}, or to {"error"}
+            for records that failed
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        for job in jobs:
+            if job.results is not None:
+                results.update(job.results)
+                continue
+            outputs = {}
+            if job.status in COMPLETED_STATUSES:
+                for record in self.service.get_output_records(job.job_id):
+                    record_id, response, error = parse_batch_output(record)
+                    outputs[record_id] = (response, error)
+            else:
+                logger.error(f"Bedrock batch job {job.job_id} ended as {job.status}")
+
+            for record_id, context in job.record_contexts.items():
+                response, error = outputs.get(
+                    record_id, (None, f"Batch job ended as {job.status}")
+                )
+                if response is None:
+                    results[record_id] = {"error": error}
+                    continue
+                usage = response.get("usage", {})
+                metering_key = (
+                    f"{context}/bedrock/{job.model_id}:{BATCH_METERING_SUFFIX}"
+                )
+                results[record_id] = {
+                    "response": response,
+                    "metering": {metering_key: {**usage, "requests": 1}},
+                }
+        return results
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit the added requests, wait for the jobs and return the results.
+
+        Returns:
+            Mapping of record ID to {"response", "metering"} or {"error"}
+        """
+        jobs = self.submit()
+        if jobs:
+            self.wait(jobs)
+        return self.collect(jobs)
@@ -14,10 +14,9 @@ import logging
 import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Union
 
-import boto3
-from botocore.config import Config
 from botocore.exceptions import (
     ClientError,
     ConnectTimeoutError,
@@ -26,7 +25,38 @@ from botocore.exceptions import (
 )
 from urllib3.exceptions import ReadTimeoutError as Urllib3ReadTimeoutError
 
+from .connection_pool import BedrockConnectionPool, get_connection_pool
+from .embeddings import EmbeddingCache, embedding_keys, get_embedding_cache
 from .model_utils import parse_model_id
+from .prompt_cache import (
+    PromptCacheTracker,
+    auto_cachepoint_enabled,
+    get_prompt_cache_tracker,
+)
+from .rate_limiter import (
+    BedrockRateLimiter,
+    ModelRateLimit,
+    estimate_request_tokens,
+    get_rate_limiter,
+)
+from .response_cache import (
+    LlmResponseCache,
+    compute_cache_key,
+    get_response_cache,
+    is_cacheable_request,
+    is_cacheable_response,
+)
+from .router import ERROR, SUCCESS, THROTTLE, BedrockRouter, RouteTarget, get_router
+from .streaming import StreamingJsonHandler
+from .token_estimator import (
+    ContextWindowExceededError,
+    TokenEstimator,
+    context_routing_enabled,
+    estimate_content_tokens,
+    estimate_text_tokens,
+    get_max_tokens,
+    get_token_estimator,
+)
 
 
 # Dummy exception classes for requests timeouts if requests is not available
@@ -62,13 +92,16 @@ DEFAULT_MAX_RETRIES = 7
 DEFAULT_INITIAL_BACKOFF = 2  # seconds
 DEFAULT_MAX_BACKOFF = 300  # 5 minutes
 
+# Concurrent requests used to embed the cache misses of a batch
+DEFAULT_EMBEDDING_WORKERS = 8
+
 
 # Models that support cachePoint functionality
 CACHEPOINT_SUPPORTED_MODELS = [
     "us.anthropic.claude-3-5-haiku-20241022-v1:0",
     "us.anthropic.claude-haiku-4-5-20251001-v1:0",
     "us.anthropic.claude-3-7-sonnet-20250219-v1:0",
-    "us.anthropic.claude-opus-4-5-20251101-v1:0"
+    "us.anthropic.claude-opus-4-5-20251101-v1:0",
     "us.anthropic.claude-opus-4-1-20250805-v1:0",
     "us.anthropic.claude-opus-4-20250514-v1:0",
     "us.anthropic.claude-sonnet-4-20250514-v1:0",
@@ -111,6 +144,16 @@ class BedrockClient:
         initial_backoff: float = DEFAULT_INITIAL_BACKOFF,
         max_backoff: float = DEFAULT_MAX_BACKOFF,
         metrics_enabled: bool = True,
+        rate_limiter: Optional[BedrockRateLimiter] = None,
+        max_concurrency: Optional[int] = None,
+        connection_pool: Optional[BedrockConnectionPool] = None,
+        response_cache: Optional[LlmResponseCache] = None,
+        auto_cachepoint: Optional[bool] = None,
+        prompt_cache_tracker: Optional[PromptCacheTracker] = None,
+        context_routing: Optional[bool] = None,
+        token_estimator: Optional[TokenEstimator] = None,
+        router: Optional[BedrockRouter] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize a Bedrock client.
@@ -121,6 +164,27 @@ class BedrockClient:
             initial_backoff: Initial backoff time in seconds
             max_backoff: Maximum backoff time in seconds
             metrics_enabled: Whether to publish metrics
+            rate_limiter: Per-model RPM/TPM limiter (defaults to the process-wide
+                limiter configured from BEDROCK_RATE_LIMITS)
+            max_concurrency: Number of threads this client is called from; grows
+                the connection pool to match
+            connection_pool: Pool providing the boto3 client and connection slots
+                (defaults to the process-wide pool)
+            response_cache: Cache of deterministic responses (defaults to the
+                process-wide cache configured from BEDROCK_RESPONSE_CACHE, if any)
+            auto_cachepoint: Insert prompt cache checkpoints after prefixes shared
+                by successive requests of a context on supported models
+                (default: True unless BEDROCK_AUTO_CACHEPOINT=false)
+            prompt_cache_tracker: Tracker of shared prefixes and cache usage per
+                context (defaults to the process-wide tracker)
+            context_routing: Route requests that only fit a model's 1M-token
+                variant to it (default: True unless BEDROCK_CONTEXT_ROUTING=false)
+            token_estimator: Calibrated token estimator used to fit requests to
+                the context window (defaults to the process-wide estimator)
+            router: Per-model region/inference profile routes (defaults to the
+                process-wide router configured from BEDROCK_ROUTES)
+            embedding_cache: Cache of embedding vectors (defaults to the
+                process-wide cache configured from BEDROCK_EMBEDDING_CACHE_*)
         """
         self.region = region or os.environ.get("AWS_REGION")
         self.max_retries = max_retries
@@ -128,19 +192,66 @@ class BedrockClient:
         self.max_backoff = max_backoff
         self.metrics_enabled = metrics_enabled
         self._client = None
+        self._rate_limiter = rate_limiter
+        self.connection_pool = connection_pool or get_connection_pool()
+        if max_concurrency:
+            self.connection_pool.reserve(max_concurrency)
+        self._response_cache = response_cache
+        self.auto_cachepoint = (
+            auto_cachepoint_enabled() if auto_cachepoint is None else auto_cachepoint
+        )
+        self.prompt_cache_tracker = prompt_cache_tracker or get_prompt_cache_tracker()
+        self.context_routing = (
+            context_routing_enabled() if context_routing is None else context_routing
+        )
+        self.token_estimator = token_estimator or get_token_estimator()
+        self._router = router
+        self._embedding_cache = embedding_cache
 
     @property
     def client(self):
-        """Lazy-loaded Bedrock client."""
-        config = Config(
-            connect_timeout=10,
-            read_timeout=300,  # allow plenty of time for large extraction or assessment inferences
-        )
-        if self._client is None:
-            self._client = boto3.client(
-                "bedrock-runtime", region_name=self.region, config=config
-            )
-        return self._client
+        """Bedrock runtime client, shared per region through the connection pool."""
+        if self._client is not None:
+            return self._client
+        return self.connection_pool.get_client(self.region)
+
+    @property
+    def rate_limiter(self) -> BedrockRateLimiter:
+        """Rate limiter shared with the other Bedrock clients in this process."""
+        if self._rate_limiter is None:
+            return get_rate_limiter()
+        return self._rate_limiter
+
+    @property
+    def router(self) -> BedrockRouter:
+        """Region router shared with the other Bedrock clients in this process."""
+        if self._router is None:
+            return get_router()
+        return self._router
+
+    @property
+    def response_cache(self) -> Optional[LlmResponseCache]:
+        """Response cache for deterministic requests, or None if not enabled."""
+        if self._response_cache is None:
+            return get_response_cache()
+        return self._response_cache
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Embedding vector cache, or None if disabled."""
+        if self._embedding_cache is None:
+            return get_embedding_cache()
+        return self._embedding_cache
+
+    def prompt_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return prompt cache usage per context.
+
+        Returns:
+            Mapping of context to request, checkpoint and input token counts and
+            the cache read/write ratios of its input tokens
+        """
+        return self.prompt_cache_tracker.stats()
 
     def __call__(
         self,
@@ -154,6 +265,7 @@ class BedrockClient:
         max_retries: Optional[int] = None,
         context: str = "Unspecified",
         service_tier: Optional[str] = None,
+        stream_handler: Optional[StreamingJsonHandler] = None,
     ) -> Dict[str, Any]:
         """
         Make the instance callable with the same signature as the original function.
@@ -170,6 +282,8 @@ class BedrockClient:
             max_tokens: Optional max_tokens parameter (int or string)
             max_retries: Optional override for the instance's max_retries setting
             service_tier: Optional service tier (priority, standard, flex)
+            stream_handler: Optional handler to stream the response through
+                (uses converse_stream instead of converse)
 
         Returns:
             Bedrock response object with metering information
@@ -190,6 +304,7 @@ class BedrockClient:
             max_retries=effective_max_retries,
             context=context,
             service_tier=service_tier,
+            stream_handler=stream_handler,
         )
 
     def _preprocess_content_for_cachepoint(
@@ -280,6 +395,7 @@ class BedrockClient:
         max_retries: Optional[int] = None,
         context: str = "Unspecified",
         service_tier: Optional[str] = None,
+        stream_handler: Optional[StreamingJsonHandler] = None,
     ) -> Dict[str, Any]:
         """
         Invoke a Bedrock model with retry logic.
@@ -294,6 +410,8 @@ class BedrockClient:
             max_tokens: Optional max_tokens parameter (int or string)
             max_retries: Optional override for the instance's max_retries setting
             service_tier: Optional service tier (priority, standard, flex)
+            stream_handler: Optional handler to stream the response through
+                (uses converse_stream instead of converse)
 
         Returns:
             Bedrock response object with metering information
@@ -306,6 +424,143 @@ class BedrockClient:
             max_retries if max_retries is not None else self.max_retries
         )
 
+        converse_params = self.build_converse_params(
+            model_id=model_id,
+            system_prompt=system_prompt,
+            content=content,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            service_tier=service_tier,
+        )
+
+        # Fit max_tokens and the model to the estimated input size
+        raw_input_tokens = estimate_content_tokens(converse_params)
+        requested_max_tokens = get_max_tokens(converse_params)
+        try:
+            plan = self.token_estimator.plan(
+                model_id,
+                self.token_estimator.calibrate(model_id, raw_input_tokens),
+                requested_max_tokens,
+                allow_routing=self.context_routing,
+            )
+        except ContextWindowExceededError as e:
+            logger.error(f"Bedrock request not sent: {str(e)}")
+            self._put_metric("BedrockContextOverflows", 1)
+            raise
+        if plan.model_id != model_id:
+            logger.info(
+                f"Routing request of ~{plan.input_tokens} input tokens from "
+                f"{model_id} to {plan.model_id}"
+            )
+            self._put_metric("BedrockContextRoutes", 1)
+        elif plan.max_tokens != requested_max_tokens:
+            logger.info(
+                f"Lowering max_tokens from {requested_max_tokens} to "
+                f"{plan.max_tokens} to fit ~{plan.input_tokens} input tokens in the "
+                f"{plan.context_window}-token context window of {model_id}"
+            )
+            self._put_metric("BedrockMaxTokensAdjusted", 1)
+        if plan.model_id != model_id or plan.max_tokens != requested_max_tokens:
+            model_id = plan.model_id
+            converse_params = self.build_converse_params(
+                model_id=model_id,
+                system_prompt=system_prompt,
+                content=content,
+                temperature=temperature,
+                top_k=top_k,
+                top_p=top_p,
+                max_tokens=plan.max_tokens,
+                service_tier=service_tier,
+            )
+
+        # Reuse the response of an identical deterministic request, if cached
+        response_cache = self.response_cache
+        cache_key = None
+        if response_cache is not None and is_cacheable_request(converse_params):
+            cache_key = compute_cache_key(converse_params)
+            cached_response = response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info(f"Bedrock response cache hit for model {model_id}")
+                self._put_metric("BedrockResponseCacheHits", 1)
+                if stream_handler is not None:
+                    stream_handler.reset()
+                    stream_handler.feed(
+                        self.extract_text_from_response(cached_response)
+                    )
+                # Metered separately from billed Bedrock token usage
+                return {
+                    "response": cached_response,
+                    "metering": {f"{context}/bedrock_cache/{model_id}": {"hits": 1}},
+                }
+            self._put_metric("BedrockResponseCacheMisses", 1)
+
+        # Checkpoint the prefix shared with earlier requests of this context
+        if (
+            self.auto_cachepoint
+            and model_id in CACHEPOINT_SUPPORTED_MODELS
+            and self.prompt_cache_tracker.apply(context, model_id, converse_params)
+        ):
+            self._put_metric("BedrockAutoCachePoints", 1)
+
+        # Start timing the entire request
+        request_start_time = time.time()
+
+        # Call the recursive retry function
+        result = self._invoke_with_retry(
+            model_id=model_id,
+            converse_params=converse_params,
+            retry_count=0,
+            max_retries=effective_max_retries,
+            request_start_time=request_start_time,
+            context=context,
+            stream_handler=stream_handler,
+        )
+
+        self.prompt_cache_tracker.record_usage(
+            context, result["response"].get("usage", {})
+        )
+        # Usage of streams closed early is itself an estimate
+        if result["response"].get("stopReason") != "json_complete":
+            self.token_estimator.record_usage(
+                model_id, raw_input_tokens, result["response"].get("usage", {})
+            )
+        if cache_key is not None and is_cacheable_response(result["response"]):
+            response_cache.put(cache_key, result["response"])
+
+        return result
+
+    def build_converse_params(
+        self,
+        model_id: str,
+        system_prompt: Union[str, List[Dict[str, str]]],
+        content: List[Dict[str, Any]],
+        temperature: Union[float, str] = 0.0,
+        top_k: Optional[Union[float, str]] = 5,
+        top_p: Optional[Union[float, str]] = 0.1,
+        max_tokens: Optional[Union[int, str]] = None,
+        service_tier: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the Converse API parameters for a model invocation.
+
+        Used by invoke_model, and by batch inference to build the same request
+        without sending it.
+
+        Args:
+            model_id: The Bedrock model ID (e.g., 'anthropic.claude-3-sonnet-20240229-v1:0')
+            system_prompt: The system prompt as string or list of content objects
+            content: The content for the user message (can include text and images)
+            temperature: The temperature parameter for model inference (float or string)
+            top_k: Optional top_k parameter (float or string)
+            top_p: Optional top_p parameter (float or string)
+            max_tokens: Optional max_tokens parameter (int or string)
+            service_tier: Optional service tier (priority, standard, flex)
+
+        Returns:
+            Parameters for the Bedrock converse API call
+        """
         # Format system prompt if needed
         if isinstance(system_prompt, str):
             formatted_system_prompt = [{"text": system_prompt}]
@@ -501,20 +756,7 @@ class BedrockClient:
         if guardrail_config:
             converse_params["guardrailConfig"] = guardrail_config
 
-        # Start timing the entire request
-        request_start_time = time.time()
-
-        # Call the recursive retry function
-        result = self._invoke_with_retry(
-            model_id=model_id,
-            converse_params=converse_params,
-            retry_count=0,
-            max_retries=effective_max_retries,
-            request_start_time=request_start_time,
-            context=context,
-        )
-
-        return result
+        return converse_params
 
     def _invoke_with_retry(
         self,
@@ -525,6 +767,8 @@ class BedrockClient:
         request_start_time: float,
         last_exception: Optional[Exception] = None,
         context: str = "Unspecified",
+        stream_handler: Optional[StreamingJsonHandler] = None,
+        previous_target: Optional[RouteTarget] = None,
     ) -> Dict[str, Any]:
         """
         Recursive helper method to handle retries for Bedrock invocation.
@@ -535,6 +779,8 @@ class BedrockClient:
             max_retries: Maximum number of retry attempts
             request_start_time: Time when the original request started
             last_exception: The last exception encountered (for final error reporting)
+            stream_handler: Optional handler to stream the response through
+            previous_target: Route target of the failed previous attempt, if any
 
         Returns:
             Bedrock response object with metering information
@@ -542,6 +788,28 @@ class BedrockClient:
         Raises:
             Exception: The last exception encountered if max retries are exceeded
         """
+        # Wait for capacity under the model's shared RPM/TPM limit, if any;
+        # every attempt, including retries, counts as a request
+        rate_limit = self.rate_limiter.get(model_id)
+        reserved_tokens = 0
+        if rate_limit is not None:
+            reserved_tokens = estimate_request_tokens(
+                converse_params, self.token_estimator
+            )
+            waited = rate_limit.acquire(reserved_tokens)
+            self._put_metric("BedrockRateLimitWait", waited * 1000, "Milliseconds")
+
+        # Send the attempt to the healthiest configured region, if the model is routed
+        target = self.router.choose(model_id, avoid=previous_target)
+        runtime = self.client
+        request_params = converse_params
+        if target is not None:
+            runtime = self.connection_pool.get_client(target.region)
+            if target.model_id:
+                request_params = {**converse_params, "modelId": target.model_id}
+            if target != self.router.targets(model_id)[0]:
+                self._put_metric("BedrockRouteFailovers", 1)
+
         try:
             # Create a copy of the messages to sanitize for logging
             sanitized_params = copy.deepcopy(converse_params)
@@ -552,7 +820,11 @@ class BedrockClient:
 
             # Log detailed request parameters
             logger.info(f"Bedrock request attempt {retry_count + 1}/{max_retries}:")
-            logger.info(f"  - model: {converse_params['modelId']}")
+            # Log what is actually sent, matching the routed metering key
+            logger.info(f"  - model: {request_params['modelId']}")
+            logger.info(
+                f"  - region: {target.region if target is not None else self.region}"
+            )
             logger.info(f"  - inferenceConfig: {converse_params['inferenceConfig']}")
             logger.info(f"  - system: {converse_params['system']}")
             logger.info(f"  - messages: {sanitized_params['messages']}")
@@ -560,6 +832,9 @@ class BedrockClient:
                 f"  - additionalModelRequestFields: {converse_params['additionalModelRequestFields']}"
             )
 
+            if target is not None:
+                logger.info(f"  - route: {model_id}@{target.label}")
+
             # Log guardrail usage if configured
             if "guardrailConfig" in converse_params:
                 logger.debug(
@@ -569,11 +844,31 @@ class BedrockClient:
             # Start timing this attempt
             attempt_start_time = time.time()
 
-            # Make the API call
-            response = self.client.converse(**converse_params)
+            # Make the API call on a pooled connection
+            try:
+                with self.connection_pool.connection() as pool_wait:
+                    if stream_handler is None:
+                        response = runtime.converse(**request_params)
+                    else:
+                        response = self._converse_stream(
+                            runtime, request_params, stream_handler
+                        )
+            except Exception:
+                self._settle_rate_limit(rate_limit, reserved_tokens, 0)
+                raise
+            self._put_metric(
+                "BedrockConnectionPoolWait", pool_wait * 1000, "Milliseconds"
+            )
+            self._settle_rate_limit(
+                rate_limit,
+                reserved_tokens,
+                response.get("usage", {}).get("totalTokens", 0),
+            )
 
             # Calculate duration
             duration = time.time() - attempt_start_time
+            if target is not None:
+                self.router.record(target, SUCCESS, duration - pool_wait)
 
             # Log response details, but sanitize large content
             sanitized_response = self._sanitize_response_for_logging(response)
@@ -609,11 +904,16 @@ class BedrockClient:
                 "BedrockTotalLatency", total_duration * 1000, "Milliseconds"
             )
 
-            # Create metering data
+            # Create metering data; routed requests are also counted per target
+            # under a separate key that has no price
             usage = response.get("usage", {})
+            metering = {f"{context}/bedrock/{model_id}": {**usage, "requests": 1}}
+            if target is not None:
+                route_key = f"{context}/bedrock_route/{model_id}@{target.label}"
+                metering[route_key] = {"requests": 1}
             response_with_metering = {
                 "response": response,
-                "metering": {f"{context}/bedrock/{model_id}": {**usage, "requests": 1}},
+                "metering": metering,
             }
 
             return response_with_metering
@@ -622,6 +922,9 @@ class BedrockClient:
             # Handle boto3/botocore client errors (have response structure)
             error_code = e.response["Error"]["Code"]
             error_message = e.response["Error"]["Message"]
+            # Errors raised mid-stream carry camelCase event names
+            # (e.g. throttlingException)
+            error_code = error_code[:1].upper() + error_code[1:]
 
             retryable_errors = [
                 "ThrottlingException",
@@ -630,12 +933,15 @@ class BedrockClient:
                 "TooManyRequestsException",
                 "ServiceUnavailableException",
                 "ModelErrorException",
+                "ModelStreamErrorException",
                 "RequestTimeout",
                 "RequestTimeoutException",
             ]
 
             if error_code in retryable_errors:
                 self._put_metric("BedrockThrottles", 1)
+                if target is not None:
+                    self.router.record(target, THROTTLE)
 
                 # Check if we've reached max retries
                 if retry_count >= max_retries:
@@ -666,6 +972,8 @@ class BedrockClient:
                     request_start_time=request_start_time,
                     last_exception=e,
                     context=context,
+                    stream_handler=stream_handler,
+                    previous_target=target,
                 )
             else:
                 logger.error(
@@ -687,6 +995,8 @@ class BedrockClient:
             error_message = str(e)
 
             self._put_metric("BedrockTimeouts", 1)
+            if target is not None:
+                self.router.record(target, ERROR)
 
             # Check if we've reached max retries
             if retry_count >= max_retries:
@@ -717,6 +1027,8 @@ class BedrockClient:
                 request_start_time=request_start_time,
                 last_exception=e,
                 context=context,
+                stream_handler=stream_handler,
+                previous_target=target,
             )
 
         except Exception as e:
@@ -727,6 +1039,87 @@ class BedrockClient:
             self._put_metric("BedrockUnexpectedErrors", 1)
             raise
 
+    def _converse_stream(
+        self,
+        runtime: Any,
+        converse_params: Dict[str, Any],
+        stream_handler: StreamingJsonHandler,
+    ) -> Dict[str, Any]:
+        """
+        Call converse_stream and assemble a response shaped like converse's.
+
+        Text deltas are passed to the stream handler as they arrive. When the
+        handler reports its JSON object complete, the stream is closed without
+        waiting for the rest of the generation; usage is then estimated and the
+        stop reason is "json_complete".
+
+        Args:
+            runtime: Bedrock runtime client to call
+            converse_params: Parameters for the Bedrock converse API call
+            stream_handler: Handler consuming the response text
+
+        Returns:
+            Converse-shaped response with timeToFirstTokenMs in its metrics
+        """
+        stream_handler.reset()
+        start_time = time.time()
+        stream = runtime.converse_stream(**converse_params)["stream"]
+        text_parts: List[str] = []
+        first_token_ms: Optional[float] = None
+        stop_reason = None
+        usage = None
+        metrics: Dict[str, Any] = {}
+        stopped_early = False
+        try:
+            for event in stream:
+                if "contentBlockDelta" in event:
+                    text = event["contentBlockDelta"].get("delta", {}).get("text")
+                    if not text:
+                        continue
+                    if first_token_ms is None:
+                        first_token_ms = (time.time() - start_time) * 1000
+                        self._put_metric(
+                            "BedrockTimeToFirstToken", first_token_ms, "Milliseconds"
+                        )
+                    text_parts.append(text)
+                    if stream_handler.feed(text):
+                        stopped_early = True
+                        break
+                elif "messageStop" in event:
+                    stop_reason = event["messageStop"].get("stopReason")
+                elif "metadata" in event:
+                    usage = event["metadata"].get("usage")
+                    metrics = dict(event["metadata"].get("metrics") or {})
+        finally:
+            if stopped_early and hasattr(stream, "close"):
+                stream.close()
+
+        text = "".join(text_parts)
+        if usage is None:
+            # Closed before the metadata event: estimate the tokens used
+            input_tokens = self.token_estimator.estimate_input_tokens(
+                converse_params.get("modelId", ""), converse_params
+            )
+            output_tokens = max(1, estimate_text_tokens(text))
+            usage = {
+                "inputTokens": input_tokens,
+                "outputTokens": output_tokens,
+                "totalTokens": input_tokens + output_tokens,
+            }
+        if stopped_early:
+            self._put_metric("BedrockStreamEarlyStops", 1)
+            stop_reason = "json_complete"
+        metrics.setdefault("latencyMs", int((time.time() - start_time) * 1000))
+        if first_token_ms is not None:
+            metrics["timeToFirstTokenMs"] = int(first_token_ms)
+
+        return {
+            "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+            "stopReason": stop_reason or "end_turn",
+            "usage": usage,
+            "metrics": metrics,
+        }
+
     def get_guardrail_config(self) -> Optional[Dict[str, str]]:
         """
         Get guardrail configuration from environment if available.
@@ -773,36 +1166,83 @@ class BedrockClient:
         Returns:
             List of floats representing the embedding vector
         """
-        if not text or not isinstance(text, str):
-            # Return an empty vector for empty input
-            return []
+        return self.generate_embeddings([text], model_id, max_retries)[0]
 
-        # Use instance max_retries if not overridden
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        model_id: str = "amazon.titan-embed-text-v1",
+        max_retries: Optional[int] = None,
+        max_workers: int = DEFAULT_EMBEDDING_WORKERS,
+    ) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts.
+
+        Texts are normalized and deduplicated, vectors already in the embedding
+        cache are reused, and the remaining texts are embedded concurrently
+        (Bedrock embedding models take one text per request).
+
+        Args:
+            texts: Texts to generate embeddings for
+            model_id: The embedding model ID to use
+            max_retries: Optional override for the instance's max_retries setting
+            max_workers: Maximum number of concurrent embedding requests
+
+        Returns:
+            One vector per input text, in input order (empty for empty input)
+        """
         effective_max_retries = (
             max_retries if max_retries is not None else self.max_retries
         )
+        keys, unique = embedding_keys(model_id, texts)
+        cache = self.embedding_cache
+
+        vectors: Dict[str, List[float]] = {}
+        if cache is not None:
+            for key in unique:
+                cached = cache.get(key)
+                if cached is not None:
+                    vectors[key] = cached
+            if vectors:
+                self._put_metric("BedrockEmbeddingCacheHits", len(vectors))
+
+        def embed(key: str) -> List[float]:
+            # Track total embedding requests
+            self._put_metric("BedrockEmbeddingRequestsTotal", 1)
+            normalized_text = unique[key]
+            # Prepare the request body based on the model
+            if "amazon.titan-embed" in model_id:
+                request_body = json.dumps({"inputText": normalized_text})
+            else:
+                # Default format for other models
+                request_body = json.dumps({"text": normalized_text})
+            return self._generate_embedding_with_retry(
+                model_id=model_id,
+                request_body=request_body,
+                normalized_text=normalized_text,
+                retry_count=0,
+                max_retries=effective_max_retries,
+            )
 
-        # Track total embedding requests
-        self._put_metric("BedrockEmbeddingRequestsTotal", 1)
-
-        # Normalize whitespace and prepare the input text
-        normalized_text = " ".join(text.split())
-
-        # Prepare the request body based on the model
-        if "amazon.titan-embed" in model_id:
-            request_body = json.dumps({"inputText": normalized_text})
+        missing = [key for key in unique if key not in vectors]
+        if len(missing) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(missing))
+            ) as executor:
+                embedded = list(executor.map(embed, missing))
         else:
-            # Default format for other models
-            request_body = json.dumps({"text": normalized_text})
-
-        # Call the recursive embedding function
-        return self._generate_embedding_with_retry(
-            model_id=model_id,
-            request_body=request_body,
-            normalized_text=normalized_text,
-            retry_count=0,
-            max_retries=effective_max_retries,
-        )
+            embedded = [embed(key) for key in missing]
+        for key, embedding in zip(missing, embedded):
+            vectors[key] = embedding
+            if cache is not None:
+                cache.put(key, embedding)
+
+        if len(texts) > 1:
+            logger.debug(
+                f"Embedded {len(texts)} texts: {len(unique)} distinct, "
+                f"{len(missing)} generated"
+            )
+        return [list(vectors[key]) if key else [] for key in keys]
 
     def _generate_embedding_with_retry(
         self,
@@ -830,6 +1270,14 @@ class BedrockClient:
         Raises:
             Exception: The last exception encountered if max retries are exceeded
         """
+        # Wait for capacity under the model's shared RPM/TPM limit, if any
+        rate_limit = self.rate_limiter.get(model_id)
+        reserved_tokens = 0
+        if rate_limit is not None:
+            reserved_tokens = estimate_text_tokens(normalized_text) + 1
+            waited = rate_limit.acquire(reserved_tokens)
+            self._put_metric("BedrockRateLimitWait", waited * 1000, "Milliseconds")
+
         try:
             logger.info(
                 f"Bedrock embedding request attempt {retry_count + 1}/{max_retries}:"
@@ -838,16 +1286,29 @@ class BedrockClient:
             logger.debug(f"  - input text length: {len(normalized_text)} characters")
 
             attempt_start_time = time.time()
-            response = self.client.invoke_model(
-                modelId=model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=request_body,
-            )
+            try:
+                with self.connection_pool.connection() as pool_wait:
+                    response = self.client.invoke_model(
+                        modelId=model_id,
+                        contentType="application/json",
+                        accept="application/json",
+                        body=request_body,
+                    )
+            except Exception:
+                self._settle_rate_limit(rate_limit, reserved_tokens, 0)
+                raise
             duration = time.time() - attempt_start_time
+            self._put_metric(
+                "BedrockConnectionPoolWait", pool_wait * 1000, "Milliseconds"
+            )
 
             # Extract the embedding vector from response
             response_body = json.loads(response["body"].read())
+            self._settle_rate_limit(
+                rate_limit,
+                reserved_tokens,
+                response_body.get("inputTextTokenCount", reserved_tokens),
+            )
 
             # Handle different response formats based on the model
             if "amazon.titan-embed" in model_id:
@@ -1000,6 +1461,23 @@ class BedrockClient:
 
         return backoff_seconds + jitter
 
+    def _settle_rate_limit(
+        self,
+        rate_limit: Optional[ModelRateLimit],
+        reserved_tokens: int,
+        used_tokens: int,
+    ) -> None:
+        """
+        Refund the unused part of a rate limit reservation.
+
+        Args:
+            rate_limit: Limit the call was admitted by (None if not limited)
+            reserved_tokens: Tokens reserved before the call
+            used_tokens: Tokens reported by the response (0 if the call failed)
+        """
+        if rate_limit is not None:
+            rate_limit.refund(reserved_tokens, used_tokens)
+
     def _put_metric(
         self, metric_name: str, value: Union[int, float], unit: str = "Count"
     ):
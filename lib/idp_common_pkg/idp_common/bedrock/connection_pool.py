@@ -0,0 +1,175 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Shared bedrock-runtime clients with connection pools sized to caller concurrency.
+
+botocore keeps at most ``max_pool_connections`` (default 10) HTTP connections
+per client. Services that call Bedrock from 20 or more threads exceed that, so
+urllib3 opens throwaway connections (a new TLS handshake per call) and logs
+"Connection pool is full" warnings.
+
+``BedrockConnectionPool`` keeps one client per region for the whole process,
+sized for the widest caller: services reserve their worker count and the next
+client lookup rebuilds the client if the pool has grown. Calls take a slot
+before using a connection, so callers beyond the pool size wait for a pooled
+connection instead of opening new ones, and the wait is measurable.
+"""
+
+import contextlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Pool size before any caller reserves connections (the default worker count
+# of the classification, summarization and OCR thread pools)
+DEFAULT_MAX_POOL_CONNECTIONS = 20
+
+CONNECT_TIMEOUT = 10
+# Allow plenty of time for large extraction or assessment inferences
+READ_TIMEOUT = 300
+
+
+@dataclass
+class ConnectionPoolStats:
+    """Calls that waited for a pooled connection and how long they waited."""
+
+    calls: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    max_in_use: int = 0
+
+
+class BedrockConnectionPool:
+    """
+    Process-wide bedrock-runtime clients and connection slots.
+
+    Thread-safe; shared by every BedrockClient that was not given its own
+    boto3 client.
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        client_factory: Optional[Callable[..., Any]] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_pool_connections: Initial connections per client
+            client_factory: Factory called like boto3.client (for tests)
+        """
+        self._size = max(1, max_pool_connections)
+        self._client_factory = client_factory or boto3.client
+        self._clients: Dict[Optional[str], Tuple[Any, int]] = {}
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self.stats = ConnectionPoolStats()
+
+    @property
+    def size(self) -> int:
+        """Connections per client (and concurrent calls allowed)."""
+        return self._size
+
+    def reserve(self, concurrency: int) -> None:
+        """
+        Grow the pool to serve at least ``concurrency`` concurrent calls.
+
+        Clients created before the pool grew are replaced on their next lookup.
+
+        Args:
+            concurrency: Number of threads the caller invokes Bedrock from
+        """
+        with self._condition:
+            if concurrency > self._size:
+                logger.info(
+                    f"Bedrock connection pool grown from {self._size} to {concurrency}"
+                )
+                self._size = concurrency
+                self._condition.notify_all()
+
+    def get_client(self, region: Optional[str]) -> Any:
+        """
+        Return the shared bedrock-runtime client for a region.
+
+        Args:
+            region: AWS region (None for the boto3 default)
+
+        Returns:
+            boto3 bedrock-runtime client with max_pool_connections at the pool size
+        """
+        cached = self._clients.get(region)
+        if cached is not None and cached[1] >= self._size:
+            return cached[0]
+        with self._condition:
+            cached = self._clients.get(region)
+            if cached is None or cached[1] < self._size:
+                config = Config(
+                    connect_timeout=CONNECT_TIMEOUT,
+                    read_timeout=READ_TIMEOUT,
+                    max_pool_connections=self._size,
+                )
+                client = self._client_factory(
+                    "bedrock-runtime", region_name=region, config=config
+                )
+                cached = (client, self._size)
+                self._clients[region] = cached
+            return cached[0]
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[float]:
+        """
+        Hold a connection slot for one call, waiting if all slots are in use.
+
+        Yields:
+            Seconds spent waiting for the slot
+        """
+        with self._condition:
+            waited = 0.0
+            if self._in_use >= self._size:
+                start = time.perf_counter()
+                while self._in_use >= self._size:
+                    self._condition.wait()
+                waited = time.perf_counter() - start
+                self.stats.waits += 1
+                self.stats.wait_seconds += waited
+            self._in_use += 1
+            self.stats.calls += 1
+            self.stats.max_in_use = max(self.stats.max_in_use, self._in_use)
+        try:
+            yield waited
+        finally:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+
+
+_shared_pool: Optional[BedrockConnectionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> BedrockConnectionPool:
+    """Return the process-wide Bedrock connection pool."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BedrockConnectionPool()
+        return _shared_pool
+
+
+def reserve_connections(concurrency: int) -> None:
+    """
+    Size the shared Bedrock connection pool for a caller's concurrency.
+
+    Args:
+        concurrency: Number of threads the caller invokes Bedrock from
+    """
+    get_connection_pool().reserve(concurrency)
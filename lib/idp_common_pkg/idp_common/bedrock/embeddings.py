@@ -0,0 +1,309 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Embedding vector cache and vectorized similarity.
+
+Semantic evaluation embeds the same expected values for every document of a
+test set, and list attributes compare every expected item with every actual
+item. Embeddings are deterministic, so ``EmbeddingCache`` keeps vectors keyed
+by a SHA-256 of the model ID and normalized text: in an in-process LRU of
+float32 arrays and, optionally, as files in a local directory (for example
+``/tmp`` in Lambda, which survives warm invocations).
+
+``cosine_similarity_matrix`` and ``most_similar`` compare whole sets of
+vectors with NumPy matrix products instead of per-pair Python loops.
+
+The cache is configured with environment variables:
+
+- ``BEDROCK_EMBEDDING_CACHE_ENTRIES``: in-process LRU size (default 4096,
+  0 disables the cache)
+- ``BEDROCK_EMBEDDING_CACHE_DIR``: directory for the on-disk tier (unset
+  keeps vectors in memory only)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key or stored vector format changes so stale entries are ignored
+CACHE_FORMAT_VERSION = "1"
+
+CACHE_ENTRIES_ENV_VAR = "BEDROCK_EMBEDDING_CACHE_ENTRIES"
+CACHE_DIR_ENV_VAR = "BEDROCK_EMBEDDING_CACHE_DIR"
+
+DEFAULT_CACHE_ENTRIES = 4096
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Collapse whitespace the way the text is sent to the embedding model."""
+    return " ".join(text.split())
+
+
+def compute_embedding_key(model_id: str, normalized_text: str) -> str:
+    """
+    Compute the cache key of an embedding.
+
+    Args:
+        model_id: Embedding model ID
+        normalized_text: Text after normalize_embedding_text
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in (CACHE_FORMAT_VERSION, model_id, normalized_text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: in-process LRU plus an optional directory.
+
+    Vectors are held as float32 arrays (a quarter of the size of a list of
+    Python floats). Thread-safe; disk errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Number of vectors kept in memory
+            cache_dir: Optional directory for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir or "", f"{key}.f32")
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Return the cached vector for a key.
+
+        Args:
+            key: Key from compute_embedding_key
+
+        Returns:
+            Embedding vector, or None on a miss
+        """
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+        if vector is None and self.cache_dir:
+            try:
+                with open(self._path(key), "rb") as f:
+                    vector = array("f")
+                    vector.frombytes(f.read())
+                self._remember(key, vector)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"Embedding cache read failed: {str(e)}")
+                vector = None
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return vector.tolist()
+
+    def put(self, key: str, embedding: Sequence[float]) -> None:
+        """
+        Cache a vector.
+
+        Args:
+            key: Key from compute_embedding_key
+            embedding: Embedding vector (empty vectors are not cached)
+        """
+        if not embedding:
+            return
+        vector = array("f", embedding)
+        self._remember(key, vector)
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                # Write then rename so concurrent readers never see a partial file
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(vector.tobytes())
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.warning(f"Embedding cache write failed: {str(e)}")
+
+    def _remember(self, key: str, vector: array) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def create_embedding_cache_from_env() -> Optional[EmbeddingCache]:
+    """
+    Create the embedding cache configured by the environment.
+
+    Returns:
+        EmbeddingCache, or None if BEDROCK_EMBEDDING_CACHE_ENTRIES is 0
+    """
+    try:
+        max_entries = int(
+            os.environ.get(CACHE_ENTRIES_ENV_VAR) or DEFAULT_CACHE_ENTRIES
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid {CACHE_ENTRIES_ENV_VAR}, using default: {e}")
+        max_entries = DEFAULT_CACHE_ENTRIES
+    if max_entries <= 0:
+        return None
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR, "").strip() or None
+    try:
+        return EmbeddingCache(max_entries, cache_dir)
+    except OSError as e:
+        logger.warning(f"Embedding cache directory unavailable, memory only: {e}")
+        return EmbeddingCache(max_entries)
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_cache_loaded = False
+_shared_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide embedding cache, or None if disabled."""
+    global _shared_cache, _shared_cache_loaded
+    with _shared_cache_lock:
+        if not _shared_cache_loaded:
+            _shared_cache = create_embedding_cache_from_env()
+            _shared_cache_loaded = True
+        return _shared_cache
+
+
+def _as_matrix(vectors: Sequence[Sequence[float]]) -> "np.ndarray":
+    import numpy as np
+
+    if not len(vectors):
+        return np.zeros((0, 0), dtype=np.float32)
+    width = max(len(v) for v in vectors)
+    matrix = np.zeros((len(vectors), width), dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        matrix[i, : len(vector)] = vector
+    return matrix
+
+
+def cosine_similarity_matrix(
+    vectors1: Sequence[Sequence[float]], vectors2: Sequence[Sequence[float]]
+) -> "np.ndarray":
+    """
+    Compute the cosine similarity of every pair of vectors.
+
+    Empty or zero vectors have a similarity of 0.0 with everything. Vectors of
+    different lengths are compared on their common prefix.
+
+    Args:
+        vectors1: N vectors
+        vectors2: M vectors
+
+    Returns:
+        N x M float array
+    """
+    import numpy as np
+
+    a = _as_matrix(vectors1)
+    b = _as_matrix(vectors2)
+    if not a.size or not b.size:
+        return np.zeros((len(vectors1), len(vectors2)), dtype=np.float32)
+    width = min(a.shape[1], b.shape[1])
+    if a.shape[1] != b.shape[1]:
+        logger.warning(f"Vector lengths don't match: {a.shape[1]} vs {b.shape[1]}")
+    a = a[:, :width]
+    b = b[:, :width]
+
+    norms_a = np.linalg.norm(a, axis=1, keepdims=True)
+    norms_b = np.linalg.norm(b, axis=1, keepdims=True)
+    a = np.divide(a, norms_a, out=np.zeros_like(a), where=norms_a > 0)
+    b = np.divide(b, norms_b, out=np.zeros_like(b), where=norms_b > 0)
+    return a @ b.T
+
+
+def most_similar(
+    queries: Sequence[Sequence[float]],
+    candidates: Sequence[Sequence[float]],
+    top_k: int = 1,
+) -> List[List[Tuple[int, float]]]:
+    """
+    Find the most similar candidates of each query vector.
+
+    Args:
+        queries: Query vectors
+        candidates: Candidate vectors (for example knowledge base entries)
+        top_k: Number of candidates returned per query
+
+    Returns:
+        Per query, up to top_k (candidate index, similarity) pairs, best first
+    """
+    import numpy as np
+
+    similarities = cosine_similarity_matrix(queries, candidates)
+    top_k = min(top_k, similarities.shape[1])
+    if top_k <= 0:
+        return [[] for _ in range(len(queries))]
+    # Partial sort of each row, then order only the top_k columns
+    top = np.argpartition(-similarities, top_k - 1, axis=1)[:, :top_k]
+    results = []
+    for row, columns in enumerate(top):
+        ordered = sorted(columns, key=lambda j: -similarities[row, j])
+        results.append([(int(j), float(similarities[row, j])) for j in ordered])
+    return results
+
+
+def embedding_keys(
+    model_id: str, texts: Sequence[str]
+) -> Tuple[List[Optional[str]], Dict[str, str]]:
+    """
+    Normalize texts and compute their cache keys.
+
+    Args:
+        model_id: Embedding model ID
+        texts: Input texts
+
+    Returns:
+        Key per text (None for empty or non-string texts), and the normalized
+        text of each distinct key
+    """
+    keys: List[Optional[str]] = []
+    unique: Dict[str, str] = {}
+    for text in texts:
+        if not text or not isinstance(text, str):
+            keys.append(None)
+            continue
+        normalized = normalize_embedding_text(text)
+        if not normalized:
+            keys.append(None)
+            continue
+        key = compute_embedding_key(model_id, normalized)
+        keys.append(key)
+        unique.setdefault(key, normalized)
+    return keys, unique
@@ -0,0 +1,343 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Automatic prompt-cache checkpoint placement.
+
+Prompt caching only helps when a ``cachePoint`` block follows a prefix that
+repeats across requests. Config authors can mark that prefix with
+``<<CACHEPOINT>>`` tags; ``PromptCacheTracker`` finds it without tags by
+comparing successive requests of the same context (e.g. "Extraction") and
+model, and inserts one ``cachePoint`` at the end of the shared prefix (system
+prompt, class schema, few-shot examples) once it is long enough to cache.
+
+Each context keeps a few recent requests as candidates and the prefixes they
+confirmed. A request that starts with a confirmed prefix gets a checkpoint
+there; a request sharing a longer prefix with a recent request confirms that
+longer prefix (for example a class-specific schema after a shared preamble).
+Prefixes end at a line break so the checkpoint position is stable.
+
+Set ``BEDROCK_AUTO_CACHEPOINT=false`` to disable automatic checkpoints.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .token_estimator import CHARS_PER_TOKEN, DOCUMENT_TOKENS, IMAGE_TOKENS
+
+logger = logging.getLogger(__name__)
+
+AUTO_CACHEPOINT_ENV_VAR = "BEDROCK_AUTO_CACHEPOINT"
+
+# Smallest prefix worth a checkpoint (the Claude Sonnet/Opus and Nova minimum)
+MIN_CACHE_PREFIX_TOKENS = 1024
+
+# Recent requests and confirmed prefixes kept per context and model
+MAX_CANDIDATES = 8
+MAX_PREFIXES = 16
+MAX_TRACKED_CONTEXTS = 256
+
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+# A block reduced to what identifies it: ("text", text) or (kind, hash)
+Signature = Tuple[str, str]
+
+
+def auto_cachepoint_enabled() -> bool:
+    """Return False if BEDROCK_AUTO_CACHEPOINT disables automatic checkpoints."""
+    value = os.environ.get(AUTO_CACHEPOINT_ENV_VAR, "true").strip().lower()
+    return value not in ("false", "0", "no", "off")
+
+
+def _block_signature(block: Dict[str, Any]) -> Signature:
+    if isinstance(block.get("text"), str):
+        return ("text", block["text"])
+    if "image" in block:
+        data = (block["image"].get("source") or {}).get("bytes") or b""
+        return ("image", hashlib.sha256(data).hexdigest())
+    serialized = json.dumps(block, sort_keys=True, default=str)
+    return ("other", hashlib.sha256(serialized.encode("utf-8")).hexdigest())
+
+
+def _signature_tokens(signature: Signature) -> int:
+    kind, value = signature
+    if kind == "text":
+        return len(value) // CHARS_PER_TOKEN
+    return IMAGE_TOKENS if kind == "image" else DOCUMENT_TOKENS
+
+
+@dataclass
+class _Prefix:
+    """Whole blocks plus the leading characters of the next text block."""
+
+    blocks: List[Signature]
+    partial_text: str = ""
+
+    @property
+    def tokens(self) -> int:
+        tokens = sum(_signature_tokens(s) for s in self.blocks)
+        return tokens + len(self.partial_text) // CHARS_PER_TOKEN
+
+    def is_prefix_of(self, signatures: List[Signature]) -> bool:
+        count = len(self.blocks)
+        if signatures[:count] != self.blocks:
+            return False
+        if not self.partial_text:
+            return True
+        return (
+            len(signatures) > count
+            and signatures[count][0] == "text"
+            and signatures[count][1].startswith(self.partial_text)
+        )
+
+
+def _common_prefix(first: List[Signature], second: List[Signature]) -> _Prefix:
+    """Longest shared prefix, ending at a block boundary or a line break."""
+    count = 0
+    while count < min(len(first), len(second)) and first[count] == second[count]:
+        count += 1
+    partial_text = ""
+    if (
+        count < min(len(first), len(second))
+        and first[count][0] == "text"
+        and second[count][0] == "text"
+    ):
+        shared = os.path.commonprefix([first[count][1], second[count][1]])
+        partial_text = shared[: shared.rfind("\n") + 1]
+    return _Prefix(list(first[:count]), partial_text)
+
+
+@dataclass
+class PromptCacheStats:
+    """Input token usage of one context, split by prompt cache use."""
+
+    requests: int = 0
+    checkpoints: int = 0
+    input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_write_input_tokens: int = 0
+
+    @property
+    def _total_input_tokens(self) -> int:
+        return (
+            self.input_tokens
+            + self.cache_read_input_tokens
+            + self.cache_write_input_tokens
+        )
+
+    @property
+    def cache_read_ratio(self) -> float:
+        """Share of input tokens read from the prompt cache."""
+        total = self._total_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+    @property
+    def cache_write_ratio(self) -> float:
+        """Share of input tokens written to the prompt cache."""
+        total = self._total_input_tokens
+        return self.cache_write_input_tokens / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "checkpoints": self.checkpoints,
+            "input_tokens": self.input_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "cache_write_input_tokens": self.cache_write_input_tokens,
+            "cache_read_ratio": round(self.cache_read_ratio, 4),
+            "cache_write_ratio": round(self.cache_write_ratio, 4),
+        }
+
+
+class _ContextHistory:
+    def __init__(self):
+        self.candidates: "OrderedDict[int, List[Signature]]" = OrderedDict()
+        self.prefixes: "OrderedDict[int, _Prefix]" = OrderedDict()
+        self._next_id = 0
+
+    def add_candidate(self, signatures: List[Signature]) -> None:
+        self._next_id += 1
+        self.candidates[self._next_id] = signatures
+        while len(self.candidates) > MAX_CANDIDATES:
+            self.candidates.popitem(last=False)
+
+    def add_prefix(self, prefix: _Prefix) -> None:
+        self._next_id += 1
+        self.prefixes[self._next_id] = prefix
+        while len(self.prefixes) > MAX_PREFIXES:
+            self.prefixes.popitem(last=False)
+
+
+class PromptCacheTracker:
+    """
+    Learns stable prompt prefixes per context and model and places checkpoints.
+
+    Thread-safe; shared by every BedrockClient in the process.
+    """
+
+    def __init__(self, min_prefix_tokens: int = MIN_CACHE_PREFIX_TOKENS):
+        """
+        Initialize the tracker.
+
+        Args:
+            min_prefix_tokens: Smallest estimated prefix that gets a checkpoint
+        """
+        self.min_prefix_tokens = min_prefix_tokens
+        self._histories: "OrderedDict[Tuple[str, str], _ContextHistory]" = (
+            OrderedDict()
+        )
+        self._stats: Dict[str, PromptCacheStats] = {}
+        self._lock = threading.Lock()
+
+    def _history(self, key: Tuple[str, str]) -> _ContextHistory:
+        history = self._histories.get(key)
+        if history is None:
+            history = _ContextHistory()
+            self._histories[key] = history
+            while len(self._histories) > MAX_TRACKED_CONTEXTS:
+                self._histories.popitem(last=False)
+        else:
+            self._histories.move_to_end(key)
+        return history
+
+    def _select_prefix(
+        self, key: Tuple[str, str], signatures: List[Signature]
+    ) -> Optional[_Prefix]:
+        with self._lock:
+            history = self._history(key)
+            confirmed = None
+            for prefix_id, prefix in history.prefixes.items():
+                if prefix.is_prefix_of(signatures) and (
+                    confirmed is None or prefix.tokens > confirmed[1].tokens
+                ):
+                    confirmed = (prefix_id, prefix)
+
+            longest = None
+            for candidate_id, candidate in history.candidates.items():
+                common = _common_prefix(candidate, signatures)
+                if longest is None or common.tokens > longest[1].tokens:
+                    longest = (candidate_id, common)
+
+            confirmed_tokens = confirmed[1].tokens if confirmed else 0
+            if (
+                longest is not None
+                and longest[1].tokens >= self.min_prefix_tokens
+                and longest[1].tokens > confirmed_tokens
+            ):
+                # A recent request shares a longer prefix: confirm it
+                del history.candidates[longest[0]]
+                history.add_prefix(longest[1])
+                return longest[1]
+
+            history.add_candidate(signatures)
+            if confirmed is not None:
+                history.prefixes.move_to_end(confirmed[0])
+                return confirmed[1]
+            return None
+
+    def apply(
+        self, context: str, model_id: str, converse_params: Dict[str, Any]
+    ) -> bool:
+        """
+        Insert a cachePoint after the stable prefix of a request, if known.
+
+        Requests that already contain a cachePoint (from <<CACHEPOINT>> tags)
+        are left unchanged.
+
+        Args:
+            context: Calling context (e.g. "Extraction")
+            model_id: Model ID the request is sent to
+            converse_params: Parameters for the converse API call (updated in place)
+
+        Returns:
+            True if a checkpoint was inserted
+        """
+        system = list(converse_params.get("system") or [])
+        messages = converse_params.get("messages") or []
+        sections: List[Tuple[Optional[int], List[Dict[str, Any]]]] = [(None, system)]
+        sections.extend(
+            (index, list(message.get("content") or []))
+            for index, message in enumerate(messages)
+        )
+        blocks = [block for _, section in sections for block in section]
+        if any("cachePoint" in block for block in blocks):
+            return False
+
+        signatures = [_block_signature(block) for block in blocks]
+        prefix = self._select_prefix((context, model_id), signatures)
+        if prefix is None:
+            return False
+
+        # Locate the section and block the prefix ends in
+        position = len(prefix.blocks)
+        for message_index, section in sections:
+            if position > len(section) or (
+                position == len(section) and prefix.partial_text
+            ):
+                position -= len(section)
+                continue
+            section = list(section)
+            if prefix.partial_text:
+                text = section[position]["text"]
+                split = len(prefix.partial_text)
+                parts = [{"text": text[:split]}, dict(CACHE_POINT)]
+                if text[split:]:
+                    parts.append({"text": text[split:]})
+                section[position : position + 1] = parts
+            else:
+                section.insert(position, dict(CACHE_POINT))
+            if message_index is None:
+                converse_params["system"] = section
+            else:
+                messages[message_index] = {
+                    **messages[message_index],
+                    "content": section,
+                }
+            break
+
+        with self._lock:
+            self._stats.setdefault(context, PromptCacheStats()).checkpoints += 1
+        logger.debug(
+            f"Inserted automatic cachePoint for {context} after ~{prefix.tokens} "
+            "prefix tokens"
+        )
+        return True
+
+    def record_usage(self, context: str, usage: Dict[str, Any]) -> None:
+        """
+        Add the token usage of a response to the context's statistics.
+
+        Args:
+            context: Calling context (e.g. "Extraction")
+            usage: Usage from the converse response
+        """
+        with self._lock:
+            stats = self._stats.setdefault(context, PromptCacheStats())
+            stats.requests += 1
+            stats.input_tokens += usage.get("inputTokens", 0)
+            stats.cache_read_input_tokens += usage.get("cacheReadInputTokens", 0)
+            stats.cache_write_input_tokens += usage.get("cacheWriteInputTokens", 0)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return prompt cache statistics, including read/write ratios, per context."""
+        with self._lock:
+            return {context: s.to_dict() for context, s in self._stats.items()}
+
+
+_shared_tracker: Optional[PromptCacheTracker] = None
+_shared_tracker_lock = threading.Lock()
+
+
+def get_prompt_cache_tracker() -> PromptCacheTracker:
+    """Return the process-wide prompt cache tracker."""
+    global _shared_tracker
+    with _shared_tracker_lock:
+        if _shared_tracker is None:
+            _shared_tracker = PromptCacheTracker()
+        return _shared_tracker
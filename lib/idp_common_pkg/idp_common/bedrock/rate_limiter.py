@@ -0,0 +1,308 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Process-wide Bedrock rate limiting with per-model RPM/TPM token buckets.
+
+Classification, extraction, assessment, summarization and rule validation each
+fan out Bedrock calls from their own thread pools. Without coordination they
+only learn about the account quota from ThrottlingException responses and back
+off independently, which produces retry storms and idle gaps.
+
+A ``BedrockRateLimiter`` holds one ``ModelRateLimit`` per configured model. A
+caller acquires one request and an estimate of the tokens the call will use
+before invoking the model, waiting until both fit the per-minute budgets, and
+refunds the difference once the actual usage is known. Models without a
+configured limit are not gated.
+
+Limits are read from the ``BEDROCK_RATE_LIMITS`` environment variable, a JSON
+object keyed by model ID (``"*"`` applies to every other model)::
+
+    {"us.amazon.nova-pro-v1:0": {"requests_per_minute": 200,
+                                 "tokens_per_minute": 400000}}
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from .model_utils import parse_model_id
+from .token_estimator import TokenEstimator, get_max_tokens, get_token_estimator
+
+logger = logging.getLogger(__name__)
+
+# Environment variable holding the per-model limits as JSON
+RATE_LIMITS_ENV_VAR = "BEDROCK_RATE_LIMITS"
+
+# Output reserve of requests that do not set max tokens
+DEFAULT_OUTPUT_TOKENS = 1024
+
+# Longest single sleep while waiting for capacity, so waiters re-check often
+MAX_WAIT_SLICE_SECONDS = 1.0
+
+
+def estimate_request_tokens(
+    converse_params: Dict[str, Any], estimator: Optional[TokenEstimator] = None
+) -> int:
+    """
+    Estimate the tokens a Converse request will use (input plus output reserve).
+
+    The input is estimated by the token estimator, calibrated for the request's
+    model. The output reserve is the request's max tokens if set, otherwise
+    DEFAULT_OUTPUT_TOKENS.
+
+    Args:
+        converse_params: Parameters for the Bedrock converse API call
+        estimator: Token estimator (default: the process-wide estimator)
+
+    Returns:
+        Estimated total tokens
+    """
+    estimator = estimator or get_token_estimator()
+    input_tokens = estimator.estimate_input_tokens(
+        converse_params.get("modelId", ""), converse_params
+    )
+    return input_tokens + (get_max_tokens(converse_params) or DEFAULT_OUTPUT_TOKENS)
+
+
+class TokenBucket:
+    """
+    Per-minute budget refilled continuously; not thread-safe on its own.
+
+    The bucket holds at most one minute of capacity. ``give`` with a negative
+    amount takes capacity that was under-estimated, which may leave the bucket
+    in debt until it refills.
+    """
+
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self._updated = now
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.available = min(self.capacity, self.available + elapsed * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if available now)."""
+        deficit = amount - self.available
+        return deficit / self.rate if deficit > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        self.available -= amount
+
+    def give(self, amount: float) -> None:
+        self.available = min(self.capacity, self.available + amount)
+
+
+@dataclass
+class RateLimitStats:
+    """Calls admitted by a model limit and time spent waiting for capacity."""
+
+    requests: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    tokens_reserved: int = 0
+    tokens_used: int = 0
+
+
+class ModelRateLimit:
+    """
+    Requests-per-minute and tokens-per-minute limit for one model.
+
+    Thread-safe; shared by every caller invoking the model in this process.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the limit.
+
+        Args:
+            requests_per_minute: Request budget per minute (None for unlimited)
+            tokens_per_minute: Token budget per minute (None for unlimited)
+            clock: Monotonic clock, replaceable for tests
+            sleep: Sleep function, replaceable for tests
+        """
+        now = clock()
+        self.requests = (
+            TokenBucket(requests_per_minute, now) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute, now) if tokens_per_minute else None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = RateLimitStats()
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Reserve one request and ``tokens`` tokens, waiting until both fit.
+
+        A reservation larger than the whole token budget is capped at the budget.
+
+        Args:
+            tokens: Estimated tokens for the call
+
+        Returns:
+            Seconds spent waiting for capacity
+        """
+        if self.tokens is not None:
+            tokens = min(tokens, int(self.tokens.capacity))
+        start = None
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = 0.0
+                for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                    if bucket is not None:
+                        bucket.refill(now)
+                        wait = max(wait, bucket.wait_time(amount))
+                if wait <= 0:
+                    if self.requests is not None:
+                        self.requests.take(1)
+                    if self.tokens is not None:
+                        self.tokens.take(tokens)
+                    self.stats.requests += 1
+                    self.stats.tokens_reserved += tokens
+                    if start is None:
+                        return 0.0
+                    waited = now - start
+                    self.stats.waits += 1
+                    self.stats.wait_seconds += waited
+                    return waited
+                if start is None:
+                    start = now
+            self._sleep(min(wait, MAX_WAIT_SLICE_SECONDS))
+
+    def refund(self, reserved_tokens: int, used_tokens: int) -> None:
+        """
+        Settle a reservation against the tokens the call actually used.
+
+        Args:
+            reserved_tokens: Tokens passed to ``acquire``
+            used_tokens: Tokens reported in the response usage (0 if the call failed)
+        """
+        with self._lock:
+            self.stats.tokens_used += used_tokens
+            if self.tokens is None:
+                return
+            reserved_tokens = min(reserved_tokens, int(self.tokens.capacity))
+            self.tokens.refill(self._clock())
+            self.tokens.give(reserved_tokens - used_tokens)
+
+
+class BedrockRateLimiter:
+    """Registry of per-model rate limits shared across Bedrock clients."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Mapping of model ID (or "*") to a dict with
+                requests_per_minute and/or tokens_per_minute
+        """
+        self._lock = threading.Lock()
+        self._limits: Dict[str, ModelRateLimit] = {}
+        self.configure(limits or {})
+
+    @classmethod
+    def from_env(cls) -> "BedrockRateLimiter":
+        """Create a limiter from the BEDROCK_RATE_LIMITS environment variable."""
+        return cls(load_rate_limits_from_env())
+
+    def configure(self, limits: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Replace the configured limits.
+
+        Args:
+            limits: Mapping of model ID (or "*") to a dict with
+                requests_per_minute and/or tokens_per_minute
+        """
+        model_limits = {}
+        for model_id, limit in limits.items():
+            requests_per_minute = limit.get("requests_per_minute")
+            tokens_per_minute = limit.get("tokens_per_minute")
+            if requests_per_minute or tokens_per_minute:
+                model_limits[model_id] = ModelRateLimit(
+                    float(requests_per_minute) if requests_per_minute else None,
+                    float(tokens_per_minute) if tokens_per_minute else None,
+                )
+        with self._lock:
+            self._limits = model_limits
+        if model_limits:
+            logger.info(f"Bedrock rate limits configured for: {list(model_limits)}")
+
+    def get(self, model_id: str) -> Optional[ModelRateLimit]:
+        """
+        Return the limit for a model, if any.
+
+        Looks up the model ID as given, then without its service tier or 1M
+        context suffix, then the "*" default.
+
+        Args:
+            model_id: Bedrock model ID as passed to invoke_model
+
+        Returns:
+            ModelRateLimit, or None if the model is not limited
+        """
+        with self._lock:
+            limits = self._limits
+        if not limits:
+            return None
+        base_model_id, _ = parse_model_id(model_id)
+        if base_model_id.endswith(":1m"):
+            base_model_id = base_model_id[:-3]
+        for key in (model_id, base_model_id, "*"):
+            if key in limits:
+                return limits[key]
+        return None
+
+
+def load_rate_limits_from_env() -> Dict[str, Dict[str, Any]]:
+    """
+    Parse per-model limits from the BEDROCK_RATE_LIMITS environment variable.
+
+    Returns:
+        Mapping of model ID to limits (empty if unset or invalid)
+    """
+    raw = os.environ.get(RATE_LIMITS_ENV_VAR, "").strip()
+    if not raw:
+        return {}
+    try:
+        limits = json.loads(raw)
+        if not isinstance(limits, dict):
+            raise ValueError("expected a JSON object keyed by model ID")
+        return {
+            model_id: limit
+            for model_id, limit in limits.items()
+            if isinstance(limit, dict)
+        }
+    except ValueError as e:
+        logger.warning(f"Ignoring invalid {RATE_LIMITS_ENV_VAR}: {str(e)}")
+        return {}
+
+
+# Limiter shared by every BedrockClient in the process
+_shared_rate_limiter: Optional[BedrockRateLimiter] = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> BedrockRateLimiter:
+    """Return the process-wide limiter, created from the environment on first use."""
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = BedrockRateLimiter.from_env()
+        return _shared_rate_limiter
@@ -0,0 +1,343 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Opt-in cache of deterministic Bedrock Converse responses.
+
+Reprocessing a document (reruns, test sets, configuration comparisons) repeats
+the same classification, extraction and assessment requests. Requests that do
+not sample (temperature 0 or a small top_p) are keyed by a SHA-256 of the canonical
+Converse parameters, with image and document bytes replaced by their own hash,
+and the response is reused on the next identical request.
+
+Entries are kept in an in-process LRU bounded by size and, optionally, in a
+persistent store shared across Lambda invocations: a DynamoDB table using the
+tracking table layout (``PK``/``SK`` with an ``ExpiresAfter`` TTL) or an S3
+prefix. The cache is configured with environment variables:
+
+- ``BEDROCK_RESPONSE_CACHE``: ``memory``, ``dynamodb://<table>`` or
+  ``s3://<bucket>/<prefix>`` (unset disables the cache)
+- ``BEDROCK_RESPONSE_CACHE_TTL_HOURS``: persistent entry lifetime (default 24)
+- ``BEDROCK_RESPONSE_CACHE_MEMORY_MB``: in-process LRU size (default 64)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key or stored response format changes so stale entries are ignored
+CACHE_FORMAT_VERSION = "1"
+
+RESPONSE_CACHE_ENV_VAR = "BEDROCK_RESPONSE_CACHE"
+TTL_HOURS_ENV_VAR = "BEDROCK_RESPONSE_CACHE_TTL_HOURS"
+MEMORY_MB_ENV_VAR = "BEDROCK_RESPONSE_CACHE_MEMORY_MB"
+
+DEFAULT_TTL_HOURS = 24
+DEFAULT_MEMORY_MB = 64
+
+# Largest top_p treated as near-greedy decoding; the configuration default is 0.1
+MAX_DETERMINISTIC_TOP_P = 0.1
+
+# Responses that depend on state outside the request are never cached
+UNCACHEABLE_STOP_REASONS = {"guardrail_intervened", "content_filtered"}
+
+
+def _canonical(value: Any) -> Any:
+    """Replace bytes with their SHA-256 so parameters serialize deterministically."""
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def compute_cache_key(converse_params: Dict[str, Any]) -> str:
+    """
+    Compute the cache key of a Converse request.
+
+    Args:
+        converse_params: Parameters for the Bedrock converse API call
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(
+        {"version": CACHE_FORMAT_VERSION, "params": _canonical(converse_params)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_cacheable_request(converse_params: Dict[str, Any]) -> bool:
+    """
+    Return True if the request does not sample.
+
+    build_converse_params drops the temperature when top_p is set, so requests
+    are deterministic either with a temperature of 0 or with a top_p no larger
+    than MAX_DETERMINISTIC_TOP_P (the configuration default of 0.1).
+    """
+    inference_config = converse_params.get("inferenceConfig") or {}
+    if "topP" in inference_config:
+        return float(inference_config["topP"]) <= MAX_DETERMINISTIC_TOP_P
+    return inference_config.get("temperature", 1) == 0
+
+
+def is_cacheable_response(response: Dict[str, Any]) -> bool:
+    """Return True if a Converse response may be reused for identical requests."""
+    return response.get("stopReason") not in UNCACHEABLE_STOP_REASONS
+
+
+class ResponseCacheStore(Protocol):
+    """Persistent tier of the response cache."""
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response JSON, or None if absent or expired."""
+        ...
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response JSON."""
+        ...
+
+
+class DynamoDBResponseCacheStore:
+    """Response store in a DynamoDB table with ``PK``/``SK`` keys and TTL."""
+
+    def __init__(self, table_name: str, ttl_seconds: int, table: Any = None):
+        """
+        Initialize the store.
+
+        Args:
+            table_name: DynamoDB table name
+            ttl_seconds: Entry lifetime written to the ExpiresAfter attribute
+            table: Optional boto3 Table resource (for tests)
+        """
+        if table is None:
+            import boto3
+
+            dynamodb = boto3.resource("dynamodb")
+            table = dynamodb.Table(table_name)  # type: ignore[attr-defined]
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        response = self.table.get_item(Key={"PK": f"llmcache#{key}", "SK": "none"})
+        item = response.get("Item")
+        # DynamoDB deletes expired items lazily, so check the expiry as well
+        if not item or int(item.get("ExpiresAfter", 0)) < time.time():
+            return None
+        return item["response"]
+
+    def put(self, key: str, value: str) -> None:
+        self.table.put_item(
+            Item={
+                "PK": f"llmcache#{key}",
+                "SK": "none",
+                "response": value,
+                "ExpiresAfter": int(time.time()) + self.ttl_seconds,
+            }
+        )
+
+
+class S3ResponseCacheStore:
+    """Response store under an S3 prefix; expiry is checked on read."""
+
+    def __init__(self, bucket: str, prefix: str, ttl_seconds: int, client: Any = None):
+        """
+        Initialize the store.
+
+        Args:
+            bucket: Cache bucket
+            prefix: Key prefix for cache entries
+            ttl_seconds: Entry lifetime (use an S3 lifecycle rule to delete old entries)
+            client: Optional boto3 S3 client (for tests)
+        """
+        if client is None:
+            import boto3
+
+            client = boto3.client("s3")
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.ttl_seconds = ttl_seconds
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key[:2]}/{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        entry = json.loads(response["Body"].read())
+        if entry.get("expires_at", 0) < time.time():
+            return None
+        return entry["response"]
+
+    def put(self, key: str, value: str) -> None:
+        entry = {"expires_at": int(time.time()) + self.ttl_seconds, "response": value}
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=json.dumps(entry).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+
+class LlmResponseCache:
+    """
+    Two-tier response cache: in-process LRU plus an optional persistent store.
+
+    Thread-safe. Store errors are logged and treated as misses, so the cache
+    never fails a model invocation.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MEMORY_MB * 1024 * 1024,
+        store: Optional[ResponseCacheStore] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_memory_bytes: Size budget of the in-process LRU (serialized JSON)
+            store: Optional persistent tier
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.store = store
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for a key.
+
+        Args:
+            key: Key from ``compute_cache_key``
+
+        Returns:
+            Converse response dict, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        if value is None and self.store is not None:
+            try:
+                value = self.store.get(key)
+            except Exception as e:
+                logger.warning(f"Bedrock response cache read failed: {str(e)}")
+            if value is not None:
+                self._remember(key, value)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Cache a response.
+
+        Args:
+            key: Key from ``compute_cache_key``
+            response: Converse response (ResponseMetadata is not stored)
+        """
+        stored = {k: v for k, v in response.items() if k != "ResponseMetadata"}
+        try:
+            value = json.dumps(stored)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Bedrock response not cacheable: {str(e)}")
+            return
+        self._remember(key, value)
+        if self.store is not None:
+            try:
+                self.store.put(key, value)
+            except Exception as e:
+                logger.warning(f"Bedrock response cache write failed: {str(e)}")
+
+    def _remember(self, key: str, value: str) -> None:
+        size = len(value)
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._entries[key] = value
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+
+def create_response_cache_from_env() -> Optional[LlmResponseCache]:
+    """
+    Create the response cache configured by BEDROCK_RESPONSE_CACHE.
+
+    Returns:
+        LlmResponseCache, or None if the cache is not enabled
+    """
+    target = os.environ.get(RESPONSE_CACHE_ENV_VAR, "").strip()
+    if not target:
+        return None
+    try:
+        ttl_seconds = int(
+            float(os.environ.get(TTL_HOURS_ENV_VAR) or DEFAULT_TTL_HOURS) * 3600
+        )
+        memory_mb = float(os.environ.get(MEMORY_MB_ENV_VAR) or DEFAULT_MEMORY_MB)
+    except ValueError as e:
+        logger.warning(f"Invalid Bedrock response cache setting, cache disabled: {e}")
+        return None
+
+    store: Optional[ResponseCacheStore] = None
+    if target.startswith("dynamodb://"):
+        store = DynamoDBResponseCacheStore(target[len("dynamodb://") :], ttl_seconds)
+    elif target.startswith("s3://"):
+        bucket, _, prefix = target[len("s3://") :].partition("/")
+        store = S3ResponseCacheStore(bucket, prefix or "bedrock-cache", ttl_seconds)
+    elif target.lower() != "memory":
+        logger.warning(
+            f"Invalid {RESPONSE_CACHE_ENV_VAR} '{target}', cache disabled. "
+            "Valid values: memory, dynamodb://<table>, s3://<bucket>/<prefix>"
+        )
+        return None
+
+    logger.info(f"Bedrock response cache enabled: {target}")
+    return LlmResponseCache(int(memory_mb * 1024 * 1024), store)
+
+
+_shared_cache: Optional[LlmResponseCache] = None
+_shared_cache_loaded = False
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LlmResponseCache]:
+    """Return the process-wide response cache, or None if not enabled."""
+    global _shared_cache, _shared_cache_loaded
+    with _shared_cache_lock:
+        if not _shared_cache_loaded:
+            _shared_cache = create_response_cache_from_env()
+            _shared_cache_loaded = True
+        return _shared_cache
@@ -0,0 +1,315 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Latency-aware routing of Bedrock calls across regions and inference profiles.
+
+A ``BedrockClient`` is bound to one region, so when that region throttles or
+degrades every stage slows down together. ``BedrockRouter`` holds an ordered
+list of targets per model (a region, optionally with an inference profile or
+model ID to use there) and keeps a rolling window of outcomes per target:
+latency of successful calls (p50/p95), throttles and errors.
+
+Each attempt goes to the first target in order that is not cooling down,
+unless a later target has been clearly faster. A target whose throttles and
+errors exceed its error budget cools down for a while and its traffic is shed
+to the next target; a retry after a throttle or timeout prefers a different
+target than the failed attempt.
+
+Routes are read from the ``BEDROCK_ROUTES`` environment variable, a JSON
+object keyed by model ID (``"*"`` applies to every other model)::
+
+    {"us.amazon.nova-pro-v1:0": ["us-east-1",
+                                 {"region": "us-west-2",
+                                  "model_id": "<inference profile ARN>",
+                                  "name": "usw2-profile"}]}
+
+Models without routes use the client's own region.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .model_utils import parse_model_id
+
+logger = logging.getLogger(__name__)
+
+ROUTES_ENV_VAR = "BEDROCK_ROUTES"
+
+# Outcomes recorded per attempt
+SUCCESS = "success"
+THROTTLE = "throttle"
+ERROR = "error"
+
+# Rolling window of outcomes kept per target
+HEALTH_WINDOW_SECONDS = 300
+HEALTH_WINDOW_SIZE = 200
+
+# A target cools down once more than ERROR_BUDGET of at least MIN_SAMPLES
+# recent attempts were throttled or failed
+MIN_SAMPLES = 5
+ERROR_BUDGET = 0.25
+COOLDOWN_SECONDS = 60
+
+# A later target takes traffic from an earlier one only if its p95 latency is
+# lower by this factor, so traffic does not flap between similar regions
+LATENCY_ADVANTAGE = 1.5
+
+
+@dataclass(frozen=True)
+class RouteTarget:
+    """A region, optionally with the model or inference profile ID to use there."""
+
+    region: str
+    model_id: Optional[str] = None
+    name: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """Name used in metering and logs."""
+        return self.name or self.region
+
+    @classmethod
+    def from_config(cls, value: Union[str, Dict[str, Any]]) -> "RouteTarget":
+        if isinstance(value, str):
+            return cls(region=value)
+        return cls(
+            region=value["region"],
+            model_id=value.get("model_id"),
+            name=value.get("name"),
+        )
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@dataclass
+class _TargetStats:
+    outcomes: Deque[Tuple[float, str, Optional[float]]] = field(
+        default_factory=lambda: deque(maxlen=HEALTH_WINDOW_SIZE)
+    )
+    cooldown_until: float = 0.0
+
+    def prune(self, now: float) -> None:
+        while self.outcomes and self.outcomes[0][0] < now - HEALTH_WINDOW_SECONDS:
+            self.outcomes.popleft()
+
+    def latency_percentile(self, fraction: float) -> Optional[float]:
+        latencies = [latency for _, outcome, latency in self.outcomes if latency]
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        return _percentile(latencies, fraction)
+
+    def failure_rate(self, outcome: str) -> float:
+        if not self.outcomes:
+            return 0.0
+        failures = sum(1 for _, o, _ in self.outcomes if o == outcome)
+        return failures / len(self.outcomes)
+
+
+class BedrockRouter:
+    """
+    Chooses a target per attempt from per-model route lists and recent health.
+
+    Thread-safe; shared by every BedrockClient in the process.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, List[Union[str, Dict[str, Any]]]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            routes: Mapping of model ID (or "*") to an ordered list of targets,
+                each a region name or {"region", "model_id", "name"}
+            clock: Monotonic clock (for tests)
+        """
+        self._routes: Dict[str, List[RouteTarget]] = {
+            model_id: [RouteTarget.from_config(target) for target in targets]
+            for model_id, targets in (routes or {}).items()
+            if targets
+        }
+        self._clock = clock
+        self._stats: Dict[RouteTarget, _TargetStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "BedrockRouter":
+        """Create a router from the BEDROCK_ROUTES environment variable."""
+        return cls(load_routes_from_env())
+
+    @property
+    def enabled(self) -> bool:
+        """True if any routes are configured."""
+        return bool(self._routes)
+
+    def targets(self, model_id: str) -> List[RouteTarget]:
+        """
+        Return the configured targets of a model in preference order.
+
+        Looks up the model ID as given, then without its service tier or 1M
+        context suffix, then the "*" default.
+        """
+        if not self._routes:
+            return []
+        base_model_id, _ = parse_model_id(model_id)
+        if base_model_id.endswith(":1m"):
+            base_model_id = base_model_id[:-3]
+        for key in (model_id, base_model_id, "*"):
+            if key in self._routes:
+                return self._routes[key]
+        return []
+
+    def _target_stats(self, target: RouteTarget) -> _TargetStats:
+        stats = self._stats.get(target)
+        if stats is None:
+            stats = _TargetStats()
+            self._stats[target] = stats
+        return stats
+
+    def choose(
+        self, model_id: str, avoid: Optional[RouteTarget] = None
+    ) -> Optional[RouteTarget]:
+        """
+        Choose the target for the next attempt.
+
+        Args:
+            model_id: Model ID as passed to invoke_model
+            avoid: Target of a failed previous attempt, used only if no other
+                target is available
+
+        Returns:
+            RouteTarget, or None if the model has no routes
+        """
+        targets = self.targets(model_id)
+        if not targets:
+            return None
+        now = self._clock()
+        with self._lock:
+            available = [
+                t for t in targets if self._target_stats(t).cooldown_until <= now
+            ]
+            if not available:
+                # Everything is cooling down: use the one that recovers first
+                return min(targets, key=lambda t: self._stats[t].cooldown_until)
+            if avoid in available and len(available) > 1:
+                available.remove(avoid)
+
+            chosen = available[0]
+            stats = self._target_stats(chosen)
+            stats.prune(now)
+            chosen_p95 = stats.latency_percentile(0.95)
+            for target in available[1:]:
+                stats = self._target_stats(target)
+                stats.prune(now)
+                p95 = stats.latency_percentile(0.95)
+                if (
+                    p95 is not None
+                    and chosen_p95 is not None
+                    and p95 * LATENCY_ADVANTAGE < chosen_p95
+                ):
+                    chosen, chosen_p95 = target, p95
+            return chosen
+
+    def record(
+        self, target: RouteTarget, outcome: str, latency: Optional[float] = None
+    ) -> None:
+        """
+        Record the outcome of an attempt.
+
+        Args:
+            target: Target the attempt was sent to
+            outcome: SUCCESS, THROTTLE or ERROR
+            latency: Duration of a successful attempt in seconds
+        """
+        now = self._clock()
+        with self._lock:
+            stats = self._target_stats(target)
+            stats.prune(now)
+            stats.outcomes.append((now, outcome, latency))
+            if outcome == SUCCESS or len(stats.outcomes) < MIN_SAMPLES:
+                return
+            failure_rate = stats.failure_rate(THROTTLE) + stats.failure_rate(ERROR)
+            if failure_rate > ERROR_BUDGET:
+                logger.warning(
+                    f"Bedrock target {target.label} exceeded its error budget "
+                    f"({failure_rate:.0%} of {len(stats.outcomes)} recent attempts "
+                    f"failed); shedding traffic for {COOLDOWN_SECONDS}s"
+                )
+                stats.cooldown_until = now + COOLDOWN_SECONDS
+                # Judge the target afresh once the cooldown ends
+                stats.outcomes.clear()
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Return rolling latency and failure statistics per target label."""
+        now = self._clock()
+        with self._lock:
+            health = {}
+            for target, stats in self._stats.items():
+                stats.prune(now)
+                p50 = stats.latency_percentile(0.5)
+                p95 = stats.latency_percentile(0.95)
+                health[target.label] = {
+                    "attempts": len(stats.outcomes),
+                    "p50_ms": None if p50 is None else round(p50 * 1000),
+                    "p95_ms": None if p95 is None else round(p95 * 1000),
+                    "throttle_rate": round(stats.failure_rate(THROTTLE), 4),
+                    "error_rate": round(stats.failure_rate(ERROR), 4),
+                    "cooling_down": stats.cooldown_until > now,
+                }
+            return health
+
+
+def load_routes_from_env() -> Dict[str, List[Union[str, Dict[str, Any]]]]:
+    """
+    Parse per-model routes from the BEDROCK_ROUTES environment variable.
+
+    Returns:
+        Mapping of model ID to targets (empty if unset or invalid)
+    """
+    raw = os.environ.get(ROUTES_ENV_VAR, "").strip()
+    if not raw:
+        return {}
+    try:
+        routes = json.loads(raw)
+        if not isinstance(routes, dict):
+            raise ValueError("expected a JSON object keyed by model ID")
+        valid = {}
+        for model_id, targets in routes.items():
+            if not isinstance(targets, list):
+                raise ValueError(f"routes for {model_id} must be a list")
+            for target in targets:
+                if not isinstance(target, str) and "region" not in target:
+                    raise ValueError(f"route target for {model_id} needs a region")
+            valid[model_id] = targets
+        return valid
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Ignoring invalid {ROUTES_ENV_VAR}: {str(e)}")
+        return {}
+
+
+# Router shared by every BedrockClient in the process
+_shared_router: Optional[BedrockRouter] = None
+_shared_router_lock = threading.Lock()
+
+
+def get_router() -> BedrockRouter:
+    """Return the process-wide router, created from the environment on first use."""
+    global _shared_router
+    with _shared_router_lock:
+        if _shared_router is None:
+            _shared_router = BedrockRouter.from_env()
+        return _shared_router
@@ -0,0 +1,221 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Incremental JSON parsing for streamed Bedrock responses.
+
+Extraction and assessment prompts ask for one JSON object. When the response
+is streamed with ``converse_stream``, ``StreamingJsonHandler`` parses the text
+as it arrives: each top-level field is decoded and validated against the class
+schema as soon as its value is complete, and the stream can be stopped once the
+top-level object closes, so trailing commentary is neither waited for nor
+generated.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Python types accepted for each JSON Schema type
+_SCHEMA_TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
+
+class IncrementalJsonParser:
+    """
+    Parses the first top-level JSON object in text that arrives in chunks.
+
+    Text before the opening brace (commentary, code fences) is skipped. Each
+    member of the top-level object is returned as soon as its value is complete.
+    Not thread-safe.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all parsed text."""
+        self._buffer: List[str] = []
+        self._member: List[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.complete = False
+
+    @property
+    def json_text(self) -> str:
+        """Text of the top-level object parsed so far."""
+        return "".join(self._buffer)
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Parse the next chunk of text.
+
+        Args:
+            text: Next chunk of the response text
+
+        Returns:
+            Top-level (key, value) members completed by this chunk
+        """
+        members: List[Tuple[str, Any]] = []
+        for char in text:
+            if self.complete:
+                break
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._buffer.append(char)
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                self._member.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+
+            if self._depth == 1 and char == ",":
+                self._finish_member(members)
+            elif self._depth == 0:
+                self._finish_member(members)
+                self.complete = True
+            else:
+                self._member.append(char)
+        return members
+
+    def _finish_member(self, members: List[Tuple[str, Any]]) -> None:
+        member = "".join(self._member).strip()
+        self._member = []
+        if not member:
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except ValueError:
+            logger.debug(f"Could not parse streamed JSON member: {member[:100]}")
+            return
+        members.extend(parsed.items())
+
+
+def validate_field(key: str, value: Any, schema: Dict[str, Any]) -> Optional[str]:
+    """
+    Check a top-level field against a JSON Schema object definition.
+
+    Only the field name and its declared type are checked; nested values are
+    validated after parsing as before.
+
+    Args:
+        key: Field name
+        value: Parsed field value
+        schema: JSON Schema of the object (with "properties")
+
+    Returns:
+        Error message, or None if the field is valid
+    """
+    properties = schema.get("properties") or {}
+    if key not in properties:
+        if schema.get("additionalProperties") is False:
+            return f"Unexpected field '{key}'"
+        return None
+    declared = properties[key].get("type")
+    if declared is None:
+        return None
+    types = declared if isinstance(declared, list) else [declared]
+    for schema_type in types:
+        accepted = _SCHEMA_TYPES.get(schema_type)
+        if accepted is None:
+            return None
+        # bool is an int subclass but not a JSON number
+        if isinstance(value, accepted) and not (
+            isinstance(value, bool) and schema_type in ("number", "integer")
+        ):
+            return None
+    return f"Field '{key}' should be of type {declared}, got {type(value).__name__}"
+
+
+class StreamingJsonHandler:
+    """
+    Consumes a streamed response whose answer is a single JSON object.
+
+    Pass to ``BedrockClient.invoke_model(stream_handler=...)`` to call
+    ``converse_stream`` instead of ``converse``.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[Dict[str, Any]] = None,
+        stop_when_complete: bool = True,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """
+        Initialize the handler.
+
+        Args:
+            schema: Optional JSON Schema to validate top-level fields against
+            stop_when_complete: Stop the stream once the top-level object closes
+            on_field: Optional callback for each top-level field as it completes
+        """
+        self.schema = schema
+        self.stop_when_complete = stop_when_complete
+        self.on_field = on_field
+        self.parser = IncrementalJsonParser()
+        self.fields: Dict[str, Any] = {}
+        self.field_errors: List[str] = []
+
+    def reset(self) -> None:
+        """Discard the state of a previous attempt (called before each attempt)."""
+        self.parser.reset()
+        self.fields = {}
+        self.field_errors = []
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level JSON object has closed."""
+        return self.parser.complete
+
+    @property
+    def json_text(self) -> str:
+        """Text of the top-level JSON object parsed so far."""
+        return self.parser.json_text
+
+    def feed(self, text: str) -> bool:
+        """
+        Process the next chunk of response text.
+
+        Args:
+            text: Next chunk of the response text
+
+        Returns:
+            True if the stream should stop
+        """
+        for key, value in self.parser.feed(text):
+            self.fields[key] = value
+            if self.schema:
+                error = validate_field(key, value, self.schema)
+                if error:
+                    logger.warning(f"Streamed field failed validation: {error}")
+                    self.field_errors.append(error)
+            if self.on_field:
+                self.on_field(key, value)
+        return self.stop_when_complete and self.parser.complete
@@ -0,0 +1,361 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Pre-flight token estimation and context-window planning.
+
+A flat characters-per-token ratio undercounts tables (every separator and
+short number is a token), CJK text (about one token per character) and images
+(sized by their pixels). ``estimate_text_tokens`` counts words, numbers,
+symbols, line breaks and non-Latin characters separately, and
+``estimate_image_tokens`` sizes images from their dimensions.
+
+``TokenEstimator`` scales these estimates per model by the ratio of the input
+tokens Bedrock reported to the estimate of the same request, and plans each
+request against the model's context window: ``max_tokens`` is lowered when the
+input leaves less room than requested, a request that only fits the model's
+1M-token variant is routed there, and a request that cannot fit any window is
+rejected before it is sent.
+
+Set ``BEDROCK_CONTEXT_ROUTING=false`` to disable routing to long-context
+variants (``max_tokens`` is still fitted to the window).
+"""
+
+import io
+import logging
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .model_utils import parse_model_id
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_ROUTING_ENV_VAR = "BEDROCK_CONTEXT_ROUTING"
+
+# Latin characters per token, and sizes of images that cannot be read and of
+# document attachments
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 1600
+DOCUMENT_TOKENS = 1600
+
+# Context windows by model family, matched in order against the model ID
+MODEL_CONTEXT_WINDOWS = [
+    (":1m", 1_000_000),
+    ("anthropic.claude", 200_000),
+    ("amazon.nova-micro", 128_000),
+    ("amazon.nova-lite", 300_000),
+    ("amazon.nova-pro", 300_000),
+    ("amazon.nova-premier", 1_000_000),
+    ("amazon.nova-2-lite", 1_000_000),
+]
+
+# Models with a 1M-token variant selected by the ":1m" model ID suffix
+LONG_CONTEXT_SUFFIX = ":1m"
+LONG_CONTEXT_MODELS = [
+    "anthropic.claude-sonnet-4-20250514-v1:0",
+    "anthropic.claude-sonnet-4-5-20250929-v1:0",
+]
+
+# Smallest max_tokens worth sending when the input nearly fills the window
+MIN_OUTPUT_TOKENS = 1024
+
+# Requests estimated above the window by this factor are rejected unsent
+OVERFLOW_MARGIN = 1.25
+
+# Weight of each observed request in the per-model calibration, and its bounds
+CALIBRATION_WEIGHT = 0.2
+MIN_CALIBRATION = 0.25
+MAX_CALIBRATION = 4.0
+
+# Image sizing: Bedrock downscales to this long edge and pixel budget,
+# then charges about one token per 750 pixels
+MAX_IMAGE_EDGE = 1568
+MAX_IMAGE_PIXELS = 1_150_000
+PIXELS_PER_TOKEN = 750
+
+_TOKEN_PATTERN = re.compile(
+    r"(?P<word>[A-Za-z]+)"
+    r"|(?P<number>\d+)"
+    r"|(?P<cjk>[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff])"
+    r"|(?P<other>[^\x00-\x7f])"
+    r"|(?P<newline>\n+)"
+    r"|(?P<symbol>[^\sA-Za-z\d])"
+)
+
+
+class ContextWindowExceededError(ValueError):
+    """Raised when a request cannot fit the context window of any routable model."""
+
+
+def context_routing_enabled() -> bool:
+    """Return False if BEDROCK_CONTEXT_ROUTING disables long-context routing."""
+    value = os.environ.get(CONTEXT_ROUTING_ENV_VAR, "true").strip().lower()
+    return value not in ("false", "0", "no", "off")
+
+
+def get_context_window(model_id: str) -> Optional[int]:
+    """
+    Return the context window of a model in tokens.
+
+    Args:
+        model_id: Bedrock model ID, optionally with a ":1m" or service tier suffix
+
+    Returns:
+        Context window, or None if the model family is not known
+    """
+    for pattern, window in MODEL_CONTEXT_WINDOWS:
+        if pattern in model_id:
+            return window
+    return None
+
+
+def get_long_context_variant(model_id: str) -> Optional[str]:
+    """Return the ":1m" variant of a model ID, or None if it has none."""
+    base_model_id, tier = parse_model_id(model_id)
+    if tier or model_id.endswith(LONG_CONTEXT_SUFFIX):
+        return None
+    if any(base_model_id.endswith(model) for model in LONG_CONTEXT_MODELS):
+        return base_model_id + LONG_CONTEXT_SUFFIX
+    return None
+
+
+def estimate_text_tokens(text: str, chars_per_token: int = CHARS_PER_TOKEN) -> int:
+    """
+    Estimate the tokens of a text.
+
+    Latin words count one token per ``chars_per_token`` characters, numbers one
+    per three digits, CJK characters one each, other non-ASCII characters one
+    per two, and each symbol or run of line breaks one.
+
+    Args:
+        text: Text to estimate
+        chars_per_token: Characters per token of Latin words
+
+    Returns:
+        Estimated tokens
+    """
+    tokens = 0
+    other = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        length = match.end() - match.start()
+        if kind == "word":
+            tokens += math.ceil(length / chars_per_token)
+        elif kind == "number":
+            tokens += math.ceil(length / 3)
+        elif kind == "other":
+            other += 1
+        else:
+            tokens += 1
+    return tokens + math.ceil(other / 2)
+
+
+def estimate_image_tokens(image_bytes: Optional[bytes]) -> int:
+    """
+    Estimate the tokens of an image from its dimensions.
+
+    Args:
+        image_bytes: Encoded image
+
+    Returns:
+        Estimated tokens (IMAGE_TOKENS if the size cannot be read)
+    """
+    if not image_bytes:
+        return IMAGE_TOKENS
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            width, height = img.size
+    except Exception as e:
+        logger.debug(f"Could not read image size for token estimate: {e}")
+        return IMAGE_TOKENS
+
+    scale = min(
+        1.0,
+        MAX_IMAGE_EDGE / max(width, height, 1),
+        math.sqrt(MAX_IMAGE_PIXELS / max(width * height, 1)),
+    )
+    pixels = (width * scale) * (height * scale)
+    return max(1, math.ceil(pixels / PIXELS_PER_TOKEN))
+
+
+def estimate_content_tokens(converse_params: Dict[str, Any]) -> int:
+    """
+    Estimate the input tokens of a Converse request (before calibration).
+
+    Args:
+        converse_params: Parameters for the Bedrock converse API call
+
+    Returns:
+        Estimated input tokens
+    """
+    blocks = list(converse_params.get("system") or [])
+    for message in converse_params.get("messages") or []:
+        blocks.extend(message.get("content") or [])
+    tokens = 0
+    for block in blocks:
+        if not isinstance(block, dict):
+            continue
+        if isinstance(block.get("text"), str):
+            tokens += estimate_text_tokens(block["text"])
+        elif "image" in block:
+            source = block["image"].get("source") or {}
+            tokens += estimate_image_tokens(source.get("bytes"))
+        elif "document" in block:
+            tokens += DOCUMENT_TOKENS
+    return tokens
+
+
+def get_max_tokens(converse_params: Dict[str, Any]) -> Optional[int]:
+    """Return the max_tokens set on a Converse request, or None."""
+    max_tokens = (converse_params.get("inferenceConfig") or {}).get("maxTokens")
+    if max_tokens is None:
+        max_tokens = (converse_params.get("additionalModelRequestFields") or {}).get(
+            "max_tokens"
+        )
+    return max_tokens
+
+
+@dataclass
+class TokenPlan:
+    """How a request fits a model's context window."""
+
+    model_id: str
+    input_tokens: int
+    max_tokens: Optional[int]
+    context_window: Optional[int]
+
+    @property
+    def fits(self) -> bool:
+        """True if the estimated input and output fit the context window."""
+        if self.context_window is None:
+            return True
+        return self.input_tokens + (self.max_tokens or 0) <= self.context_window
+
+
+class TokenEstimator:
+    """
+    Calibrated per-model token estimates and context-window planning.
+
+    Thread-safe; shared by every BedrockClient in the process.
+    """
+
+    def __init__(self):
+        self._calibration: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def calibration(self, model_id: str) -> float:
+        """Return the ratio of reported to estimated input tokens for a model."""
+        with self._lock:
+            return self._calibration.get(model_id, 1.0)
+
+    def calibrate(self, model_id: str, raw_tokens: int) -> int:
+        """Scale an estimate from estimate_content_tokens for a model."""
+        return round(raw_tokens * self.calibration(model_id))
+
+    def estimate_input_tokens(
+        self, model_id: str, converse_params: Dict[str, Any]
+    ) -> int:
+        """
+        Estimate the input tokens of a request, calibrated for the model.
+
+        Args:
+            model_id: Model ID the request is sent to
+            converse_params: Parameters for the Bedrock converse API call
+
+        Returns:
+            Estimated input tokens
+        """
+        return self.calibrate(model_id, estimate_content_tokens(converse_params))
+
+    def record_usage(
+        self, model_id: str, raw_estimate: int, usage: Dict[str, Any]
+    ) -> None:
+        """
+        Update a model's calibration from the usage Bedrock reported.
+
+        Args:
+            model_id: Model ID the request was sent to
+            raw_estimate: Uncalibrated estimate from estimate_content_tokens
+            usage: Usage from the converse response
+        """
+        actual = (
+            usage.get("inputTokens", 0)
+            + usage.get("cacheReadInputTokens", 0)
+            + usage.get("cacheWriteInputTokens", 0)
+        )
+        if raw_estimate <= 0 or actual <= 0:
+            return
+        observed = min(MAX_CALIBRATION, max(MIN_CALIBRATION, actual / raw_estimate))
+        with self._lock:
+            previous = self._calibration.get(model_id)
+            if previous is None:
+                self._calibration[model_id] = observed
+            else:
+                self._calibration[model_id] = (
+                    1 - CALIBRATION_WEIGHT
+                ) * previous + CALIBRATION_WEIGHT * observed
+
+    def plan(
+        self,
+        model_id: str,
+        input_tokens: int,
+        max_tokens: Optional[int],
+        allow_routing: bool = True,
+    ) -> TokenPlan:
+        """
+        Fit a request to a context window.
+
+        Args:
+            model_id: Requested model ID
+            input_tokens: Calibrated input token estimate
+            max_tokens: Requested max_tokens (None if not set)
+            allow_routing: Allow routing to the model's long-context variant
+
+        Returns:
+            Plan with the model ID and max_tokens to use
+
+        Raises:
+            ContextWindowExceededError: If the input cannot fit any routable model
+        """
+        window = get_context_window(model_id)
+        plan = TokenPlan(model_id, input_tokens, max_tokens, window)
+        if plan.fits:
+            return plan
+
+        # Lower max_tokens if the input leaves enough room for a useful answer
+        room = window - input_tokens
+        if room >= MIN_OUTPUT_TOKENS:
+            return TokenPlan(model_id, input_tokens, room, window)
+
+        variant = get_long_context_variant(model_id) if allow_routing else None
+        if variant is not None:
+            variant_plan = self.plan(variant, input_tokens, max_tokens, False)
+            if variant_plan.fits:
+                return variant_plan
+
+        if input_tokens > window * OVERFLOW_MARGIN:
+            raise ContextWindowExceededError(
+                f"Request of ~{input_tokens} input tokens exceeds the "
+                f"{window}-token context window of {model_id}"
+            )
+        # Close to the limit: the estimate may be high, so let Bedrock decide
+        return plan
+
+
+_shared_estimator: Optional[TokenEstimator] = None
+_shared_estimator_lock = threading.Lock()
+
+
+def get_token_estimator() -> TokenEstimator:
+    """Return the process-wide token estimator."""
+    global _shared_estimator
+    with _shared_estimator_lock:
+        if _shared_estimator is None:
+            _shared_estimator = TokenEstimator()
+        return _shared_estimator
@@ -0,0 +1,589 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Cross-document page fingerprint cache for page-level classification.
+
+Many packets contain the same blank forms filled in differently. Each page is
+fingerprinted with a perceptual hash of its image (a 64-bit difference hash,
+which changes little when fields are filled in) and a 64-bit SimHash of its
+normalized text layout (the labels starting each line). A page whose
+fingerprint is within the configured Hamming distances of a page classified
+earlier reuses that classification instead of calling the model.
+
+The index is compact (two 64-bit integers and a label index per page) and held
+in memory per warm container. Image hashes are bucketed by their eight bytes:
+two hashes within Hamming distance 7 agree exactly on at least one byte, so a
+lookup only compares the pages sharing a bucket with the page, not the whole
+index. It is loaded once from a persistent store (a
+DynamoDB table using the tracking table layout, or an S3 object) and new
+entries are written back after each document. Entries are scoped by a key
+computed from the classes, model and prompts, so any change to the class
+configuration starts a new, empty index.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import re
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from botocore.exceptions import ClientError
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Bump when the fingerprint algorithm or stored format changes
+CACHE_FORMAT_VERSION = "1"
+
+DEFAULT_MAX_ENTRIES = 100000
+
+_HASH_BITS = 64
+
+# Image hashes are bucketed by each of their bytes; lookups are exact for image
+# distances below the band count (pigeonhole principle)
+BAND_COUNT = 8
+_BAND_BITS = _HASH_BITS // BAND_COUNT
+_BAND_MASK = (1 << _BAND_BITS) - 1
+MAX_IMAGE_DISTANCE = BAND_COUNT - 1
+_WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+_DIGIT_PATTERN = re.compile(r"\d")
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+    """Perceptual image hash and text layout signature of a page."""
+
+    image_hash: int
+    text_hash: int
+
+    @property
+    def key(self) -> str:
+        """Hex string identifying the fingerprint in a store."""
+        return f"{self.image_hash:016x}{self.text_hash:016x}"
+
+    @classmethod
+    def from_key(cls, key: str) -> "PageFingerprint":
+        """Parse a fingerprint from its ``key``."""
+        return cls(int(key[:16], 16), int(key[16:32], 16))
+
+
+@dataclass
+class FingerprintMatch:
+    """Classification reused from the nearest cached page."""
+
+    doc_type: str
+    document_boundary: str
+    image_distance: int
+    text_distance: int
+
+
+def compute_image_hash(image_bytes: bytes) -> int:
+    """
+    Compute the 64-bit difference hash (dHash) of a page image.
+
+    The image is reduced to a 9x8 grayscale thumbnail and each bit records
+    whether a pixel is brighter than its right neighbour, so the hash captures
+    the page layout and ignores small local changes such as filled-in fields.
+
+    Args:
+        image_bytes: Encoded page image
+
+    Returns:
+        64-bit hash as an integer
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        thumbnail = img.convert("L").resize((9, 8), Image.Resampling.BILINEAR)
+        pixels = thumbnail.tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+def compute_text_layout_signature(text: Optional[str]) -> int:
+    """
+    Compute a 64-bit SimHash of the normalized text layout of a page.
+
+    Each line contributes its label: the words before the first colon, or its
+    first three words if it has none, lowercased and with digits masked. On a
+    form these are the printed field labels, so the same form filled in with
+    different values gets the same or a nearby signature.
+
+    Args:
+        text: Page text (markdown or plain text)
+
+    Returns:
+        64-bit signature as an integer (0 for a page without text)
+    """
+    weights: Dict[str, int] = {}
+    for line in (text or "").splitlines():
+        label, colon, _ = line.partition(":")
+        words = [
+            _DIGIT_PATTERN.sub("0", word.lower())
+            for word in _WORD_PATTERN.findall(label)
+        ]
+        if not words:
+            continue
+        feature = " ".join(words if colon else words[:3])
+        weights[feature] = weights.get(feature, 0) + 1
+    if not weights:
+        return 0
+
+    totals = [0] * _HASH_BITS
+    for feature, weight in weights.items():
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        feature_hash = int.from_bytes(digest, "big")
+        for bit in range(_HASH_BITS):
+            if feature_hash >> bit & 1:
+                totals[bit] += weight
+            else:
+                totals[bit] -= weight
+    return sum(1 << bit for bit, total in enumerate(totals) if total > 0)
+
+
+def compute_page_fingerprint(
+    text: Optional[str], image_bytes: Optional[bytes]
+) -> Optional[PageFingerprint]:
+    """
+    Fingerprint a page from its text and image.
+
+    Args:
+        text: Page text
+        image_bytes: Page image; pages without an image are not fingerprinted
+
+    Returns:
+        PageFingerprint, or None if the page has no usable image
+    """
+    if not image_bytes:
+        return None
+    try:
+        image_hash = compute_image_hash(image_bytes)
+    except Exception as e:
+        logger.warning(f"Failed to compute page image hash: {str(e)}")
+        return None
+    return PageFingerprint(image_hash, compute_text_layout_signature(text))
+
+
+def compute_config_key(*settings: str) -> str:
+    """
+    Compute the key scoping cached entries to a classification configuration.
+
+    Args:
+        settings: Strings identifying everything that affects the classification
+            (classes, model, prompts)
+
+    Returns:
+        Hex SHA-256 digest (first 32 characters)
+    """
+    digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode("utf-8"))
+    for part in settings:
+        digest.update(b"\0")
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits of two hashes."""
+    return (a ^ b).bit_count()
+
+
+# (fingerprint, doc_type, document_boundary)
+FingerprintEntry = Tuple[PageFingerprint, str, str]
+
+
+class FingerprintStore(Protocol):
+    """Persistent tier of the fingerprint index."""
+
+    def load(self, config_key: str) -> List[FingerprintEntry]:
+        """Return every stored entry of a configuration."""
+        ...
+
+    def save(self, config_key: str, entries: List[FingerprintEntry]) -> None:
+        """Add entries of a configuration."""
+        ...
+
+
+class DynamoDBFingerprintStore:
+    """
+    Fingerprint store in a DynamoDB table with ``PK``/``SK`` keys and TTL.
+
+    Each entry is an item with ``PK`` ``pagefp#{config_key}`` and the
+    fingerprint key as ``SK``, so an index is loaded with a single query.
+    """
+
+    def __init__(self, table_name: str, ttl_seconds: int, table: Any = None):
+        """
+        Initialize the store.
+
+        Args:
+            table_name: DynamoDB table name
+            ttl_seconds: Entry lifetime written to the ExpiresAfter attribute
+            table: Optional boto3 Table resource (for tests)
+        """
+        if table is None:
+            import boto3
+
+            dynamodb = boto3.resource("dynamodb")
+            table = dynamodb.Table(table_name)  # type: ignore[attr-defined]
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def load(self, config_key: str) -> List[FingerprintEntry]:
+        from boto3.dynamodb.conditions import Key
+
+        entries: List[FingerprintEntry] = []
+        now = time.time()
+        query: Dict[str, Any] = {
+            "KeyConditionExpression": Key("PK").eq(f"pagefp#{config_key}")
+        }
+        while True:
+            response = self.table.query(**query)
+            for item in response.get("Items", []):
+                # DynamoDB deletes expired items lazily, so check the expiry as well
+                if int(item.get("ExpiresAfter", 0)) < now:
+                    continue
+                entries.append(
+                    (
+                        PageFingerprint.from_key(item["SK"]),
+                        item["class"],
+                        item.get("document_boundary", "continue"),
+                    )
+                )
+            if "LastEvaluatedKey" not in response:
+                return entries
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def save(self, config_key: str, entries: List[FingerprintEntry]) -> None:
+        expires_after = int(time.time()) + self.ttl_seconds
+        with self.table.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch:
+            for fingerprint, doc_type, document_boundary in entries:
+                batch.put_item(
+                    Item={
+                        "PK": f"pagefp#{config_key}",
+                        "SK": fingerprint.key,
+                        "class": doc_type,
+                        "document_boundary": document_boundary,
+                        "ExpiresAfter": expires_after,
+                    }
+                )
+
+
+class S3FingerprintStore:
+    """
+    Fingerprint store with one JSON object per configuration under an S3 prefix.
+
+    Saving reads, merges and rewrites the object, so entries written by
+    concurrent containers at the same moment can be lost; they are added again
+    the next time a matching page is classified.
+    """
+
+    def __init__(self, bucket: str, prefix: str, client: Any = None):
+        """
+        Initialize the store.
+
+        Args:
+            bucket: Cache bucket
+            prefix: Key prefix for index objects
+            client: Optional boto3 S3 client (for tests)
+        """
+        if client is None:
+            import boto3
+
+            client = boto3.client("s3")
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _object_key(self, config_key: str) -> str:
+        return f"{self.prefix}/{config_key}.json"
+
+    def load(self, config_key: str) -> List[FingerprintEntry]:
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._object_key(config_key)
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return []
+            raise
+        return [
+            (PageFingerprint.from_key(key), doc_type, document_boundary)
+            for key, doc_type, document_boundary in json.loads(
+                response["Body"].read()
+            )
+        ]
+
+    def save(self, config_key: str, entries: List[FingerprintEntry]) -> None:
+        merged = {
+            fingerprint.key: (doc_type, document_boundary)
+            for fingerprint, doc_type, document_boundary in self.load(config_key)
+        }
+        for fingerprint, doc_type, document_boundary in entries:
+            merged[fingerprint.key] = (doc_type, document_boundary)
+        body = [[key, *labels] for key, labels in merged.items()]
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(config_key),
+            Body=json.dumps(body, separators=(",", ":")).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+
+def _bands(image_hash: int) -> List[int]:
+    """Split an image hash into its BAND_COUNT band values."""
+    return [
+        (image_hash >> (band * _BAND_BITS)) & _BAND_MASK for band in range(BAND_COUNT)
+    ]
+
+
+class PageFingerprintIndex:
+    """
+    In-memory index of classified page fingerprints for one configuration.
+
+    Thread-safe. Store errors are logged and ignored, so the cache never fails
+    a classification.
+    """
+
+    def __init__(
+        self,
+        config_key: str,
+        store: Optional[FingerprintStore] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            config_key: Key from ``compute_config_key``
+            store: Optional persistent tier, loaded by ``load()``
+            max_entries: Maximum entries held; further pages are not indexed
+        """
+        self.config_key = config_key
+        self.store = store
+        self.max_entries = max_entries
+        self._image_hashes = array("Q")
+        self._text_hashes = array("Q")
+        self._label_ids = array("I")
+        # Positions of the indexed pages per band and band value
+        self._buckets = [
+            [array("I") for _ in range(1 << _BAND_BITS)] for _ in range(BAND_COUNT)
+        ]
+        self._labels: List[Tuple[str, str]] = []
+        self._label_lookup: Dict[Tuple[str, str], int] = {}
+        self._keys: set = set()
+        self._pending: List[FingerprintEntry] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._image_hashes)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that found a near-duplicate page."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def load(self) -> None:
+        """Load the stored entries of the configuration into memory."""
+        if self.store is None:
+            return
+        t0 = time.time()
+        try:
+            entries = self.store.load(self.config_key)
+        except Exception as e:
+            logger.warning(f"Failed to load page fingerprint index: {str(e)}")
+            return
+        with self._lock:
+            for fingerprint, doc_type, document_boundary in entries:
+                self._insert(fingerprint, doc_type, document_boundary)
+        logger.info(
+            f"Loaded {len(self)} page fingerprints in {time.time() - t0:.2f} seconds"
+        )
+
+    def lookup(
+        self,
+        fingerprint: PageFingerprint,
+        max_image_distance: int,
+        max_text_distance: int,
+    ) -> Optional[FingerprintMatch]:
+        """
+        Find the nearest indexed page within the given distances.
+
+        Only pages sharing an image hash band with the page are compared.
+
+        Args:
+            fingerprint: Fingerprint of the page to classify
+            max_image_distance: Maximum Hamming distance of the image hashes
+                (at most MAX_IMAGE_DISTANCE)
+            max_text_distance: Maximum Hamming distance of the text signatures
+
+        Returns:
+            FingerprintMatch of the nearest page, or None on a miss
+
+        Raises:
+            ValueError: If max_image_distance exceeds MAX_IMAGE_DISTANCE
+        """
+        if max_image_distance > MAX_IMAGE_DISTANCE:
+            raise ValueError(
+                f"max_image_distance must be at most {MAX_IMAGE_DISTANCE}, "
+                f"got {max_image_distance}"
+            )
+        best: Optional[Tuple[int, int, int, int]] = None
+        with self._lock:
+            candidates = set()
+            for band, value in enumerate(_bands(fingerprint.image_hash)):
+                candidates.update(self._buckets[band][value])
+            for position in sorted(candidates):
+                image_distance = hamming_distance(
+                    self._image_hashes[position], fingerprint.image_hash
+                )
+                if image_distance > max_image_distance:
+                    continue
+                text_distance = hamming_distance(
+                    self._text_hashes[position], fingerprint.text_hash
+                )
+                if text_distance > max_text_distance:
+                    continue
+                distance = image_distance + text_distance
+                if best is None or distance < best[0]:
+                    best = (distance, position, image_distance, text_distance)
+                    if distance == 0:
+                        break
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            _, position, image_distance, text_distance = best
+            doc_type, document_boundary = self._labels[self._label_ids[position]]
+        return FingerprintMatch(
+            doc_type, document_boundary, image_distance, text_distance
+        )
+
+    def add(
+        self, fingerprint: PageFingerprint, doc_type: str, document_boundary: str
+    ) -> None:
+        """
+        Index a classified page; it is written to the store by ``flush()``.
+
+        Args:
+            fingerprint: Fingerprint of the page
+            doc_type: Class assigned to the page
+            document_boundary: Boundary assigned to the page
+        """
+        with self._lock:
+            if self._insert(fingerprint, doc_type, document_boundary):
+                self._pending.append((fingerprint, doc_type, document_boundary))
+
+    def flush(self) -> None:
+        """Write entries added since the last flush to the store."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending or self.store is None:
+            return
+        try:
+            self.store.save(self.config_key, pending)
+        except Exception as e:
+            logger.warning(f"Failed to store page fingerprints: {str(e)}")
+
+    def _insert(
+        self, fingerprint: PageFingerprint, doc_type: str, document_boundary: str
+    ) -> bool:
+        if fingerprint.key in self._keys or len(self) >= self.max_entries:
+            return False
+        label = (doc_type, document_boundary)
+        label_id = self._label_lookup.get(label)
+        if label_id is None:
+            label_id = self._label_lookup[label] = len(self._labels)
+            self._labels.append(label)
+        self._keys.add(fingerprint.key)
+        position = len(self._image_hashes)
+        for band, value in enumerate(_bands(fingerprint.image_hash)):
+            self._buckets[band][value].append(position)
+        self._image_hashes.append(fingerprint.image_hash)
+        self._text_hashes.append(fingerprint.text_hash)
+        self._label_ids.append(label_id)
+        return True
+
+
+def create_fingerprint_store(
+    location: str, ttl_seconds: int
+) -> Optional[FingerprintStore]:
+    """
+    Create the persistent store of the fingerprint index.
+
+    Args:
+        location: ``dynamodb://<table>``, ``s3://<bucket>/<prefix>`` or
+            ``memory`` (no persistent store)
+        ttl_seconds: Lifetime of DynamoDB entries
+
+    Returns:
+        FingerprintStore, or None for an in-memory index
+    """
+    if location.startswith("dynamodb://"):
+        return DynamoDBFingerprintStore(location[len("dynamodb://") :], ttl_seconds)
+    if location.startswith("s3://"):
+        bucket, _, prefix = location[len("s3://") :].partition("/")
+        return S3FingerprintStore(bucket, prefix or "classification-fingerprints")
+    return None
+
+
+_shared_index: Optional[PageFingerprintIndex] = None
+_shared_index_location: Optional[str] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_fingerprint_index(
+    config_key: str,
+    store_location: str = "memory",
+    ttl_seconds: int = 30 * 24 * 3600,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> PageFingerprintIndex:
+    """
+    Return the process-wide fingerprint index of a configuration.
+
+    The index is loaded from its store the first time it is requested in a
+    container. Requesting a different configuration key or store replaces it,
+    which invalidates the entries of the previous class configuration.
+
+    Args:
+        config_key: Key from ``compute_config_key``
+        store_location: Store location accepted by ``create_fingerprint_store``
+        ttl_seconds: Lifetime of DynamoDB entries
+        max_entries: Maximum entries held in memory
+
+    Returns:
+        PageFingerprintIndex
+    """
+    global _shared_index, _shared_index_location
+    with _shared_index_lock:
+        if (
+            _shared_index is None
+            or _shared_index.config_key != config_key
+            or _shared_index_location != store_location
+        ):
+            if _shared_index is not None:
+                logger.info(
+                    "Classification configuration changed, "
+                    "replacing the page fingerprint index"
+                )
+            store = None
+            try:
+                store = create_fingerprint_store(store_location, ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Failed to create page fingerprint store: {str(e)}")
+            index = PageFingerprintIndex(config_key, store, max_entries)
+            index.load()
+            _shared_index = index
+            _shared_index_location = store_location
+        return _shared_index
@@ -0,0 +1,532 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Local pre-classifier for page-level classification.
+
+High-volume classes are often recognizable from a handful of words on the
+page. ``LocalPageClassifier`` is a multinomial logistic regression over hashed
+word n-gram features, stored as NumPy arrays, that runs in-process before the
+Bedrock call. Each label is a (class, document boundary) pair, so one
+prediction provides both values the page-level method needs. Pages whose
+predicted probability reaches the calibrated threshold take the local label;
+all other pages fall through to Bedrock.
+
+Models are fit offline from historical results: ``load_reporting_examples``
+joins the section classifications saved in the reporting bucket with the page
+text in the output bucket, ``fit_local_classifier`` trains on part of them and
+calibrates the threshold on the rest so that accepted held-out pages reach a
+target precision. Run the module to fit and upload a model::
+
+    python -m idp_common.classification.local_classifier \\
+        --reporting-bucket <reporting bucket> --output-bucket <output bucket> \\
+        --model-uri s3://<bucket>/models/local-classifier.npz
+
+NumPy is imported on first use, so it is only needed when a model is used; it
+is installed with the ``local_classifier`` extra.
+"""
+
+import argparse
+import io
+import json
+import logging
+import math
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from idp_common import s3
+from idp_common.utils import parse_s3_uri
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the feature hashing or stored model format changes
+MODEL_FORMAT_VERSION = 1
+
+DEFAULT_NUM_FEATURES = 2**16
+DEFAULT_MAX_NGRAM = 2
+DEFAULT_TARGET_PRECISION = 0.98
+
+_WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+_DIGIT_PATTERN = re.compile(r"\d")
+
+# (page text, class, document boundary)
+TrainingExample = Tuple[str, str, str]
+
+
+def hash_features(
+    text: Optional[str],
+    num_features: int = DEFAULT_NUM_FEATURES,
+    max_ngram: int = DEFAULT_MAX_NGRAM,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Compute the hashed n-gram feature vector of a page.
+
+    Words are lowercased with digits masked, so account numbers and dates map
+    to the same features. Word n-grams up to ``max_ngram`` are hashed into
+    ``num_features`` signed buckets with sublinear term frequency, and the
+    vector is L2-normalized.
+
+    Args:
+        text: Page text
+        num_features: Size of the hashed feature space
+        max_ngram: Longest word n-gram
+
+    Returns:
+        Tuple of (feature indices, feature values) of the sparse vector
+    """
+    import numpy as np
+
+    words = [
+        _DIGIT_PATTERN.sub("0", word.lower())
+        for word in _WORD_PATTERN.findall(text or "")
+    ]
+    counts: Counter = Counter()
+    for n in range(1, max_ngram + 1):
+        for start in range(len(words) - n + 1):
+            counts[" ".join(words[start : start + n])] += 1
+
+    buckets: Dict[int, float] = {}
+    for ngram, count in counts.items():
+        hashed = zlib.crc32(ngram.encode("utf-8"))
+        sign = 1.0 if hashed & 0x80000000 else -1.0
+        index = hashed % num_features
+        buckets[index] = buckets.get(index, 0.0) + sign * (1.0 + math.log(count))
+
+    indices = np.fromiter(buckets.keys(), dtype=np.int64, count=len(buckets))
+    values = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+    norm = float(np.linalg.norm(values))
+    if norm > 0:
+        values /= norm
+    return indices, values
+
+
+def _softmax(scores: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    exp = np.exp(scores - scores.max())
+    return exp / exp.sum()
+
+
+class LocalPageClassifier:
+    """
+    Linear page classifier over hashed n-gram features.
+
+    ``weights`` has one row per label; ``labels`` holds the (class, boundary)
+    pair of each row. ``threshold`` is the calibrated minimum probability for
+    a prediction to be used, or None if no threshold reached the target
+    precision during calibration.
+    """
+
+    def __init__(
+        self,
+        weights: "np.ndarray",
+        bias: "np.ndarray",
+        labels: Sequence[Tuple[str, str]],
+        threshold: Optional[float],
+        num_features: int = DEFAULT_NUM_FEATURES,
+        max_ngram: int = DEFAULT_MAX_NGRAM,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the classifier.
+
+        Args:
+            weights: Array of shape (labels, num_features)
+            bias: Array of shape (labels,)
+            labels: (class, document boundary) of each weight row
+            threshold: Calibrated minimum probability, or None
+            num_features: Size of the hashed feature space
+            max_ngram: Longest word n-gram
+            metadata: Training statistics stored with the model
+        """
+        self.weights = weights
+        self.bias = bias
+        self.labels = [tuple(label) for label in labels]
+        self.threshold = threshold
+        self.num_features = num_features
+        self.max_ngram = max_ngram
+        self.metadata = metadata or {}
+
+    @property
+    def classes(self) -> List[str]:
+        """Distinct classes the model predicts."""
+        return sorted({doc_type for doc_type, _ in self.labels})
+
+    def predict_proba(self, text: Optional[str]) -> "np.ndarray":
+        """Return the probability of each label for a page."""
+        indices, values = hash_features(text, self.num_features, self.max_ngram)
+        scores = self.weights[:, indices] @ values + self.bias
+        return _softmax(scores)
+
+    def predict(self, text: Optional[str]) -> Tuple[str, str, float]:
+        """
+        Predict the class and document boundary of a page.
+
+        Args:
+            text: Page text
+
+        Returns:
+            Tuple of (class, document boundary, probability)
+        """
+        probabilities = self.predict_proba(text)
+        best = int(probabilities.argmax())
+        doc_type, document_boundary = self.labels[best]
+        return doc_type, document_boundary, float(probabilities[best])
+
+    def to_bytes(self) -> bytes:
+        """Serialize the model as a compressed ``.npz`` archive."""
+        import numpy as np
+
+        header = {
+            "version": MODEL_FORMAT_VERSION,
+            "labels": [list(label) for label in self.labels],
+            "threshold": self.threshold,
+            "num_features": self.num_features,
+            "max_ngram": self.max_ngram,
+            "metadata": self.metadata,
+        }
+        output = io.BytesIO()
+        np.savez_compressed(
+            output,
+            weights=self.weights.astype(np.float32),
+            bias=self.bias.astype(np.float32),
+            header=np.array(json.dumps(header)),
+        )
+        return output.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LocalPageClassifier":
+        """
+        Load a model serialized with ``to_bytes``.
+
+        Raises:
+            ValueError: If the model was saved in an unsupported format
+            ImportError: If NumPy is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError(
+                "NumPy is required for the local classifier. "
+                "Install with: pip install 'idp_common[local_classifier]'"
+            )
+
+        with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+            header = json.loads(str(archive["header"]))
+            if header.get("version") != MODEL_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported local classifier format {header.get('version')}"
+                )
+            return cls(
+                weights=archive["weights"],
+                bias=archive["bias"],
+                labels=header["labels"],
+                threshold=header["threshold"],
+                num_features=header["num_features"],
+                max_ngram=header["max_ngram"],
+                metadata=header.get("metadata"),
+            )
+
+    def save(self, uri: str) -> None:
+        """Write the model to an S3 URI or a local path."""
+        data = self.to_bytes()
+        if uri.startswith("s3://"):
+            bucket, key = parse_s3_uri(uri)
+            s3.write_content(data, bucket, key, content_type="application/octet-stream")
+        else:
+            with open(uri, "wb") as f:
+                f.write(data)
+
+    @classmethod
+    def load(cls, uri: str) -> "LocalPageClassifier":
+        """Read a model from an S3 URI or a local path."""
+        if uri.startswith("s3://"):
+            return cls.from_bytes(s3.get_binary_content(uri))
+        with open(uri, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def calibrate_threshold(
+    confidences: Sequence[float],
+    correct: Sequence[bool],
+    target_precision: float = DEFAULT_TARGET_PRECISION,
+    min_accepted: int = 10,
+) -> Optional[float]:
+    """
+    Find the lowest probability threshold meeting a target precision.
+
+    Args:
+        confidences: Predicted probability of each held-out page
+        correct: Whether each prediction matched the recorded label
+        target_precision: Required precision among accepted pages
+        min_accepted: Minimum accepted pages for a threshold to count
+
+    Returns:
+        Lowest threshold whose accepted pages reach the target precision, or
+        None if there is none
+    """
+    ranked = sorted(zip(confidences, correct), key=lambda item: -item[0])
+    threshold = None
+    hits = 0
+    for accepted, (confidence, is_correct) in enumerate(ranked, start=1):
+        hits += int(is_correct)
+        # Only cut between distinct confidences so ties are accepted together
+        if accepted < len(ranked) and ranked[accepted][0] == confidence:
+            continue
+        if accepted >= min_accepted and hits / accepted >= target_precision:
+            threshold = confidence
+    return threshold
+
+
+def fit_local_classifier(
+    examples: Iterable[TrainingExample],
+    num_features: int = DEFAULT_NUM_FEATURES,
+    max_ngram: int = DEFAULT_MAX_NGRAM,
+    epochs: int = 10,
+    learning_rate: float = 0.5,
+    l2: float = 1e-4,
+    validation_fraction: float = 0.2,
+    target_precision: float = DEFAULT_TARGET_PRECISION,
+    min_accepted: int = 10,
+    seed: int = 42,
+) -> LocalPageClassifier:
+    """
+    Fit a local classifier and calibrate its threshold on held-out pages.
+
+    Trains a multinomial logistic regression with stochastic gradient descent
+    on the sparse hashed features.
+
+    Args:
+        examples: (page text, class, document boundary) per page
+        num_features: Size of the hashed feature space
+        max_ngram: Longest word n-gram
+        epochs: Passes over the training pages
+        learning_rate: Initial SGD step size (decays per epoch)
+        l2: L2 regularization strength
+        validation_fraction: Share of pages held out for calibration
+        target_precision: Required precision of accepted held-out pages
+        min_accepted: Minimum accepted held-out pages for a threshold
+        seed: Random seed for the split and the example order
+
+    Returns:
+        LocalPageClassifier
+
+    Raises:
+        ValueError: If the examples hold fewer than two labels
+    """
+    import numpy as np
+
+    rows = [
+        (hash_features(text, num_features, max_ngram), (doc_type, boundary))
+        for text, doc_type, boundary in examples
+    ]
+    labels = sorted({label for _, label in rows})
+    if len(labels) < 2:
+        raise ValueError("At least two distinct labels are needed to fit a model")
+    label_ids = {label: i for i, label in enumerate(labels)}
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(rows))
+    holdout_size = int(len(rows) * validation_fraction)
+    holdout, train = order[:holdout_size], order[holdout_size:]
+
+    weights = np.zeros((len(labels), num_features), dtype=np.float32)
+    bias = np.zeros(len(labels), dtype=np.float32)
+    for epoch in range(epochs):
+        step = learning_rate / (1.0 + epoch)
+        for row in rng.permutation(train):
+            (indices, values), label = rows[row]
+            probabilities = _softmax(weights[:, indices] @ values + bias)
+            probabilities[label_ids[label]] -= 1.0
+            # Regularize only the active features (lazy L2)
+            weights[:, indices] -= step * (
+                np.outer(probabilities, values) + l2 * weights[:, indices]
+            )
+            bias -= step * probabilities
+
+    classifier = LocalPageClassifier(
+        weights, bias, labels, None, num_features, max_ngram
+    )
+
+    confidences: List[float] = []
+    correct: List[bool] = []
+    for row in holdout:
+        (indices, values), label = rows[row]
+        probabilities = _softmax(weights[:, indices] @ values + bias)
+        best = int(probabilities.argmax())
+        confidences.append(float(probabilities[best]))
+        correct.append(labels[best] == label)
+    classifier.threshold = calibrate_threshold(
+        confidences, correct, target_precision, min_accepted
+    )
+
+    accepted = [
+        is_correct
+        for confidence, is_correct in zip(confidences, correct)
+        if classifier.threshold is not None and confidence >= classifier.threshold
+    ]
+    classifier.metadata = {
+        "trained_at": int(time.time()),
+        "training_pages": len(train),
+        "holdout_pages": len(holdout),
+        "holdout_accuracy": sum(correct) / len(correct) if correct else None,
+        "holdout_coverage": len(accepted) / len(correct) if correct else None,
+        "holdout_precision": sum(accepted) / len(accepted) if accepted else None,
+        "target_precision": target_precision,
+    }
+    if classifier.threshold is None:
+        logger.warning(
+            f"No threshold reached {target_precision:.0%} precision on "
+            f"{len(holdout)} held-out pages; the model will not be used "
+            "unless classification.localClassifier.min_confidence is set"
+        )
+    logger.info(f"Fit local classifier: {classifier.metadata}")
+    return classifier
+
+
+def load_reporting_examples(
+    reporting_bucket: str,
+    output_bucket: str,
+    prefix: str = "document_sections/",
+    max_sections: Optional[int] = None,
+) -> Iterator[TrainingExample]:
+    """
+    Load page-level training examples from historical classification results.
+
+    Reads the section records saved by ``SaveReportingData`` under
+    ``document_sections/`` (document ID, section class and the page indices of
+    the section) and the parsed text of each page from the output bucket. The
+    first page of a section is labeled "start" and the others "continue".
+
+    Requires ``pyarrow`` (the ``reporting`` extra).
+
+    Args:
+        reporting_bucket: Reporting bucket
+        output_bucket: Output bucket holding ``{document}/pages/{n}/result.json``
+        prefix: Prefix of the section records
+        max_sections: Stop after this many sections
+
+    Yields:
+        (page text, class, document boundary) per page
+    """
+    import pyarrow.parquet as pq
+
+    client = s3.get_s3_client()
+    seen = set()
+    sections = 0
+    paginator = client.get_paginator("list_objects_v2")
+    for listing in paginator.paginate(Bucket=reporting_bucket, Prefix=prefix):
+        for item in listing.get("Contents", []):
+            if not item["Key"].endswith(".parquet"):
+                continue
+            body = client.get_object(Bucket=reporting_bucket, Key=item["Key"])
+            table = pq.read_table(io.BytesIO(body["Body"].read()))
+            for record in table.to_pylist():
+                document_id = record.get("document_id")
+                doc_type = record.get("section_classification")
+                page_indices = record.get("split_document.page_indices")
+                key = (document_id, record.get("section_id"))
+                if not (document_id and doc_type and page_indices) or key in seen:
+                    continue
+                seen.add(key)
+                for position, page_index in enumerate(sorted(json.loads(page_indices))):
+                    uri = (
+                        f"s3://{output_bucket}/{document_id}/pages/"
+                        f"{int(page_index) + 1}/result.json"
+                    )
+                    try:
+                        text = s3.get_text_content(uri)
+                    except Exception as e:
+                        logger.warning(f"Skipping page {uri}: {str(e)}")
+                        continue
+                    yield text, doc_type, "start" if position == 0 else "continue"
+                sections += 1
+                if max_sections and sections >= max_sections:
+                    return
+
+
+_shared_classifiers: Dict[str, LocalPageClassifier] = {}
+_shared_classifiers_lock = threading.Lock()
+
+
+def get_local_classifier(uri: str) -> LocalPageClassifier:
+    """
+    Return the model at a URI, loading it once per warm container.
+
+    Args:
+        uri: S3 URI or local path of the model
+
+    Returns:
+        LocalPageClassifier
+    """
+    with _shared_classifiers_lock:
+        classifier = _shared_classifiers.get(uri)
+        if classifier is None:
+            t0 = time.time()
+            classifier = LocalPageClassifier.load(uri)
+            _shared_classifiers.clear()
+            _shared_classifiers[uri] = classifier
+            logger.info(
+                f"Loaded local classifier {uri} with {len(classifier.labels)} labels "
+                f"in {time.time() - t0:.2f} seconds"
+            )
+        return classifier
+
+
+def main() -> None:
+    """Fit a local classifier from reporting data and save it."""
+    parser = argparse.ArgumentParser(
+        description="Fit a local page pre-classifier from historical results"
+    )
+    parser.add_argument("--reporting-bucket", required=True)
+    parser.add_argument("--output-bucket", required=True)
+    parser.add_argument(
+        "--model-uri", required=True, help="S3 URI or local path for the model"
+    )
+    parser.add_argument("--max-sections", type=int, default=None)
+    parser.add_argument("--num-features", type=int, default=DEFAULT_NUM_FEATURES)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument(
+        "--target-precision", type=float, default=DEFAULT_TARGET_PRECISION
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    examples = list(
+        load_reporting_examples(
+            args.reporting_bucket, args.output_bucket, max_sections=args.max_sections
+        )
+    )
+    logger.info(f"Loaded {len(examples)} training pages")
+    classifier = fit_local_classifier(
+        examples,
+        num_features=args.num_features,
+        epochs=args.epochs,
+        target_precision=args.target_precision,
+    )
+    classifier.save(args.model_uri)
+    logger.info(
+        f"Saved local classifier to {args.model_uri} "
+        f"(threshold {classifier.threshold})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Multi-page batching for page-level classification.
+
+Page-level classification normally makes one Bedrock call per page, each
+repeating the system prompt, class list and few-shot examples. With
+``pagesPerRequest`` above 1, consecutive pages are packed into one request
+instead, up to a page count, an estimated input token budget and an image
+budget, and the model returns the class and document boundary of every page
+in one structured response.
+
+This module plans the batches and builds and parses the batch-specific parts
+of the request; ``ClassificationService`` builds the rest of the prompt from
+the configured task prompt and maps the answers back to ``PageClassification``
+results.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from idp_common.bedrock.token_estimator import (
+    estimate_image_tokens,
+    estimate_text_tokens,
+)
+from idp_common.utils import extract_structured_data_from_text
+
+logger = logging.getLogger(__name__)
+
+PAGE_BATCH_INSTRUCTIONS = """The document text above contains {page_count} pages, \
+each starting with a <page-number> tag.{image_note} Classify every page \
+separately, in order, and decide for each page whether it starts a new document \
+("start") or continues the document of the previous page ("continue").
+
+Respond only with a JSON object of the form:
+{{"pages": [{{"page": "<page-number>", "class": "<class name>", \
+"document_boundary": "start" | "continue"}}]}}
+
+Include exactly one entry for each of these page numbers: {page_ids}"""
+
+PAGE_BATCH_IMAGE_NOTE = " The page images follow, each labeled with its page number."
+
+
+def estimate_page_cost(
+    text: Optional[str], image_bytes: Optional[bytes], include_image: bool
+) -> Tuple[int, int]:
+    """
+    Estimate the input tokens and images a page adds to a batch request.
+
+    Args:
+        text: Page text
+        image_bytes: Page image
+        include_image: Whether the page image is sent with the request
+
+    Returns:
+        Tuple of (estimated tokens, number of images)
+    """
+    tokens = estimate_text_tokens(text or "") + 10  # page number tag
+    images = 0
+    if include_image and image_bytes:
+        tokens += estimate_image_tokens(image_bytes) + 10  # image label
+        images = 1
+    return tokens, images
+
+
+def plan_page_batches(
+    page_costs: Iterable[Tuple[str, int, int]],
+    max_pages: int,
+    max_tokens: int,
+    max_images: int,
+) -> Iterator[List[str]]:
+    """
+    Pack consecutive pages into batches within the page, token and image budgets.
+
+    Batches are yielded as soon as they are full, so pages can be classified
+    while later pages are still being loaded. A page that alone exceeds a
+    budget gets a batch of its own.
+
+    Args:
+        page_costs: (page_id, tokens, images) per page, in page order
+        max_pages: Maximum pages per batch
+        max_tokens: Maximum estimated page tokens per batch
+        max_images: Maximum images per batch
+
+    Yields:
+        Lists of page IDs
+    """
+    batch: List[str] = []
+    batch_tokens = 0
+    batch_images = 0
+    for page_id, tokens, images in page_costs:
+        if batch and (
+            len(batch) >= max_pages
+            or batch_tokens + tokens > max_tokens
+            or batch_images + images > max_images
+        ):
+            yield batch
+            batch, batch_tokens, batch_images = [], 0, 0
+        batch.append(page_id)
+        batch_tokens += tokens
+        batch_images += images
+    if batch:
+        yield batch
+
+
+def build_batch_document_text(page_texts: Sequence[Tuple[str, str]]) -> str:
+    """
+    Join the text of a batch of pages, each marked with its page number.
+
+    Args:
+        page_texts: (page_id, text) per page, in page order
+
+    Returns:
+        Text substituted for {DOCUMENT_TEXT} in the task prompt
+    """
+    return "\n\n".join(
+        f"<page-number>{page_id}</page-number>\n{text}" for page_id, text in page_texts
+    )
+
+
+def build_batch_instructions(page_ids: Sequence[str], with_images: bool) -> str:
+    """Return the instructions asking for one answer per page of the batch."""
+    return PAGE_BATCH_INSTRUCTIONS.format(
+        page_count=len(page_ids),
+        image_note=PAGE_BATCH_IMAGE_NOTE if with_images else "",
+        page_ids=", ".join(page_ids),
+    )
+
+
+def parse_batch_classification_response(text: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse the per-page answers of a batch classification response.
+
+    Accepts {"pages": [...]} or a bare list of entries with "page", "class"
+    and "document_boundary" fields. Entries without a page number are ignored.
+
+    Args:
+        text: Model response text
+
+    Returns:
+        Mapping of page ID to its entry (the first entry wins for repeats)
+    """
+    try:
+        # A bare JSON list is parsed directly; the generic extraction looks
+        # for an object and would return only the first entry
+        data = json.loads(text.strip())
+    except ValueError:
+        try:
+            data, _ = extract_structured_data_from_text(text)
+        except Exception as e:
+            logger.warning(f"Failed to parse batch classification response: {e}")
+            return {}
+    if isinstance(data, dict):
+        data = data.get("pages")
+    if not isinstance(data, list):
+        return {}
+
+    answers: Dict[str, Dict[str, Any]] = {}
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        page_id = entry.get("page", entry.get("page_id"))
+        if page_id is None:
+            continue
+        answers.setdefault(str(page_id).strip(), entry)
+    return answers
@@ -0,0 +1,108 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Concurrent page content loading for classification.
+
+Context-aware and holistic classification need the text (and images) of many
+pages before or alongside the model calls. Reading them one page at a time
+costs one S3 round trip per page before the first call can start.
+``PageContentLoader`` submits every page load to a bounded thread pool, in
+page order, as soon as it is created. Callers then wait only for the pages
+they need: ``loader[page_id]`` blocks until that page is loaded, so the
+classification of page N can start once pages N-k..N+k are available, and
+``as_completed()`` streams pages in the order their loads finish.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from idp_common.models import Page
+
+logger = logging.getLogger(__name__)
+
+# The shared boto3 S3 client keeps at most 10 pooled connections
+DEFAULT_PAGE_LOADER_WORKERS = 10
+
+
+def sort_page_ids(page_ids) -> List[str]:
+    """Sort page IDs numerically, with non-numeric IDs last."""
+    return sorted(page_ids, key=lambda x: int(x) if x.isdigit() else float("inf"))
+
+
+class PageContentLoader:
+    """
+    Loads the content of a document's pages concurrently.
+
+    ``load_page(page_id, page)`` is called once per page on a worker thread.
+    It should handle its own errors; an exception it raises is re-raised to
+    the caller that asks for that page. Use as a context manager, or call
+    ``close()``, to release the worker threads.
+    """
+
+    def __init__(
+        self,
+        pages: Mapping[str, Page],
+        load_page: Callable[[str, Page], Any],
+        max_workers: int = DEFAULT_PAGE_LOADER_WORKERS,
+    ):
+        """
+        Initialize the loader and start loading every page.
+
+        Args:
+            pages: Pages to load, by page ID
+            load_page: Function returning the loaded content of a page
+            max_workers: Maximum number of pages loaded at the same time
+        """
+        self.page_ids = sort_page_ids(pages.keys())
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(self.page_ids) or 1)),
+            thread_name_prefix="page-loader",
+        )
+        # Submitted in page order so the first pages are ready first
+        self._futures: Dict[str, Future] = {
+            page_id: self._executor.submit(load_page, page_id, pages[page_id])
+            for page_id in self.page_ids
+        }
+
+    def __contains__(self, page_id: object) -> bool:
+        return page_id in self._futures
+
+    def __getitem__(self, page_id: str) -> Any:
+        """Return the content of a page, waiting for it to be loaded."""
+        return self._futures[page_id].result()
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def get(self, page_id: str, default: Any = None) -> Any:
+        """Return the content of a page, or default for an unknown page ID."""
+        if page_id not in self._futures:
+            return default
+        return self[page_id]
+
+    def as_completed(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (page_id, content) pairs in the order their loads finish."""
+        page_ids = {future: page_id for page_id, future in self._futures.items()}
+        for future in as_completed(page_ids):
+            yield page_ids[future], future.result()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wait for every page and return their content by page ID."""
+        return dict(self.as_completed())
+
+    def close(self, cancel_pending: bool = True) -> None:
+        """
+        Shut down the worker threads.
+
+        Args:
+            cancel_pending: Cancel page loads that have not started yet
+        """
+        self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
+
+    def __enter__(self) -> "PageContentLoader":
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
@@ -22,15 +22,27 @@ import logging
 import os
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
 
 import boto3
 from botocore.exceptions import ClientError
 
-from idp_common import bedrock, image, s3, utils
+from idp_common import bedrock, image, metrics, s3, utils
+from idp_common.bedrock.batch import BedrockBatchRunner
+from idp_common.classification.fingerprint_cache import (
+    PageFingerprint,
+    PageFingerprintIndex,
+    compute_config_key,
+    compute_page_fingerprint,
+    get_fingerprint_index,
+)
+from idp_common.classification.local_classifier import (
+    LocalPageClassifier,
+    get_local_classifier,
+)
 from idp_common.classification.models import (
     ClassificationResult,
     DocumentClassification,
@@ -38,6 +50,17 @@ from idp_common.classification.models import (
     DocumentType,
     PageClassification,
 )
+from idp_common.classification.page_batching import (
+    build_batch_document_text,
+    build_batch_instructions,
+    estimate_page_cost,
+    parse_batch_classification_response,
+    plan_page_batches,
+)
+from idp_common.classification.page_loader import (
+    DEFAULT_PAGE_LOADER_WORKERS,
+    PageContentLoader,
+)
 from idp_common.config.models import IDPConfig
 from idp_common.config.schema_constants import (
     X_AWS_IDP_CLASSIFICATION,
@@ -45,7 +68,7 @@ from idp_common.config.schema_constants import (
     X_AWS_IDP_DOCUMENT_TYPE,
     X_AWS_IDP_PAGE_CONTENT_REGEX,
 )
-from idp_common.models import Document, Section, Status
+from idp_common.models import Document, Page, Section, Status
 from idp_common.utils import extract_json_from_text, extract_structured_data_from_text
 from idp_common.utils.few_shot_example_builder import build_few_shot_examples_content
 
@@ -136,6 +159,8 @@ class ClassificationService:
             if not model_id:
                 raise ValueError("No model ID specified in configuration for Bedrock")
             self.bedrock_model = model_id
+            # Pages are classified concurrently; size the shared pool for them
+            bedrock.reserve_connections(self.max_workers)
             logger.info(
                 f"Initialized classification service with Bedrock backend using model {model_id}"
             )
@@ -172,6 +197,279 @@ class ClassificationService:
                 "Using multimodal page-level classification method with document boundary detection"
             )
 
+        # Reuse classifications of near-duplicate pages across documents
+        self.fingerprint_index: Optional[PageFingerprintIndex] = None
+        if (
+            self.config.classification.fingerprintCache.enabled
+            and self.backend == "bedrock"
+            and self.classification_method == self.MULTIMODAL_PAGE_LEVEL
+        ):
+            self.fingerprint_index = self._load_fingerprint_index()
+
+        # Local pre-classifier for pages the LLM is not needed for
+        self.local_classifier: Optional[LocalPageClassifier] = None
+        self.local_classifier_threshold: Optional[float] = None
+        if (
+            self.config.classification.localClassifier.enabled
+            and self.backend == "bedrock"
+            and self.classification_method == self.MULTIMODAL_PAGE_LEVEL
+        ):
+            self._load_local_classifier()
+
+    def _load_local_classifier(self) -> None:
+        """Load the configured local pre-classifier and its threshold."""
+        local_config = self.config.classification.localClassifier
+        if not local_config.model_uri:
+            logger.warning(
+                "Local classifier enabled without a model_uri, classifying all "
+                "pages with Bedrock"
+            )
+            return
+        try:
+            classifier = get_local_classifier(local_config.model_uri)
+        except Exception as e:
+            logger.warning(
+                f"Failed to load local classifier {local_config.model_uri}, "
+                f"classifying all pages with Bedrock: {str(e)}"
+            )
+            return
+
+        threshold = local_config.min_confidence
+        if threshold is None:
+            threshold = classifier.threshold
+        if threshold is None:
+            logger.warning(
+                "Local classifier has no calibrated threshold and no min_confidence "
+                "is configured, classifying all pages with Bedrock"
+            )
+            return
+
+        unknown_classes = set(classifier.classes) - self.valid_doc_types
+        if unknown_classes:
+            logger.warning(
+                f"Local classifier predicts classes that are not configured, pages "
+                f"predicted as {', '.join(sorted(unknown_classes))} go to Bedrock"
+            )
+        self.local_classifier = classifier
+        self.local_classifier_threshold = threshold
+        logger.info(f"Local pre-classifier enabled with threshold {threshold:.3f}")
+
+    def _classify_page_locally(
+        self,
+        page_id: str,
+        text_content: Optional[str],
+        image_uri: Optional[str] = None,
+        text_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> Optional[PageClassification]:
+        """
+        Classify a page with the local pre-classifier, if it is confident.
+
+        Args:
+            page_id: ID of the page
+            text_content: Text of the page
+            image_uri: URI of the image content
+            text_uri: URI of the text content
+            raw_text_uri: URI of the raw text content
+
+        Returns:
+            PageClassification with the local label, or None if the page should
+            be classified with Bedrock
+        """
+        if self.local_classifier is None or not text_content:
+            return None
+        threshold = self.local_classifier_threshold or 0.0
+        try:
+            doc_type, document_boundary, confidence = self.local_classifier.predict(
+                text_content
+            )
+        except Exception as e:
+            logger.warning(f"Local classifier failed for page {page_id}: {str(e)}")
+            return None
+
+        accepted = confidence >= threshold and doc_type in self.valid_doc_types
+        try:
+            metrics.put_metric(
+                "ClassificationLocalClassifierHits"
+                if accepted
+                else "ClassificationLocalClassifierFallthroughs",
+                1,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish local classifier metric: {str(e)}")
+        if not accepted:
+            logger.debug(
+                f"Local classifier predicted '{doc_type}' for page {page_id} with "
+                f"confidence {confidence:.3f}, classifying with Bedrock"
+            )
+            return None
+
+        logger.info(
+            f"Page {page_id} classified as '{doc_type}' by the local classifier "
+            f"(confidence {confidence:.3f}). Skipping LLM classification."
+        )
+        return PageClassification(
+            page_id=page_id,
+            classification=DocumentClassification(
+                doc_type=doc_type,
+                confidence=confidence,
+                metadata={
+                    "local_classifier": {
+                        "confidence": round(confidence, 4),
+                        "threshold": round(threshold, 4),
+                    },
+                    "document_boundary": document_boundary,
+                },
+            ),
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
+
+    def _load_fingerprint_index(self) -> PageFingerprintIndex:
+        """
+        Get the page fingerprint index of the current classification configuration.
+
+        The index is scoped by the classes, model and prompts, so it is loaded
+        afresh (empty) whenever one of them changes.
+
+        Returns:
+            PageFingerprintIndex shared by the services of this container
+        """
+        classification_config = self.config.classification
+        cache_config = classification_config.fingerprintCache
+        config_key = compute_config_key(
+            json.dumps(self.config.classes, sort_keys=True, default=str),
+            self.bedrock_model,
+            classification_config.system_prompt,
+            classification_config.task_prompt,
+        )
+
+        table_name = cache_config.table or self.cache_table_name
+        if cache_config.bucket:
+            location = f"s3://{cache_config.bucket}/{cache_config.prefix.strip('/')}"
+        elif table_name:
+            location = f"dynamodb://{table_name}"
+        else:
+            location = "memory"
+
+        index = get_fingerprint_index(
+            config_key,
+            store_location=location,
+            ttl_seconds=cache_config.ttl_days * 24 * 3600,
+            max_entries=cache_config.max_entries,
+        )
+        logger.info(
+            f"Page fingerprint cache enabled ({location}) with {len(index)} pages"
+        )
+        return index
+
+    def _match_page_fingerprint(
+        self,
+        page_id: str,
+        text_content: Optional[str],
+        image_content: Optional[bytes],
+        image_uri: Optional[str] = None,
+        text_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> Tuple[Optional[PageClassification], Optional[PageFingerprint]]:
+        """
+        Look up a page in the fingerprint index.
+
+        Args:
+            page_id: ID of the page
+            text_content: Text of the page
+            image_content: Prepared image of the page
+            image_uri: URI of the image content
+            text_uri: URI of the text content
+            raw_text_uri: URI of the raw text content
+
+        Returns:
+            Tuple of (classification reused from a near-duplicate page, or None;
+            fingerprint of the page, or None if the cache is not used)
+        """
+        if self.fingerprint_index is None:
+            return None, None
+        fingerprint = compute_page_fingerprint(text_content, image_content)
+        if fingerprint is None:
+            return None, None
+
+        cache_config = self.config.classification.fingerprintCache
+        match = self.fingerprint_index.lookup(
+            fingerprint,
+            max_image_distance=cache_config.max_image_distance,
+            max_text_distance=cache_config.max_text_distance,
+        )
+        try:
+            metrics.put_metric(
+                "ClassificationFingerprintCacheHits"
+                if match
+                else "ClassificationFingerprintCacheMisses",
+                1,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish fingerprint cache metric: {str(e)}")
+        if match is None:
+            return None, fingerprint
+
+        logger.info(
+            f"Page {page_id} classified as '{match.doc_type}' from a near-duplicate "
+            f"page (image distance {match.image_distance}, text distance "
+            f"{match.text_distance}). Skipping LLM classification."
+        )
+        result = PageClassification(
+            page_id=page_id,
+            classification=DocumentClassification(
+                doc_type=match.doc_type,
+                confidence=1.0,
+                metadata={
+                    "metering": {
+                        f"Classification/fingerprint_cache/{self.bedrock_model}": {
+                            "hits": 1
+                        }
+                    },
+                    "document_boundary": match.document_boundary,
+                    "fingerprint_match": {
+                        "image_distance": match.image_distance,
+                        "text_distance": match.text_distance,
+                    },
+                },
+            ),
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
+        return result, fingerprint
+
+    def _remember_page_fingerprint(
+        self, fingerprint: Optional[PageFingerprint], page_result: PageClassification
+    ) -> None:
+        """Add a page classified by the model to the fingerprint index."""
+        if self.fingerprint_index is None or fingerprint is None:
+            return
+        classification = page_result.classification
+        if (
+            "error" in classification.metadata
+            or classification.doc_type not in self.valid_doc_types
+        ):
+            return
+        self.fingerprint_index.add(
+            fingerprint,
+            classification.doc_type,
+            classification.metadata.get("document_boundary", "continue"),
+        )
+
+    def _flush_page_fingerprints(self) -> None:
+        """Persist new page fingerprints and log the cache hit rate."""
+        if self.fingerprint_index is None:
+            return
+        self.fingerprint_index.flush()
+        index = self.fingerprint_index
+        logger.info(
+            f"Page fingerprint cache: {index.hits} hits, {index.misses} misses "
+            f"({index.hit_rate:.0%} hit rate), {len(index)} pages indexed"
+        )
+
     def _load_document_types(self) -> List[DocumentType]:
         """Load document types from configuration with regex patterns."""
         doc_types = []
@@ -361,74 +659,84 @@ class ClassificationService:
         )
         return original_document
 
-    def _preload_page_content(
-        self, document: Document, context_size: int
-    ) -> Dict[str, PageContextData]:
+    def _load_page_context(self, page_id: str, page: Page) -> PageContextData:
         """
-        Pre-load text and image content for all pages when context is needed.
+        Load the text and image content of a page for use as context.
+
+        Load errors are logged and leave the content empty.
 
         Args:
-            document: Document with pages to load
-            context_size: Number of context pages (determines if images should be loaded)
+            page_id: ID of the page
+            page: Page to load
 
         Returns:
-            Dictionary mapping page_id to PageContextData with loaded content
+            PageContextData with the loaded content
         """
-        page_content_cache: Dict[str, PageContextData] = {}
+        text_content = None
+        image_content = None
 
-        # Type-safe access to image config
-        target_width = self.config.classification.image.target_width
-        target_height = self.config.classification.image.target_height
+        # Load text content
+        if page.parsed_text_uri:
+            try:
+                text_content = s3.get_text_content(page.parsed_text_uri)
+            except Exception as e:
+                logger.warning(f"Failed to load text content for page {page_id}: {e}")
 
-        for page_id, page in document.pages.items():
-            text_content = None
-            image_content = None
+        # Load image content
+        if page.image_uri:
+            try:
+                # Type-safe access to image config
+                image_config = self.config.classification.image
+                image_content = image.prepare_image(
+                    page.image_uri,
+                    image_config.target_width,
+                    image_config.target_height,
+                    image_format=image_config.format,
+                    quality=image_config.quality,
+                    color_mode=image_config.color_mode,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load image content for page {page_id}: {e}")
 
-            # Load text content
-            if page.parsed_text_uri:
-                try:
-                    text_content = s3.get_text_content(page.parsed_text_uri)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to load text content for page {page_id}: {e}"
-                    )
+        return PageContextData(
+            page_id=page_id,
+            text_content=text_content,
+            image_content=image_content,
+        )
 
-            # Load image content
-            if page.image_uri:
-                try:
-                    image_content = image.prepare_image(
-                        page.image_uri, target_width, target_height
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to load image content for page {page_id}: {e}"
-                    )
+    def _start_page_content_loader(self, document: Document) -> PageContentLoader:
+        """
+        Start loading the text and image content of all pages concurrently.
 
-            page_content_cache[page_id] = PageContextData(
-                page_id=page_id,
-                text_content=text_content,
-                image_content=image_content,
-            )
+        Args:
+            document: Document with pages to load
 
-        logger.info(
-            f"Pre-loaded content for {len(page_content_cache)} pages for context-aware classification"
+        Returns:
+            PageContentLoader yielding PageContextData per page as it is loaded
+        """
+        return PageContentLoader(
+            document.pages,
+            self._load_page_context,
+            max_workers=min(self.max_workers, DEFAULT_PAGE_LOADER_WORKERS),
         )
-        return page_content_cache
 
     def _get_context_for_page(
         self,
         page_id: str,
         sorted_page_ids: List[str],
-        page_content_cache: Dict[str, PageContextData],
+        page_content_cache: Mapping[str, PageContextData],
         context_size: int,
     ) -> Dict[str, Any]:
         """
         Get context data for a specific page.
 
+        With a PageContentLoader as page_content_cache this waits only for the
+        context pages of page_id to be loaded.
+
         Args:
             page_id: The page being classified
             sorted_page_ids: All page IDs in sorted order
-            page_content_cache: Pre-loaded page content
+            page_content_cache: Pre-loaded page content or a PageContentLoader
             context_size: Number of pages before/after to include
 
         Returns:
@@ -479,6 +787,330 @@ class ClassificationService:
             "after_images": after_images,
         }
 
+    def _classify_page_with_context(
+        self,
+        page_id: str,
+        page: Page,
+        page_loader: PageContentLoader,
+        context_size: int,
+    ) -> PageClassification:
+        """
+        Classify a page with Bedrock once its context pages are loaded.
+
+        Args:
+            page_id: ID of the page
+            page: Page to classify
+            page_loader: Loader of the document's page content
+            context_size: Number of pages before/after to include
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        context = self._get_context_for_page(
+            page_id, page_loader.page_ids, page_loader, context_size
+        )
+        return self.classify_page_bedrock(
+            page_id=page_id,
+            text_uri=page.parsed_text_uri,
+            image_uri=page.image_uri,
+            raw_text_uri=page.raw_text_uri,
+            before_texts=context["before_texts"],
+            after_texts=context["after_texts"],
+            before_images=context["before_images"],
+            after_images=context["after_images"],
+        )
+
+    def _use_page_batches(self) -> bool:
+        """Return True if pages are classified several per Bedrock request."""
+        return (
+            self.backend == "bedrock" and self.config.classification.pagesPerRequest > 1
+        )
+
+    def _submit_page_batches(
+        self,
+        executor: ThreadPoolExecutor,
+        pages_to_classify: Dict[str, Page],
+        page_loader: PageContentLoader,
+    ) -> Dict[Future, Optional[str]]:
+        """
+        Pack pages into batches as they are loaded and submit each batch.
+
+        Pages that need no model call (no content, a page content regex match,
+        a confident local classifier prediction or a near-duplicate in the
+        fingerprint cache) are classified on their own.
+
+        Args:
+            executor: Executor the classification work is submitted to
+            pages_to_classify: Pages to classify, by page ID
+            page_loader: Loader of the document's page content
+
+        Returns:
+            Futures mapped to their page ID, or to None for batch futures
+        """
+        config = self._get_classification_config()
+        classification_config = self.config.classification
+        include_images = "{DOCUMENT_IMAGE}" in config["task_prompt"]
+
+        # Few-shot example images are sent with every batch
+        max_images = classification_config.pageBatchMaxImages
+        if "{FEW_SHOT_EXAMPLES}" in config["task_prompt"]:
+            example_images = sum(
+                1
+                for block in build_few_shot_examples_content(self.config)
+                if "image" in block
+            )
+            max_images = max(1, max_images - example_images)
+
+        futures: Dict[Future, Optional[str]] = {}
+
+        def page_costs():
+            for page_id in page_loader.page_ids:
+                if page_id not in pages_to_classify:
+                    continue
+                page_content = page_loader[page_id]
+                text = page_content.text_content
+                if not (text or page_content.image_content) or (
+                    text and self._check_page_content_regex(text)
+                ):
+                    page = pages_to_classify[page_id]
+                    future = executor.submit(
+                        self.classify_page_bedrock,
+                        page_id=page_id,
+                        text_uri=page.parsed_text_uri,
+                        image_uri=page.image_uri,
+                        raw_text_uri=page.raw_text_uri,
+                    )
+                    futures[future] = page_id
+                    continue
+                local_result = self._classify_page_locally(
+                    page_id,
+                    text,
+                    image_uri=pages_to_classify[page_id].image_uri,
+                    text_uri=pages_to_classify[page_id].parsed_text_uri,
+                    raw_text_uri=pages_to_classify[page_id].raw_text_uri,
+                )
+                if local_result is not None:
+                    future = Future()
+                    future.set_result(local_result)
+                    futures[future] = page_id
+                    continue
+                fingerprint_result, _ = self._match_page_fingerprint(
+                    page_id,
+                    text,
+                    page_content.image_content,
+                    image_uri=pages_to_classify[page_id].image_uri,
+                    text_uri=pages_to_classify[page_id].parsed_text_uri,
+                    raw_text_uri=pages_to_classify[page_id].raw_text_uri,
+                )
+                if fingerprint_result is not None:
+                    future = Future()
+                    future.set_result(fingerprint_result)
+                    futures[future] = page_id
+                    continue
+                tokens, images = estimate_page_cost(
+                    text, page_content.image_content, include_images
+                )
+                yield page_id, tokens, images
+
+        batch_count = 0
+        for batch in plan_page_batches(
+            page_costs(),
+            max_pages=classification_config.pagesPerRequest,
+            max_tokens=classification_config.pageBatchMaxTokens,
+            max_images=max_images,
+        ):
+            future = executor.submit(
+                self._classify_page_batch, batch, pages_to_classify, page_loader
+            )
+            futures[future] = None
+            batch_count += 1
+
+        logger.info(
+            f"Submitted {batch_count} page batches of up to "
+            f"{classification_config.pagesPerRequest} pages for classification"
+        )
+        return futures
+
+    def _classify_page_batch(
+        self,
+        page_ids: List[str],
+        pages: Dict[str, Page],
+        page_loader: PageContentLoader,
+    ) -> List[Tuple[str, Union[PageClassification, Exception]]]:
+        """
+        Classify a batch of pages, bisecting the batch when the request fails.
+
+        Pages missing from the response are retried in smaller batches; a
+        single page is classified with classify_page_bedrock, whose exceptions
+        are returned for that page.
+
+        Args:
+            page_ids: IDs of the pages in the batch, in page order
+            pages: Pages by page ID
+            page_loader: Loader of the document's page content
+
+        Returns:
+            (page_id, PageClassification or exception) for every page of the batch
+        """
+        if len(page_ids) == 1:
+            page_id = page_ids[0]
+            page = pages[page_id]
+            try:
+                return [
+                    (
+                        page_id,
+                        self.classify_page_bedrock(
+                            page_id=page_id,
+                            text_uri=page.parsed_text_uri,
+                            image_uri=page.image_uri,
+                            raw_text_uri=page.raw_text_uri,
+                        ),
+                    )
+                ]
+            except Exception as e:
+                return [(page_id, e)]
+
+        unused_metering: Dict[str, Any] = {}
+        try:
+            results, unused_metering = self._invoke_page_batch(
+                page_ids, pages, page_loader
+            )
+        except Exception as e:
+            logger.warning(
+                f"Classification of pages {', '.join(page_ids)} in one request "
+                f"failed, splitting the batch: {e}"
+            )
+            results = {}
+
+        outcomes: List[Tuple[str, Union[PageClassification, Exception]]] = [
+            (page_id, results[page_id]) for page_id in page_ids if page_id in results
+        ]
+        missing = [page_id for page_id in page_ids if page_id not in results]
+        if missing:
+            if results:
+                logger.warning(
+                    f"No classification returned for pages {', '.join(missing)}, "
+                    "retrying them"
+                )
+            middle = (len(missing) + 1) // 2
+            for part in (missing[:middle], missing[middle:]):
+                if part:
+                    outcomes.extend(
+                        self._classify_page_batch(part, pages, page_loader)
+                    )
+
+        # Keep the metering of a response that could not be used
+        if unused_metering:
+            for _, outcome in outcomes:
+                if isinstance(outcome, PageClassification):
+                    metadata = outcome.classification.metadata
+                    metadata["metering"] = utils.merge_metering_data(
+                        metadata.get("metering", {}), unused_metering
+                    )
+                    break
+        return outcomes
+
+    def _invoke_page_batch(
+        self,
+        page_ids: List[str],
+        pages: Dict[str, Page],
+        page_loader: PageContentLoader,
+    ) -> Tuple[Dict[str, PageClassification], Dict[str, Any]]:
+        """
+        Classify several pages with one Bedrock request.
+
+        Args:
+            page_ids: IDs of the pages in the batch, in page order
+            pages: Pages by page ID
+            page_loader: Loader of the document's page content
+
+        Returns:
+            Tuple of (results of the pages answered in the response, metering
+            of the request if no page could be answered)
+        """
+        config = self._get_classification_config()
+        contents = {page_id: page_loader[page_id] for page_id in page_ids}
+
+        document_text = build_batch_document_text(
+            [(page_id, contents[page_id].text_content or "") for page_id in page_ids]
+        )
+        content = self._build_content(
+            config["task_prompt"], document_text, self._format_classes_list()
+        )
+
+        page_images = []
+        if "{DOCUMENT_IMAGE}" in config["task_prompt"]:
+            page_images = [
+                (page_id, contents[page_id].image_content)
+                for page_id in page_ids
+                if contents[page_id].image_content
+            ]
+        for page_id, image_content in page_images:
+            content.append({"text": f"Image of page {page_id}:"})
+            content.append(image.prepare_bedrock_image_attachment(image_content))
+        content.append({"text": build_batch_instructions(page_ids, bool(page_images))})
+
+        logger.info(f"Classifying pages {', '.join(page_ids)} with Bedrock")
+        t0 = time.time()
+        response_with_metering = self._invoke_bedrock_model(
+            content=content, config=config
+        )
+        logger.info(
+            f"Time taken for classification of {len(page_ids)} pages: "
+            f"{time.time() - t0:.2f} seconds"
+        )
+
+        response = response_with_metering["response"]
+        metering = response_with_metering["metering"]
+        answers = parse_batch_classification_response(
+            response["output"]["message"]["content"][0].get("text", "")
+        )
+
+        results: Dict[str, PageClassification] = {}
+        for page_id in page_ids:
+            answer = answers.get(page_id) or {}
+            doc_type = str(answer.get("class") or "").strip()
+            if not doc_type:
+                continue
+            if doc_type not in self.valid_doc_types:
+                logger.warning(
+                    f"Unknown document type '{doc_type}' for page {page_id}, "
+                    f"valid types are: {', '.join(self.valid_doc_types)}"
+                )
+            page = pages[page_id]
+            results[page_id] = PageClassification(
+                page_id=page_id,
+                classification=DocumentClassification(
+                    doc_type=doc_type,
+                    confidence=1.0,  # Default confidence
+                    metadata={
+                        # The request's metering is counted once, on its first page
+                        "metering": {},
+                        "document_boundary": str(
+                            answer.get("document_boundary") or "continue"
+                        ).lower(),
+                        "page_batch_size": len(page_ids),
+                    },
+                ),
+                image_uri=page.image_uri,
+                text_uri=page.parsed_text_uri,
+                raw_text_uri=page.raw_text_uri,
+            )
+
+        if self.fingerprint_index is not None:
+            for page_id, page_result in results.items():
+                self._remember_page_fingerprint(
+                    compute_page_fingerprint(
+                        contents[page_id].text_content, contents[page_id].image_content
+                    ),
+                    page_result,
+                )
+
+        if not results:
+            return results, metering
+        next(iter(results.values())).classification.metadata["metering"] = metering
+        return results, {}
+
     def _classify_pages_multimodal(self, document: Document) -> Document:
         """
         Classify pages using multimodal page-level classification.
@@ -535,89 +1167,81 @@ class ClassificationService:
                     f"Found {len(cached_page_classifications)} cached page classifications, classifying {len(pages_to_classify)} remaining pages"
                 )
 
-                # Pre-load page content if context is enabled
-                page_content_cache: Dict[str, PageContextData] = {}
-                sorted_page_ids: List[str] = []
-                if context_size > 0:
-                    page_content_cache = self._preload_page_content(
-                        document, context_size
-                    )
-                    sorted_page_ids = sorted(
-                        document.pages.keys(),
-                        key=lambda x: int(x) if x.isdigit() else float("inf"),
-                    )
+                # Start loading page content for context or batching; each page
+                # (or batch) is classified as soon as the pages it needs are loaded
+                use_batches = self._use_page_batches()
+                page_loader: Optional[PageContentLoader] = None
+                if context_size > 0 or use_batches:
+                    page_loader = self._start_page_content_loader(document)
 
                 with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    futures = {}
+                    # Page futures return a PageClassification; batch futures
+                    # (page_id None) return (page_id, result or exception) pairs
+                    futures: Dict[Future, Optional[str]] = {}
 
-                    # Start processing only uncached pages
-                    for page_id, page in pages_to_classify.items():
+                    if page_loader is not None and use_batches:
                         if context_size > 0:
-                            # Get context for this page
-                            context = self._get_context_for_page(
-                                page_id,
-                                sorted_page_ids,
-                                page_content_cache,
-                                context_size,
-                            )
-                            future = executor.submit(
-                                self.classify_page_bedrock,
-                                page_id=page_id,
-                                text_uri=page.parsed_text_uri,
-                                image_uri=page.image_uri,
-                                raw_text_uri=page.raw_text_uri,
-                                before_texts=context["before_texts"],
-                                after_texts=context["after_texts"],
-                                before_images=context["before_images"],
-                                after_images=context["after_images"],
-                            )
-                        else:
-                            future = executor.submit(
-                                self.classify_page,
-                                page_id=page_id,
-                                text_uri=page.parsed_text_uri,
-                                image_uri=page.image_uri,
-                                raw_text_uri=page.raw_text_uri,
+                            logger.info(
+                                "Classifying pages in batches; contextPagesCount is "
+                                "not used since each batch holds neighbouring pages"
                             )
-                        futures[future] = page_id
+                        futures = self._submit_page_batches(
+                            executor, pages_to_classify, page_loader
+                        )
+                    else:
+                        # Start processing only uncached pages
+                        for page_id, page in pages_to_classify.items():
+                            if page_loader is not None:
+                                future = executor.submit(
+                                    self._classify_page_with_context,
+                                    page_id=page_id,
+                                    page=page,
+                                    page_loader=page_loader,
+                                    context_size=context_size,
+                                )
+                            else:
+                                future = executor.submit(
+                                    self.classify_page,
+                                    page_id=page_id,
+                                    text_uri=page.parsed_text_uri,
+                                    image_uri=page.image_uri,
+                                    raw_text_uri=page.raw_text_uri,
+                                )
+                            futures[future] = page_id
 
                     # Process results as they complete
                     for future in as_completed(futures):
-                        page_id = futures[future]
-                        try:
-                            page_result = future.result()
-                            all_page_results.append(page_result)
-
-                            # Check if there was an error in the classification
-                            if "error" in page_result.classification.metadata:
-                                with errors_lock:
-                                    error_msg = f"Error classifying page {page_id}: {page_result.classification.metadata['error']}"
-                                    document.errors.append(error_msg)
-
-                            # Update the page in the document
-                            document.pages[
-                                page_id
-                            ].classification = page_result.classification.doc_type
-                            document.pages[
-                                page_id
-                            ].confidence = page_result.classification.confidence
-
-                            # Copy metadata (including boundary information) to the page
-                            setattr(
-                                document.pages[page_id],
-                                "metadata",
-                                page_result.classification.metadata,
-                            )
+                        outcomes: List[Tuple[str, Any]]
+                        if futures[future] is None:
+                            outcomes = future.result()
+                        else:
+                            try:
+                                outcomes = [(futures[future], future.result())]
+                            except Exception as e:
+                                outcomes = [(futures[future], e)]
+
+                        for page_id, outcome in outcomes:
+                            if isinstance(outcome, PageClassification):
+                                page_result = outcome
+                                all_page_results.append(page_result)
+
+                                # Check if there was an error in the classification
+                                if "error" in page_result.classification.metadata:
+                                    with errors_lock:
+                                        error_msg = f"Error classifying page {page_id}: {page_result.classification.metadata['error']}"
+                                        document.errors.append(error_msg)
+
+                                # Update the page in the document and merge metering
+                                page_metering = self._apply_page_result(
+                                    document, page_result
+                                )
+                                combined_metering = utils.merge_metering_data(
+                                    combined_metering, page_metering
+                                )
+                                continue
 
-                            # Merge metering data
-                            page_metering = page_result.classification.metadata.get(
-                                "metering", {}
-                            )
-                            combined_metering = utils.merge_metering_data(
-                                combined_metering, page_metering
-                            )
-                        except Exception as e:
                             # Capture exception details in the document object instead of raising
+                            e = outcome
                             error_msg = f"Error classifying page {page_id}: {str(e)}"
                             logger.error(error_msg)
                             with errors_lock:
@@ -632,6 +1256,10 @@ class ClassificationService:
                                 ].classification = "error (backoff/retry)"
                                 document.pages[page_id].confidence = 0.0
 
+                if page_loader is not None:
+                    page_loader.close()
+                self._flush_page_fingerprints()
+
                 # Store failed page exceptions in document metadata for caller to access
                 if failed_page_exceptions:
                     logger.info(
@@ -1128,6 +1756,81 @@ class ClassificationService:
         Returns:
             PageClassification: Classification result for the page
         """
+        early_result, content, fingerprint = self._prepare_page_classification_content(
+            page_id=page_id,
+            text_uri=text_uri,
+            image_uri=image_uri,
+            raw_text_uri=raw_text_uri,
+            before_texts=before_texts,
+            after_texts=after_texts,
+            before_images=before_images,
+            after_images=after_images,
+        )
+        if early_result is not None:
+            return early_result
+
+        # Get classification configuration
+        config = self._get_classification_config()
+
+        logger.info(f"Classifying page {page_id} with Bedrock")
+
+        t0 = time.time()
+
+        # Invoke Bedrock model
+        try:
+            response_with_metering = self._invoke_bedrock_model(
+                content=content, config=config
+            )
+
+            t1 = time.time()
+            logger.info(
+                f"Time taken for classification of page {page_id}: {t1 - t0:.2f} seconds"
+            )
+
+            page_result = self._parse_page_classification_response(
+                page_id=page_id,
+                response_with_metering=response_with_metering,
+                image_uri=image_uri,
+                text_uri=text_uri,
+                raw_text_uri=raw_text_uri,
+            )
+        except Exception as e:
+            logger.error(f"Error classifying page {page_id}: {str(e)}")
+            raise
+        self._remember_page_fingerprint(fingerprint, page_result)
+        return page_result
+
+    def _prepare_page_classification_content(
+        self,
+        page_id: str,
+        text_uri: Optional[str] = None,
+        image_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+        before_texts: Optional[List[str]] = None,
+        after_texts: Optional[List[str]] = None,
+        before_images: Optional[List[bytes]] = None,
+        after_images: Optional[List[bytes]] = None,
+    ) -> Tuple[
+        Optional[PageClassification], List[Dict[str, Any]], Optional[PageFingerprint]
+    ]:
+        """
+        Load a page and build the content of its Bedrock classification request.
+
+        Args:
+            page_id: ID of the page
+            text_uri: URI of the text content
+            image_uri: URI of the image content
+            raw_text_uri: URI of the raw text content
+            before_texts: Optional list of text content from preceding pages (for context)
+            after_texts: Optional list of text content from following pages (for context)
+            before_images: Optional list of image content from preceding pages (for context)
+            after_images: Optional list of image content from following pages (for context)
+
+        Returns:
+            Tuple of (classification result if the page needs no model call, or None;
+            content for the model request; fingerprint of the page if the
+            fingerprint cache is enabled)
+        """
         # Initialize content variables
         text_content = None
         image_content = None
@@ -1144,12 +1847,18 @@ class ClassificationService:
         if image_uri:
             try:
                 # Type-safe access to image config
-                target_width = self.config.classification.image.target_width
-                target_height = self.config.classification.image.target_height
+                image_config = self.config.classification.image
+                target_width = image_config.target_width
+                target_height = image_config.target_height
 
                 # Just pass the values directly - prepare_image handles empty strings/None
                 image_content = image.prepare_image(
-                    image_uri, target_width, target_height
+                    image_uri,
+                    target_width,
+                    target_height,
+                    image_format=image_config.format,
+                    quality=image_config.quality,
+                    color_mode=image_config.color_mode,
                 )
             except Exception as e:
                 logger.warning(f"Failed to load image content from {image_uri}: {e}")
@@ -1164,7 +1873,7 @@ class ClassificationService:
                 )
 
                 # Create and return classification result with regex match
-                return PageClassification(
+                regex_result = PageClassification(
                     page_id=page_id,
                     classification=DocumentClassification(
                         doc_type=regex_matched_class,
@@ -1178,18 +1887,43 @@ class ClassificationService:
                     text_uri=text_uri,
                     raw_text_uri=raw_text_uri,
                 )
+                return regex_result, [], None
 
         # Verify we have at least some content to classify
         if not text_content and not image_content:
             logger.warning(f"No content available for page {page_id}")
             # Return unclassified result
-            return self._create_unclassified_result(
+            unclassified = self._create_unclassified_result(
                 page_id=page_id,
                 image_uri=image_uri,
                 text_uri=text_uri,
                 raw_text_uri=raw_text_uri,
                 error_message="No content available for classification",
             )
+            return unclassified, [], None
+
+        # Take the label of the local pre-classifier if it is confident
+        local_result = self._classify_page_locally(
+            page_id,
+            text_content,
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
+        if local_result is not None:
+            return local_result, [], None
+
+        # Reuse the classification of a near-duplicate page classified before
+        fingerprint_result, fingerprint = self._match_page_fingerprint(
+            page_id,
+            text_content,
+            image_content,
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
+        if fingerprint_result is not None:
+            return fingerprint_result, [], fingerprint
 
         # Get classification configuration
         config = self._get_classification_config()
@@ -1270,85 +2004,90 @@ class ClassificationService:
                 image_content,
             )
 
-        logger.info(f"Classifying page {page_id} with Bedrock")
+        return None, content, fingerprint
 
-        t0 = time.time()
+    def _parse_page_classification_response(
+        self,
+        page_id: str,
+        response_with_metering: Dict[str, Any],
+        image_uri: Optional[str] = None,
+        text_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> PageClassification:
+        """
+        Create the classification result of a page from a Bedrock response.
 
-        # Invoke Bedrock model
-        try:
-            response_with_metering = self._invoke_bedrock_model(
-                content=content, config=config
-            )
+        Args:
+            page_id: ID of the page
+            response_with_metering: Response and metering from invoke_model
+            image_uri: URI of the image content
+            text_uri: URI of the text content
+            raw_text_uri: URI of the raw text content
 
-            t1 = time.time()
-            logger.info(
-                f"Time taken for classification of page {page_id}: {t1 - t0:.2f} seconds"
-            )
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        response = response_with_metering["response"]
+        metering = response_with_metering["metering"]
 
-            response = response_with_metering["response"]
-            metering = response_with_metering["metering"]
+        # Extract classification result
+        classification_text = response["output"]["message"]["content"][0].get(
+            "text", ""
+        )
 
-            # Extract classification result
-            classification_text = response["output"]["message"]["content"][0].get(
-                "text", ""
+        # Try to extract structured data (JSON or YAML) from the response
+        try:
+            classification_data, detected_format = (
+                extract_structured_data_from_text(classification_text)
             )
-
-            # Try to extract structured data (JSON or YAML) from the response
-            try:
-                classification_data, detected_format = (
-                    extract_structured_data_from_text(classification_text)
+            if isinstance(classification_data, dict):
+                doc_type = classification_data.get("class", "")
+                document_boundary = classification_data.get(
+                    "document_boundary", "continue"
                 )
-                if isinstance(classification_data, dict):
-                    doc_type = classification_data.get("class", "")
-                    document_boundary = classification_data.get(
-                        "document_boundary", "continue"
-                    )
-                    logger.info(
-                        f"Parsed classification response as {detected_format}: {classification_data}"
-                    )
-                else:
-                    # If parsing failed, try to extract classification directly from text
-                    doc_type = self._extract_class_from_text(classification_text)
-                    document_boundary = "continue"
-            except Exception as e:
-                logger.warning(f"Failed to parse structured data from response: {e}")
-                # Try to extract classification directly from text
+                logger.info(
+                    f"Parsed classification response as {detected_format}: {classification_data}"
+                )
+            else:
+                # If parsing failed, try to extract classification directly from text
                 doc_type = self._extract_class_from_text(classification_text)
                 document_boundary = "continue"
+        except Exception as e:
+            logger.warning(f"Failed to parse structured data from response: {e}")
+            # Try to extract classification directly from text
+            doc_type = self._extract_class_from_text(classification_text)
+            document_boundary = "continue"
+
+        # Validate classification against known document types
+        if not doc_type:
+            doc_type = "unclassified"
+            logger.warning(
+                f"Empty classification for page {page_id}, using 'unclassified'"
+            )
+        elif doc_type not in self.valid_doc_types:
+            logger.warning(
+                f"Unknown document type '{doc_type}' for page {page_id}, "
+                f"valid types are: {', '.join(self.valid_doc_types)}"
+            )
+            # Still use the classification, it might be a new valid type
 
-            # Validate classification against known document types
-            if not doc_type:
-                doc_type = "unclassified"
-                logger.warning(
-                    f"Empty classification for page {page_id}, using 'unclassified'"
-                )
-            elif doc_type not in self.valid_doc_types:
-                logger.warning(
-                    f"Unknown document type '{doc_type}' for page {page_id}, "
-                    f"valid types are: {', '.join(self.valid_doc_types)}"
-                )
-                # Still use the classification, it might be a new valid type
-
-            logger.info(f"Page {page_id} classified as {doc_type}")
+        logger.info(f"Page {page_id} classified as {doc_type}")
 
-            # Create and return classification result
-            return PageClassification(
-                page_id=page_id,
-                classification=DocumentClassification(
-                    doc_type=doc_type,
-                    confidence=1.0,  # Default confidence
-                    metadata={
-                        "metering": metering,
-                        "document_boundary": str(document_boundary).lower(),
-                    },
-                ),
-                image_uri=image_uri,
-                text_uri=text_uri,
-                raw_text_uri=raw_text_uri,
-            )
-        except Exception as e:
-            logger.error(f"Error classifying page {page_id}: {str(e)}")
-            raise
+        # Create and return classification result
+        return PageClassification(
+            page_id=page_id,
+            classification=DocumentClassification(
+                doc_type=doc_type,
+                confidence=1.0,  # Default confidence
+                metadata={
+                    "metering": metering,
+                    "document_boundary": str(document_boundary).lower(),
+                },
+            ),
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
 
     def classify_page_sagemaker(
         self,
@@ -1932,6 +2671,181 @@ class ClassificationService:
 
         return self._classify_pages_multimodal(document)
 
+    def _apply_page_result(
+        self, document: Document, page_result: PageClassification
+    ) -> Dict[str, Any]:
+        """
+        Copy a page classification result to the document's page.
+
+        Args:
+            document: Document containing the page
+            page_result: Classification result of the page
+
+        Returns:
+            Metering data of the page classification
+        """
+        page = document.pages[page_result.page_id]
+        page.classification = page_result.classification.doc_type
+        page.confidence = page_result.classification.confidence
+
+        # Copy metadata (including boundary information) to the page
+        setattr(page, "metadata", page_result.classification.metadata)
+
+        return page_result.classification.metadata.get("metering", {})
+
+    def _supports_batch_classification(self, document: Document) -> bool:
+        """
+        Check if a document is classified page by page with Bedrock.
+
+        Documents matched by name regex, single-class configurations, holistic
+        classification, the SageMaker backend and limited page classification
+        use classify_document instead.
+        """
+        if self.backend != "bedrock" or self.has_single_class:
+            return False
+        if self.classification_method != self.MULTIMODAL_PAGE_LEVEL:
+            return False
+        try:
+            if int(self.max_pages_for_classification) > 0:
+                return False
+        except (ValueError, TypeError):
+            pass  # "ALL" or invalid values classify every page
+        return not self._check_document_name_regex(document)
+
+    def classify_documents_batch(
+        self, documents: List[Document], batch_runner: BedrockBatchRunner
+    ) -> List[Document]:
+        """
+        Classify many documents with Bedrock batch inference.
+
+        The page classification requests of every document are submitted as
+        model invocation jobs through ``batch_runner`` and the results are
+        mapped back to the pages as in classify_document, including section
+        splitting, status and metering. Documents that are not classified page
+        by page with Bedrock are classified with classify_document.
+
+        Page content (including images) is held in memory until the jobs are
+        submitted, so very large backlogs should be passed in chunks.
+
+        Args:
+            documents: Documents to classify
+            batch_runner: Runner that submits the jobs and waits for them
+
+        Returns:
+            List[Document]: The updated documents, in the same order
+        """
+        config = self._get_classification_config()
+        context_size = self.config.classification.contextPagesCount
+        page_results: Dict[int, List[PageClassification]] = {}
+        pending: Dict[str, Tuple[int, Page]] = {}
+        fingerprints: Dict[str, Optional[PageFingerprint]] = {}
+
+        for doc_index, document in enumerate(documents):
+            if not document.pages or not self._supports_batch_classification(
+                document
+            ):
+                continue
+            page_results[doc_index] = []
+
+            page_loader: Optional[PageContentLoader] = None
+            if context_size > 0:
+                page_loader = self._start_page_content_loader(document)
+
+            for page_id, page in document.pages.items():
+                context = {}
+                if page_loader is not None:
+                    context = self._get_context_for_page(
+                        page_id, page_loader.page_ids, page_loader, context_size
+                    )
+                (
+                    early_result,
+                    content,
+                    fingerprint,
+                ) = self._prepare_page_classification_content(
+                    page_id=page_id,
+                    text_uri=page.parsed_text_uri,
+                    image_uri=page.image_uri,
+                    raw_text_uri=page.raw_text_uri,
+                    **context,
+                )
+                if early_result is not None:
+                    page_results[doc_index].append(early_result)
+                    continue
+
+                record_id = f"{doc_index:06d}-{page_id}"
+                pending[record_id] = (doc_index, page)
+                fingerprints[record_id] = fingerprint
+                batch_runner.add(
+                    record_id=record_id,
+                    model_id=config["model_id"],
+                    system_prompt=config["system_prompt"],
+                    content=content,
+                    temperature=config["temperature"],
+                    top_k=config["top_k"],
+                    top_p=config["top_p"],
+                    max_tokens=config["max_tokens"],
+                    context="Classification",
+                )
+            if page_loader is not None:
+                page_loader.close()
+
+        logger.info(
+            f"Classifying {len(pending)} pages of {len(page_results)} documents "
+            "with Bedrock batch inference"
+        )
+        results = batch_runner.run() if pending else {}
+
+        for record_id, (doc_index, page) in pending.items():
+            result = results.get(record_id, {"error": "No batch result for page"})
+            if "error" in result:
+                page_result = self._create_unclassified_result(
+                    page_id=page.page_id,
+                    image_uri=page.image_uri,
+                    text_uri=page.parsed_text_uri,
+                    raw_text_uri=page.raw_text_uri,
+                    error_message=result["error"],
+                )
+            else:
+                page_result = self._parse_page_classification_response(
+                    page_id=page.page_id,
+                    response_with_metering=result,
+                    image_uri=page.image_uri,
+                    text_uri=page.parsed_text_uri,
+                    raw_text_uri=page.raw_text_uri,
+                )
+                self._remember_page_fingerprint(fingerprints[record_id], page_result)
+            page_results[doc_index].append(page_result)
+        self._flush_page_fingerprints()
+
+        classified = []
+        for doc_index, document in enumerate(documents):
+            if doc_index not in page_results:
+                classified.append(self.classify_document(document))
+                continue
+
+            combined_metering = {}
+            for page_result in page_results[doc_index]:
+                if "error" in page_result.classification.metadata:
+                    document.errors.append(
+                        f"Error classifying page {page_result.page_id}: "
+                        f"{page_result.classification.metadata['error']}"
+                    )
+                page_metering = self._apply_page_result(document, page_result)
+                combined_metering = utils.merge_metering_data(
+                    combined_metering, page_metering
+                )
+
+            document = self._apply_section_splitting_strategy(
+                document, page_results[doc_index]
+            )
+            document = self._update_document_status(document)
+            document.metering = utils.merge_metering_data(
+                document.metering, combined_metering
+            )
+            classified.append(document)
+
+        return classified
+
     def classify_pages(self, pages: Dict[str, Dict[str, Any]]) -> ClassificationResult:
         """
         Classify multiple pages concurrently.
@@ -2440,24 +3354,36 @@ class ClassificationService:
         Returns:
             Dictionary mapping page_id to text content
         """
-        pages_content = {}
+        with PageContentLoader(
+            document.pages,
+            self._load_page_text,
+            max_workers=min(self.max_workers, DEFAULT_PAGE_LOADER_WORKERS),
+        ) as loader:
+            return loader.to_dict()
 
-        for page_id, page in document.pages.items():
-            # Fetch page text content from S3 if available
-            if page.parsed_text_uri:
-                try:
-                    pages_content[page_id] = s3.get_text_content(page.parsed_text_uri)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to load text content from {page.parsed_text_uri}: {e}"
-                    )
-                    # Continue with empty content
-                    pages_content[page_id] = f"[Error loading page {page_id} content]"
-            else:
-                # Page has no text content
-                pages_content[page_id] = f"[No text content for page {page_id}]"
+    def _load_page_text(self, page_id: str, page: Page) -> str:
+        """
+        Load the text of a page for holistic classification.
 
-        return pages_content
+        Args:
+            page_id: ID of the page
+            page: Page to load
+
+        Returns:
+            Page text, or a placeholder if it has none or cannot be loaded
+        """
+        # Fetch page text content from S3 if available
+        if not page.parsed_text_uri:
+            # Page has no text content
+            return f"[No text content for page {page_id}]"
+        try:
+            return s3.get_text_content(page.parsed_text_uri)
+        except Exception as e:
+            logger.warning(
+                f"Failed to load text content from {page.parsed_text_uri}: {e}"
+            )
+            # Continue with empty content
+            return f"[Error loading page {page_id} content]"
 
     def holistic_classify_document(self, document: Document) -> Document:
         """
@@ -44,6 +44,18 @@ class ImageConfig(BaseModel):
     preprocessing: Optional[bool] = Field(
         default=None, description="Enable image preprocessing"
     )
+    format: Optional[str] = Field(
+        default=None,
+        description="Encoding format for images sent to the model: 'jpeg', 'png' or 'webp' (empty keeps the original format; OCR page images are always JPEG)",
+    )
+    quality: Optional[int] = Field(
+        default=None,
+        description="JPEG/WebP encoding quality 1-100 (empty uses the default: 95 for JPEG, 80 for WebP)",
+    )
+    color_mode: Optional[str] = Field(
+        default=None,
+        description="'color', 'grayscale', or 'auto' (grayscale for pages without color); empty keeps the image colors",
+    )
 
     @field_validator("target_width", "target_height", mode="before")
     @classmethod
@@ -81,6 +93,58 @@ class ImageConfig(BaseModel):
             return v.lower() in ("true", "1", "yes")
         return bool(v)
 
+    @field_validator("format", mode="before")
+    @classmethod
+    def validate_format(cls, v: Any) -> Optional[str]:
+        """Validate and normalize image format, treating empty strings as None"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        v = str(v).lower().strip()
+        if v == "jpg":
+            v = "jpeg"
+
+        valid_values = ["jpeg", "png", "webp"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid image format '{v}', keeping the original format. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return None
+        return v
+
+    @field_validator("color_mode", mode="before")
+    @classmethod
+    def validate_color_mode(cls, v: Any) -> Optional[str]:
+        """Validate and normalize image color mode, treating empty strings as None"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        v = str(v).lower().strip()
+
+        valid_values = ["color", "grayscale", "auto"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid image color_mode '{v}', keeping the image colors. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return None
+        return v
+
+    @field_validator("quality", mode="before")
+    @classmethod
+    def parse_quality(cls, v: Any) -> Optional[int]:
+        """Parse quality from string or number, clamped to 1-100"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        return min(100, max(1, int(v)))
+
 
 class AgenticConfig(BaseModel):
     """Agentic extraction configuration"""
@@ -117,6 +181,10 @@ class ExtractionConfig(BaseModel):
     custom_prompt_lambda_arn: Optional[str] = Field(
         default=None, description="ARN of custom prompt Lambda"
     )
+    streaming: bool = Field(
+        default=False,
+        description="Stream the response and stop once the JSON object is complete",
+    )
 
     @field_validator("temperature", "top_p", "top_k", mode="before")
     @classmethod
@@ -143,6 +211,102 @@ class ExtractionConfig(BaseModel):
         return self
 
 
+class ClassificationFingerprintCacheConfig(BaseModel):
+    """Cross-document page fingerprint cache configuration"""
+
+    enabled: bool = Field(
+        default=False,
+        description="Reuse the classification of near-duplicate pages (e.g. the same form filled in differently) classified before",
+    )
+    max_image_distance: int = Field(
+        default=4,
+        ge=0,
+        le=7,
+        description="Maximum Hamming distance between the 64-bit perceptual image hashes of matching pages (at most 7)",
+    )
+    max_text_distance: int = Field(
+        default=8,
+        ge=0,
+        le=64,
+        description="Maximum Hamming distance between the 64-bit text layout signatures of matching pages",
+    )
+    table: Optional[str] = Field(
+        default=None,
+        description="DynamoDB table for the index (defaults to the classification cache table)",
+    )
+    bucket: Optional[str] = Field(
+        default=None,
+        description="S3 bucket for the index, used instead of DynamoDB when set",
+    )
+    prefix: str = Field(
+        default="classification-fingerprints",
+        description="S3 key prefix for index objects",
+    )
+    ttl_days: int = Field(
+        default=30, gt=0, description="Lifetime of stored DynamoDB entries"
+    )
+    max_entries: int = Field(
+        default=100000, gt=0, description="Maximum page fingerprints held in memory"
+    )
+
+    @field_validator(
+        "max_image_distance",
+        "max_text_distance",
+        "ttl_days",
+        "max_entries",
+        mode="before",
+    )
+    @classmethod
+    def parse_int(cls, v: Any) -> int:
+        """Parse int from string or number"""
+        if isinstance(v, str):
+            return int(v) if v else 0
+        return int(v)
+
+    @field_validator("table", "bucket", mode="before")
+    @classmethod
+    def parse_location(cls, v: Any) -> Optional[str]:
+        """Treat empty strings as unset"""
+        if isinstance(v, str) and not v.strip():
+            return None
+        return v
+
+
+class LocalClassifierConfig(BaseModel):
+    """Local page pre-classifier configuration"""
+
+    enabled: bool = Field(
+        default=False,
+        description="Classify pages with a local hashed n-gram model before calling Bedrock",
+    )
+    model_uri: Optional[str] = Field(
+        default=None,
+        description="S3 URI or path of the model fit with idp_common.classification.local_classifier",
+    )
+    min_confidence: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Minimum probability for using the local label (defaults to the model's calibrated threshold)",
+    )
+
+    @field_validator("model_uri", mode="before")
+    @classmethod
+    def parse_model_uri(cls, v: Any) -> Optional[str]:
+        """Treat empty strings as unset"""
+        if isinstance(v, str) and not v.strip():
+            return None
+        return v
+
+    @field_validator("min_confidence", mode="before")
+    @classmethod
+    def parse_min_confidence(cls, v: Any) -> Optional[float]:
+        """Parse float from string or number, treating empty strings as unset"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        return float(v)
+
+
 class ClassificationConfig(BaseModel):
     """Document classification configuration"""
 
@@ -174,6 +338,27 @@ class ClassificationConfig(BaseModel):
         description="Number of pages before/after target page to include as context for multimodalPageLevelClassification. "
         "0=no context (default), 1=include 1 page on each side, 2=include 2 pages on each side.",
     )
+    pagesPerRequest: int = Field(
+        default=1,
+        description="Maximum number of pages classified per Bedrock request for multimodalPageLevelClassification. "
+        "1=one request per page (default). Higher values pack consecutive pages into one request.",
+    )
+    pageBatchMaxTokens: int = Field(
+        default=50000,
+        gt=0,
+        description="Estimated input token budget for the pages of one batched classification request",
+    )
+    pageBatchMaxImages: int = Field(
+        default=20,
+        gt=0,
+        description="Maximum page images in one batched classification request",
+    )
+    fingerprintCache: ClassificationFingerprintCacheConfig = Field(
+        default_factory=ClassificationFingerprintCacheConfig
+    )
+    localClassifier: LocalClassifierConfig = Field(
+        default_factory=LocalClassifierConfig
+    )
     image: ImageConfig = Field(default_factory=ImageConfig)
 
     @field_validator("temperature", "top_p", "top_k", mode="before")
@@ -235,6 +420,22 @@ class ClassificationConfig(BaseModel):
             return "llm_determined"
         return v
 
+    @field_validator("pageBatchMaxTokens", "pageBatchMaxImages", mode="before")
+    @classmethod
+    def parse_page_batch_budget(cls, v: Any) -> int:
+        """Parse page batch budgets from string or number"""
+        if isinstance(v, str):
+            return int(v) if v else 0
+        return int(v)
+
+    @field_validator("pagesPerRequest", mode="before")
+    @classmethod
+    def parse_pages_per_request(cls, v: Any) -> int:
+        """Parse pagesPerRequest from string or number, ensuring at least 1"""
+        if isinstance(v, str):
+            v = int(v) if v else 1
+        return max(1, int(v))
+
     @field_validator("contextPagesCount", mode="before")
     @classmethod
     def parse_context_pages_count(cls, v: Any) -> int:
@@ -298,6 +499,10 @@ class AssessmentConfig(BaseModel):
     validation_enabled: bool = Field(default=False, description="Enable validation")
     image: ImageConfig = Field(default_factory=ImageConfig)
     granular: GranularAssessmentConfig = Field(default_factory=GranularAssessmentConfig)
+    streaming: bool = Field(
+        default=False,
+        description="Stream the response and stop once the JSON object is complete",
+    )
 
     @field_validator(
         "temperature",
@@ -364,6 +569,393 @@ class OCRFeature(BaseModel):
     name: str = Field(description="Feature name (e.g., LAYOUT, TABLES, FORMS)")
 
 
+class OCRRasterizationConfig(BaseModel):
+    """OCR page rasterization configuration"""
+
+    engine: str = Field(
+        default="thread",
+        description="Where PDF pages are rendered: 'thread' (inside OCR page workers) or 'process' (separate process pool)",
+    )
+    max_workers: Optional[int] = Field(
+        default=None,
+        description="Number of rasterization processes (defaults to CPU count)",
+    )
+
+    @field_validator("engine", mode="before")
+    @classmethod
+    def validate_engine(cls, v: Any) -> str:
+        """Validate and normalize rasterization engine value"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return "thread"
+        if isinstance(v, str):
+            v = v.lower().strip()
+
+        valid_values = ["thread", "process"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid rasterization engine '{v}', using default 'thread'. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return "thread"
+        return v
+
+    @field_validator("max_workers", mode="before")
+    @classmethod
+    def parse_max_workers(cls, v: Any) -> Optional[int]:
+        """Parse max_workers from string or number, treating empty/non-positive as None"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        result = int(v)
+        return result if result > 0 else None
+
+
+class OCRIngestionConfig(BaseModel):
+    """OCR document ingestion configuration"""
+
+    mode: str = Field(
+        default="memory",
+        description="How the source document is loaded: 'memory' (read whole object) or 'spool' (stream to a temp file and open lazily)",
+    )
+    chunk_size_mb: int = Field(
+        default=8, gt=0, description="Chunk size in MB when streaming to disk"
+    )
+    spool_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for spooled documents (defaults to the system temp dir)",
+    )
+
+    @field_validator("mode", mode="before")
+    @classmethod
+    def validate_mode(cls, v: Any) -> str:
+        """Validate and normalize ingestion mode value"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return "memory"
+        if isinstance(v, str):
+            v = v.lower().strip()
+
+        valid_values = ["memory", "spool"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid ingestion mode '{v}', using default 'memory'. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return "memory"
+        return v
+
+    @field_validator("chunk_size_mb", mode="before")
+    @classmethod
+    def parse_chunk_size_mb(cls, v: Any) -> int:
+        """Parse chunk_size_mb from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 8
+        return int(v)
+
+    @field_validator("spool_dir", mode="before")
+    @classmethod
+    def parse_spool_dir(cls, v: Any) -> Optional[str]:
+        """Treat empty strings as unset"""
+        if isinstance(v, str) and not v.strip():
+            return None
+        return v
+
+
+class OCRCacheConfig(BaseModel):
+    """OCR page result cache configuration"""
+
+    enabled: bool = Field(
+        default=False,
+        description="Reuse OCR results for pages whose rendered image and OCR settings match a previous run",
+    )
+    bucket: Optional[str] = Field(
+        default=None,
+        description="S3 bucket for cache entries (defaults to the document output bucket)",
+    )
+    prefix: str = Field(default="ocr-cache", description="S3 key prefix for cache entries")
+
+    @field_validator("bucket", mode="before")
+    @classmethod
+    def parse_bucket(cls, v: Any) -> Optional[str]:
+        """Treat empty strings as unset"""
+        if isinstance(v, str) and not v.strip():
+            return None
+        return v
+
+
+class OCRTextLayerConfig(BaseModel):
+    """Born-digital PDF text layer configuration"""
+
+    enabled: bool = Field(
+        default=False,
+        description="Use the embedded PDF text layer instead of OCR for pages that pass the quality checks",
+    )
+    min_chars: int = Field(
+        default=50, ge=0, description="Minimum non-whitespace characters on the page"
+    )
+    max_garbage_ratio: float = Field(
+        default=0.05,
+        ge=0.0,
+        le=1.0,
+        description="Maximum share of unmappable characters (replacement, private-use, control)",
+    )
+    min_coverage: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="Minimum share of the page content area (text plus images) covered by text",
+    )
+
+    @field_validator("min_chars", mode="before")
+    @classmethod
+    def parse_min_chars(cls, v: Any) -> int:
+        """Parse min_chars from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 50
+        return int(v)
+
+    @field_validator("max_garbage_ratio", mode="before")
+    @classmethod
+    def parse_max_garbage_ratio(cls, v: Any) -> float:
+        """Parse max_garbage_ratio from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 0.05
+        return float(v)
+
+    @field_validator("min_coverage", mode="before")
+    @classmethod
+    def parse_min_coverage(cls, v: Any) -> float:
+        """Parse min_coverage from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 0.5
+        return float(v)
+
+
+class OCRUploadConfig(BaseModel):
+    """OCR page artifact upload configuration"""
+
+    mode: str = Field(
+        default="sync",
+        description="How page artifacts are written to S3: 'sync' (by the page worker) or 'async' (bounded upload queue overlapping with OCR)",
+    )
+    max_pending: int = Field(
+        default=64,
+        gt=0,
+        description="Maximum queued or in-flight uploads before page workers block",
+    )
+    max_workers: Optional[int] = Field(
+        default=None,
+        description="Number of upload threads (defaults to max(ocr.max_workers, 10))",
+    )
+
+    @field_validator("mode", mode="before")
+    @classmethod
+    def validate_mode(cls, v: Any) -> str:
+        """Validate and normalize upload mode value"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return "sync"
+        if isinstance(v, str):
+            v = v.lower().strip()
+
+        valid_values = ["sync", "async"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid upload mode '{v}', using default 'sync'. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return "sync"
+        return v
+
+    @field_validator("max_pending", mode="before")
+    @classmethod
+    def parse_max_pending(cls, v: Any) -> int:
+        """Parse max_pending from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 64
+        return int(v)
+
+    @field_validator("max_workers", mode="before")
+    @classmethod
+    def parse_max_workers(cls, v: Any) -> Optional[int]:
+        """Parse max_workers from string or number, treating empty/non-positive as None"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        result = int(v)
+        return result if result > 0 else None
+
+
+class OCRConcurrencyConfig(BaseModel):
+    """OCR page request concurrency configuration"""
+
+    mode: str = Field(
+        default="fixed",
+        description="How many Textract page requests run concurrently: 'fixed' (ocr.max_workers) or 'adaptive' (AIMD limit reduced on throttling)",
+    )
+    initial_limit: Optional[int] = Field(
+        default=None,
+        description="Concurrent requests allowed at the start of a document (defaults to half of max_limit)",
+    )
+    min_limit: int = Field(
+        default=1, gt=0, description="Lower bound for the adaptive limit"
+    )
+    max_limit: Optional[int] = Field(
+        default=None,
+        description="Upper bound for the adaptive limit and number of page workers (defaults to ocr.max_workers)",
+    )
+    decrease_factor: float = Field(
+        default=0.5,
+        gt=0,
+        lt=1,
+        description="Factor the limit is multiplied by when a request is throttled",
+    )
+
+    @field_validator("mode", mode="before")
+    @classmethod
+    def validate_mode(cls, v: Any) -> str:
+        """Validate and normalize concurrency mode value"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return "fixed"
+        if isinstance(v, str):
+            v = v.lower().strip()
+
+        valid_values = ["fixed", "adaptive"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid concurrency mode '{v}', using default 'fixed'. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return "fixed"
+        return v
+
+    @field_validator("initial_limit", "max_limit", mode="before")
+    @classmethod
+    def parse_optional_limit(cls, v: Any) -> Optional[int]:
+        """Parse limits from string or number, treating empty/non-positive as None"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        result = int(v)
+        return result if result > 0 else None
+
+    @field_validator("min_limit", mode="before")
+    @classmethod
+    def parse_min_limit(cls, v: Any) -> int:
+        """Parse min_limit from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 1
+        return int(v)
+
+    @field_validator("decrease_factor", mode="before")
+    @classmethod
+    def parse_decrease_factor(cls, v: Any) -> float:
+        """Parse decrease_factor from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 0.5
+        return float(v)
+
+
+class OCRConversionConfig(BaseModel):
+    """Office/text document (txt, csv, xlsx, docx) conversion configuration"""
+
+    mode: str = Field(
+        default="eager",
+        description="When page images of converted documents are rendered: 'eager' (always) or 'lazy' (only if a downstream stage uses page images)",
+    )
+
+    @field_validator("mode", mode="before")
+    @classmethod
+    def validate_mode(cls, v: Any) -> str:
+        """Validate and normalize conversion mode value"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return "eager"
+        if isinstance(v, str):
+            v = v.lower().strip()
+
+        valid_values = ["eager", "lazy"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid conversion mode '{v}', using default 'eager'. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return "eager"
+        return v
+
+
+class OCRMemoryConfig(BaseModel):
+    """OCR page memory admission configuration"""
+
+    mode: str = Field(
+        default="budget",
+        description="How pages are admitted to the page workers: 'budget' (estimated page memory must fit the memory budget) or 'off' (ocr.max_workers only)",
+    )
+    budget_mb: Optional[int] = Field(
+        default=None,
+        description="Memory in MB that pages in flight may use together (defaults to memory_fraction of the Lambda memory size, less memory already in use)",
+    )
+    memory_fraction: float = Field(
+        default=0.7,
+        gt=0,
+        le=1,
+        description="Share of the Lambda memory size available to pages in flight when budget_mb is not set",
+    )
+
+    @field_validator("mode", mode="before")
+    @classmethod
+    def validate_mode(cls, v: Any) -> str:
+        """Validate and normalize memory admission mode value"""
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return "budget"
+        if isinstance(v, str):
+            v = v.lower().strip()
+
+        valid_values = ["budget", "off"]
+        if v not in valid_values:
+            logger.warning(
+                f"Invalid memory admission mode '{v}', using default 'budget'. "
+                f"Valid values: {', '.join(valid_values)}"
+            )
+            return "budget"
+        return v
+
+    @field_validator("budget_mb", mode="before")
+    @classmethod
+    def parse_budget_mb(cls, v: Any) -> Optional[int]:
+        """Parse budget_mb from string or number, treating empty/non-positive as None"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        result = int(v)
+        return result if result > 0 else None
+
+    @field_validator("memory_fraction", mode="before")
+    @classmethod
+    def parse_memory_fraction(cls, v: Any) -> float:
+        """Parse memory_fraction from string or number"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return 0.7
+        return float(v)
+
+
 class OCRConfig(BaseModel):
     """OCR configuration"""
 
@@ -384,6 +976,16 @@ class OCRConfig(BaseModel):
     )
     max_workers: int = Field(default=20, gt=0, description="Max concurrent workers")
     image: ImageConfig = Field(default_factory=ImageConfig)
+    rasterization: OCRRasterizationConfig = Field(
+        default_factory=OCRRasterizationConfig
+    )
+    ingestion: OCRIngestionConfig = Field(default_factory=OCRIngestionConfig)
+    cache: OCRCacheConfig = Field(default_factory=OCRCacheConfig)
+    text_layer: OCRTextLayerConfig = Field(default_factory=OCRTextLayerConfig)
+    upload: OCRUploadConfig = Field(default_factory=OCRUploadConfig)
+    concurrency: OCRConcurrencyConfig = Field(default_factory=OCRConcurrencyConfig)
+    conversion: OCRConversionConfig = Field(default_factory=OCRConversionConfig)
+    memory: OCRMemoryConfig = Field(default_factory=OCRMemoryConfig)
 
     @field_validator("max_workers", mode="before")
     @classmethod
@@ -811,7 +1413,9 @@ class RuleValidationConfig(BaseModel):
     max_chunk_size: int = Field(
         default=8000, gt=0, description="Maximum tokens per chunk"
     )
-    token_size: int = Field(default=4, gt=0, description="Average characters per token")
+    token_size: int = Field(
+        default=4, gt=0, description="Average characters per token of Latin words"
+    )
     overlap_percentage: int = Field(
         default=10, ge=0, le=100, description="Chunk overlap percentage"
     )
@@ -24,7 +24,6 @@ This module provides methods to compare expected and actual values using various
 import ast
 import json
 import logging
-import math
 import re
 from abc import ABC, abstractmethod
 from typing import Any, List, Optional, Tuple
@@ -54,6 +53,21 @@ class Comparator(ABC):
         """
         pass
 
+    def compare_matrix(
+        self, values1: List[Any], values2: List[Any]
+    ) -> List[List[float]]:
+        """
+        Compare every value of one list with every value of another.
+
+        Args:
+            values1: First list of values
+            values2: Second list of values
+
+        Returns:
+            Matrix of similarity scores, one row per value of values1
+        """
+        return [[self.compare(v1, v2) for v2 in values2] for v1 in values1]
+
 
 class ExactComparator(Comparator):
     """Exact string match comparator."""
@@ -97,6 +111,45 @@ class FuzzyComparator(Comparator):
         return score
 
 
+class SemanticComparator(Comparator):
+    """Embedding similarity comparator."""
+
+    def __init__(
+        self, threshold: float = 0.8, model_id: str = "amazon.titan-embed-text-v1"
+    ):
+        """
+        Initialize the semantic comparator.
+
+        Args:
+            threshold: Minimum similarity score to consider a match (0.0 to 1.0)
+            model_id: The embedding model to use
+        """
+        self.threshold = threshold
+        self.model_id = model_id
+
+    def compare(self, value1: Any, value2: Any) -> float:
+        """Compare values using embedding similarity."""
+        return self.compare_matrix([value1], [value2])[0][0]
+
+    def compare_matrix(
+        self, values1: List[Any], values2: List[Any]
+    ) -> List[List[float]]:
+        """Embed both lists in one batch and compare them as a matrix."""
+        texts1 = [str(value) for value in values1]
+        texts2 = [str(value) for value in values2]
+        try:
+            embeddings = bedrock.generate_embeddings(texts1 + texts2, self.model_id)
+            similarities = bedrock.cosine_similarity_matrix(
+                embeddings[: len(texts1)], embeddings[len(texts1) :]
+            )
+        except Exception as e:
+            logger.warning(
+                f"Error in semantic comparison, falling back to fuzzy matching: {e}"
+            )
+            return FuzzyComparator(self.threshold).compare_matrix(values1, values2)
+        return similarities.clip(0.0, 1.0).tolist()
+
+
 def strip_punctuation_space(text: str) -> str:
     """
     Strip punctuation and standardize whitespace in text.
@@ -276,15 +329,8 @@ def compare_hungarian(
     if not actual_list:
         return 0, 0, 0.0
 
-    # Create similarity matrix for Hungarian algorithm
-    matrix: List[List[float]] = [
-        [0.0 for _ in range(len(actual_list))] for _ in range(len(expected_list))
-    ]
-
-    # Fill matrix with comparison scores from the provided comparator
-    for i, exp_val in enumerate(expected_list):
-        for j, act_val in enumerate(actual_list):
-            matrix[i][j] = comparator.compare(exp_val, act_val)
+    # Create similarity matrix for Hungarian algorithm from the provided comparator
+    matrix = comparator.compare_matrix(expected_list, actual_list)
 
     # Convert to cost matrix (Hungarian algorithm minimizes cost)
     cost_matrix = make_cost_matrix(matrix, lambda x: 1 - x)  # type: ignore[arg-type]
@@ -399,24 +445,7 @@ def cosine_similarity(v1: List[float], v2: List[float]) -> float:
     if not v1 or not v2:
         return 0.0
 
-    # Ensure vectors are the same length
-    if len(v1) != len(v2):
-        logger.warning(f"Vector lengths don't match: {len(v1)} vs {len(v2)}")
-        min_len = min(len(v1), len(v2))
-        v1 = v1[:min_len]
-        v2 = v2[:min_len]
-
-    # Calculate dot product and magnitudes
-    dot_product = sum(a * b for a, b in zip(v1, v2))
-    magnitude1 = math.sqrt(sum(a * a for a in v1))
-    magnitude2 = math.sqrt(sum(b * b for b in v2))
-
-    # Avoid division by zero
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0.0
-
-    # Calculate cosine similarity
-    return dot_product / (magnitude1 * magnitude2)
+    return float(bedrock.cosine_similarity_matrix([v1], [v2])[0, 0])
 
 
 def compare_semantic(
@@ -468,9 +497,10 @@ def compare_semantic(
             f"Actual text: {actual_str[:100]}{'...' if len(actual_str) > 100 else ''}"
         )
 
-        # Generate embeddings
-        expected_embedding = bedrock.generate_embedding(expected_str, model_id)
-        actual_embedding = bedrock.generate_embedding(actual_str, model_id)
+        # Generate both embeddings in one batch (repeated values come from cache)
+        expected_embedding, actual_embedding = bedrock.generate_embeddings(
+            [expected_str, actual_str], model_id
+        )
 
         # If either embedding is empty, fall back to fuzzy matching
         if not expected_embedding or not actual_embedding:
@@ -555,6 +585,8 @@ def compare_values(
             comparator = FuzzyComparator(threshold)
         elif comparator_type == "NUMERIC":
             comparator = NumericComparator()
+        elif comparator_type == "SEMANTIC":
+            comparator = SemanticComparator(threshold)
         else:
             # Default to exact comparator
             comparator = ExactComparator()
@@ -18,6 +18,7 @@ from typing import Any
 
 from idp_common import bedrock, image, metrics, s3, utils
 from idp_common.bedrock import format_prompt
+from idp_common.bedrock.streaming import StreamingJsonHandler
 from idp_common.config.models import IDPConfig
 from idp_common.config.schema_constants import (
     ID_FIELD,
@@ -396,7 +397,9 @@ class ExtractionService:
             return content
 
         # Get examples from the JSON Schema for this specific class
-        content = build_few_shot_extraction_examples_content(self._class_schema)
+        content = build_few_shot_extraction_examples_content(
+            self._class_schema, self.config.extraction.image
+        )
 
         return content
 
@@ -669,8 +672,9 @@ class ExtractionService:
             List of prepared images
         """
         t0 = time.time()
-        target_width = self.config.extraction.image.target_width
-        target_height = self.config.extraction.image.target_height
+        image_config = self.config.extraction.image
+        target_width = image_config.target_width
+        target_height = image_config.target_height
 
         page_images = []
         for page_id in sorted_page_ids:
@@ -679,7 +683,17 @@ class ExtractionService:
 
             page = document.pages[page_id]
             image_uri = page.image_uri
-            image_content = image.prepare_image(image_uri, target_width, target_height)
+            # Lazily converted pages have no image unless a stage needed one
+            if not image_uri:
+                continue
+            image_content = image.prepare_image(
+                image_uri,
+                target_width,
+                target_height,
+                image_format=image_config.format,
+                quality=image_config.quality,
+                color_mode=image_config.color_mode,
+            )
             page_images.append(image_content)
 
         t1 = time.time()
@@ -962,7 +976,11 @@ class ExtractionService:
             metering = response_with_metering["metering"]
             parsing_succeeded = True
         else:
-            # Standard Bedrock invocation
+            # Standard Bedrock invocation, optionally streamed so fields are
+            # checked as they arrive and generation stops once the JSON closes
+            stream_handler = None
+            if self.config.extraction.streaming:
+                stream_handler = StreamingJsonHandler(schema=self._class_schema)
             response_with_metering = bedrock.invoke_model(
                 model_id=model_id,
                 system_prompt=system_prompt,
@@ -972,7 +990,14 @@ class ExtractionService:
                 top_p=top_p,
                 max_tokens=max_tokens,
                 context="Extraction",
+                stream_handler=stream_handler,
             )
+            if stream_handler is not None and stream_handler.field_errors:
+                logger.warning(
+                    f"Streamed extraction for {section_info.class_label} has "
+                    "fields that do not match the class schema: "
+                    f"{stream_handler.field_errors}"
+                )
 
             extracted_text = bedrock.extract_text_from_response(
                 dict(response_with_metering)
@@ -10,27 +10,159 @@ from ..utils import parse_s3_uri
 
 logger = logging.getLogger(__name__)
 
+# Encoding profile formats (all accepted by Bedrock; Textract accepts JPEG and PNG)
+IMAGE_FORMATS = {"jpeg": "JPEG", "png": "PNG", "webp": "WEBP"}
+
+# Formats kept as-is when an encoding profile does not set a format
+_KEEP_FORMATS = ["JPEG", "PNG", "GIF", "WEBP"]
+
+# Default quality per format when an encoding profile does not set one
+_DEFAULT_QUALITY = {"JPEG": 95, "WEBP": 80}
+
+
+def is_monochrome(
+    image: Image.Image, tolerance: int = 12, max_color_ratio: float = 0.002
+) -> bool:
+    """
+    Check whether an image has (almost) no color, e.g. a scanned or rendered text page.
+
+    The check runs on a thumbnail. A pixel counts as colored if its RGB channels
+    differ by more than ``tolerance``.
+
+    Args:
+        image: PIL image
+        tolerance: Maximum channel difference of a gray pixel
+        max_color_ratio: Maximum share of colored pixels in a monochrome image
+
+    Returns:
+        True if the image can be stored in grayscale without visible loss
+    """
+    if image.mode in ("1", "L", "LA", "I", "F"):
+        return True
+
+    sample = image.convert("RGB")
+    sample.thumbnail((256, 256))
+    red, green, blue = sample.split()
+    spread = ImageChops.lighter(
+        ImageChops.lighter(
+            ImageChops.difference(red, green), ImageChops.difference(green, blue)
+        ),
+        ImageChops.difference(red, blue),
+    )
+    colored = sum(spread.histogram()[tolerance + 1 :])
+    return colored <= max_color_ratio * sample.width * sample.height
+
+
+def _encode_pil_image(
+    image: Image.Image,
+    save_format: str,
+    quality: Optional[int] = None,
+    color_mode: Optional[str] = None,
+) -> bytes:
+    """Encode a PIL image in the given PIL format, color mode and quality."""
+    if color_mode == "grayscale" or (color_mode == "auto" and is_monochrome(image)):
+        if image.mode != "L":
+            image = image.convert("L")
+    elif save_format == "JPEG" and image.mode not in ("RGB", "L"):
+        # JPEG has no alpha or palette
+        image = image.convert("RGB")
+    elif save_format == "WEBP" and image.mode not in ("RGB", "RGBA", "L"):
+        image = image.convert("RGBA" if "A" in image.mode else "RGB")
+    elif image.mode == "CMYK":
+        image = image.convert("RGB")
+
+    save_kwargs: Dict[str, Any] = {"format": save_format}
+    if save_format in _DEFAULT_QUALITY:
+        save_kwargs["quality"] = quality or _DEFAULT_QUALITY[save_format]
+    if save_format == "JPEG":
+        save_kwargs["optimize"] = True
+
+    img_byte_array = io.BytesIO()
+    image.save(img_byte_array, **save_kwargs)
+    return img_byte_array.getvalue()
+
+
+def _resolve_save_format(
+    image_format: Optional[str], original_format: Optional[str]
+) -> str:
+    """Return the PIL format for a profile format (None keeps the original)."""
+    if image_format:
+        save_format = IMAGE_FORMATS.get(image_format.lower())
+        if not save_format:
+            raise ValueError(
+                f"Unsupported image format: {image_format}. "
+                f"Must be one of: {', '.join(IMAGE_FORMATS)}"
+            )
+        return save_format
+    if original_format in _KEEP_FORMATS:
+        return original_format
+    return "JPEG"
+
+
+def encode_image(
+    image_data: bytes,
+    image_format: Optional[str] = None,
+    quality: Optional[int] = None,
+    color_mode: Optional[str] = None,
+) -> bytes:
+    """
+    Re-encode an image with an encoding profile.
+
+    The original bytes are returned instead if they are already in the requested
+    format and not larger than the re-encoded image.
+
+    Args:
+        image_data: Raw image bytes
+        image_format: "jpeg", "png" or "webp" (None keeps the original format when
+            Bedrock accepts it, JPEG otherwise)
+        quality: JPEG/WebP quality 1-100 (None = 95 for JPEG, 80 for WebP)
+        color_mode: "color", "grayscale", or "auto" (grayscale if the image is
+            monochrome); None means "color"
+
+    Returns:
+        Encoded image bytes
+    """
+    image = Image.open(io.BytesIO(image_data))
+    save_format = _resolve_save_format(image_format, image.format)
+    encoded = _encode_pil_image(image, save_format, quality, color_mode)
+    if image.format == save_format and len(image_data) <= len(encoded):
+        return image_data
+    return encoded
+
 
 def resize_image(
     image_data: bytes,
     target_width: Optional[int] = None,
     target_height: Optional[int] = None,
     allow_upscale: bool = False,
+    image_format: Optional[str] = None,
+    quality: Optional[int] = None,
+    color_mode: Optional[str] = None,
 ) -> bytes:
     """
     Resize an image to fit within target dimensions while preserving aspect ratio.
     No padding, no distortion - pure proportional scaling.
     Preserves original format when possible.
 
+    If any encoding option (image_format, quality, color_mode) is set, the image is
+    encoded with it even when no resize is needed (see encode_image).
+
     Args:
         image_data: Raw image bytes
         target_width: Target width in pixels (None or empty string = no resize)
         target_height: Target height in pixels (None or empty string = no resize)
         allow_upscale: Whether to allow making the image larger than original
+        image_format: Output format ("jpeg", "png", "webp"; None keeps the original)
+        quality: JPEG/WebP quality 1-100
+        color_mode: "color", "grayscale" or "auto"
 
     Returns:
         Resized image bytes in original format (or JPEG if format cannot be preserved)
     """
+    encoding_requested = any(
+        option is not None for option in (image_format, quality, color_mode)
+    )
+
     # Handle empty strings - convert to None
     if isinstance(target_width, str) and not target_width.strip():
         target_width = None
@@ -39,6 +171,8 @@ def resize_image(
 
     # If BOTH dimensions are None, return original image unchanged
     if target_width is None and target_height is None:
+        if encoding_requested:
+            return encode_image(image_data, image_format, quality, color_mode)
         logger.info(
             "No resize requested (both dimensions are None), returning original image"
         )
@@ -98,6 +232,10 @@ def resize_image(
         )
         image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
+        if encoding_requested:
+            save_format = _resolve_save_format(image_format, original_format)
+            return _encode_pil_image(image, save_format, quality, color_mode)
+
         # Save in original format if possible
         img_byte_array = io.BytesIO()
 
@@ -131,6 +269,8 @@ def resize_image(
 
         image.save(img_byte_array, **save_kwargs)
         return img_byte_array.getvalue()
+    elif encoding_requested:
+        return encode_image(image_data, image_format, quality, color_mode)
     else:
         # No resizing needed - return original data unchanged
         logger.info(
@@ -144,6 +284,9 @@ def prepare_image(
     target_width: Optional[int] = None,
     target_height: Optional[int] = None,
     allow_upscale: bool = False,
+    image_format: Optional[str] = None,
+    quality: Optional[int] = None,
+    color_mode: Optional[str] = None,
 ) -> bytes:
     """
     Prepare an image for model input from either S3 URI or raw bytes
@@ -153,6 +296,9 @@ def prepare_image(
         target_width: Target width in pixels (None or empty string = no resize)
         target_height: Target height in pixels (None or empty string = no resize)
         allow_upscale: Whether to allow making the image larger than original
+        image_format: Output format ("jpeg", "png", "webp"; None keeps the original)
+        quality: JPEG/WebP quality 1-100
+        color_mode: "color", "grayscale" or "auto" (grayscale for monochrome images)
 
     Returns:
         Processed image bytes ready for model input (preserves format when possible)
@@ -168,7 +314,15 @@ def prepare_image(
         )
 
     # Resize and process
-    return resize_image(image_data, target_width, target_height, allow_upscale)
+    return resize_image(
+        image_data,
+        target_width,
+        target_height,
+        allow_upscale,
+        image_format=image_format,
+        quality=quality,
+        color_mode=color_mode,
+    )
 
 
 def apply_adaptive_binarization(image_data: bytes) -> bytes:
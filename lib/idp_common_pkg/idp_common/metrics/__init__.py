@@ -2,10 +2,13 @@
 # SPDX-License-Identifier: MIT-0
 
 import boto3
+import functools
 import os
 import logging
 import threading
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional
+
+from .emitter import get_metrics_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +42,9 @@ def put_metric(
     """
     Publish a metric to CloudWatch in a thread-safe manner
 
+    The datapoint is buffered and published in bulk by a background flusher
+    (as EMF log lines or batched put_metric_data) unless METRICS_BACKEND=sync.
+
     Args:
         name: The name of the metric
         value: The value of the metric
@@ -52,6 +58,13 @@ def put_metric(
     if namespace is None:
         namespace = os.environ.get("METRIC_NAMESPACE", "GENAIDP")
 
+    # Buffer the datapoint for the background flusher unless metrics are synchronous
+    buffer = get_metrics_buffer()
+    if buffer is not None:
+        logger.debug(f"Buffering metric {name}: {value}")
+        buffer.add(name, value, unit, dimensions, namespace)
+        return
+
     # Use thread lock to ensure thread safety when publishing metrics
     with _metric_lock:
         logger.debug(f"Publishing metric {name}: {value}")
@@ -72,6 +85,41 @@ def put_metric(
             logger.error(f"Error publishing metric {name}: {e}")
 
 
+def flush_metrics() -> int:
+    """
+    Publish all buffered metrics now.
+
+    Call before a Lambda handler returns: the execution environment is frozen
+    between invocations and may be shut down without running the flusher.
+
+    Returns:
+        Number of datapoints published
+    """
+    buffer = get_metrics_buffer()
+    return buffer.flush() if buffer is not None else 0
+
+
+def flush_metrics_after(handler: Callable) -> Callable:
+    """
+    Decorate a Lambda handler to flush buffered metrics when it returns or raises.
+
+    Args:
+        handler: Lambda handler function
+
+    Returns:
+        Wrapped handler
+    """
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            flush_metrics()
+
+    return wrapper
+
+
 def create_client_performance_metrics(
     name: str,
     duration_ms: float,
@@ -81,12 +129,24 @@ def create_client_performance_metrics(
     """
     Helper to publish standardized client performance metrics in a thread-safe manner
 
+    With a buffered backend the metrics are added to the buffer together.
+
     Args:
         name: Base name for the metric group
         duration_ms: Duration in milliseconds
         is_success: Whether the operation succeeded
         error_type: Optional error type for failures
     """
+    buffer = get_metrics_buffer()
+    if buffer is not None:
+        namespace = os.environ.get("METRIC_NAMESPACE", "GENAIDP")
+        outcome = "Success" if is_success else "Failure"
+        buffer.add(f"{name}Latency", duration_ms, "Milliseconds", namespace=namespace)
+        buffer.add(f"{name}{outcome}", 1, namespace=namespace)
+        if not is_success and error_type:
+            buffer.add(f"{name}Error.{error_type}", 1, namespace=namespace)
+        return
+
     # Use a single lock for all metrics to ensure they are published as a group
     with _metric_lock:
         # Get namespace from environment
@@ -0,0 +1,359 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Buffered metric emission.
+
+Publishing each datapoint with its own ``put_metric_data`` call behind a
+global lock serializes every worker thread on a network round trip, and a
+single Bedrock invocation records up to nine datapoints. ``MetricsBuffer``
+instead appends datapoints to an in-memory buffer and a background thread
+publishes them in bulk, either as CloudWatch Embedded Metric Format (EMF) log
+lines or as batched ``put_metric_data`` calls.
+
+The buffer is flushed when it reaches its size limit, when its oldest
+datapoint is older than the flush interval, at interpreter exit, and
+explicitly by ``flush_metrics()``. Lambda functions freeze between
+invocations, so handlers should flush before returning (see
+``flush_metrics_after``).
+
+The backend is configured with environment variables:
+
+- ``METRICS_BACKEND``: ``emf`` (default in Lambda), ``batch`` (default
+  elsewhere) or ``sync`` (one ``put_metric_data`` call per datapoint)
+- ``METRICS_FLUSH_INTERVAL_SECONDS``: maximum age of buffered datapoints
+  (default 5)
+"""
+
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ENV_VAR = "METRICS_BACKEND"
+FLUSH_INTERVAL_ENV_VAR = "METRICS_FLUSH_INTERVAL_SECONDS"
+
+EMF = "emf"
+BATCH = "batch"
+SYNC = "sync"
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+
+# CloudWatch limits: datums per put_metric_data call, distinct values per
+# datum, and metrics and values per metric in one EMF log line
+MAX_DATUMS_PER_CALL = 1000
+MAX_VALUES_PER_DATUM = 150
+MAX_EMF_METRICS = 100
+MAX_EMF_VALUES = 100
+
+# Datapoints buffered before the flusher is woken early
+MAX_BUFFERED_DATAPOINTS = 1000
+
+
+@dataclass(frozen=True)
+class MetricDatapoint:
+    """A single recorded metric value."""
+
+    namespace: str
+    name: str
+    value: float
+    unit: str
+    dimensions: Tuple[Tuple[str, str], ...]
+
+
+def _group_series(
+    points: List[MetricDatapoint],
+) -> Dict[Tuple[str, str, str, Tuple], List[float]]:
+    """Group datapoint values by namespace, name, unit and dimensions."""
+    series: Dict[Tuple[str, str, str, Tuple], List[float]] = {}
+    for point in points:
+        key = (point.namespace, point.name, point.unit, point.dimensions)
+        series.setdefault(key, []).append(point.value)
+    return series
+
+
+def build_metric_data(points: List[MetricDatapoint]) -> Dict[str, List[Dict]]:
+    """
+    Build put_metric_data datums from datapoints.
+
+    Repeated values of a series are collapsed into Values/Counts, so a
+    thousand "1 request" datapoints become one datum.
+
+    Args:
+        points: Buffered datapoints
+
+    Returns:
+        Mapping of namespace to its MetricData datums
+    """
+    data: Dict[str, List[Dict]] = {}
+    for (namespace, name, unit, dimensions), values in _group_series(
+        points
+    ).items():
+        counts: Dict[float, int] = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+        distinct = list(counts.items())
+        for start in range(0, len(distinct), MAX_VALUES_PER_DATUM):
+            chunk = distinct[start : start + MAX_VALUES_PER_DATUM]
+            data.setdefault(namespace, []).append(
+                {
+                    "MetricName": name,
+                    "Unit": unit,
+                    "Dimensions": [
+                        {"Name": key, "Value": value} for key, value in dimensions
+                    ],
+                    "Values": [value for value, _ in chunk],
+                    "Counts": [float(count) for _, count in chunk],
+                }
+            )
+    return data
+
+
+def build_emf_records(
+    points: List[MetricDatapoint], timestamp: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build Embedded Metric Format records from datapoints.
+
+    Datapoints sharing a namespace and dimension set go into the same record,
+    each metric with its array of values.
+
+    Args:
+        points: Buffered datapoints
+        timestamp: Record time in seconds (defaults to now)
+
+    Returns:
+        EMF records, one per log line
+    """
+    timestamp_ms = int((timestamp if timestamp is not None else time.time()) * 1000)
+    groups: Dict[Tuple[str, Tuple], List[Tuple[str, str, List[float]]]] = {}
+    for (namespace, name, unit, dimensions), values in _group_series(
+        points
+    ).items():
+        for start in range(0, len(values), MAX_EMF_VALUES):
+            groups.setdefault((namespace, dimensions), []).append(
+                (name, unit, values[start : start + MAX_EMF_VALUES])
+            )
+
+    records = []
+    for (namespace, dimensions), metrics in groups.items():
+        # A record holds each metric name once, so split repeats across records
+        pending = metrics
+        while pending:
+            names: set = set()
+            batch, rest = [], []
+            for metric in pending:
+                if metric[0] in names or len(batch) >= MAX_EMF_METRICS:
+                    rest.append(metric)
+                else:
+                    names.add(metric[0])
+                    batch.append(metric)
+            record: Dict[str, Any] = {
+                "_aws": {
+                    "Timestamp": timestamp_ms,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": namespace,
+                            "Dimensions": [[key for key, _ in dimensions]],
+                            "Metrics": [
+                                {"Name": name, "Unit": unit}
+                                for name, unit, _ in batch
+                            ],
+                        }
+                    ],
+                }
+            }
+            record.update({key: value for key, value in dimensions})
+            for name, _, values in batch:
+                record[name] = values if len(values) > 1 else values[0]
+            records.append(record)
+            pending = rest
+    return records
+
+
+class MetricsBuffer:
+    """
+    Buffers datapoints and publishes them in bulk from a background thread.
+
+    Thread-safe; recording a datapoint only takes a lock to append to a list.
+    Publishing errors are logged and the datapoints dropped, so metrics never
+    fail the caller.
+    """
+
+    def __init__(
+        self,
+        backend: str = BATCH,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        client_factory: Optional[Callable[[], Any]] = None,
+        stream: Optional[TextIO] = None,
+        start_flusher: bool = True,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            backend: EMF or BATCH
+            flush_interval: Maximum age of buffered datapoints in seconds
+            client_factory: Returns the CloudWatch client (BATCH backend)
+            stream: Stream EMF records are written to (defaults to stdout)
+            start_flusher: Start the background flusher on first use
+        """
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self._client_factory = client_factory
+        self._stream = stream
+        self._start_flusher = start_flusher
+        self._points: List[MetricDatapoint] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def add(
+        self,
+        name: str,
+        value: float,
+        unit: str = "Count",
+        dimensions: Optional[List[Dict[str, str]]] = None,
+        namespace: str = "GENAIDP",
+    ) -> None:
+        """
+        Buffer a datapoint.
+
+        Args:
+            name: The name of the metric
+            value: The value of the metric
+            unit: The unit of the metric
+            dimensions: Optional list of {"Name", "Value"} dimensions
+            namespace: Metric namespace
+        """
+        point = MetricDatapoint(
+            namespace=namespace,
+            name=name,
+            value=float(value),
+            unit=unit,
+            dimensions=tuple((d["Name"], d["Value"]) for d in dimensions or []),
+        )
+        with self._lock:
+            self._points.append(point)
+            full = len(self._points) >= MAX_BUFFERED_DATAPOINTS
+            if self._start_flusher and self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, name="metrics-flusher", daemon=True
+                )
+                self._flusher.start()
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        """Return the number of buffered datapoints."""
+        with self._lock:
+            return len(self._points)
+
+    def flush(self) -> int:
+        """
+        Publish all buffered datapoints.
+
+        Returns:
+            Number of datapoints published
+        """
+        with self._flush_lock:
+            with self._lock:
+                points, self._points = self._points, []
+            if not points:
+                return 0
+            try:
+                if self.backend == EMF:
+                    self._write_emf(points)
+                else:
+                    self._put_metric_data(points)
+            except Exception as e:
+                logger.error(f"Error publishing {len(points)} buffered metrics: {e}")
+            return len(points)
+
+    def _write_emf(self, points: List[MetricDatapoint]) -> None:
+        stream = self._stream or sys.stdout
+        lines = [
+            json.dumps(record, separators=(",", ":"))
+            for record in build_emf_records(points)
+        ]
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+
+    def _put_metric_data(self, points: List[MetricDatapoint]) -> None:
+        if self._client_factory is None:
+            from . import get_cloudwatch_client
+
+            cloudwatch = get_cloudwatch_client()
+        else:
+            cloudwatch = self._client_factory()
+        for namespace, datums in build_metric_data(points).items():
+            for start in range(0, len(datums), MAX_DATUMS_PER_CALL):
+                cloudwatch.put_metric_data(
+                    Namespace=namespace,
+                    MetricData=datums[start : start + MAX_DATUMS_PER_CALL],
+                )
+        logger.debug(f"Published {len(points)} buffered metric datapoints")
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+def get_backend() -> str:
+    """Return the metrics backend configured by METRICS_BACKEND."""
+    default = EMF if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else BATCH
+    backend = os.environ.get(BACKEND_ENV_VAR, default).strip().lower()
+    if backend not in (EMF, BATCH, SYNC):
+        logger.warning(
+            f"Invalid {BACKEND_ENV_VAR} '{backend}', using '{default}'. "
+            f"Valid values: {EMF}, {BATCH}, {SYNC}"
+        )
+        return default
+    return backend
+
+
+def create_metrics_buffer_from_env() -> Optional[MetricsBuffer]:
+    """
+    Create the metrics buffer configured by the environment.
+
+    Returns:
+        MetricsBuffer, or None for the synchronous backend
+    """
+    backend = get_backend()
+    if backend == SYNC:
+        return None
+    try:
+        flush_interval = float(
+            os.environ.get(FLUSH_INTERVAL_ENV_VAR) or DEFAULT_FLUSH_INTERVAL_SECONDS
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid {FLUSH_INTERVAL_ENV_VAR}, using default: {e}")
+        flush_interval = DEFAULT_FLUSH_INTERVAL_SECONDS
+    buffer = MetricsBuffer(backend, flush_interval)
+    atexit.register(buffer.flush)
+    return buffer
+
+
+_shared_buffer: Optional[MetricsBuffer] = None
+_shared_buffer_loaded = False
+_shared_buffer_lock = threading.Lock()
+
+
+def get_metrics_buffer() -> Optional[MetricsBuffer]:
+    """Return the process-wide metrics buffer, or None if metrics are synchronous."""
+    global _shared_buffer, _shared_buffer_loaded
+    with _shared_buffer_lock:
+        if not _shared_buffer_loaded:
+            _shared_buffer = create_metrics_buffer_from_env()
+            _shared_buffer_loaded = True
+        return _shared_buffer
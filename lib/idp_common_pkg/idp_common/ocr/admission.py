@@ -0,0 +1,171 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Memory-budgeted admission of OCR page work.
+
+Every page in flight holds a rendered pixmap, image byte buffers and an OCR
+response. The thread pool width bounds the number of pages, not their size, so
+a document of large pages (posters, high-resolution scans) can exceed the Lambda
+memory limit while a document of letter pages never comes close.
+
+``MemoryBudget`` admits a page only while the estimated footprint of the pages
+already admitted plus the new page fits in the budget. A page larger than the
+whole budget is admitted once nothing else is in flight, so large pages run one
+at a time and small pages run as wide as the thread pool allows.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# Copies of the page pixels held at once while a page is processed: the
+# rendered pixmap plus PIL conversions and the encoded image buffers
+PAGE_PIXEL_COPIES = 4
+
+# Fixed per-page allowance for the OCR response, parsed text and S3 payloads
+PAGE_OVERHEAD_MB = 8.0
+
+
+def estimate_page_memory_mb(
+    width: float,
+    height: float,
+    is_pdf: bool,
+    dpi: Optional[int],
+    resize_config: Optional[Dict[str, Any]] = None,
+) -> float:
+    """
+    Estimate the peak memory used while processing one page.
+
+    Args:
+        width: Page width (PDF points for PDFs, pixels for image files)
+        height: Page height (PDF points for PDFs, pixels for image files)
+        is_pdf: Whether the page is rendered from a PDF
+        dpi: Rendering DPI for PDFs (defaults to 150 if None)
+        resize_config: Optional dict with target_width and target_height; PDF
+            pages are rendered directly at this size
+
+    Returns:
+        Estimated memory in MB
+    """
+    if is_pdf:
+        scale = (dpi or 150) / 72
+        width_px, height_px = width * scale, height * scale
+        target_width = (resize_config or {}).get("target_width")
+        target_height = (resize_config or {}).get("target_height")
+        if target_width and target_height:
+            fit = min(1.0, target_width / width_px, target_height / height_px)
+            width_px, height_px = width_px * fit, height_px * fit
+    else:
+        # Image files are decoded at full size before any resize
+        width_px, height_px = width, height
+
+    pixel_mb = width_px * height_px * 3 / (1024 * 1024)
+    return pixel_mb * PAGE_PIXEL_COPIES + PAGE_OVERHEAD_MB
+
+
+def lambda_memory_budget_mb(
+    memory_fraction: float, baseline_mb: Optional[float] = None
+) -> Optional[float]:
+    """
+    Derive a page memory budget from the Lambda function memory size.
+
+    Args:
+        memory_fraction: Share of the function memory that page work may use
+        baseline_mb: Memory already in use (e.g. current RSS), subtracted from
+            the budget
+
+    Returns:
+        Budget in MB, or None outside Lambda
+    """
+    memory_size = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+    if not memory_size:
+        return None
+    try:
+        budget_mb = int(memory_size) * memory_fraction - (baseline_mb or 0.0)
+    except ValueError:
+        return None
+    return max(budget_mb, PAGE_OVERHEAD_MB)
+
+
+@dataclass
+class AdmissionStats:
+    """Budget usage, pages run alone and time spent waiting for admission."""
+
+    budget_mb: float = 0.0
+    pages: int = 0
+    max_in_use_mb: float = 0.0
+    max_in_flight: int = 0
+    oversized_pages: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+
+
+class MemoryBudget:
+    """
+    Admission gate limiting the estimated memory of pages in flight.
+
+    Thread-safe; ``acquire`` is called by the thread submitting page work and
+    ``release`` by the page workers when a page is done.
+    """
+
+    def __init__(self, budget_mb: float):
+        """
+        Initialize the budget.
+
+        Args:
+            budget_mb: Memory in MB that admitted pages may use together
+        """
+        self.budget_mb = budget_mb
+        self._in_use_mb = 0.0
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self.stats = AdmissionStats(budget_mb=budget_mb)
+
+    @property
+    def in_use_mb(self) -> float:
+        """Estimated memory of the pages currently admitted."""
+        return self._in_use_mb
+
+    def acquire(self, cost_mb: float) -> None:
+        """
+        Admit a page, blocking until its estimated memory fits in the budget.
+
+        A page larger than the budget is admitted when no other page is in flight.
+
+        Args:
+            cost_mb: Estimated memory of the page
+        """
+        with self._condition:
+            if not self._fits(cost_mb):
+                start = time.perf_counter()
+                self.stats.waits += 1
+                while not self._fits(cost_mb):
+                    self._condition.wait()
+                self.stats.wait_seconds += time.perf_counter() - start
+            self._in_use_mb += cost_mb
+            self._in_flight += 1
+            self.stats.pages += 1
+            if cost_mb > self.budget_mb:
+                self.stats.oversized_pages += 1
+            self.stats.max_in_use_mb = max(self.stats.max_in_use_mb, self._in_use_mb)
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+
+    def release(self, cost_mb: float) -> None:
+        """
+        Return the memory of a finished page to the budget.
+
+        Args:
+            cost_mb: Estimated memory passed to ``acquire``
+        """
+        with self._condition:
+            self._in_use_mb = max(0.0, self._in_use_mb - cost_mb)
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _fits(self, cost_mb: float) -> bool:
+        return self._in_flight == 0 or self._in_use_mb + cost_mb <= self.budget_mb
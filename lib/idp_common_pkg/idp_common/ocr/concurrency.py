@@ -0,0 +1,229 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Adaptive (AIMD) concurrency control for OCR page requests.
+
+With a fixed number of page workers, a document either drives Textract past
+its throughput limit (and burns retries on throttled calls) or leaves capacity
+unused. ``AimdConcurrencyController`` limits the number of in-flight requests
+instead: every page worker acquires a slot around its OCR call, the limit grows
+additively while calls succeed (by ``increase`` per round of ``limit`` calls)
+and is cut multiplicatively when a call is throttled.
+
+Throttles are reported in two ways:
+
+- ``register_throttle_handler`` hooks the botocore ``needs-retry`` event of a
+  client, so throttled attempts that botocore retries internally still count
+- a throttling ``ClientError`` raised out of ``slot()`` counts as well
+
+Only one decrease is applied per congestion event: a throttle reduces the limit
+only if its slot was acquired after the previous decrease, so a burst of
+throttles from requests that were already in flight halves the limit once.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "ProvisionedThroughputExceededException",
+    }
+)
+
+
+def is_throttle_error(error: Any) -> bool:
+    """Return True if the exception is a throttling botocore ClientError."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES
+
+
+@dataclass
+class ConcurrencyStats:
+    """Limit history, throttle counts and time spent waiting for a slot."""
+
+    limit: int = 0
+    min_limit_reached: int = 0
+    max_limit_reached: int = 0
+    max_in_flight: int = 0
+    requests: int = 0
+    throttles: int = 0
+    decreases: int = 0
+    wait_seconds: float = 0.0
+
+
+class _Slot:
+    """An acquired slot; remembers the decrease epoch it was acquired in."""
+
+    __slots__ = ("epoch", "throttled")
+
+    def __init__(self, epoch: int):
+        self.epoch = epoch
+        self.throttled = False
+
+
+class AimdConcurrencyController:
+    """
+    Additive-increase/multiplicative-decrease limit on concurrent requests.
+
+    Thread-safe; one controller is shared by all page workers of a document.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            initial_limit: Number of concurrent requests allowed at first
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit (defaults to initial_limit)
+            increase: Slots added per round of ``limit`` successful requests
+            decrease_factor: Factor the limit is multiplied by on a throttle
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial_limit)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._epoch = 0
+        # Successful requests since the limit last changed
+        self._successes = 0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self.stats = ConcurrencyStats(
+            limit=self.limit,
+            min_limit_reached=self.limit,
+            max_limit_reached=self.limit,
+        )
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold a slot for the duration of one request, blocking until one is free.
+
+        A throttling ``ClientError`` raised inside the block decreases the limit;
+        a block that completes without a reported throttle increases it.
+        """
+        slot = self._acquire()
+        self._local.slot = slot
+        try:
+            yield
+        except Exception as e:
+            if is_throttle_error(e) and not slot.throttled:
+                self._throttled(slot)
+            self._release(slot, succeeded=False)
+            raise
+        else:
+            self._release(slot, succeeded=True)
+        finally:
+            self._local.slot = None
+
+    def record_throttle(self) -> None:
+        """Report a throttled attempt of the request held by the calling thread."""
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            with self._condition:
+                self.stats.throttles += 1
+            return
+        self._throttled(slot)
+
+    def register_throttle_handler(self, client: Any, service_name: str) -> None:
+        """
+        Count throttled attempts that botocore retries on a client.
+
+        Args:
+            client: boto3 client whose requests are made inside ``slot()``
+            service_name: Service name used in botocore event names (e.g. "textract")
+        """
+        client.meta.events.register(
+            f"needs-retry.{service_name}", self._on_needs_retry, unique_id=id(self)
+        )
+
+    def unregister_throttle_handler(self, client: Any, service_name: str) -> None:
+        """Remove the handler added by ``register_throttle_handler``."""
+        client.meta.events.unregister(
+            f"needs-retry.{service_name}", self._on_needs_retry, unique_id=id(self)
+        )
+
+    def _on_needs_retry(self, response=None, caught_exception=None, **kwargs) -> None:
+        """botocore needs-retry handler; never changes the retry decision."""
+        if response is None:
+            return None
+        parsed = response[1] if isinstance(response, tuple) else {}
+        code = (parsed or {}).get("Error", {}).get("Code")
+        if code in THROTTLE_ERROR_CODES:
+            self.record_throttle()
+        return None
+
+    def _acquire(self) -> _Slot:
+        start = time.perf_counter()
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            self.stats.requests += 1
+            self.stats.wait_seconds += time.perf_counter() - start
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+            return _Slot(self._epoch)
+
+    def _throttled(self, slot: _Slot) -> None:
+        with self._condition:
+            self.stats.throttles += 1
+            slot.throttled = True
+            if slot.epoch != self._epoch:
+                # Already reacted to this congestion event
+                return
+            previous = self.limit
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            self._epoch += 1
+            self._successes = 0
+            self.stats.decreases += 1
+            self._update_stats()
+        logger.info(
+            f"Request throttled, reducing concurrency limit from {previous} to {self.limit}"
+        )
+
+    def _release(self, slot: _Slot, succeeded: bool) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if succeeded and not slot.throttled and self._limit < self.max_limit:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self._limit = min(float(self.max_limit), self._limit + self.increase)
+                    self._successes = 0
+                    self._update_stats()
+            self._condition.notify_all()
+
+    def _update_stats(self) -> None:
+        self.stats.limit = self.limit
+        self.stats.min_limit_reached = min(self.stats.min_limit_reached, self.limit)
+        self.stats.max_limit_reached = max(self.stats.max_limit_reached, self.limit)
@@ -7,33 +7,88 @@ Document converter for handling various document formats.
 This module provides functionality to convert different document formats
 (Plain Text, CSV, Excel, Word) into page images and text outputs
 consistent with PDF processing.
+
+Conversion runs in two phases. The ``layout_*_pages`` methods split a document
+into ``ConvertedPage`` objects whose text is available immediately and whose
+image is rendered only when ``render_image()`` is called, so callers that only
+need text never pay for drawing and JPEG encoding. The ``convert_*_to_pages``
+methods lay out and render every page (in parallel when ``max_workers`` > 1).
 """
 
+import concurrent.futures
 import io
 import logging
 import os
 import tempfile
-from typing import List, Tuple
+from functools import partial
+from typing import Callable, List, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
 logger = logging.getLogger(__name__)
 
 
+class ConvertedPage:
+    """A laid-out page of a converted document with a lazily rendered image."""
+
+    def __init__(self, text: str, render: Callable[[], bytes]):
+        """
+        Initialize the page.
+
+        Args:
+            text: Page text
+            render: Callable returning the page image as JPEG bytes
+        """
+        self.text = text
+        self._render = render
+
+    def render_image(self) -> bytes:
+        """
+        Render the page image.
+
+        The image is not kept, so each call renders it again.
+
+        Returns:
+            JPEG image bytes
+        """
+        return self._render()
+
+
 class DocumentConverter:
     """Converter for various document formats to images and text."""
 
-    def __init__(self, dpi: int = 150):
+    def __init__(self, dpi: int = 150, max_workers: int = 1):
         """
         Initialize the document converter.
 
         Args:
             dpi: DPI for image generation
+            max_workers: Number of threads rendering page images in convert_*_to_pages
         """
         self.dpi = dpi
         self.page_width = int(8.5 * dpi)  # 8.5 inches at specified DPI
         self.page_height = int(11 * dpi)  # 11 inches at specified DPI
         self.margin = int(0.5 * dpi)  # 0.5 inch margin
+        self.max_workers = max(1, max_workers)
+
+    def render_pages(self, pages: List[ConvertedPage]) -> List[Tuple[bytes, str]]:
+        """
+        Render the images of laid-out pages.
+
+        Args:
+            pages: Pages returned by a layout_*_pages method
+
+        Returns:
+            List of tuples (image_bytes, page_text)
+        """
+        if self.max_workers == 1 or len(pages) < 2:
+            images = [page.render_image() for page in pages]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(pages))
+            ) as executor:
+                images = list(executor.map(lambda page: page.render_image(), pages))
+        return [(image, page.text) for image, page in zip(images, pages)]
 
     def convert_text_to_pages(self, content: str) -> List[Tuple[bytes, str]]:
         """
@@ -45,13 +100,55 @@ class DocumentConverter:
         Returns:
             List of tuples (image_bytes, page_text)
         """
-        try:
-            # Use a basic font
-            try:
-                font = ImageFont.truetype("DejaVuSansMono.ttf", 12)
-            except OSError:
-                font = ImageFont.load_default()
+        return self.render_pages(self.layout_text_pages(content))
+
+    def convert_csv_to_pages(self, content: str) -> List[Tuple[bytes, str]]:
+        """
+        Convert CSV content to page images and text with enhanced pandas processing.
+
+        Args:
+            content: CSV content as string
+
+        Returns:
+            List of tuples (image_bytes, page_text)
+        """
+        return self.render_pages(self.layout_csv_pages(content))
+
+    def convert_excel_to_pages(self, file_bytes: bytes) -> List[Tuple[bytes, str]]:
+        """
+        Convert Excel file to page images and text with enhanced formatting preservation.
+
+        Args:
+            file_bytes: Excel file bytes
+
+        Returns:
+            List of tuples (image_bytes, page_text)
+        """
+        return self.render_pages(self.layout_excel_pages(file_bytes))
+
+    def convert_word_to_pages(self, file_bytes: bytes) -> List[Tuple[bytes, str]]:
+        """
+        Convert Word document to page images and text with enhanced formatting.
+
+        Args:
+            file_bytes: Word document bytes
+
+        Returns:
+            List of tuples (image_bytes, page_text)
+        """
+        return self.render_pages(self.layout_word_pages(file_bytes))
+
+    def layout_text_pages(self, content: str) -> List[ConvertedPage]:
+        """
+        Split plain text content into pages.
+
+        Args:
+            content: Plain text content
 
+        Returns:
+            List of pages with lazily rendered images
+        """
+        try:
             # Calculate text area dimensions
             text_width = self.page_width - (2 * self.margin)
             text_height = self.page_height - (2 * self.margin)
@@ -85,40 +182,56 @@ class DocumentConverter:
             pages = []
             for i in range(0, len(lines), lines_per_page):
                 page_lines = lines[i : i + lines_per_page]
-                page_text = "\n".join(page_lines)
+                pages.append(
+                    ConvertedPage(
+                        "\n".join(page_lines),
+                        partial(self._render_text_page, page_lines, line_height),
+                    )
+                )
 
-                # Create image
-                img = Image.new("RGB", (self.page_width, self.page_height), "white")
-                draw = ImageDraw.Draw(img)
+            return pages if pages else [self._empty_converted_page("")]
 
-                # Draw text
-                y_pos = self.margin
-                for line in page_lines:
-                    draw.text((self.margin, y_pos), line, fill="black", font=font)
-                    y_pos += line_height
+        except Exception as e:
+            logger.error(f"Error converting text to pages: {str(e)}")
+            return [self._empty_converted_page(content)]
+
+    def _render_text_page(self, page_lines: List[str], line_height: int) -> bytes:
+        """Render a plain text page image."""
+        try:
+            # Use a basic font
+            try:
+                font = ImageFont.truetype("DejaVuSansMono.ttf", 12)
+            except OSError:
+                font = ImageFont.load_default()
 
-                # Convert to bytes
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format="JPEG", quality=95)
-                img_bytes = img_buffer.getvalue()
+            # Create image
+            img = Image.new("RGB", (self.page_width, self.page_height), "white")
+            draw = ImageDraw.Draw(img)
 
-                pages.append((img_bytes, page_text))
+            # Draw text
+            y_pos = self.margin
+            for line in page_lines:
+                draw.text((self.margin, y_pos), line, fill="black", font=font)
+                y_pos += line_height
 
-            return pages if pages else [(self._create_empty_page(), "")]
+            # Convert to bytes
+            img_buffer = io.BytesIO()
+            img.save(img_buffer, format="JPEG", quality=95)
+            return img_buffer.getvalue()
 
         except Exception as e:
-            logger.error(f"Error converting text to pages: {str(e)}")
-            return [(self._create_empty_page(), content)]
+            logger.error(f"Error rendering text page: {str(e)}")
+            return self._create_empty_page()
 
-    def convert_csv_to_pages(self, content: str) -> List[Tuple[bytes, str]]:
+    def layout_csv_pages(self, content: str) -> List[ConvertedPage]:
         """
-        Convert CSV content to page images and text with enhanced pandas processing.
+        Split CSV content into pages with enhanced pandas processing.
 
         Args:
             content: CSV content as string
 
         Returns:
-            List of tuples (image_bytes, page_text)
+            List of pages with lazily rendered images
         """
         try:
             import csv
@@ -135,7 +248,7 @@ class DocumentConverter:
                 )
 
                 if df.empty:
-                    return [(self._create_empty_page(), "")]
+                    return [self._empty_converted_page("")]
 
                 # Generate high-quality markdown using pandas
                 formatted_text = self._format_csv_with_pandas(df, content)
@@ -149,27 +262,27 @@ class DocumentConverter:
                 rows = list(csv_reader)
 
                 if not rows:
-                    return [(self._create_empty_page(), "")]
+                    return [self._empty_converted_page("")]
 
                 # Format as table text using improved method
                 formatted_text = self._format_csv_as_table(rows)
 
-            # Convert the enhanced markdown text to clean page images
-            return self._convert_markdown_to_pages(formatted_text)
+            # Split the enhanced markdown text into clean pages
+            return self._layout_markdown_pages(formatted_text)
 
         except Exception as e:
             logger.error(f"Error converting CSV to pages: {str(e)}")
-            return [(self._create_empty_page(), content)]
+            return [self._empty_converted_page(content)]
 
-    def convert_excel_to_pages(self, file_bytes: bytes) -> List[Tuple[bytes, str]]:
+    def layout_excel_pages(self, file_bytes: bytes) -> List[ConvertedPage]:
         """
-        Convert Excel file to page images and text with enhanced formatting preservation.
+        Split an Excel file into pages with enhanced formatting preservation.
 
         Args:
             file_bytes: Excel file bytes
 
         Returns:
-            List of tuples (image_bytes, page_text)
+            List of pages with lazily rendered images
         """
         try:
             import pandas as pd
@@ -213,22 +326,22 @@ class DocumentConverter:
                             }
                         )
 
-                # Render formatted Excel content
-                return self._render_formatted_excel_content(formatted_elements)
+                # Lay out formatted Excel content
+                return self._layout_formatted_excel_content(formatted_elements)
 
         except Exception as e:
             logger.error(f"Error converting Excel to pages: {str(e)}")
-            return [(self._create_empty_page(), "Error reading Excel file")]
+            return [self._empty_converted_page("Error reading Excel file")]
 
-    def convert_word_to_pages(self, file_bytes: bytes) -> List[Tuple[bytes, str]]:
+    def layout_word_pages(self, file_bytes: bytes) -> List[ConvertedPage]:
         """
-        Convert Word document to page images and text with enhanced formatting.
+        Split a Word document into pages with enhanced formatting.
 
         Args:
             file_bytes: Word document bytes
 
         Returns:
-            List of tuples (image_bytes, page_text)
+            List of pages with lazily rendered images
         """
         try:
             from docx import Document
@@ -243,12 +356,12 @@ class DocumentConverter:
                 # Extract formatted elements
                 elements = self._extract_word_formatting(doc)
 
-                # Render with enhanced formatting
-                return self._render_formatted_word_content(elements)
+                # Lay out with enhanced formatting
+                return self._layout_formatted_word_content(elements)
 
         except Exception as e:
             logger.error(f"Error converting Word to pages: {str(e)}")
-            return [(self._create_empty_page(), "Error reading Word document")]
+            return [self._empty_converted_page("Error reading Word document")]
 
     def _extract_word_formatting(self, doc) -> List[dict]:
         """Extract formatted content from Word document."""
@@ -382,24 +495,23 @@ class DocumentConverter:
 
         return elements
 
-    def _render_formatted_word_content(
+    def _layout_formatted_word_content(
         self, elements: List[dict]
-    ) -> List[Tuple[bytes, str]]:
-        """Render formatted Word content with enhanced typography."""
+    ) -> List[ConvertedPage]:
+        """Split formatted Word content into pages rendered with enhanced typography."""
         try:
-            # Load fonts
-            fonts = self._load_fonts()
-
             # Calculate layout
             pages_content = self._calculate_word_page_layout(elements)
 
-            # Render pages
-            pages = []
-            for page_elements in pages_content:
-                img_bytes, text = self._render_word_page(page_elements, fonts)
-                pages.append((img_bytes, text))
+            pages = [
+                ConvertedPage(
+                    self._word_page_text(page_elements),
+                    partial(self._render_word_page, page_elements),
+                )
+                for page_elements in pages_content
+            ]
 
-            return pages if pages else [(self._create_empty_page(), "")]
+            return pages if pages else [self._empty_converted_page("")]
 
         except Exception as e:
             logger.error(f"Error rendering formatted Word content: {str(e)}")
@@ -407,7 +519,7 @@ class DocumentConverter:
             text_content = "\n".join(
                 [elem.get("text", "") for elem in elements if elem.get("text")]
             )
-            return self.convert_text_to_pages(text_content)
+            return self.layout_text_pages(text_content)
 
     def _load_fonts(self) -> dict:
         """Load available fonts with fallbacks."""
@@ -510,16 +622,30 @@ class DocumentConverter:
 
         return pages if pages else [[]]
 
-    def _render_word_page(self, elements: List[dict], fonts: dict) -> Tuple[bytes, str]:
+    def _word_page_text(self, elements: List[dict]) -> str:
+        """Collect the text of a laid-out Word page."""
+        page_text = []
+        for element in elements:
+            if element["type"] == "paragraph":
+                page_text.append(element["text"])
+            elif element["type"] == "table":
+                for row in element["data"]:
+                    row_text = " | ".join([cell["text"] for cell in row])
+                    page_text.append(row_text)
+        return "\n".join(page_text)
+
+    def _render_word_page(self, elements: List[dict]) -> bytes:
         """Render a single page with enhanced formatting."""
         try:
+            # Load fonts
+            fonts = self._load_fonts()
+
             # Create image
             img = Image.new("RGB", (self.page_width, self.page_height), "white")
             draw = ImageDraw.Draw(img)
 
-            # Track position and collect text
+            # Track position
             y_pos = self.margin
-            page_text = []
             text_width = self.page_width - (2 * self.margin)
 
             for element in elements:
@@ -543,7 +669,6 @@ class DocumentConverter:
                     )
 
                     y_pos += para_height + element.get("space_after", 0)
-                    page_text.append(element["text"])
 
                 elif element["type"] == "table":
                     y_pos += element.get("space_before", 0)
@@ -555,24 +680,15 @@ class DocumentConverter:
 
                     y_pos += table_height + element.get("space_after", 0)
 
-                    # Add table text
-                    for row in element["data"]:
-                        row_text = " | ".join([cell["text"] for cell in row])
-                        page_text.append(row_text)
-
             # Convert to bytes
             img_buffer = io.BytesIO()
             img.save(img_buffer, format="JPEG", quality=95)
             img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-
-            return img_bytes, "\n".join(page_text)
+            return img_buffer.getvalue()
 
         except Exception as e:
             logger.error(f"Error rendering Word page: {str(e)}")
-            return self._create_empty_page(), "\n".join(
-                [elem.get("text", "") for elem in elements]
-            )
+            return self._create_empty_page()
 
     def _render_formatted_paragraph(
         self, draw, element: dict, x: int, y: int, width: int, base_font
@@ -869,24 +985,24 @@ class DocumentConverter:
             except Exception:
                 return []
 
-    def _render_formatted_excel_content(
+    def _layout_formatted_excel_content(
         self, elements: List[dict]
-    ) -> List[Tuple[bytes, str]]:
+    ) -> List[ConvertedPage]:
         """
-        Render formatted Excel content as clean markdown pages.
+        Lay out formatted Excel content as clean markdown pages.
 
         Args:
             elements: List of formatted Excel elements (sheet headers, tables)
 
         Returns:
-            List of tuples (image_bytes, page_text)
+            List of pages with lazily rendered images
         """
         try:
             # Generate enhanced markdown text for Excel content
             enhanced_text = self._generate_enhanced_excel_markdown(elements)
 
-            # Convert the enhanced markdown text to clean page images
-            return self._convert_markdown_to_pages(enhanced_text)
+            # Split the enhanced markdown text into clean pages
+            return self._layout_markdown_pages(enhanced_text)
 
         except Exception as e:
             logger.error(f"Error rendering formatted Excel content: {str(e)}")
@@ -903,7 +1019,7 @@ class DocumentConverter:
                         text_content.append(row_text)
 
             combined_text = "\n".join(text_content)
-            return self._convert_markdown_to_pages(combined_text)
+            return self._layout_markdown_pages(combined_text)
 
     def _get_text_width(self, draw, text: str, font) -> int:
         """Get text width using the appropriate PIL method."""
@@ -1150,35 +1266,20 @@ class DocumentConverter:
 
         return "\n".join(formatted_rows)
 
-    def _convert_markdown_to_pages(
-        self, markdown_content: str
-    ) -> List[Tuple[bytes, str]]:
+    def _layout_markdown_pages(self, markdown_content: str) -> List[ConvertedPage]:
         """
-        Convert markdown content to clean page images with proper formatting.
-        Returns original markdown as page_text to preserve proper markdown syntax.
+        Split markdown content into pages with proper formatting.
+        Returns original markdown as page text to preserve proper markdown syntax.
 
         Args:
             markdown_content: Markdown formatted text
 
         Returns:
-            List of tuples (image_bytes, page_text)
+            List of pages with lazily rendered images
         """
         try:
-            # Use a monospace font for better markdown rendering
-            try:
-                font_normal = ImageFont.truetype("DejaVuSansMono.ttf", 12)
-                font_bold = ImageFont.truetype("DejaVuSansMono-Bold.ttf", 12)
-                font_heading = ImageFont.truetype("DejaVuSansMono-Bold.ttf", 16)
-            except OSError:
-                font_normal = ImageFont.load_default()
-                font_bold = ImageFont.load_default()
-                font_heading = ImageFont.load_default()
-
-            # Calculate text area dimensions
-            text_width = self.page_width - (2 * self.margin)
-            text_height = self.page_height - (2 * self.margin)
-
             # Calculate lines per page with better spacing
+            text_height = self.page_height - (2 * self.margin)
             line_height = 18  # Slightly more space for better readability
             lines_per_page = text_height // line_height
 
@@ -1205,75 +1306,114 @@ class DocumentConverter:
                 # Create the page text from processed markdown
                 page_text = "\n".join(page_text_lines)
 
-                # Create image with simple but clean formatting
-                img = Image.new("RGB", (self.page_width, self.page_height), "white")
-                draw = ImageDraw.Draw(img)
+                pages.append(
+                    ConvertedPage(
+                        page_text,
+                        partial(
+                            self._render_markdown_page, page_text_lines, line_height
+                        ),
+                    )
+                )
+                original_line_idx += len(page_original_lines)
+
+            return pages if pages else [self._empty_converted_page(markdown_content)]
 
-                # Render with simple text formatting (fast and preserves all content)
-                y_pos = self.margin
+        except Exception as e:
+            logger.error(f"Error converting markdown to pages: {str(e)}")
+            # Fallback to basic text conversion
+            return self.layout_text_pages(markdown_content)
 
-                for line in page_text_lines:
-                    if y_pos + line_height > self.page_height - self.margin:
-                        break  # Page is full
+    def _render_markdown_page(
+        self, page_text_lines: List[str], line_height: int
+    ) -> bytes:
+        """
+        Render a markdown page image with simple but clean formatting.
 
-                    # Simple formatting based on content
-                    if line.startswith("#"):
-                        # Heading - use bold font and remove markdown syntax
-                        text = line.lstrip("#").strip()
-                        font = font_heading
-                        color = "#2c3e50"
-                    elif line.startswith("- ") or line.startswith("* "):
-                        # List item - add bullet and indent
-                        text = "• " + line[2:].strip()
-                        font = font_normal
-                        color = "black"
-                        x_pos = self.margin + 20
-                    elif "**" in line:
-                        # Bold text - remove markdown and use bold font
-                        text = line.replace("**", "")
-                        font = font_bold
-                        color = "black"
-                    else:
-                        # Regular text
-                        text = line
-                        font = font_normal
-                        color = "black"
-
-                    # Default x position
-                    if not line.startswith("- ") and not line.startswith("* "):
-                        x_pos = self.margin
-
-                    # Handle long lines by wrapping
-                    wrapped_lines = self._wrap_text_to_width(
-                        text, font, text_width - (x_pos - self.margin), draw
-                    )
+        Args:
+            page_text_lines: Markdown lines of the page
+            line_height: Line height in pixels
+
+        Returns:
+            JPEG image bytes
+        """
+        try:
+            # Use a monospace font for better markdown rendering
+            try:
+                font_normal = ImageFont.truetype("DejaVuSansMono.ttf", 12)
+                font_bold = ImageFont.truetype("DejaVuSansMono-Bold.ttf", 12)
+                font_heading = ImageFont.truetype("DejaVuSansMono-Bold.ttf", 16)
+            except OSError:
+                font_normal = ImageFont.load_default()
+                font_bold = ImageFont.load_default()
+                font_heading = ImageFont.load_default()
 
-                    for wrapped_line in wrapped_lines:
-                        if y_pos + line_height > self.page_height - self.margin:
-                            break  # Page is full
+            # Calculate text area dimensions
+            text_width = self.page_width - (2 * self.margin)
 
-                        # Draw the text
-                        draw.text((x_pos, y_pos), wrapped_line, fill=color, font=font)
-                        y_pos += line_height
+            # Create image with simple but clean formatting
+            img = Image.new("RGB", (self.page_width, self.page_height), "white")
+            draw = ImageDraw.Draw(img)
 
-                    # Add small spacing after headings
-                    if line.startswith("#"):
-                        y_pos += 6
+            # Render with simple text formatting (fast and preserves all content)
+            y_pos = self.margin
 
-                # Convert to bytes
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format="JPEG", quality=95)
-                img_bytes = img_buffer.getvalue()
+            for line in page_text_lines:
+                if y_pos + line_height > self.page_height - self.margin:
+                    break  # Page is full
+
+                # Simple formatting based on content
+                if line.startswith("#"):
+                    # Heading - use bold font and remove markdown syntax
+                    text = line.lstrip("#").strip()
+                    font = font_heading
+                    color = "#2c3e50"
+                elif line.startswith("- ") or line.startswith("* "):
+                    # List item - add bullet and indent
+                    text = "• " + line[2:].strip()
+                    font = font_normal
+                    color = "black"
+                    x_pos = self.margin + 20
+                elif "**" in line:
+                    # Bold text - remove markdown and use bold font
+                    text = line.replace("**", "")
+                    font = font_bold
+                    color = "black"
+                else:
+                    # Regular text
+                    text = line
+                    font = font_normal
+                    color = "black"
+
+                # Default x position
+                if not line.startswith("- ") and not line.startswith("* "):
+                    x_pos = self.margin
+
+                # Handle long lines by wrapping
+                wrapped_lines = self._wrap_text_to_width(
+                    text, font, text_width - (x_pos - self.margin), draw
+                )
 
-                pages.append((img_bytes, page_text))
-                original_line_idx += len(page_original_lines)
+                for wrapped_line in wrapped_lines:
+                    if y_pos + line_height > self.page_height - self.margin:
+                        break  # Page is full
+
+                    # Draw the text
+                    draw.text((x_pos, y_pos), wrapped_line, fill=color, font=font)
+                    y_pos += line_height
 
-            return pages if pages else [(self._create_empty_page(), markdown_content)]
+                # Add small spacing after headings
+                if line.startswith("#"):
+                    y_pos += 6
+
+            # Convert to bytes
+            img_buffer = io.BytesIO()
+            img.save(img_buffer, format="JPEG", quality=95)
+            return img_buffer.getvalue()
 
         except Exception as e:
-            logger.error(f"Error converting markdown to pages: {str(e)}")
-            # Fallback to basic text conversion
-            return self.convert_text_to_pages(markdown_content)
+            logger.error(f"Error rendering markdown page: {str(e)}")
+            # Fallback to basic text rendering
+            return self._render_text_page(page_text_lines, 16)
 
     def _wrap_text_to_width(self, text: str, font, max_width: int, draw) -> List[str]:
         """
@@ -1400,6 +1540,10 @@ class DocumentConverter:
 
         return page_lines
 
+    def _empty_converted_page(self, text: str) -> ConvertedPage:
+        """Create a page with the given text and an empty white image."""
+        return ConvertedPage(text, self._create_empty_page)
+
     def _create_empty_page(self) -> bytes:
         """Create an empty white page image."""
         try:
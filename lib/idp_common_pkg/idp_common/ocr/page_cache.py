@@ -0,0 +1,132 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Content-addressed cache for per-page OCR results.
+
+Pages are keyed by a SHA-256 of the rendered page image plus every setting that
+changes the OCR output (backend, Textract features, Bedrock model and prompts,
+preprocessing). A hit restores the stored ``rawText.json``, ``textConfidence.json``
+and ``result.json`` artifacts into the page's output prefix with S3 server-side
+copies, so reruns and duplicate uploads do not call Textract or Bedrock again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from idp_common import s3
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored artifact format changes so stale entries are ignored
+CACHE_FORMAT_VERSION = "1"
+
+# Artifacts cached per page. result.json is written last and checked first, so
+# its presence means the whole entry is complete.
+CACHED_ARTIFACTS = ("rawText.json", "textConfidence.json", "result.json")
+
+
+class OcrPageCache:
+    """
+    S3-backed OCR result cache keyed by page image content.
+
+    Entries are stored under ``s3://{bucket}/{prefix}/{key[:2]}/{key}/`` and
+    never expire on their own; use an S3 lifecycle rule on the prefix to bound
+    storage.
+    """
+
+    def __init__(self, bucket: Optional[str] = None, prefix: str = "ocr-cache"):
+        """
+        Initialize the cache.
+
+        Args:
+            bucket: Cache bucket (defaults to each document's output bucket)
+            prefix: Key prefix for cache entries
+        """
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    @staticmethod
+    def compute_key(image_bytes: bytes, *settings: str) -> str:
+        """
+        Compute the cache key for a page.
+
+        Args:
+            image_bytes: Rendered page image sent to OCR (before preprocessing)
+            settings: Strings identifying everything else that affects the output
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256(image_bytes)
+        for part in (CACHE_FORMAT_VERSION, *settings):
+            digest.update(b"\0")
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_key(self, cache_key: str, artifact: str) -> str:
+        return f"{self.prefix}/{cache_key[:2]}/{cache_key}/{artifact}"
+
+    def restore(self, cache_key: str, output_bucket: str, page_prefix: str) -> bool:
+        """
+        Copy a cached entry into a page's output prefix.
+
+        Args:
+            cache_key: Key from ``compute_key``
+            output_bucket: Bucket the page artifacts are written to
+            page_prefix: Page output prefix (e.g. ``{document}/pages/1``)
+
+        Returns:
+            True on a hit (all artifacts copied), False on a miss or error
+        """
+        cache_bucket = self.bucket or output_bucket
+        try:
+            s3.get_s3_client().head_object(
+                Bucket=cache_bucket, Key=self._entry_key(cache_key, "result.json")
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                logger.warning(f"OCR cache lookup failed for {cache_key}: {str(e)}")
+            return False
+
+        try:
+            for artifact in CACHED_ARTIFACTS:
+                s3.copy_content(
+                    cache_bucket,
+                    self._entry_key(cache_key, artifact),
+                    output_bucket,
+                    f"{page_prefix}/{artifact}",
+                )
+        except Exception as e:
+            # Partially restored artifacts are overwritten by normal processing
+            logger.warning(f"Failed to restore OCR cache entry {cache_key}: {str(e)}")
+            return False
+        return True
+
+    def store(self, cache_key: str, output_bucket: str, page_prefix: str) -> None:
+        """
+        Copy a page's freshly written artifacts into the cache.
+
+        Failures are logged and ignored; caching never fails a page.
+
+        Args:
+            cache_key: Key from ``compute_key``
+            output_bucket: Bucket the page artifacts were written to
+            page_prefix: Page output prefix (e.g. ``{document}/pages/1``)
+        """
+        cache_bucket = self.bucket or output_bucket
+        try:
+            for artifact in CACHED_ARTIFACTS:
+                s3.copy_content(
+                    output_bucket,
+                    f"{page_prefix}/{artifact}",
+                    cache_bucket,
+                    self._entry_key(cache_key, artifact),
+                )
+        except Exception as e:
+            logger.warning(f"Failed to store OCR cache entry {cache_key}: {str(e)}")
@@ -0,0 +1,151 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Page rasterization for the OCR service.
+
+Rendering a PDF page (``get_pixmap`` + JPEG encoding) is CPU-bound and holds the
+GIL, so pages rendered from the OCR thread pool are effectively serialized on
+large scans. ``ProcessPoolRasterizer`` moves that work into a process pool where
+every worker opens its own handle to the document file and returns encoded page
+images, so the OCR thread pool only waits on Textract/Bedrock/S3 I/O.
+
+Workers render with ``idp_common.ocr.service.render_page_image``, the same
+function used for in-thread rendering, so both engines produce identical images.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+from typing import Any, Dict, Optional
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# Per-process state for rasterization workers. Each worker process opens its own
+# document handle once in the initializer and reuses it for every page it renders.
+_worker_document: Optional[fitz.Document] = None
+_worker_settings: Dict[str, Any] = {}
+
+
+def _init_worker(
+    document_path: str,
+    dpi: Optional[int],
+    resize_config: Optional[Dict[str, Any]],
+    encoding_config: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Open the worker's own handle to the document file."""
+    global _worker_document, _worker_settings
+    _worker_document = fitz.open(document_path)
+    _worker_settings = {
+        "dpi": dpi,
+        "resize_config": resize_config,
+        "encoding_config": encoding_config,
+    }
+
+
+def _render_in_worker(page_index: int) -> bytes:
+    """Render one page using the worker's document handle."""
+    if _worker_document is None:
+        raise RuntimeError("Rasterization worker was not initialized")
+    # Imported here to avoid a circular import (the service imports this module)
+    from idp_common.ocr.service import render_page_image
+
+    page = _worker_document.load_page(page_index)
+    return render_page_image(
+        page,
+        _worker_document.is_pdf,
+        _worker_settings.get("dpi"),
+        _worker_settings.get("resize_config"),
+        page_index + 1,
+        _worker_settings.get("encoding_config"),
+    )
+
+
+class ProcessPoolRasterizer:
+    """
+    Render document pages to JPEG bytes in a pool of worker processes.
+
+    Each worker opens its own handle to ``document_path`` so no PyMuPDF objects
+    are shared across processes; only the page index goes in and the encoded
+    image bytes come back.
+
+    Note:
+        Process pools require POSIX semaphores, which are not available in AWS
+        Lambda. Creating the pool raises ``OSError`` there; callers should fall
+        back to in-thread rendering.
+    """
+
+    def __init__(
+        self,
+        document_path: str,
+        dpi: Optional[int] = None,
+        resize_config: Optional[Dict[str, Any]] = None,
+        encoding_config: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        start_method: str = "spawn",
+    ):
+        """
+        Initialize the rasterizer and start its worker processes.
+
+        Args:
+            document_path: Path to the document file each worker opens
+            dpi: DPI for PDF rendering (defaults to 150 if None)
+            resize_config: Optional dict with target_width and target_height
+            encoding_config: Optional dict with JPEG quality and color_mode
+            max_workers: Number of worker processes (defaults to CPU count)
+            start_method: multiprocessing start method ("spawn" avoids forking
+                a parent that holds boto3 clients and running threads)
+
+        Raises:
+            OSError: If the platform does not support process pools
+        """
+        self.document_path = document_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(document_path, dpi, resize_config, encoding_config),
+        )
+        logger.info(
+            f"Started process-pool rasterizer with {self.max_workers} workers for {document_path}"
+        )
+
+    def submit(self, page_index: int) -> concurrent.futures.Future:
+        """
+        Schedule rendering of a page.
+
+        Args:
+            page_index: Zero-based index of the page
+
+        Returns:
+            Future resolving to the page's JPEG bytes
+        """
+        return self._executor.submit(_render_in_worker, page_index)
+
+    def render(self, page_index: int) -> bytes:
+        """
+        Render a page and wait for the result.
+
+        Args:
+            page_index: Zero-based index of the page
+
+        Returns:
+            JPEG bytes for the page
+        """
+        return self.submit(page_index).result()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ProcessPoolRasterizer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
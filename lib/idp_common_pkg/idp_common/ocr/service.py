@@ -11,24 +11,220 @@ processing of multiple pages.
 
 from __future__ import annotations
 
+import codecs
 import concurrent.futures
+import contextlib
 import logging
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import boto3
 import fitz  # PyMuPDF
+import PIL.Image
 from botocore.config import Config
 
-from idp_common import bedrock, image, s3, utils
-from idp_common.config.models import IDPConfig
+from idp_common import bedrock, image, metrics, s3, utils
+from idp_common.config.models import IDPConfig, OCRMemoryConfig
 from idp_common.models import Document, Page, Status
-from idp_common.ocr.document_converter import DocumentConverter
+from idp_common.ocr.admission import (
+    PAGE_OVERHEAD_MB,
+    AdmissionStats,
+    MemoryBudget,
+    estimate_page_memory_mb,
+    lambda_memory_budget_mb,
+)
+from idp_common.ocr.concurrency import AimdConcurrencyController, ConcurrencyStats
+from idp_common.ocr.document_converter import ConvertedPage, DocumentConverter
+from idp_common.ocr.page_cache import OcrPageCache
+from idp_common.ocr.rasterizer import ProcessPoolRasterizer
+from idp_common.ocr.text_layer import extract_text_layer, to_textract_response
+from idp_common.ocr.textract_markdown import (
+    convert_textract_response,
+    text_confidence_table,
+)
+from idp_common.ocr.upload_queue import ArtifactUploadQueue
 
 logger = logging.getLogger(__name__)
 
 
+# Default DPI used when rendering PDF pages and no DPI is configured
+DEFAULT_DPI = 150
+
+# Number of leading bytes kept for file type detection when a document is spooled
+FILE_TYPE_SNIFF_BYTES = 8192
+
+
+def get_rss_mb() -> Optional[float]:
+    """
+    Get the current resident set size of this process in MB.
+
+    Uses psutil when installed and falls back to /proc/self/statm on Linux
+    (including AWS Lambda).
+
+    Returns:
+        RSS in MB, or None if it cannot be determined
+    """
+    try:
+        import psutil
+
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def render_page_image(
+    page: fitz.Page,
+    is_pdf: bool,
+    dpi: Optional[int],
+    resize_config: Optional[Dict[str, Any]],
+    page_id: int,
+    encoding_config: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    """
+    Render a page to JPEG bytes at the optimal size to prevent memory issues.
+
+    If resize config is provided, images are rendered directly at target dimensions
+    to avoid creating oversized pixmaps that cause OutOfMemory errors.
+
+    Args:
+        page: PyMuPDF page object
+        is_pdf: Whether the document is a PDF file
+        dpi: DPI for PDF rendering (defaults to 150 if None)
+        resize_config: Optional dict with target_width and target_height
+        page_id: Page number for logging
+        encoding_config: Optional dict with JPEG quality and color_mode
+
+    Returns:
+        Image bytes in JPEG format (at target size if resize config exists)
+    """
+    pix = None
+    try:
+        # Check if we should extract at target size to avoid memory issues
+        if resize_config:
+            target_width = resize_config.get("target_width")
+            target_height = resize_config.get("target_height")
+
+            if target_width and target_height:
+                # Get page dimensions to calculate scaling
+                page_rect = page.rect
+
+                if is_pdf:
+                    # For PDF files, calculate dimensions at specified DPI
+                    render_dpi = dpi or DEFAULT_DPI
+                    original_width = int(page_rect.width * (render_dpi / 72))
+                    original_height = int(page_rect.height * (render_dpi / 72))
+                else:
+                    # For image files, use actual dimensions
+                    original_width = int(page_rect.width)
+                    original_height = int(page_rect.height)
+
+                # Apply same logic as image.resize_image - preserve aspect ratio, never upscale
+                width_ratio = target_width / original_width
+                height_ratio = target_height / original_height
+                scale_factor = min(width_ratio, height_ratio)  # Preserve aspect ratio
+
+                # Only resize if scale_factor < 1.0 (never upscale)
+                if scale_factor < 1.0:
+                    # Extract at reduced size using matrix transformation
+                    if is_pdf:
+                        # For PDF, combine DPI scaling with size reduction
+                        base_scale = (dpi or DEFAULT_DPI) / 72  # PDF points to pixels
+                        final_scale = base_scale * scale_factor
+                        matrix = fitz.Matrix(final_scale, final_scale)
+                    else:
+                        # For images, just apply the scale factor
+                        matrix = fitz.Matrix(scale_factor, scale_factor)
+
+                    pix = page.get_pixmap(matrix=matrix)  # type: ignore[attr-defined]
+
+                    actual_width, actual_height = pix.width, pix.height
+                    logger.info(
+                        f"Extracted page {page_id} at target size: {actual_width}x{actual_height} (scale: {scale_factor:.3f})"
+                    )
+
+                else:
+                    # No resize needed - image is already smaller than targets
+                    if is_pdf:
+                        pix = page.get_pixmap(dpi=dpi or DEFAULT_DPI)  # type: ignore[attr-defined]
+                    else:
+                        pix = page.get_pixmap()  # type: ignore[attr-defined]
+
+                    # Log actual extracted dimensions
+                    actual_width, actual_height = pix.width, pix.height
+                    logger.info(
+                        f"Page {page_id} already fits target size, extracted at: {actual_width}x{actual_height}"
+                    )
+            else:
+                # No valid target dimensions - use original extraction
+                if is_pdf:
+                    pix = page.get_pixmap(dpi=dpi or DEFAULT_DPI)  # type: ignore[attr-defined]
+                else:
+                    pix = page.get_pixmap()  # type: ignore[attr-defined]
+
+                # Log actual extracted dimensions
+                actual_width, actual_height = pix.width, pix.height
+                logger.info(
+                    f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
+                )
+        else:
+            # No resize config - extract at original size
+            if is_pdf:
+                pix = page.get_pixmap(dpi=dpi or DEFAULT_DPI)  # type: ignore[attr-defined]
+            else:
+                pix = page.get_pixmap()  # type: ignore[attr-defined]
+
+            # Log actual extracted dimensions
+            actual_width, actual_height = pix.width, pix.height
+            logger.info(
+                f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
+            )
+
+        return encode_page_pixmap(pix, encoding_config)
+    finally:
+        # Aggressive cleanup of PyMuPDF pixmap to prevent memory leaks
+        if pix is not None:
+            pix = None
+
+
+def encode_page_pixmap(
+    pix: fitz.Pixmap, encoding_config: Optional[Dict[str, Any]] = None
+) -> bytes:
+    """
+    Encode a rendered page as JPEG.
+
+    Args:
+        pix: Rendered page pixmap
+        encoding_config: Optional dict with quality (JPEG quality 1-100, default 95)
+            and color_mode ("color", "grayscale", or "auto" for grayscale when the
+            page has no color)
+
+    Returns:
+        JPEG image bytes
+    """
+    if not encoding_config:
+        return pix.tobytes("jpeg")
+
+    color_mode = encoding_config.get("color_mode")
+    if pix.n - pix.alpha >= 3 and color_mode in ("grayscale", "auto"):
+        if color_mode == "grayscale" or (
+            pix.n == 3
+            and image.is_monochrome(
+                PIL.Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            )
+        ):
+            pix = fitz.Pixmap(fitz.csGRAY, pix)
+
+    return pix.tobytes("jpeg", jpg_quality=encoding_config.get("quality") or 95)
+
+
 class OcrService:
     """Service for OCR processing of documents using AWS Textract or Amazon Bedrock."""
 
@@ -87,6 +283,20 @@ class OcrService:
             self.bedrock_config = bedrock_config
             self.preprocessing_config = preprocessing_config
             self.enhanced_features = enhanced_features
+            self.rasterization_engine = "thread"
+            self.rasterization_workers = None
+            self.ingestion_mode = "memory"
+            self.ingestion_chunk_size = 8 * 1024 * 1024
+            self.spool_dir = None
+            self.page_cache = None
+            self.text_layer_config = None
+            self.upload_mode = "sync"
+            self.upload_max_pending = 64
+            self.upload_workers = None
+            self.concurrency_config = None
+            self.memory_config = OCRMemoryConfig()
+            self.render_converted_images = True
+            self.encoding_config = None
         else:
             # Convert dict to IDPConfig if needed
             if config is not None and isinstance(config, dict):
@@ -109,6 +319,68 @@ class OcrService:
             # Extract DPI from image configuration (Pydantic handles type conversion!)
             self.dpi = self.config.ocr.image.dpi
 
+            # Extract page rasterization settings (thread or process pool)
+            self.rasterization_engine = self.config.ocr.rasterization.engine
+            self.rasterization_workers = self.config.ocr.rasterization.max_workers
+
+            # Extract document ingestion settings (in-memory or spooled to disk)
+            ingestion_config = self.config.ocr.ingestion
+            self.ingestion_mode = ingestion_config.mode
+            self.ingestion_chunk_size = ingestion_config.chunk_size_mb * 1024 * 1024
+            self.spool_dir = ingestion_config.spool_dir
+
+            # Extract page result cache settings
+            cache_config = self.config.ocr.cache
+            self.page_cache = (
+                OcrPageCache(bucket=cache_config.bucket, prefix=cache_config.prefix)
+                if cache_config.enabled
+                else None
+            )
+
+            # Extract born-digital text layer settings
+            self.text_layer_config = (
+                self.config.ocr.text_layer
+                if self.config.ocr.text_layer.enabled
+                else None
+            )
+
+            # Extract page artifact upload settings (synchronous or queued)
+            upload_config = self.config.ocr.upload
+            self.upload_mode = upload_config.mode
+            self.upload_max_pending = upload_config.max_pending
+            self.upload_workers = upload_config.max_workers
+
+            # Extract page request concurrency settings (fixed or adaptive)
+            self.concurrency_config = (
+                self.config.ocr.concurrency
+                if self.config.ocr.concurrency.mode == "adaptive"
+                else None
+            )
+
+            # Extract page memory admission settings (memory budget or off)
+            self.memory_config = (
+                self.config.ocr.memory
+                if self.config.ocr.memory.mode == "budget"
+                else None
+            )
+
+            # Page image JPEG quality and color mode (None keeps PyMuPDF defaults)
+            image_config = self.config.ocr.image
+            if image_config.quality or image_config.color_mode:
+                self.encoding_config = {
+                    "quality": image_config.quality,
+                    "color_mode": image_config.color_mode,
+                }
+            else:
+                self.encoding_config = None
+
+            # Converted txt/csv/xlsx/docx pages only get images if a later
+            # stage uses them (lazy conversion mode)
+            self.render_converted_images = (
+                self.config.ocr.conversion.mode == "eager"
+                or self._page_images_needed(self.config)
+            )
+
             # Extract enhanced features (type-safe access)
             features_config = self.config.ocr.features
             if features_config:
@@ -230,6 +502,13 @@ class OcrService:
                 f"Invalid backend: {backend}. Must be 'textract', 'bedrock', or 'none'"
             )
 
+        # Adaptive concurrency only applies to Textract page requests; page
+        # workers are sized for the upper bound of the limit
+        if self.backend != "textract":
+            self.concurrency_config = None
+        if self.concurrency_config is not None:
+            self.max_workers = self.concurrency_config.max_limit or self.max_workers
+
         # Initialize clients based on backend
         if self.backend == "textract":
             # Define valid Textract feature types
@@ -263,6 +542,11 @@ class OcrService:
             )
 
             logger.info("OCR Service initialized with Textract backend")
+            if self.concurrency_config is not None:
+                logger.info(
+                    f"Adaptive Textract concurrency enabled, limit "
+                    f"{self.concurrency_config.min_limit}-{self.max_workers}"
+                )
         elif self.backend == "bedrock":
             # Enhanced features not used with Bedrock
             self.enhanced_features = False
@@ -283,6 +567,9 @@ class OcrService:
                     f"Missing required bedrock_config fields: {missing_fields}"
                 )
 
+            # Page workers call Bedrock concurrently; size the shared pool for them
+            bedrock.reserve_connections(self.max_workers)
+
             logger.info(
                 f"OCR Service initialized with Bedrock backend, config: {self.bedrock_config}"
             )
@@ -303,8 +590,51 @@ class OcrService:
             f"S3 client initialized with {max(self.max_workers, 10)} connection pool size"
         )
 
+        # Queued uploads use their own S3 client so they do not compete with
+        # the page workers for connections
+        self.upload_workers = self.upload_workers or max(self.max_workers, 10)
+        self.upload_s3_client = None
+        if self.upload_mode == "async":
+            self.upload_s3_client = boto3.client(
+                "s3",
+                config=Config(
+                    retries={"max_attempts": 10, "mode": "adaptive"},
+                    max_pool_connections=self.upload_workers,
+                ),
+            )
+            logger.info(
+                f"Artifact upload queue enabled with {self.upload_workers} workers, "
+                f"max {self.upload_max_pending} pending uploads"
+            )
+
         # Initialize document converter for non-PDF formats
-        self.document_converter = DocumentConverter(dpi=self.dpi or 150)
+        self.document_converter = DocumentConverter(
+            dpi=self.dpi or 150, max_workers=self.max_workers
+        )
+
+        # Process-pool rasterizer for the document currently being processed
+        # (only set while process_document runs with the 'process' engine)
+        self._page_rasterizer: Optional[ProcessPoolRasterizer] = None
+
+        # Peak RSS observed while processing the last document, sampled at the
+        # start and end of the document and whenever a page finishes
+        self.peak_memory_mb: Optional[float] = None
+        self._memory_lock = threading.Lock()
+
+        # Page memory budget usage of the last PDF/image document (budget
+        # admission mode inside Lambda or with ocr.memory.budget_mb only)
+        self.admission_stats: Optional[AdmissionStats] = None
+
+        # Upload queue for the document currently being processed (async upload
+        # mode only) and the time page workers spent waiting on it
+        self._upload_queue: Optional[ArtifactUploadQueue] = None
+        self.upload_wait_seconds: Optional[float] = None
+
+        # Concurrency controller shared by the page workers of the document
+        # currently being processed (adaptive concurrency mode only) and its
+        # final statistics
+        self._concurrency: Optional[AimdConcurrencyController] = None
+        self.concurrency_stats: Optional[ConcurrencyStats] = None
 
     def process_document(self, document: Document) -> Document:
         """
@@ -319,139 +649,128 @@ class OcrService:
         """
         t0 = time.time()
 
-        # Get the document from S3
+        # Track memory for the whole document, including ingestion
+        self.peak_memory_mb = None
+        self._record_memory_sample()
+        spooled_path = None
         try:
-            response = self.s3_client.get_object(
-                Bucket=document.input_bucket, Key=document.input_key
+            # Get the document from S3
+            try:
+                response = self.s3_client.get_object(
+                    Bucket=document.input_bucket, Key=document.input_key
+                )
+                if self.ingestion_mode == "spool":
+                    # Stream to disk so peak memory does not grow with file size
+                    spooled_path, file_head = self._spool_s3_body(
+                        response["Body"], document.input_key
+                    )
+                    file_content = None
+                else:
+                    file_content = response["Body"].read()
+                    file_head = file_content
+                t1 = time.time()
+                logger.debug(f"Time taken for S3 GetObject: {t1 - t0:.6f} seconds")
+            except Exception as e:
+                import traceback
+
+                error_msg = f"Error retrieving document from S3: {str(e)}"
+                stack_trace = traceback.format_exc()
+                logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
+                document.errors.append(f"{error_msg} (see logs for full trace)")
+                document.status = Status.FAILED
+                return document
+
+            self._process_document_content(
+                document, file_content, file_head, spooled_path
             )
-            file_content = response["Body"].read()
-            t1 = time.time()
-            logger.debug(f"Time taken for S3 GetObject: {t1 - t0:.6f} seconds")
-        except Exception as e:
-            import traceback
+        finally:
+            self._record_memory_sample()
+            self._remove_spooled_file(spooled_path)
 
-            error_msg = f"Error retrieving document from S3: {str(e)}"
-            stack_trace = traceback.format_exc()
-            logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
-            document.errors.append(f"{error_msg} (see logs for full trace)")
-            document.status = Status.FAILED
-            return document
+        t2 = time.time()
+        logger.info(f"OCR processing completed in {t2 - t0:.2f} seconds")
+        logger.info(
+            f"Processed {len(document.pages)} pages, with {len(document.errors)} errors"
+        )
+        if self.peak_memory_mb is not None:
+            logger.info(f"Peak memory usage during OCR: {self.peak_memory_mb:.1f} MB")
+        return document
+
+    def _process_document_content(
+        self,
+        document: Document,
+        file_content: Optional[bytes],
+        file_head: bytes,
+        spooled_path: Optional[str],
+    ) -> None:
+        """
+        Detect the file type and run OCR over every page of the document.
 
+        Args:
+            document: Document model object to update with OCR results
+            file_content: Full document bytes, or None when the document was spooled
+            file_head: Leading bytes of the document used for file type detection
+            spooled_path: Path of the spooled document file (spool ingestion mode only)
+        """
         # Detect file type and process accordingly
+        self._start_upload_queue()
+        self._start_concurrency_controller()
         try:
-            file_type = self._detect_file_type(document.input_key, file_content)
+            file_type = self._detect_file_type(
+                document.input_key, file_head, truncated=file_content is None
+            )
             logger.info(f"Detected file type: {file_type}")
 
             if file_type in ["txt", "csv", "xlsx", "docx"]:
-                # Process non-PDF documents
-                pages_data = self._process_non_pdf_document(file_type, file_content)
-                document.num_pages = len(pages_data)
+                # Converters need the whole file; these formats are small
+                if file_content is None:
+                    file_content = self._read_spooled_file(spooled_path)
 
-                # Process each page
-                for page_index, (image_bytes, page_text) in enumerate(pages_data):
-                    page_id = str(page_index + 1)
-                    try:
-                        ocr_result, page_metering = self._process_converted_page(
-                            page_index,
-                            image_bytes,
-                            page_text,
-                            document.output_bucket,
-                            document.input_key,
-                        )
-
-                        # Create Page object and add to document
-                        document.pages[page_id] = Page(
-                            page_id=page_id,
-                            image_uri=ocr_result["image_uri"],
-                            raw_text_uri=ocr_result["raw_text_uri"],
-                            parsed_text_uri=ocr_result["parsed_text_uri"],
-                            text_confidence_uri=ocr_result["text_confidence_uri"],
-                        )
-
-                        # Merge metering data
-                        document.metering = utils.merge_metering_data(
-                            document.metering, page_metering
-                        )
-
-                    except Exception as e:
-                        import traceback
-
-                        error_msg = f"Error processing page {page_index + 1}: {str(e)}"
-                        stack_trace = traceback.format_exc()
-                        logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
-                        document.errors.append(f"{error_msg} (see logs for full trace)")
+                # Process non-PDF documents
+                converted_pages = self._process_non_pdf_document(
+                    file_type, file_content
+                )
+                document.num_pages = len(converted_pages)
+                self._process_converted_pages(document, converted_pages)
             else:
                 # Process PDF/image documents using existing logic
-                pdf_document = fitz.open(stream=file_content, filetype=file_type)
+                if spooled_path:
+                    # Open from disk - MuPDF reads page objects on demand
+                    pdf_document = fitz.open(spooled_path, filetype=file_type)
+                else:
+                    pdf_document = fitz.open(stream=file_content, filetype=file_type)
                 num_pages = len(pdf_document)
                 document.num_pages = num_pages
 
-                with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=self.max_workers
-                ) as executor:
-                    # Pass original file content for image files
-                    original_content = file_content if not pdf_document.is_pdf else None
-
-                    future_to_page = {
-                        executor.submit(
-                            self._process_single_page,
-                            i,
-                            pdf_document,
-                            document.output_bucket,
-                            document.input_key,
-                            original_content,
-                        ): i
-                        for i in range(num_pages)
-                    }
+                # Image files are processed from their original bytes
+                if not pdf_document.is_pdf and file_content is None:
+                    file_content = self._read_spooled_file(spooled_path)
 
-                    # Start memory monitoring in background thread
-                    memory_monitor_shutdown = self._start_memory_monitoring()
-                    completed_pages = 0
+                # Render pages in a separate process pool if configured, so the
+                # thread pool below only waits on Textract/Bedrock/S3 I/O
+                rasterizer_path = None
+                if (
+                    self.rasterization_engine == "process"
+                    and pdf_document.is_pdf
+                    and num_pages > 1
+                ):
+                    rasterizer_path = spooled_path or self._spool_bytes(
+                        file_content, f".{file_type}"
+                    )
+                    self._start_page_rasterizer(rasterizer_path)
 
-                    try:
-                        for future in concurrent.futures.as_completed(future_to_page):
-                            page_index = future_to_page[future]
-                            page_id = str(page_index + 1)
-                            try:
-                                ocr_result, page_metering = future.result()
-
-                                # Create Page object and add to document
-                                document.pages[page_id] = Page(
-                                    page_id=page_id,
-                                    image_uri=ocr_result["image_uri"],
-                                    raw_text_uri=ocr_result["raw_text_uri"],
-                                    parsed_text_uri=ocr_result["parsed_text_uri"],
-                                    text_confidence_uri=ocr_result[
-                                        "text_confidence_uri"
-                                    ],
-                                )
-
-                                # Merge metering data
-                                document.metering = utils.merge_metering_data(
-                                    document.metering, page_metering
-                                )
-
-                                completed_pages += 1
-
-                            except Exception as e:
-                                import traceback
-
-                                error_msg = (
-                                    f"Error processing page {page_index + 1}: {str(e)}"
-                                )
-                                stack_trace = traceback.format_exc()
-                                logger.error(
-                                    f"{error_msg}\nStack trace:\n{stack_trace}"
-                                )
-                                document.errors.append(
-                                    f"{error_msg} (see logs for full trace)"
-                                )
-                    finally:
-                        # Stop memory monitoring
-                        memory_monitor_shutdown.set()
+                try:
+                    self._process_pdf_pages(document, pdf_document, file_content)
+                finally:
+                    self._stop_page_rasterizer()
+                    if rasterizer_path != spooled_path:
+                        self._remove_spooled_file(rasterizer_path)
 
                 pdf_document.close()
 
+            # All page artifacts must be in S3 before the pages are finalized
+            self._flush_upload_queue(document)
+
             # Sort the pages dictionary by ascending page number
             logger.info(f"Sorting {len(document.pages)} pages by page number")
 
@@ -475,13 +794,386 @@ class OcrService:
             logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
             document.errors.append(f"{error_msg} (see logs for full trace)")
             document.status = Status.FAILED
+        finally:
+            self._stop_concurrency_controller()
+            self._stop_upload_queue()
+
+    def _start_upload_queue(self) -> None:
+        """Start the artifact upload queue for a document (async upload mode only)."""
+        self.upload_wait_seconds = None
+        if self.upload_mode == "async":
+            self._upload_queue = ArtifactUploadQueue(
+                self.upload_s3_client,
+                max_pending=self.upload_max_pending,
+                max_workers=self.upload_workers,
+            )
 
-        t2 = time.time()
-        logger.info(f"OCR processing completed in {t2 - t0:.2f} seconds")
+    def _stop_upload_queue(self) -> None:
+        """Wait for any remaining uploads and stop the upload queue."""
+        if self._upload_queue is not None:
+            self._upload_queue.close()
+            self._upload_queue = None
+
+    def _start_concurrency_controller(self) -> None:
+        """Create the AIMD controller for a document (adaptive concurrency only)."""
+        self.concurrency_stats = None
+        if self.concurrency_config is None:
+            return
+        max_limit = self.max_workers
+        initial_limit = self.concurrency_config.initial_limit or max(
+            self.concurrency_config.min_limit, max_limit // 2
+        )
+        self._concurrency = AimdConcurrencyController(
+            initial_limit=initial_limit,
+            min_limit=self.concurrency_config.min_limit,
+            max_limit=max_limit,
+            decrease_factor=self.concurrency_config.decrease_factor,
+        )
+        self._concurrency.register_throttle_handler(self.textract_client, "textract")
+
+    def _stop_concurrency_controller(self) -> None:
+        """Detach the controller and publish its final limit and throttle count."""
+        if self._concurrency is None:
+            return
+        controller, self._concurrency = self._concurrency, None
+        controller.unregister_throttle_handler(self.textract_client, "textract")
+        stats = controller.stats
+        self.concurrency_stats = stats
         logger.info(
-            f"Processed {len(document.pages)} pages, with {len(document.errors)} errors"
+            f"Textract concurrency: final limit {stats.limit} "
+            f"(range {stats.min_limit_reached}-{stats.max_limit_reached}, "
+            f"max in flight {stats.max_in_flight}), {stats.throttles} throttles, "
+            f"{stats.decreases} decreases, slot wait {stats.wait_seconds:.2f}s"
         )
-        return document
+        try:
+            metrics.put_metric("OcrConcurrencyLimit", stats.limit)
+            metrics.put_metric("OcrThrottles", stats.throttles)
+        except Exception as e:
+            logger.warning(f"Failed to publish OCR concurrency metrics: {str(e)}")
+
+    def _textract_slot(self):
+        """Slot for one Textract request; a no-op unless concurrency is adaptive."""
+        if self._concurrency is None:
+            return contextlib.nullcontext()
+        return self._concurrency.slot()
+
+    def _run_textract(self, image_bytes: bytes, page_id: int) -> Dict[str, Any]:
+        """
+        Run Textract on a page image within a concurrency slot.
+
+        Args:
+            image_bytes: Page image to analyze
+            page_id: Page number for logging purposes
+
+        Returns:
+            Textract API response
+        """
+        with self._textract_slot():
+            if isinstance(self.enhanced_features, list) and self.enhanced_features:
+                return self._analyze_document(image_bytes, page_id)
+            return self.textract_client.detect_document_text(
+                Document={"Bytes": image_bytes}
+            )
+
+    def _write_content(
+        self,
+        content: Any,
+        bucket: str,
+        key: str,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """Write a page artifact to S3, through the upload queue when enabled."""
+        if self._upload_queue is not None:
+            self._upload_queue.put(content, bucket, key, content_type=content_type)
+        else:
+            s3.write_content(content, bucket, key, content_type=content_type)
+
+    def _store_cached_page(
+        self, cache_key: str, output_bucket: str, page_prefix: str
+    ) -> None:
+        """Store a page's artifacts in the page cache once they are in S3."""
+        if self._upload_queue is not None:
+            self._upload_queue.defer(
+                f"{page_prefix}/",
+                lambda: self.page_cache.store(cache_key, output_bucket, page_prefix),
+            )
+        else:
+            self.page_cache.store(cache_key, output_bucket, page_prefix)
+
+    def _flush_upload_queue(self, document: Document) -> None:
+        """
+        Wait for all queued uploads and drop pages whose artifacts failed to upload.
+
+        Args:
+            document: Document whose pages were processed
+        """
+        if self._upload_queue is None:
+            return
+        failures = self._upload_queue.flush()
+        for page_id in list(document.pages):
+            page_prefix = f"{document.input_key}/pages/{page_id}/"
+            page_errors = [
+                error for key, error in failures.items() if key.startswith(page_prefix)
+            ]
+            if page_errors:
+                del document.pages[page_id]
+                error_msg = (
+                    f"Error uploading artifacts for page {page_id}: {page_errors[0]}"
+                )
+                logger.error(error_msg)
+                document.errors.append(error_msg)
+
+        stats = self._upload_queue.stats
+        self.upload_wait_seconds = stats.wait_seconds
+        logger.info(
+            f"Artifact upload queue: {stats.uploads} uploads ({stats.failed} failed), "
+            f"page workers waited {stats.wait_seconds:.2f}s total "
+            f"(max {stats.max_wait_seconds:.2f}s), final flush {stats.flush_seconds:.2f}s"
+        )
+
+    def _spool_s3_body(self, body: Any, input_key: str) -> Tuple[str, bytes]:
+        """
+        Stream an S3 object body to a temporary file in fixed-size chunks.
+
+        Args:
+            body: S3 GetObject response body (StreamingBody or file-like object)
+            input_key: S3 key of the document, used for the temp file suffix
+
+        Returns:
+            Tuple of (spooled file path, leading bytes for file type detection)
+        """
+        suffix = os.path.splitext(input_key)[1]
+        head = bytearray()
+        total_bytes = 0
+
+        def chunks():
+            nonlocal total_bytes
+            while True:
+                chunk = body.read(self.ingestion_chunk_size)
+                if not chunk:
+                    break
+                if len(head) < FILE_TYPE_SNIFF_BYTES:
+                    head.extend(chunk[: FILE_TYPE_SNIFF_BYTES - len(head)])
+                total_bytes += len(chunk)
+                yield chunk
+
+        spooled_path = self._spool_bytes(chunks(), suffix)
+        logger.info(
+            f"Spooled {total_bytes / (1024 * 1024):.1f} MB document to {spooled_path}"
+        )
+        return spooled_path, bytes(head)
+
+    def _spool_bytes(self, content: Union[bytes, Iterable[bytes]], suffix: str) -> str:
+        """
+        Write bytes (or an iterable of byte chunks) to a new temporary file.
+
+        Args:
+            content: Bytes or iterable of byte chunks to write
+            suffix: Temp file suffix (e.g. ".pdf")
+
+        Returns:
+            Path of the temporary file; the caller is responsible for removing it
+        """
+        import tempfile
+
+        with tempfile.NamedTemporaryFile(
+            suffix=suffix, dir=self.spool_dir, delete=False
+        ) as spooled_file:
+            try:
+                if isinstance(content, (bytes, bytearray)):
+                    spooled_file.write(content)
+                else:
+                    for chunk in content:
+                        spooled_file.write(chunk)
+            except Exception:
+                spooled_file.close()
+                os.remove(spooled_file.name)
+                raise
+            return spooled_file.name
+
+    def _read_spooled_file(self, spooled_path: str) -> bytes:
+        """Read a spooled document back into memory (small formats and images only)."""
+        with open(spooled_path, "rb") as spooled_file:
+            return spooled_file.read()
+
+    def _remove_spooled_file(self, spooled_path: Optional[str]) -> None:
+        """Remove a spooled temp file if it exists."""
+        if spooled_path and os.path.exists(spooled_path):
+            os.remove(spooled_path)
+
+    def _process_pdf_pages(
+        self,
+        document: Document,
+        pdf_document: fitz.Document,
+        file_content: bytes,
+    ) -> None:
+        """
+        Process all pages of a PDF/image document concurrently and add them to the document.
+
+        Args:
+            document: Document model object to update with page results
+            pdf_document: PyMuPDF document object
+            file_content: Original file content (used directly for image files)
+        """
+        num_pages = document.num_pages
+
+        # Pass original file content for image files
+        original_content = file_content if not pdf_document.is_pdf else None
+
+        # Size every page before any worker touches the document
+        budget = self._create_memory_budget()
+        page_memory_mb = [0.0] * num_pages
+        if budget is not None:
+            page_memory_mb = [
+                self._estimate_page_memory_mb(pdf_document, i, original_content)
+                for i in range(num_pages)
+            ]
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            # Submit pages in order; with a memory budget, each page waits
+            # until its estimated memory fits next to the pages in flight
+            future_to_page = {}
+            for i in range(num_pages):
+                if budget is not None:
+                    budget.acquire(page_memory_mb[i])
+                future = executor.submit(
+                    self._process_single_page,
+                    i,
+                    pdf_document,
+                    document.output_bucket,
+                    document.input_key,
+                    original_content,
+                )
+                future.add_done_callback(
+                    lambda _, cost=page_memory_mb[i]: self._finish_page_memory(
+                        budget, cost
+                    )
+                )
+                future_to_page[future] = i
+
+            completed_pages = 0
+
+            for future in concurrent.futures.as_completed(future_to_page):
+                page_index = future_to_page[future]
+                page_id = str(page_index + 1)
+                try:
+                    ocr_result, page_metering = future.result()
+
+                    # Create Page object and add to document
+                    document.pages[page_id] = Page(
+                        page_id=page_id,
+                        image_uri=ocr_result["image_uri"],
+                        raw_text_uri=ocr_result["raw_text_uri"],
+                        parsed_text_uri=ocr_result["parsed_text_uri"],
+                        text_confidence_uri=ocr_result["text_confidence_uri"],
+                    )
+
+                    # Merge metering data
+                    document.metering = utils.merge_metering_data(
+                        document.metering, page_metering
+                    )
+
+                    completed_pages += 1
+
+                except Exception as e:
+                    import traceback
+
+                    error_msg = f"Error processing page {page_index + 1}: {str(e)}"
+                    stack_trace = traceback.format_exc()
+                    logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
+                    document.errors.append(f"{error_msg} (see logs for full trace)")
+
+        if budget is not None:
+            self._finish_memory_budget(budget)
+
+    def _create_memory_budget(self) -> Optional[MemoryBudget]:
+        """
+        Create the page memory budget for a document (budget admission mode only).
+
+        The budget is ocr.memory.budget_mb if set, otherwise a share of the Lambda
+        memory size less the memory already in use. Outside Lambda without
+        budget_mb, pages are admitted up to max_workers only.
+
+        Returns:
+            MemoryBudget, or None if admission is off or no budget applies
+        """
+        self.admission_stats = None
+        if self.memory_config is None:
+            return None
+        budget_mb = self.memory_config.budget_mb or lambda_memory_budget_mb(
+            self.memory_config.memory_fraction, self._record_memory_sample()
+        )
+        if budget_mb is None:
+            return None
+        logger.info(f"Page memory budget: {budget_mb:.0f} MB")
+        return MemoryBudget(budget_mb)
+
+    def _estimate_page_memory_mb(
+        self,
+        pdf_document: fitz.Document,
+        page_index: int,
+        original_content: Optional[bytes] = None,
+    ) -> float:
+        """
+        Estimate the memory needed to process a page from its size.
+
+        PDF pages are sized from the page rectangle at the rendering DPI; image
+        files from the pixel size in the image header.
+
+        Args:
+            pdf_document: PyMuPDF document object
+            page_index: Zero-based page index
+            original_content: Original image bytes (image files only)
+
+        Returns:
+            Estimated memory in MB
+        """
+        try:
+            if pdf_document.is_pdf or not original_content:
+                rect = pdf_document.page_cropbox(page_index)
+                width, height = rect.width, rect.height
+            else:
+                import io
+
+                from PIL import Image as PILImage
+
+                with PILImage.open(io.BytesIO(original_content)) as img:
+                    width, height = img.size
+            return estimate_page_memory_mb(
+                width,
+                height,
+                is_pdf=pdf_document.is_pdf,
+                dpi=self.dpi,
+                resize_config=self.resize_config,
+            )
+        except Exception as e:
+            logger.debug(f"Could not estimate memory of page {page_index + 1}: {e}")
+            return PAGE_OVERHEAD_MB
+
+    def _finish_page_memory(
+        self, budget: Optional[MemoryBudget] = None, page_memory_mb: float = 0.0
+    ) -> None:
+        """Sample RSS for a finished page, then return its memory to the budget."""
+        self._record_memory_sample()
+        if budget is not None:
+            budget.release(page_memory_mb)
+
+    def _finish_memory_budget(self, budget: MemoryBudget) -> None:
+        """Publish the budget usage of a document."""
+        stats = budget.stats
+        self.admission_stats = stats
+        logger.info(
+            f"Page memory budget {stats.budget_mb:.0f} MB: max estimated in use "
+            f"{stats.max_in_use_mb:.0f} MB, max pages in flight {stats.max_in_flight}, "
+            f"{stats.oversized_pages} pages run alone, {stats.waits} admission "
+            f"waits ({stats.wait_seconds:.2f}s)"
+        )
+        try:
+            metrics.put_metric("OcrAdmissionWaitSeconds", stats.wait_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to publish OCR admission metrics: {str(e)}")
 
     def _feature_combo(self):
         """Return the pricing feature combination string based on enhanced_features.
@@ -556,6 +1248,14 @@ class OcrService:
                 pdf_document, output_bucket, prefix, original_file_content
             )
 
+        # Use the embedded text layer instead of OCR for born-digital pages
+        if self.text_layer_config is not None and pdf_document.is_pdf:
+            text_layer_result = self._process_single_page_text_layer(
+                page_index, pdf_document, output_bucket, prefix
+            )
+            if text_layer_result is not None:
+                return text_layer_result
+
         # Use the appropriate backend for PDFs
         if self.backend == "none":
             return self._process_single_page_none(
@@ -846,13 +1546,23 @@ class OcrService:
 
         # Store image with appropriate format
         image_key = f"{prefix}/pages/{page_id}/image.{img_ext}"
-        s3.write_content(img_data, output_bucket, image_key, content_type=content_type)
+        self._write_content(
+            img_data, output_bucket, image_key, content_type=content_type
+        )
 
         t1 = time.time()
         logger.debug(
             f"Time for image processing (page {page_id}): {t1 - t0:.6f} seconds"
         )
 
+        # Reuse OCR results for an identical image if caching is enabled
+        cache_key = self._page_cache_key(img_data)
+        cached_result = self._restore_cached_page(
+            cache_key, output_bucket, prefix, page_id, image_key
+        )
+        if cached_result is not None:
+            return cached_result
+
         # Process with OCR based on backend
         if self.backend == "none":
             # No OCR processing
@@ -863,7 +1573,7 @@ class OcrService:
 
             # Store empty raw OCR response
             raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-            s3.write_content(
+            self._write_content(
                 empty_ocr_response,
                 output_bucket,
                 raw_text_key,
@@ -876,7 +1586,7 @@ class OcrService:
             }
 
             text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-            s3.write_content(
+            self._write_content(
                 text_confidence_data,
                 output_bucket,
                 text_confidence_key,
@@ -886,7 +1596,7 @@ class OcrService:
             # Store empty parsed text result
             parsed_result = {"text": ""}
             parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-            s3.write_content(
+            self._write_content(
                 parsed_result,
                 output_bucket,
                 parsed_text_key,
@@ -929,7 +1639,7 @@ class OcrService:
 
             # Store raw Bedrock response
             raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-            s3.write_content(
+            self._write_content(
                 response_with_metering["response"],
                 output_bucket,
                 raw_text_key,
@@ -942,7 +1652,7 @@ class OcrService:
             }
 
             text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-            s3.write_content(
+            self._write_content(
                 text_confidence_data,
                 output_bucket,
                 text_confidence_key,
@@ -952,7 +1662,7 @@ class OcrService:
             # Store parsed text result
             parsed_result = {"text": extracted_text}
             parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-            s3.write_content(
+            self._write_content(
                 parsed_result,
                 output_bucket,
                 parsed_text_key,
@@ -970,12 +1680,7 @@ class OcrService:
                 logger.debug("Applied adaptive binarization preprocessing for OCR")
 
             # Process with OCR
-            if isinstance(self.enhanced_features, list) and self.enhanced_features:
-                textract_result = self._analyze_document(ocr_img_data, page_id)
-            else:
-                textract_result = self.textract_client.detect_document_text(
-                    Document={"Bytes": ocr_img_data}
-                )
+            textract_result = self._run_textract(ocr_img_data, page_id)
 
             # Extract metering data
             feature_combo = self._feature_combo()
@@ -987,33 +1692,39 @@ class OcrService:
 
             # Store raw Textract response
             raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-            s3.write_content(
+            self._write_content(
                 textract_result,
                 output_bucket,
                 raw_text_key,
                 content_type="application/json",
             )
 
-            # Generate and store text confidence data
-            text_confidence_data = self._generate_text_confidence_data(textract_result)
+            # Generate text confidence data and markdown in one pass over the blocks
+            text_confidence_data, parsed_result = self._convert_textract_response(
+                textract_result, page_id
+            )
             text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-            s3.write_content(
+            self._write_content(
                 text_confidence_data,
                 output_bucket,
                 text_confidence_key,
                 content_type="application/json",
             )
 
-            # Parse and store text content
-            parsed_result = self._parse_textract_response(textract_result, page_id)
+            # Store parsed text content
             parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-            s3.write_content(
+            self._write_content(
                 parsed_result,
                 output_bucket,
                 parsed_text_key,
                 content_type="application/json",
             )
 
+        if cache_key:
+            self._store_cached_page(
+                cache_key, output_bucket, f"{prefix}/pages/{page_id}"
+            )
+
         t2 = time.time()
         logger.debug(f"Total processing time for image file: {t2 - t0:.6f} seconds")
 
@@ -1027,50 +1738,206 @@ class OcrService:
 
         return result, metering
 
-    def _start_memory_monitoring(self):
+    def _page_cache_key(self, img_bytes: bytes) -> Optional[str]:
         """
-        Start background memory monitoring that logs usage every 5 seconds.
+        Compute the OCR page cache key for a rendered page image.
+
+        The key covers the image bytes and every setting that changes the OCR
+        output: backend, Textract API and features, Bedrock model and prompts,
+        and preprocessing.
+
+        Args:
+            img_bytes: Rendered page image (before OCR preprocessing)
 
         Returns:
-            Event object that can be set to stop monitoring
+            Cache key, or None if caching is disabled or the backend performs no OCR
         """
-        import threading
+        if self.page_cache is None or self.backend == "none":
+            return None
 
-        shutdown_event = threading.Event()
+        preprocessing = bool(
+            self.preprocessing_config and self.preprocessing_config.get("enabled")
+        )
+        if self.backend == "bedrock":
+            settings = (
+                "bedrock",
+                self.bedrock_config["model_id"],
+                self.bedrock_config["system_prompt"],
+                self.bedrock_config["task_prompt"],
+            )
+        else:
+            features = (
+                sorted(self.enhanced_features)
+                if isinstance(self.enhanced_features, list)
+                else []
+            )
+            settings = (
+                "textract",
+                f"{self._get_api_name()}{self._feature_combo()}",
+                ",".join(features),
+            )
+        return OcrPageCache.compute_key(
+            img_bytes, *settings, f"preprocessing={preprocessing}"
+        )
 
-        def monitor_memory():
-            while not shutdown_event.is_set():
-                try:
-                    import os
+    def _restore_cached_page(
+        self,
+        cache_key: Optional[str],
+        output_bucket: str,
+        prefix: str,
+        page_id: int,
+        image_key: str,
+    ) -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+        """
+        Restore a page's OCR artifacts from the page cache.
 
-                    import psutil
+        Args:
+            cache_key: Key from _page_cache_key (None skips the lookup)
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+            page_id: One-based page number
+            image_key: S3 key of the page image already written
 
-                    process = psutil.Process(os.getpid())
-                    memory_info = process.memory_info()
-                    memory_mb = memory_info.rss / (1024 * 1024)  # Convert to MB
+        Returns:
+            Tuple of (page_result_dict, metering_data) on a cache hit, otherwise None
+        """
+        if not cache_key or not self.page_cache.restore(
+            cache_key, output_bucket, f"{prefix}/pages/{page_id}"
+        ):
+            return None
 
-                    logger.info(f"Memory usage: {memory_mb:.1f} MB")
+        logger.info(f"OCR cache hit for page {page_id}")
 
-                    # Warning if memory usage is getting high
-                    if memory_mb > 3500:
-                        logger.warning(
-                            f"HIGH memory usage detected: {memory_mb:.1f} MB"
-                        )
+        # Hits are metered separately from billed OCR calls
+        if self.backend == "bedrock":
+            billing_api = f"bedrock/{self.bedrock_config['model_id']}"
+        else:
+            billing_api = f"textract/{self._get_api_name()}{self._feature_combo()}"
+        metering = {f"OCR/ocr_cache/{billing_api}": {"hits": 1}}
 
-                except ImportError:
-                    logger.debug("psutil not available, skipping memory monitoring")
-                    break
-                except Exception as e:
-                    logger.debug(f"Error monitoring memory: {str(e)}")
+        result = {
+            "raw_text_uri": f"s3://{output_bucket}/{prefix}/pages/{page_id}/rawText.json",
+            "parsed_text_uri": f"s3://{output_bucket}/{prefix}/pages/{page_id}/result.json",
+            "text_confidence_uri": f"s3://{output_bucket}/{prefix}/pages/{page_id}/textConfidence.json",
+            "image_uri": f"s3://{output_bucket}/{image_key}",
+        }
+        return result, metering
+
+    def _record_memory_sample(self) -> Optional[float]:
+        """
+        Sample the current RSS and update ``self.peak_memory_mb``.
+
+        Returns:
+            Current RSS in MB, or None if it cannot be determined
+        """
+        memory_mb = get_rss_mb()
+        with self._memory_lock:
+            if memory_mb is not None and (
+                self.peak_memory_mb is None or memory_mb > self.peak_memory_mb
+            ):
+                self.peak_memory_mb = memory_mb
+        return memory_mb
+
+    def _process_single_page_text_layer(
+        self,
+        page_index: int,
+        pdf_document: fitz.Document,
+        output_bucket: str,
+        prefix: str,
+    ) -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+        """
+        Process a single page from its embedded PDF text layer, without OCR.
+
+        The text layer is scored for character count, unmappable characters and
+        coverage; pages that fail are left to the configured OCR backend.
+
+        Args:
+            page_index: Zero-based index of the page
+            pdf_document: PyMuPDF document object
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+
+        Returns:
+            Tuple of (page_result_dict, metering_data), or None if the page
+            needs OCR
+        """
+        t0 = time.time()
+        page_id = page_index + 1
+
+        page = pdf_document.load_page(page_index)
+        lines, score = extract_text_layer(page)
+        config = self.text_layer_config
+        if not score.passes(
+            config.min_chars, config.max_garbage_ratio, config.min_coverage
+        ):
+            logger.info(
+                f"Page {page_id} text layer not usable (chars={score.char_count}, "
+                f"garbage={score.garbage_ratio:.3f}, coverage={score.coverage:.2f}), "
+                f"using {self.backend} backend"
+            )
+            return None
+
+        # Textract-compatible response so parsing and assessment work unchanged
+        text_layer_response = to_textract_response(lines, page)
+        page = None
+        logger.info(
+            f"Page {page_id} using embedded text layer ({score.char_count} chars, "
+            f"coverage={score.coverage:.2f})"
+        )
+
+        # The page image is still needed downstream (classification, UI, assessment)
+        img_bytes = self._render_page(pdf_document, page_index, page_id)
+        image_key = f"{prefix}/pages/{page_id}/image.jpg"
+        self._write_content(
+            img_bytes, output_bucket, image_key, content_type="image/jpeg"
+        )
+        img_bytes = None
+
+        # Store text layer response in place of the raw OCR response
+        raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
+        self._write_content(
+            text_layer_response,
+            output_bucket,
+            raw_text_key,
+            content_type="application/json",
+        )
+
+        # Generate text confidence data (for efficient assessment) and markdown
+        text_confidence_data, parsed_result = self._convert_textract_response(
+            text_layer_response, page_id
+        )
+        text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
+        self._write_content(
+            text_confidence_data,
+            output_bucket,
+            text_confidence_key,
+            content_type="application/json",
+        )
+
+        # Store parsed text content with markdown
+        parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
+        self._write_content(
+            parsed_result,
+            output_bucket,
+            parsed_text_key,
+            content_type="application/json",
+        )
 
-                # Wait 5 seconds or until shutdown
-                shutdown_event.wait(5.0)
+        t1 = time.time()
+        logger.debug(f"Time for text layer (page {page_id}): {t1 - t0:.6f} seconds")
 
-        # Start monitoring thread
-        monitor_thread = threading.Thread(target=monitor_memory, daemon=True)
-        monitor_thread.start()
+        # Metered separately from billed OCR calls
+        metering = {"OCR/pdf_text_layer": {"pages": 1}}
 
-        return shutdown_event
+        # Create and return page result
+        result = {
+            "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
+            "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
+            "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
+            "image_uri": f"s3://{output_bucket}/{image_key}",
+        }
+
+        return result, metering
 
     def _process_single_page_textract(
         self,
@@ -1095,18 +1962,27 @@ class OcrService:
         page_id = page_index + 1
 
         # Extract page image - now returns image at optimal size directly
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        img_bytes = self._render_page(pdf_document, page_index, page_id)
 
         # Upload processed image to S3 (already at target size if resize config exists)
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
+        self._write_content(
+            img_bytes, output_bucket, image_key, content_type="image/jpeg"
+        )
 
         t1 = time.time()
         logger.debug(
             f"Time for image processing (page {page_id}): {t1 - t0:.6f} seconds"
         )
 
+        # Reuse OCR results for an identical page image if caching is enabled
+        cache_key = self._page_cache_key(img_bytes)
+        cached_result = self._restore_cached_page(
+            cache_key, output_bucket, prefix, page_id, image_key
+        )
+        if cached_result is not None:
+            return cached_result
+
         # Use the extracted image directly for OCR (no additional resize needed)
         ocr_img_bytes = img_bytes
 
@@ -1120,12 +1996,7 @@ class OcrService:
             )
 
         # Process with OCR using potentially resized image
-        if isinstance(self.enhanced_features, list) and self.enhanced_features:
-            textract_result = self._analyze_document(ocr_img_bytes, page_id)
-        else:
-            textract_result = self.textract_client.detect_document_text(
-                Document={"Bytes": ocr_img_bytes}
-            )
+        textract_result = self._run_textract(ocr_img_bytes, page_id)
 
         # Aggressive memory cleanup - clear large image variables immediately after OCR
         img_bytes = None
@@ -1146,33 +2017,39 @@ class OcrService:
 
         # Store raw Textract response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self._write_content(
             textract_result,
             output_bucket,
             raw_text_key,
             content_type="application/json",
         )
 
-        # Generate and store text confidence data for efficient assessment
-        text_confidence_data = self._generate_text_confidence_data(textract_result)
+        # Generate text confidence data (for efficient assessment) and markdown
+        text_confidence_data, parsed_result = self._convert_textract_response(
+            textract_result, page_id
+        )
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self._write_content(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
             content_type="application/json",
         )
 
-        # Parse and store text content with markdown
-        parsed_result = self._parse_textract_response(textract_result, page_id)
+        # Store parsed text content with markdown
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self._write_content(
             parsed_result,
             output_bucket,
             parsed_text_key,
             content_type="application/json",
         )
 
+        if cache_key:
+            self._store_cached_page(
+                cache_key, output_bucket, f"{prefix}/pages/{page_id}"
+            )
+
         t2 = time.time()
         logger.debug(f"Time for Textract (page {page_id}): {t2 - t1:.6f} seconds")
 
@@ -1201,100 +2078,65 @@ class OcrService:
         Returns:
             Image bytes in JPEG format (at target size if resize config exists)
         """
-        pix = None
-        try:
-            # Check if we should extract at target size to avoid memory issues
-            if self.resize_config:
-                target_width = self.resize_config.get("target_width")
-                target_height = self.resize_config.get("target_height")
+        return render_page_image(
+            page, is_pdf, self.dpi, self.resize_config, page_id, self.encoding_config
+        )
 
-                if target_width and target_height:
-                    # Get page dimensions to calculate scaling
-                    page_rect = page.rect
+    def _render_page(
+        self, pdf_document: fitz.Document, page_index: int, page_id: int
+    ) -> bytes:
+        """
+        Render a page image, using the process-pool rasterizer when one is active.
 
-                    if is_pdf:
-                        # For PDF files, calculate dimensions at specified DPI (default to 150 if None)
-                        dpi = self.dpi or 150
-                        original_width = int(page_rect.width * (dpi / 72))
-                        original_height = int(page_rect.height * (dpi / 72))
-                    else:
-                        # For image files, use actual dimensions
-                        original_width = int(page_rect.width)
-                        original_height = int(page_rect.height)
-
-                    # Apply same logic as image.resize_image - preserve aspect ratio, never upscale
-                    width_ratio = target_width / original_width
-                    height_ratio = target_height / original_height
-                    scale_factor = min(
-                        width_ratio, height_ratio
-                    )  # Preserve aspect ratio
-
-                    # Only resize if scale_factor < 1.0 (never upscale)
-                    if scale_factor < 1.0:
-                        # Extract at reduced size using matrix transformation
-                        if is_pdf:
-                            # For PDF, combine DPI scaling with size reduction
-                            dpi = self.dpi or 150
-                            base_scale = dpi / 72  # Convert PDF points to pixels
-                            final_scale = base_scale * scale_factor
-                            matrix = fitz.Matrix(final_scale, final_scale)
-                        else:
-                            # For images, just apply the scale factor
-                            matrix = fitz.Matrix(scale_factor, scale_factor)
+        Args:
+            pdf_document: PyMuPDF document object
+            page_index: Zero-based index of the page
+            page_id: Page number for logging
 
-                        pix = page.get_pixmap(matrix=matrix)  # type: ignore[attr-defined]
+        Returns:
+            Image bytes in JPEG format
+        """
+        if self._page_rasterizer is not None:
+            return self._page_rasterizer.render(page_index)
 
-                        actual_width, actual_height = pix.width, pix.height
-                        logger.info(
-                            f"Extracted page {page_id} at target size: {actual_width}x{actual_height} (scale: {scale_factor:.3f})"
-                        )
+        page = pdf_document.load_page(page_index)
+        return self._extract_page_image(page, pdf_document.is_pdf, page_id)
 
-                    else:
-                        # No resize needed - image is already smaller than targets
-                        if is_pdf:
-                            dpi = self.dpi or 150
-                            pix = page.get_pixmap(dpi=dpi)  # type: ignore[attr-defined]
-                        else:
-                            pix = page.get_pixmap()  # type: ignore[attr-defined]
+    def _start_page_rasterizer(self, document_path: str) -> bool:
+        """
+        Start a process-pool rasterizer over the document file.
 
-                        # Log actual extracted dimensions
-                        actual_width, actual_height = pix.width, pix.height
-                        logger.info(
-                            f"Page {page_id} already fits target size, extracted at: {actual_width}x{actual_height}"
-                        )
-                else:
-                    # No valid target dimensions - use original extraction
-                    if is_pdf:
-                        dpi = self.dpi or 150
-                        pix = page.get_pixmap(dpi=dpi)  # type: ignore[attr-defined]
-                    else:
-                        pix = page.get_pixmap()  # type: ignore[attr-defined]
+        Falls back to in-thread rendering when process pools are not available,
+        e.g. in AWS Lambda which has no POSIX semaphores.
 
-                    # Log actual extracted dimensions
-                    actual_width, actual_height = pix.width, pix.height
-                    logger.info(
-                        f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
-                    )
-            else:
-                # No resize config - extract at original size
-                if is_pdf:
-                    dpi = self.dpi or 150
-                    pix = page.get_pixmap(dpi=dpi)  # type: ignore[attr-defined]
-                else:
-                    pix = page.get_pixmap()  # type: ignore[attr-defined]
+        Args:
+            document_path: Path of the document file each worker opens
 
-                # Log actual extracted dimensions
-                actual_width, actual_height = pix.width, pix.height
-                logger.info(
-                    f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
-                )
+        Returns:
+            True if the rasterizer was started, False if falling back to threads
+        """
+        try:
+            self._page_rasterizer = ProcessPoolRasterizer(
+                document_path,
+                dpi=self.dpi,
+                resize_config=self.resize_config,
+                encoding_config=self.encoding_config,
+                max_workers=self.rasterization_workers,
+            )
+            return True
+        except (OSError, ImportError, NotImplementedError) as e:
+            logger.warning(
+                f"Process-pool rasterization unavailable ({str(e)}), "
+                "falling back to rendering pages in worker threads"
+            )
+            self._page_rasterizer = None
+            return False
 
-            image_bytes = pix.tobytes("jpeg")
-            return image_bytes
-        finally:
-            # Aggressive cleanup of PyMuPDF pixmap to prevent memory leaks
-            if pix is not None:
-                pix = None
+    def _stop_page_rasterizer(self) -> None:
+        """Shut down the process-pool rasterizer if one is running."""
+        if self._page_rasterizer is not None:
+            self._page_rasterizer.close()
+            self._page_rasterizer = None
 
     def _process_single_page_bedrock(
         self,
@@ -1319,18 +2161,27 @@ class OcrService:
         page_id = page_index + 1
 
         # Extract page image - now returns image at optimal size directly
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        img_bytes = self._render_page(pdf_document, page_index, page_id)
 
         # Upload processed image to S3 (already at target size if resize config exists)
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
+        self._write_content(
+            img_bytes, output_bucket, image_key, content_type="image/jpeg"
+        )
 
         t1 = time.time()
         logger.debug(
             f"Time for image processing (page {page_id}): {t1 - t0:.6f} seconds"
         )
 
+        # Reuse OCR results for an identical page image if caching is enabled
+        cache_key = self._page_cache_key(img_bytes)
+        cached_result = self._restore_cached_page(
+            cache_key, output_bucket, prefix, page_id, image_key
+        )
+        if cached_result is not None:
+            return cached_result
+
         # Use the extracted image directly for OCR (no additional resize needed)
         ocr_img_bytes = img_bytes
 
@@ -1370,7 +2221,7 @@ class OcrService:
 
         # Store raw Bedrock response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self._write_content(
             response_with_metering["response"],
             output_bucket,
             raw_text_key,
@@ -1384,7 +2235,7 @@ class OcrService:
         }
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self._write_content(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
@@ -1394,13 +2245,18 @@ class OcrService:
         # Store parsed text result
         parsed_result = {"text": extracted_text}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self._write_content(
             parsed_result,
             output_bucket,
             parsed_text_key,
             content_type="application/json",
         )
 
+        if cache_key:
+            self._store_cached_page(
+                cache_key, output_bucket, f"{prefix}/pages/{page_id}"
+            )
+
         # Create and return page result
         result = {
             "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
@@ -1434,12 +2290,13 @@ class OcrService:
         page_id = page_index + 1
 
         # Extract page image at specified DPI (consistent with other backends)
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        img_bytes = self._render_page(pdf_document, page_index, page_id)
 
         # Upload image to S3
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
+        self._write_content(
+            img_bytes, output_bucket, image_key, content_type="image/jpeg"
+        )
 
         t1 = time.time()
         logger.debug(
@@ -1451,7 +2308,7 @@ class OcrService:
 
         # Store empty raw OCR response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self._write_content(
             empty_ocr_response,
             output_bucket,
             raw_text_key,
@@ -1464,7 +2321,7 @@ class OcrService:
         }
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self._write_content(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
@@ -1474,7 +2331,7 @@ class OcrService:
         # Store empty parsed text result
         parsed_result = {"text": ""}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self._write_content(
             parsed_result,
             output_bucket,
             parsed_text_key,
@@ -1577,28 +2434,7 @@ class OcrService:
         Returns:
             Text confidence data as markdown table with ~80-90% token reduction
         """
-        # Start building the markdown table with explicit left alignment
-        markdown_lines = ["| Text | Confidence |", "|:-----|:-----------|"]
-
-        blocks = raw_ocr_data.get("Blocks", [])
-
-        for block in blocks:
-            if block.get("BlockType") == "LINE" and block.get("Text"):
-                text = block.get("Text", "").replace(
-                    "|", "\\|"
-                )  # Escape pipe characters
-                confidence = round(block.get("Confidence", 0.0), 1)
-
-                # Add text type indicator if it's handwriting
-                if block.get("TextType") == "HANDWRITING":
-                    markdown_lines.append(f"| {text} (HANDWRITING) | {confidence} |")
-                else:
-                    markdown_lines.append(f"| {text} | {confidence} |")
-
-        # Join all lines into a single markdown string
-        markdown_table = "\n".join(markdown_lines)
-
-        return {"text": markdown_table}
+        return {"text": text_confidence_table(raw_ocr_data.get("Blocks", []))}
 
     def _parse_textract_response(
         self, response: Dict[str, Any], page_id: int = None
@@ -1613,8 +2449,26 @@ class OcrService:
         Returns:
             Dictionary with 'text' key containing extracted text
         """
-        from textractor.parsers import response_parser  # type: ignore[import-untyped]
+        return self._convert_textract_response(response, page_id)[1]
+
+    def _convert_textract_response(
+        self, response: Dict[str, Any], page_id: int = None
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Convert a Textract response to text confidence data and markdown text.
+
+        Both outputs are built in a single pass over the response blocks (see
+        idp_common.ocr.textract_markdown), producing the same markdown as
+        textractor's ``to_markdown()``.
+
+        Args:
+            response: Raw Textract API response
+            page_id: Optional page number for logging purposes
 
+        Returns:
+            Tuple of (text confidence data, parsed result), each a dictionary
+            with a 'text' key
+        """
         # Create page identifier for logging
         page_info = f" for page {page_id}" if page_id else ""
 
@@ -1622,43 +2476,16 @@ class OcrService:
         logger.debug(f"Enhanced features{page_info}: {self.enhanced_features}")
 
         try:
-            # Parse the response with textractor - debug level
-            logger.debug(f"Parsing Textract response{page_info} with textractor")
-            parsed_response = response_parser.parse(response)
-
-            try:
-                # First try to convert to markdown
-                text = parsed_response.to_markdown()
-                logger.info(f"Successfully extracted markdown text{page_info}")
-            except Exception as e:
-                # If markdown conversion fails, use plain text instead
-                logger.warning(f"Markdown conversion failed{page_info}: {str(e)}")
-
-                # Identify if it's a known issue - keep these as warnings
-                if "reading_order" in str(e):
-                    if "Signature" in str(e):
-                        logger.warning(
-                            f"Detected Signature object error{page_info} with SIGNATURES feature"
-                        )
-                    elif "KeyValue" in str(e):
-                        logger.warning(
-                            f"Detected KeyValue object error{page_info} with FORMS feature"
-                        )
-
-                # Use plain text instead
-                logger.warning(f"Falling back to plain text extraction{page_info}")
-                text = parsed_response.text
-                logger.info(f"Successfully extracted plain text{page_info}")
-
+            text, confidence_table = convert_textract_response(response)
+            logger.info(f"Successfully extracted markdown text{page_info}")
         except Exception as e:
-            # If parsing completely fails, extract text directly from blocks
-            logger.warning(f"Textractor parsing failed{page_info}: {str(e)}")
-
-            # Simple extraction from LINE blocks as final fallback
+            # If conversion fails, extract text directly from blocks
+            logger.warning(f"Markdown conversion failed{page_info}: {str(e)}")
             logger.warning(
                 f"Falling back to basic text extraction from blocks{page_info}"
             )
             blocks = response.get("Blocks", [])
+            confidence_table = text_confidence_table(blocks)
 
             text_lines = []
             for block in blocks:
@@ -1672,15 +2499,18 @@ class OcrService:
             else:
                 logger.info(f"Successfully extracted basic text{page_info}")
 
-        return {"text": text}
+        return {"text": confidence_table}, {"text": text}
 
-    def _detect_file_type(self, filename: str, content: bytes) -> str:
+    def _detect_file_type(
+        self, filename: str, content: bytes, truncated: bool = False
+    ) -> str:
         """
         Detect file type based on filename extension and content.
 
         Args:
             filename: Name of the file
             content: File content bytes
+            truncated: True if content holds only the leading bytes of the file
 
         Returns:
             File type string
@@ -1714,7 +2544,10 @@ class OcrService:
 
             # Default to treating as text if we can decode it
             try:
-                content.decode("utf-8")
+                # A truncated head may end part-way through a multi-byte character
+                codecs.getincrementaldecoder("utf-8")().decode(
+                    content, final=not truncated
+                )
                 return "txt"
             except UnicodeDecodeError:
                 pass
@@ -1722,85 +2555,183 @@ class OcrService:
             # Default to PDF for unknown binary files
             return "pdf"
 
+    @staticmethod
+    def _page_images_needed(config: IDPConfig) -> bool:
+        """
+        Check whether a stage after OCR uses page images.
+
+        Args:
+            config: IDP configuration
+
+        Returns:
+            True if classification, extraction or assessment sends page images
+        """
+        if (
+            config.classification.classificationMethod
+            != "textbasedHolisticClassification"
+        ):
+            # Page-level classification always attaches the page image
+            return True
+        if config.extraction.custom_prompt_lambda_arn:
+            # Custom prompt Lambdas receive image URIs for DOCUMENT_IMAGE
+            return True
+        if config.extraction.agentic.enabled:
+            # Agentic extraction passes page images to the agent
+            return True
+        if not (config.extraction.task_prompt or "").strip():
+            # The default extraction prompt attaches every page image
+            return True
+        prompts = [config.classification.task_prompt, config.extraction.task_prompt]
+        if config.assessment.enabled:
+            prompts.append(config.assessment.task_prompt)
+        return any("{DOCUMENT_IMAGE}" in (prompt or "") for prompt in prompts)
+
     def _process_non_pdf_document(
         self, file_type: str, content: bytes
-    ) -> List[Tuple[bytes, str]]:
+    ) -> List[ConvertedPage]:
         """
-        Process non-PDF documents and convert to pages.
+        Process non-PDF documents and split them into pages.
+
+        Page images are not rendered here; see _process_converted_page.
 
         Args:
             file_type: Type of the file
             content: File content bytes
 
         Returns:
-            List of tuples (image_bytes, page_text)
+            List of converted pages
         """
+        converter = self.document_converter
         try:
             if file_type == "txt":
                 text_content = content.decode("utf-8")
-                return self.document_converter.convert_text_to_pages(text_content)
+                return converter.layout_text_pages(text_content)
 
             elif file_type == "csv":
                 text_content = content.decode("utf-8")
-                return self.document_converter.convert_csv_to_pages(text_content)
+                return converter.layout_csv_pages(text_content)
 
             elif file_type == "xlsx":
-                return self.document_converter.convert_excel_to_pages(content)
+                return converter.layout_excel_pages(content)
 
             elif file_type == "docx":
-                return self.document_converter.convert_word_to_pages(content)
+                return converter.layout_word_pages(content)
 
             else:
                 # Fallback to text
                 try:
                     text_content = content.decode("utf-8")
-                    return self.document_converter.convert_text_to_pages(text_content)
+                    return converter.layout_text_pages(text_content)
                 except UnicodeDecodeError:
                     return [
-                        (
-                            self.document_converter._create_empty_page(),
-                            "Error: Unable to process file",
-                        )
+                        converter._empty_converted_page("Error: Unable to process file")
                     ]
 
         except Exception as e:
             logger.error(f"Error processing {file_type} document: {str(e)}")
             return [
-                (
-                    self.document_converter._create_empty_page(),
-                    f"Error processing {file_type} document",
+                converter._empty_converted_page(
+                    f"Error processing {file_type} document"
                 )
             ]
 
+    def _process_converted_pages(
+        self, document: Document, converted_pages: List[ConvertedPage]
+    ) -> None:
+        """
+        Process the pages of a converted document concurrently and add them to the document.
+
+        Page images are rendered by the page workers, so rendering runs in
+        parallel and overlaps with the S3 writes of other pages.
+
+        Args:
+            document: Document model object to update with page results
+            converted_pages: Pages returned by _process_non_pdf_document
+        """
+        if not self.render_converted_images:
+            logger.info(
+                "Skipping page image rendering for converted document, "
+                "no downstream stage uses page images"
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            future_to_page = {}
+            for page_index, converted_page in enumerate(converted_pages):
+                future = executor.submit(
+                    self._process_converted_page,
+                    page_index,
+                    converted_page,
+                    document.output_bucket,
+                    document.input_key,
+                )
+                future.add_done_callback(lambda _: self._finish_page_memory())
+                future_to_page[future] = page_index
+
+            for future in concurrent.futures.as_completed(future_to_page):
+                page_index = future_to_page[future]
+                page_id = str(page_index + 1)
+                try:
+                    ocr_result, page_metering = future.result()
+
+                    # Create Page object and add to document
+                    document.pages[page_id] = Page(
+                        page_id=page_id,
+                        image_uri=ocr_result["image_uri"],
+                        raw_text_uri=ocr_result["raw_text_uri"],
+                        parsed_text_uri=ocr_result["parsed_text_uri"],
+                        text_confidence_uri=ocr_result["text_confidence_uri"],
+                    )
+
+                    # Merge metering data
+                    document.metering = utils.merge_metering_data(
+                        document.metering, page_metering
+                    )
+
+                except Exception as e:
+                    import traceback
+
+                    error_msg = f"Error processing page {page_index + 1}: {str(e)}"
+                    stack_trace = traceback.format_exc()
+                    logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
+                    document.errors.append(f"{error_msg} (see logs for full trace)")
+
     def _process_converted_page(
         self,
         page_index: int,
-        image_bytes: bytes,
-        page_text: str,
+        converted_page: ConvertedPage,
         output_bucket: str,
         prefix: str,
-    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    ) -> Tuple[Dict[str, Optional[str]], Dict[str, Any]]:
         """
         Process a converted page (from non-PDF document).
 
         Args:
             page_index: Zero-based index of the page
-            image_bytes: Page image bytes
-            page_text: Extracted text for the page
+            converted_page: Page text and lazily rendered page image
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
 
         Returns:
-            Tuple of (page_result_dict, metering_data)
+            Tuple of (page_result_dict, metering_data); image_uri is None if
+            the page image was not rendered
         """
         t0 = time.time()
         page_id = page_index + 1
-
-        # Upload image to S3
-        image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(
-            image_bytes, output_bucket, image_key, content_type="image/jpeg"
-        )
+        page_text = converted_page.text
+
+        # Render and upload image to S3 only if a later stage uses it
+        image_uri = None
+        if self.render_converted_images:
+            image_key = f"{prefix}/pages/{page_id}/image.jpg"
+            self._write_content(
+                converted_page.render_image(),
+                output_bucket,
+                image_key,
+                content_type="image/jpeg",
+            )
+            image_uri = f"s3://{output_bucket}/{image_key}"
 
         # Create OCR response structure for compatibility
         ocr_response = {
@@ -1819,7 +2750,7 @@ class OcrService:
 
         # Store raw OCR response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self._write_content(
             ocr_response,
             output_bucket,
             raw_text_key,
@@ -1838,7 +2769,7 @@ class OcrService:
         text_confidence_data = {"text": markdown_table}
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self._write_content(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
@@ -1848,7 +2779,7 @@ class OcrService:
         # Store parsed text result
         parsed_result = {"text": page_text}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self._write_content(
             parsed_result,
             output_bucket,
             parsed_text_key,
@@ -1868,7 +2799,7 @@ class OcrService:
             "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
             "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
             "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
-            "image_uri": f"s3://{output_bucket}/{image_key}",
+            "image_uri": image_uri,
         }
 
         return result, metering
@@ -0,0 +1,250 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Embedded text layer extraction for born-digital PDF pages.
+
+Generated PDFs carry exact text and glyph positions, so OCR adds cost and
+latency without adding accuracy. This module scores a page's text layer with
+PyMuPDF and, for pages that pass, builds a Textract-compatible response
+(PAGE/LINE/WORD blocks with normalized geometry) so the rest of the pipeline
+(markdown parsing, text confidence, assessment geometry) works unchanged.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+# Confidence reported for text taken from the PDF text layer (exact, not recognized)
+TEXT_LAYER_CONFIDENCE = 100.0
+
+# Namespace for deterministic block IDs, so identical pages produce identical output
+_BLOCK_ID_NAMESPACE = uuid.UUID("6f1c3a52-9d0e-4c1b-8a57-2f4e0d9b7c13")
+
+
+@dataclass
+class TextLayerScore:
+    """Quality score of a page's embedded text layer."""
+
+    char_count: int
+    garbage_ratio: float
+    coverage: float
+
+    def passes(
+        self, min_chars: int, max_garbage_ratio: float, min_coverage: float
+    ) -> bool:
+        """Return True if the text layer can be used instead of OCR."""
+        return (
+            self.char_count >= min_chars
+            and self.garbage_ratio <= max_garbage_ratio
+            and self.coverage >= min_coverage
+        )
+
+
+def _is_garbage_char(char: str) -> bool:
+    """
+    Check for characters that indicate a broken text layer.
+
+    Fonts without a usable ToUnicode map extract as replacement characters,
+    private-use or unassigned code points, or control characters.
+    """
+    if char == "\ufffd":
+        return True
+    category = unicodedata.category(char)
+    return category in ("Co", "Cn", "Cs") or (category == "Cc" and not char.isspace())
+
+
+def _rect_area(rect: fitz.Rect, clip: fitz.Rect) -> float:
+    """Area of rect clipped to clip (0 for empty or invalid rects)."""
+    clipped = fitz.Rect(rect) & clip
+    return 0.0 if clipped.is_empty else clipped.width * clipped.height
+
+
+def extract_text_layer(
+    page: fitz.Page,
+) -> Tuple[List[Dict[str, Any]], TextLayerScore]:
+    """
+    Extract lines and words from a page's text layer and score it.
+
+    The garbage ratio counts unmappable characters and invisible text (render
+    mode 3 or zero opacity, as used for OCR layers on scans). Coverage is the
+    share of the page's content area (text lines plus images) that is text;
+    images with text drawn over them are treated as backgrounds and ignored, so
+    a scanned region without a text layer lowers the score.
+
+    Args:
+        page: PyMuPDF page
+
+    Returns:
+        Tuple of (lines, score). Each line is a dict with ``text``, ``bbox`` and
+        ``words`` (each a dict with ``text`` and ``bbox``), in unrotated page
+        coordinates.
+    """
+    page_dict = page.get_text("rawdict", sort=True)
+    page_rect = fitz.Rect(0, 0, page_dict["width"], page_dict["height"])
+    page_area = page_rect.width * page_rect.height
+
+    lines: List[Dict[str, Any]] = []
+    char_count = 0
+    garbage_count = 0
+    text_area = 0.0
+
+    for block in page_dict.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        for line in block.get("lines", []):
+            words: List[Dict[str, Any]] = []
+            word_chars: List[str] = []
+            word_rect = fitz.Rect()
+            for span in line.get("spans", []):
+                for char_info in span.get("chars", []):
+                    char = char_info["c"]
+                    if char.isspace():
+                        if word_chars:
+                            words.append(
+                                {"text": "".join(word_chars), "bbox": word_rect}
+                            )
+                            word_chars, word_rect = [], fitz.Rect()
+                        continue
+                    char_count += 1
+                    if _is_garbage_char(char):
+                        garbage_count += 1
+                    word_chars.append(char)
+                    word_rect |= fitz.Rect(char_info["bbox"])
+            if word_chars:
+                words.append({"text": "".join(word_chars), "bbox": word_rect})
+            if not words:
+                continue
+
+            line_rect = fitz.Rect(line["bbox"])
+            text_area += _rect_area(line_rect, page_rect)
+            lines.append(
+                {
+                    "text": " ".join(word["text"] for word in words),
+                    "bbox": line_rect,
+                    "words": words,
+                }
+            )
+
+    # Invisible text is an OCR layer, not born-digital content
+    for span in page.get_texttrace():
+        if span.get("type") == 3 or span.get("opacity", 1.0) == 0:
+            garbage_count += sum(
+                1 for char in span.get("chars", ()) if not chr(char[0]).isspace()
+            )
+
+    image_area = 0.0
+    for info in page.get_image_info():
+        image_rect = fitz.Rect(info["bbox"])
+        if not any(line["bbox"].intersects(image_rect) for line in lines):
+            image_area += _rect_area(image_rect, page_rect)
+    image_area = min(image_area, page_area)
+    content_area = text_area + image_area
+
+    score = TextLayerScore(
+        char_count=char_count,
+        garbage_ratio=min(garbage_count / char_count, 1.0) if char_count else 1.0,
+        coverage=text_area / content_area if content_area else 0.0,
+    )
+    return lines, score
+
+
+def to_textract_response(
+    lines: List[Dict[str, Any]], page: fitz.Page
+) -> Dict[str, Any]:
+    """
+    Build a Textract DetectDocumentText-style response from text layer lines.
+
+    Geometry is normalized to the rotated page as displayed (and rendered to
+    the page image), matching Textract's coordinate system.
+
+    Args:
+        lines: Lines returned by extract_text_layer
+        page: PyMuPDF page the lines were extracted from
+
+    Returns:
+        Dict with ``DocumentMetadata`` and PAGE/LINE/WORD ``Blocks``
+    """
+    matrix = page.rotation_matrix
+    width, height = page.rect.width, page.rect.height
+    page_number = page.number + 1 if page.number is not None else 1
+    block_index = 0
+
+    def next_id() -> str:
+        nonlocal block_index
+        block_index += 1
+        return str(uuid.uuid5(_BLOCK_ID_NAMESPACE, f"{page_number}-{block_index}"))
+
+    def geometry(rect: fitz.Rect) -> Dict[str, Any]:
+        r = fitz.Rect(rect) * matrix
+        left, top = r.x0 / width, r.y0 / height
+        right, bottom = r.x1 / width, r.y1 / height
+        return {
+            "BoundingBox": {
+                "Width": right - left,
+                "Height": bottom - top,
+                "Left": left,
+                "Top": top,
+            },
+            "Polygon": [
+                {"X": left, "Y": top},
+                {"X": right, "Y": top},
+                {"X": right, "Y": bottom},
+                {"X": left, "Y": bottom},
+            ],
+        }
+
+    page_block: Dict[str, Any] = {
+        "BlockType": "PAGE",
+        "Geometry": {
+            "BoundingBox": {"Width": 1.0, "Height": 1.0, "Left": 0.0, "Top": 0.0},
+            "Polygon": [
+                {"X": 0.0, "Y": 0.0},
+                {"X": 1.0, "Y": 0.0},
+                {"X": 1.0, "Y": 1.0},
+                {"X": 0.0, "Y": 1.0},
+            ],
+        },
+        "Id": next_id(),
+        "Page": 1,
+    }
+    blocks: List[Dict[str, Any]] = [page_block]
+    line_ids: List[str] = []
+
+    for line in lines:
+        line_block: Dict[str, Any] = {
+            "BlockType": "LINE",
+            "Confidence": TEXT_LAYER_CONFIDENCE,
+            "Text": line["text"],
+            "Geometry": geometry(line["bbox"]),
+            "Id": next_id(),
+            "Page": 1,
+        }
+        word_blocks = [
+            {
+                "BlockType": "WORD",
+                "Confidence": TEXT_LAYER_CONFIDENCE,
+                "Text": word["text"],
+                "TextType": "PRINTED",
+                "Geometry": geometry(word["bbox"]),
+                "Id": next_id(),
+                "Page": 1,
+            }
+            for word in line["words"]
+        ]
+        line_block["Relationships"] = [
+            {"Type": "CHILD", "Ids": [word["Id"] for word in word_blocks]}
+        ]
+        line_ids.append(line_block["Id"])
+        blocks.append(line_block)
+        blocks.extend(word_blocks)
+
+    if line_ids:
+        page_block["Relationships"] = [{"Type": "CHILD", "Ids": line_ids}]
+
+    return {"DocumentMetadata": {"Pages": 1}, "Blocks": blocks}
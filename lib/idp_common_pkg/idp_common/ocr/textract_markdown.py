@@ -0,0 +1,1126 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Direct conversion of Textract responses to markdown.
+
+Produces the same markdown as textractor's ``response_parser.parse(response)
+.to_markdown()`` (default ``MarkdownLinearizationConfig``) for LINE, LAYOUT_*,
+TABLE/CELL/MERGED_CELL, KEY_VALUE_SET, SELECTION_ELEMENT and SIGNATURE blocks,
+and builds the text confidence table in the same pass over ``Blocks``.
+
+Textractor builds a full entity graph per page and deep-copies every line and
+word (including the raw JSON blocks), which dominates post-OCR CPU time on
+dense pages. This module indexes the blocks once and runs the same layout
+assignment and linearization steps on lightweight objects, with tables
+rendered by ``tabulate`` directly instead of through a pandas DataFrame.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from tabulate import tabulate
+
+# Share of an entity's area that must fall inside a layout to be attached to it
+_THRESHOLD = 0.95
+
+# MarkdownLinearizationConfig defaults
+_LAYOUT_ELEMENT_SEPARATOR = "\n\n"
+_SAME_PARAGRAPH_SEPARATOR = " "
+_SAME_LAYOUT_ELEMENT_SEPARATOR = "\n"
+_TABLE_COLUMN_SEPARATOR = "\t"
+_TABLE_ROW_SEPARATOR = "\n"
+_TABLE_LAYOUT_PREFIX = "\n\n"
+_TABLE_LAYOUT_SUFFIX = "\n"
+_TABLE_COLUMN_HEADER_THRESHOLD = 0.9
+_TITLE_PREFIX = "# "
+_SECTION_HEADER_PREFIX = "## "
+_KEY_SUFFIX = " "
+_SELECTED = "[X]"
+_NOT_SELECTED = "[ ]"
+_SIGNATURE_TOKEN = "[SIGNATURE]"
+_MAX_CONSECUTIVE_NEW_LINES = 2
+_H_TOLERANCE = 0.3
+_LINE_BREAK_THRESHOLD = 0.9
+_OVERLAP_RATIO = 0.5
+
+_LAYOUT_ENTITY = "LAYOUT_ENTITY"
+_LAYOUT_FIGURE = "LAYOUT_FIGURE"
+_LAYOUT_HEADER = "LAYOUT_HEADER"
+_LAYOUT_KEY_VALUE = "LAYOUT_KEY_VALUE"
+_LAYOUT_LIST = "LAYOUT_LIST"
+_LAYOUT_PAGE_NUMBER = "LAYOUT_PAGE_NUMBER"
+_LAYOUT_SECTION_HEADER = "LAYOUT_SECTION_HEADER"
+_LAYOUT_TABLE = "LAYOUT_TABLE"
+_LAYOUT_TEXT = "LAYOUT_TEXT"
+_LAYOUT_TITLE = "LAYOUT_TITLE"
+
+CONFIDENCE_TABLE_HEADER = "| Text | Confidence |\n|:-----|:-----------|"
+
+
+class _Box:
+    """Axis-aligned bounding box in normalized page coordinates."""
+
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x: float, y: float, width: float, height: float):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_block(cls, block: Dict[str, Any]) -> "_Box":
+        box = block["Geometry"]["BoundingBox"]
+        return cls(box["Left"], box["Top"], box["Width"], box["Height"])
+
+    @property
+    def area(self) -> float:
+        if self.width < 0 or self.height < 0:
+            return 0
+        return self.width * self.height
+
+    def intersection_area(self, other: "_Box") -> float:
+        width = min(self.x + self.width, other.x + other.width) - max(self.x, other.x)
+        height = min(self.y + self.height, other.y + other.height) - max(
+            self.y, other.y
+        )
+        if width < 0 or height < 0:
+            return 0
+        return width * height
+
+    @classmethod
+    def enclosing(cls, boxes: Iterable["_Box"]) -> "_Box":
+        boxes = list(boxes)
+        if not boxes:
+            return cls(0, 0, 1, 1)
+        x1 = min(box.x for box in boxes)
+        y1 = min(box.y for box in boxes)
+        x2 = max(box.x + box.width for box in boxes)
+        y2 = max(box.y + box.height for box in boxes)
+        return cls(x1, y1, x2 - x1, y2 - y1)
+
+
+class _Entity:
+    """Base for page entities; children are removed and deduplicated in place."""
+
+    __slots__ = ("bbox", "children")
+
+    def __init__(self, bbox: _Box):
+        self.bbox = bbox
+        self.children: List[Any] = []
+
+    def remove(self, entity: Any) -> bool:
+        """Remove entity from the subtree, dropping children left empty."""
+        for child in self.children:
+            if entity is child:
+                break
+            if not isinstance(child, _Word) and child.remove(entity):
+                if not child.children:
+                    self.children.remove(child)
+                return True
+        else:
+            return False
+        self.children.remove(child)
+        if self.children:
+            self.bbox = _Box.enclosing(c.bbox for c in self.children)
+        return True
+
+    def visit(self, seen: set) -> None:
+        """Drop words already emitted by an earlier entity in reading order."""
+        for child in list(self.children):
+            if isinstance(child, _Word):
+                if id(child) in seen:
+                    self.children.remove(child)
+                else:
+                    seen.add(id(child))
+            else:
+                child.visit(seen)
+
+
+class _Word(_Entity):
+    __slots__ = ("text", "line", "cell_id")
+
+    def __init__(self, bbox: _Box, text: str):
+        super().__init__(bbox)
+        self.text = text
+        self.line: Optional[_Line] = None
+        self.cell_id: Optional[str] = None
+
+    def words(self) -> List["_Word"]:
+        return [self]
+
+    def text_and_words(self) -> Tuple[str, List["_Word"]]:
+        return self.text, [self]
+
+
+class _Line(_Entity):
+    __slots__ = ()
+
+    def __init__(self, bbox: _Box, words: List[_Word]):
+        super().__init__(bbox)
+        self.children = words
+
+    def words(self) -> List[_Word]:
+        return self.children
+
+    def text_and_words(self) -> Tuple[str, List[_Word]]:
+        return " ".join(word.text for word in self.children), self.children
+
+
+class _SelectionElement(_Entity):
+    __slots__ = ("selected", "key_id")
+
+    def __init__(self, bbox: _Box, selected: bool):
+        super().__init__(bbox)
+        self.selected = selected
+        self.key_id: Optional[str] = None
+
+    def words(self) -> List[_Word]:
+        # Linearization emits a generated word that is not part of any line
+        return [_Word(self.bbox, self._text())]
+
+    def _text(self) -> str:
+        return _SELECTED if self.selected else _NOT_SELECTED
+
+    def text_and_words(self) -> Tuple[str, List[_Word]]:
+        return self._text(), self.words()
+
+
+class _Signature(_Entity):
+    __slots__ = ("id",)
+
+    def __init__(self, entity_id: str, bbox: _Box):
+        super().__init__(bbox)
+        self.id = entity_id
+
+    def words(self) -> List[_Word]:
+        return [_Word(self.bbox, _SIGNATURE_TOKEN)]
+
+    def text_and_words(self) -> Tuple[str, List[_Word]]:
+        return _SIGNATURE_TOKEN, self.words()
+
+
+class _Value(_Entity):
+    __slots__ = ("value_words", "contains_checkbox")
+
+    def __init__(self, bbox: _Box):
+        super().__init__(bbox)
+        self.value_words: List[_Word] = []
+        self.contains_checkbox = False
+
+    def text_and_words(self) -> Tuple[str, List[_Word]]:
+        if self.contains_checkbox:
+            return self.children[0].text_and_words()
+        return _linearize(self.value_words, no_new_lines=True)
+
+
+class _KeyValue(_Entity):
+    __slots__ = ("id", "key", "value", "contains_checkbox")
+
+    def __init__(
+        self, entity_id: str, bbox: _Box, value: Optional[_Value], checkbox: bool
+    ):
+        super().__init__(bbox)
+        self.id = entity_id
+        self.key: List[_Word] = []
+        self.value = value
+        self.contains_checkbox = checkbox
+
+    def words(self) -> List[_Word]:
+        """Key and value words, as used for overlap checks."""
+        value_words = (
+            self.value.value_words
+            if self.value is not None and not self.contains_checkbox
+            else []
+        )
+        return sorted(self.key + value_words, key=lambda w: w.bbox.x + w.bbox.y)
+
+    def text_and_words(self) -> Tuple[str, List[_Word]]:
+        key_text = " ".join(word.text for word in self.key)
+        value_text, value_words = (
+            self.value.text_and_words() if self.value is not None else ("", [])
+        )
+        if not key_text and not value_text:
+            return "", []
+        return f"{key_text}{_KEY_SUFFIX}{value_text}", self.key + value_words
+
+
+class _TableCell(_Entity):
+    __slots__ = ("id", "row", "col", "is_header", "merged", "siblings")
+
+    def __init__(self, block: Dict[str, Any]):
+        super().__init__(_Box.from_block(block))
+        self.id = block["Id"]
+        self.row = int(block["RowIndex"])
+        self.col = int(block["ColumnIndex"])
+        self.is_header = "COLUMN_HEADER" in (block.get("EntityTypes") or [])
+        self.merged = False
+        self.siblings: List[_TableCell] = []
+
+    def words(self) -> List[_Word]:
+        return [word for child in self.children for word in child.words()]
+
+    def text(self) -> str:
+        return _linearize(self.children, no_new_lines=True)[0]
+
+    def merged_range(self) -> Tuple[int, int, int, int]:
+        if not self.merged:
+            return self.row, self.col, self.row, self.col
+        rows = [cell.row for cell in self.siblings]
+        cols = [cell.col for cell in self.siblings]
+        return min(rows), min(cols), max(rows), max(cols)
+
+
+class _Table(_Entity):
+    __slots__ = ()
+
+    def words(self) -> List[_Word]:
+        return [word for cell in self.children for word in cell.words()]
+
+    def _merged_text(self, cell: _TableCell) -> str:
+        children = [child for sibling in cell.siblings for child in sibling.children]
+        return _linearize(children, no_new_lines=True)[0]
+
+    def text_and_words(self) -> Tuple[str, List[_Word]]:
+        words = self.words()
+        if not words:
+            return "", []
+
+        rows = [
+            list(cells)
+            for _, cells in itertools.groupby(self.children, key=lambda c: c.row)
+        ]
+        column_count = max(cell.col for cell in self.children)
+
+        # Leading rows with column header cells; only the first becomes the header
+        columns: List[List[str]] = [[] for _ in range(column_count)]
+        header_count = 0
+        processed = set()
+        row_offset = 0
+        for row in rows:
+            if not any(cell.is_header for cell in row):
+                break
+            for i, cell in enumerate(row):
+                if i >= column_count:
+                    continue
+                if id(cell) in processed:
+                    columns[i].append("")
+                elif cell.siblings:
+                    for sibling in cell.siblings:
+                        header_count += sibling.is_header
+                        processed.add(id(sibling))
+                    columns[i].append(self._merged_text(cell))
+                else:
+                    header_count += cell.is_header
+                    columns[i].append(cell.text())
+            row_offset += 1
+        use_columns = header_count / column_count >= _TABLE_COLUMN_HEADER_THRESHOLD
+
+        table: List[List[str]] = []
+        if any(columns):
+            table.append([column[0] if column else "" for column in columns])
+            row_offset = 1
+        for row in rows[row_offset:]:
+            values = [""] * max(len(row), max(cell.col for cell in row))
+            for cell in row:
+                if cell.siblings:
+                    first_row, first_col, _, _ = cell.merged_range()
+                    if cell.col == first_col and cell.row == first_row:
+                        text = self._merged_text(cell)
+                    else:
+                        text = ""
+                else:
+                    text = cell.text()
+                values[cell.col - 1] = text
+            table.append(values)
+
+        if use_columns:
+            headers, data = table[0], table[1:]
+        else:
+            headers = [""] * max((len(row) for row in table), default=0)
+            data = table
+        width = len(headers)
+        data = [row + [""] * (width - len(row)) for row in data]
+        return tabulate(data, headers=headers, tablefmt="github"), words
+
+
+class _Layout(_Entity):
+    __slots__ = ("reading_order", "layout_type")
+
+    def __init__(self, bbox: _Box, reading_order: float, layout_type: str):
+        super().__init__(bbox)
+        self.reading_order = reading_order
+        self.layout_type = layout_type
+
+    def words(self) -> List[_Word]:
+        return [word for child in self.children for word in child.words()]
+
+    def text(self) -> str:
+        layout_type = self.layout_type
+        if layout_type == _LAYOUT_LIST:
+            text = ""
+            items = sorted(
+                (c for c in self.children if isinstance(c, _Layout)),
+                key=lambda c: c.reading_order,
+            )
+            for i, item in enumerate(items):
+                text += item.text().replace("\n", " ")
+                if i != len(self.children) - 1:
+                    text += "\n"
+        elif layout_type in (_LAYOUT_TITLE, _LAYOUT_SECTION_HEADER):
+            prefix = (
+                _TITLE_PREFIX
+                if layout_type == _LAYOUT_TITLE
+                else _SECTION_HEADER_PREFIX
+            )
+            text = prefix + _linearize(self.children, no_new_lines=True)[0]
+        elif layout_type in (_LAYOUT_HEADER, _LAYOUT_TEXT):
+            text = _linearize(self.children, no_new_lines=True)[0]
+        elif layout_type == _LAYOUT_TABLE:
+            text = (
+                _TABLE_LAYOUT_PREFIX
+                + _linearize(self.children, is_layout_table=True)[0]
+                + _TABLE_LAYOUT_SUFFIX
+            )
+        else:
+            text = _linearize(self.children)[0]
+
+        # Same check as textractor: only runs of 6+ newlines are collapsed
+        excess = _LAYOUT_ELEMENT_SEPARATOR * (_MAX_CONSECUTIVE_NEW_LINES + 1)
+        while excess in text:
+            text = text.replace(
+                "\n" * (_MAX_CONSECUTIVE_NEW_LINES + 1),
+                "\n" * _MAX_CONSECUTIVE_NEW_LINES,
+            )
+        return text
+
+
+def _compare_boxes(a: _Entity, b: _Entity) -> int:
+    """Reading order comparison: same row (by vertical center) sorts left to right."""
+    delta = (a.bbox.height + b.bbox.height) / 3.5
+    a_mid = a.bbox.y + a.bbox.height / 2.0
+    b_mid = b.bbox.y + b.bbox.height / 2.0
+    if abs(a_mid - b_mid) < delta:
+        return 1 if a.bbox.x > b.bbox.x else -1
+    return 1 if a_mid > b_mid else -1
+
+
+_reading_order_key = functools.cmp_to_key(_compare_boxes)
+
+
+def _reading_order(layout: _Layout) -> float:
+    return layout.reading_order
+
+
+def _top(entity: _Entity) -> float:
+    return entity.bbox.y
+
+
+def _top_left(entity: _Entity) -> Tuple[float, float]:
+    return entity.bbox.y, entity.bbox.x
+
+
+def _group_horizontally(elements: List[_Entity]) -> List[List[_Entity]]:
+    """Group elements into visual rows by vertical overlap; tables get their own row."""
+
+    def vertical_overlap(a: _Entity, b: _Entity) -> float:
+        top = max(a.bbox.y, b.bbox.y)
+        bottom = min(a.bbox.y + a.bbox.height, b.bbox.y + b.bbox.height)
+        return max(bottom - top, 0)
+
+    def should_group(element: _Entity, group: List[_Entity]) -> bool:
+        max_height = max(e.bbox.height for e in group)
+        if max_height <= 0:
+            return False
+        overlap = sum(vertical_overlap(element, e) for e in group)
+        return overlap / max_height >= _OVERLAP_RATIO
+
+    ordered = sorted(elements, key=_reading_order_key)
+    if not ordered:
+        return []
+    groups = []
+    current = [ordered[0]]
+    for element in ordered[1:]:
+        if isinstance(element, _Table):
+            if current:
+                groups.append(current)
+            groups.append([element])
+            current = []
+        elif not current or should_group(element, current):
+            current.append(element)
+        else:
+            groups.append(current)
+            current = [element]
+    groups.append(current)
+    return groups
+
+
+def _same_paragraph(a: _Entity, b: _Entity) -> bool:
+    return (
+        isinstance(a, _Line)
+        and isinstance(b, _Line)
+        and abs(a.bbox.x - b.bbox.x) <= _H_TOLERANCE * a.bbox.width
+        and abs(a.bbox.y + a.bbox.height - b.bbox.y)
+        <= _LINE_BREAK_THRESHOLD * min(a.bbox.height, b.bbox.height)
+    )
+
+
+def _linearize(
+    elements: List[Any], no_new_lines: bool = False, is_layout_table: bool = False
+) -> Tuple[str, List[_Word]]:
+    """Port of textractor's ``linearize_children`` for the markdown configuration."""
+    # Loose words are regrouped into (partial) copies of the lines they belong to
+    line_words: Dict[int, Tuple[_Line, List[_Word]]] = {}
+    others = []
+    for element in elements:
+        if isinstance(element, _Word):
+            if element.line is not None:
+                entry = line_words.setdefault(id(element.line), (element.line, []))
+                entry[1].append(element)
+        else:
+            others.append(element)
+    for line, words in line_words.values():
+        others.append(_Line(line.bbox, sorted(words, key=lambda w: w.bbox.x)))
+
+    result = ""
+    words_output: List[_Word] = []
+    previous = None
+    for group in _group_horizontally(others):
+        group = sorted(group, key=lambda e: e.bbox.x)
+        if not group:
+            continue
+        for index, element in enumerate(group):
+            text, words = element.text_and_words()
+            if isinstance(element, _Table) and words:
+                result += text
+            elif isinstance(element, _KeyValue) and words:
+                result += _SAME_LAYOUT_ELEMENT_SEPARATOR + text
+            elif previous is None:
+                result += text
+            elif is_layout_table:
+                result += ("" if index == 0 else _TABLE_COLUMN_SEPARATOR) + text
+            elif _same_paragraph(previous, element):
+                result += _SAME_PARAGRAPH_SEPARATOR + text
+            else:
+                result += _SAME_LAYOUT_ELEMENT_SEPARATOR + text
+            words_output += words
+            previous = element
+        result += (
+            _TABLE_ROW_SEPARATOR if is_layout_table else _SAME_LAYOUT_ELEMENT_SEPARATOR
+        )
+        # The next row is compared against the extent of this one
+        previous = _Line(_Box.enclosing(e.bbox for e in group), [])
+
+    if no_new_lines:
+        result = result.replace("\n", " ")
+        while "  " in result:
+            result = result.replace("  ", " ")
+    return result, words_output
+
+
+def _child_ids(block: Dict[str, Any], relationship: str = "CHILD") -> List[str]:
+    for rel in block.get("Relationships") or []:
+        if rel.get("Type") == relationship:
+            return rel.get("Ids", [])
+    return []
+
+
+class _PageBuilder:
+    """Assigns a page's lines, tables, key-values and signatures to layouts."""
+
+    def __init__(
+        self,
+        page_block: Dict[str, Any],
+        blocks_by_id: Dict[str, Dict[str, Any]],
+        blocks_by_type: Dict[str, List[Dict[str, Any]]],
+        words: Dict[str, _Word],
+    ):
+        self.child_ids = set(_child_ids(page_block))
+        self.blocks_by_id = blocks_by_id
+        self.blocks_by_type = blocks_by_type
+        self.words = words
+        self.layouts: List[_Layout] = []
+
+    def _page_blocks(self, block_type: str) -> List[Dict[str, Any]]:
+        return [
+            block
+            for block in self.blocks_by_type.get(block_type, ())
+            if block["Id"] in self.child_ids
+        ]
+
+    def _word(self, word_id: str) -> Optional[_Word]:
+        word = self.words.get(word_id)
+        if word is None:
+            block = self.blocks_by_id.get(word_id)
+            if block is None:
+                return None
+            word = _Word(_Box.from_block(block), block.get("Text") or "")
+            self.words[word_id] = word
+        return word
+
+    def _word_list(self, word_ids: Iterable[str]) -> List[_Word]:
+        return [word for word in map(self._word, word_ids) if word is not None]
+
+    def _is_word(self, block_id: str) -> bool:
+        block = self.blocks_by_id.get(block_id)
+        return block is not None and block.get("BlockType") == "WORD"
+
+    def build(self) -> str:
+        lines, line_words = self._build_lines()
+        self._build_layouts(lines)
+        key_values, kv_words, checkboxes = self._build_key_values()
+        table_words, kv_added = self._build_tables(key_values, checkboxes)
+        self._attach_key_values(key_values, kv_added)
+
+        # Words that do not belong to any LINE are linearized as their own line
+        for word in itertools.chain(table_words, kv_words, line_words):
+            if word.line is None:
+                word.line = _Line(word.bbox, [word])
+
+        self._attach_signatures()
+
+        seen: set = set()
+        for layout in sorted(self.layouts, key=_reading_order):
+            layout.visit(seen)
+            if not layout.children and layout.layout_type != _LAYOUT_FIGURE:
+                self.layouts.remove(layout)
+
+        ordered = sorted(self.layouts, key=_reading_order)
+        return _LAYOUT_ELEMENT_SEPARATOR.join(layout.text() for layout in ordered)
+
+    def _build_lines(self) -> Tuple[List[_Line], List[_Word]]:
+        lines = []
+        line_words = []
+        line_by_id = {}
+        for block in self._page_blocks("LINE"):
+            word_ids = _child_ids(block)
+            if not word_ids:
+                continue
+            words = self._word_list(word_ids)
+            line = _Line(_Box.from_block(block), words)
+            for word in words:
+                word.line = line
+            line_words.extend(words)
+            lines.append(line)
+            line_by_id[block["Id"]] = line
+        self.line_by_id = line_by_id
+        return lines, line_words
+
+    def _layout_from_block(self, block: Dict[str, Any], reading_order: int) -> _Layout:
+        layout = _Layout(_Box.from_block(block), reading_order, block["BlockType"])
+        layout.children.extend(
+            self.line_by_id[line_id]
+            for line_id in _child_ids(block)
+            if line_id in self.line_by_id
+        )
+        return layout
+
+    def _build_layouts(self, lines: List[_Line]) -> None:
+        parsed = set()
+        for i, block in enumerate(self._page_blocks("LAYOUT")):
+            if block["Id"] in parsed:
+                continue
+            parsed.add(block["Id"])
+            if block["BlockType"] == _LAYOUT_LIST:
+                layout = _Layout(_Box.from_block(block), i, _LAYOUT_LIST)
+                for item_id in _child_ids(block):
+                    item = self.blocks_by_id[item_id]
+                    parsed.add(item_id)
+                    layout.children.append(self._layout_from_block(item, i))
+            else:
+                layout = self._layout_from_block(block, i)
+            self.layouts.append(layout)
+
+        if not self.layouts:
+            # DetectDocumentText (no LAYOUT feature): one layout per line
+            for i, line in enumerate(lines):
+                layout = _Layout(line.bbox, i, _LAYOUT_ENTITY)
+                layout.children = [line]
+                self.layouts.append(layout)
+
+    def _build_key_values(
+        self,
+    ) -> Tuple[List[_KeyValue], List[_Word], Dict[str, _SelectionElement]]:
+        checkboxes = {
+            block["Id"]: _SelectionElement(
+                _Box.from_block(block), block.get("SelectionStatus") == "SELECTED"
+            )
+            for block in self.blocks_by_type.get("SELECTION_ELEMENT", ())
+        }
+
+        key_blocks = [
+            block
+            for block in self._page_blocks("KEY_VALUE_SET")
+            if (block.get("EntityTypes") or [None])[0] == "KEY"
+        ]
+
+        values: Dict[str, _Value] = {}
+        key_value_ids = {}
+        for key_block in key_blocks:
+            value_ids = _child_ids(key_block, "VALUE")
+            if not value_ids:
+                continue
+            value_id = value_ids[0]
+            key_value_ids[key_block["Id"]] = value_id
+            value_block = self.blocks_by_id.get(value_id)
+            if value_block is None or value_id in values:
+                continue
+            value = _Value(_Box.from_block(value_block))
+            for child_id in _child_ids(value_block):
+                child = self.blocks_by_id.get(child_id)
+                if child is None or child["BlockType"] == "SIGNATURE":
+                    continue
+                if child["BlockType"] == "WORD":
+                    word = self._word(child_id)
+                    value.value_words.append(word)
+                    value.children.append(word)
+                elif child_id in checkboxes:
+                    value.children.append(checkboxes[child_id])
+                    value.contains_checkbox = True
+            value.value_words.sort(key=lambda w: w.bbox.x + w.bbox.y)
+            values[value_id] = value
+
+        key_values = []
+        kv_words: List[_Word] = []
+        for key_block in key_blocks:
+            value = values.get(key_value_ids.get(key_block["Id"]))
+            kv = _KeyValue(
+                key_block["Id"],
+                _Box.from_block(key_block),
+                value,
+                value is not None and value.contains_checkbox,
+            )
+            if value is not None:
+                if kv.contains_checkbox:
+                    value.children[0].key_id = kv.id
+                else:
+                    kv_words.extend(value.value_words)
+                kv.key = self._word_list(
+                    child_id
+                    for child_id in _child_ids(key_block)
+                    if self._is_word(child_id)
+                )
+                kv.children = kv.key + [value]
+                kv_words.extend(kv.key)
+                kv.bbox = _Box.enclosing([kv.bbox, value.bbox])
+            key_values.append(kv)
+        return key_values, kv_words, checkboxes
+
+    def _build_tables(
+        self, key_values: List[_KeyValue], checkboxes: Dict[str, _SelectionElement]
+    ) -> Tuple[List[_Word], set]:
+        kv_by_id = {kv.id: kv for kv in key_values}
+        table_blocks = self._page_blocks("TABLE")
+        tables = {block["Id"]: _Table(_Box.from_block(block)) for block in table_blocks}
+
+        cells: Dict[str, _TableCell] = {}
+        cell_blocks: Dict[str, Dict[str, Any]] = {}
+        for block in table_blocks:
+            for cell_id in _child_ids(block):
+                cell_block = self.blocks_by_id.get(cell_id)
+                if cell_block is not None and cell_block["BlockType"] == "CELL":
+                    cell_blocks[cell_id] = cell_block
+        for cell_id, cell_block in cell_blocks.items():
+            cells[cell_id] = _TableCell(cell_block)
+
+        merged_children = {
+            block["Id"]: _child_ids(block)
+            for block in self.blocks_by_type.get("MERGED_CELL", ())
+        }
+        merged_cell_ids = {
+            cell_id for child_ids in merged_children.values() for cell_id in child_ids
+        }
+
+        table_words: List[_Word] = []
+        kv_added: set = set()
+        for cell_id, cell_block in cell_blocks.items():
+            cell = cells[cell_id]
+            child_ids = _child_ids(cell_block)
+            words = self._word_list(
+                child_id for child_id in child_ids if self._is_word(child_id)
+            )
+            for word in words:
+                word.cell_id = cell.id
+            table_words.extend(words)
+            cell.children.extend(words)
+
+            # Checkboxes that belong to a key-value replace the key words in the cell
+            for child_id in child_ids:
+                child = self.blocks_by_id.get(child_id)
+                if child is None or child["BlockType"] != "SELECTION_ELEMENT":
+                    continue
+                checkbox = checkboxes[child_id]
+                if checkbox.key_id in kv_added:
+                    continue
+                if checkbox.key_id is None:
+                    cell.children.append(checkbox)
+                    continue
+                kv = kv_by_id[checkbox.key_id]
+                kv_words = kv.words()
+                if not kv_words:
+                    kv_added.add(kv.id)
+                    continue
+                try:
+                    index = cell.children.index(kv_words[0])
+                except ValueError:
+                    continue
+                cell.children.insert(index, kv)
+                for word in kv_words:
+                    if word in cell.children:
+                        cell.children.remove(word)
+                kv_added.add(kv.id)
+            cell.merged = cell_id in merged_cell_ids
+
+        # Key-values entirely inside tables are rendered by the table
+        if table_blocks:
+            table_word_ids = {id(word) for word in table_words}
+            for kv in key_values:
+                if kv.id not in kv_added and all(
+                    id(word) in table_word_ids for word in kv.words()
+                ):
+                    kv_added.add(kv.id)
+
+        for child_ids in merged_children.values():
+            siblings = [cells[cell_id] for cell_id in child_ids if cell_id in cells]
+            for cell_id in child_ids:
+                if cell_id in cells:
+                    cells[cell_id].siblings = siblings
+
+        for block in table_blocks:
+            table = tables[block["Id"]]
+            table.children = sorted(
+                (cells[cell_id] for cell_id in _child_ids(block) if cell_id in cells),
+                key=lambda c: (c.row, c.col),
+            )
+
+        self._place_tables(list(tables.values()))
+        return table_words, kv_added
+
+    def _place_tables(self, tables: List[_Table]) -> None:
+        # Tables inside a LAYOUT_TABLE replace the layout's copy of their words
+        added = set()
+        for layout in sorted(self.layouts, key=_top):
+            if layout.layout_type != _LAYOUT_TABLE:
+                continue
+            for table in sorted(tables, key=_top):
+                if (
+                    id(table) not in added
+                    and layout.bbox.intersection_area(table.bbox)
+                    > _THRESHOLD * table.bbox.area
+                ):
+                    for word in table.words():
+                        layout.remove(word)
+                    layout.children.append(table)
+                    layout.bbox = _Box.enclosing(c.bbox for c in layout.children)
+                    added.add(id(table))
+
+        table_layouts = []
+        for table in tables:
+            if id(table) not in added:
+                layout = _Layout(table.bbox, -1, _LAYOUT_TABLE)
+                layout.children.append(table)
+                table_layouts.append(layout)
+        table_layouts.sort(key=_reading_order_key)
+
+        # Other layouts overlapping a free-standing table give up its words and
+        # are split around it when the table sits between their lines
+        intersecting: Dict[_Layout, List[Tuple[_Layout, float]]] = defaultdict(list)
+        for layout in self.layouts:
+            for table_layout in table_layouts:
+                area = layout.bbox.intersection_area(table_layout.bbox)
+                if area:
+                    intersecting[layout].append((table_layout, area))
+        by_table: Dict[_Layout, List[Tuple[_Layout, float]]] = defaultdict(list)
+        for layout, table_hits in intersecting.items():
+            for table_layout, area in table_hits:
+                by_table[table_layout].append((layout, area))
+
+        to_remove: List[_Layout] = []
+        split_tree: Dict[int, List[Optional[_Layout]]] = {}
+        split_order: List[int] = []
+        for layout, table_hits in intersecting.items():
+            vertical_overlap = False
+            for i, (table_layout, area) in enumerate(table_hits):
+                for word in table_layout.children[0].words():
+                    layout.remove(word)
+                if not (
+                    len(by_table[table_layout]) <= 100
+                    and layout.layout_type != _LAYOUT_FIGURE
+                    and area >= table_layout.bbox.area * _THRESHOLD
+                    and layout.children
+                ):
+                    owners = by_table[table_layout]
+                    table_layout.reading_order = sum(
+                        owner.reading_order for owner, _ in owners
+                    ) / len(owners)
+                    continue
+                if vertical_overlap or any(
+                    _has_vertical_overlap(child.bbox, table_layout.bbox)
+                    for child in layout.children
+                ):
+                    vertical_overlap = True
+                    _bump_reading_order(
+                        table_layout, layout.reading_order + (i + 1) * 0.01
+                    )
+                    continue
+                self._split_around(
+                    layout, table_layout, i, split_tree, split_order, to_remove
+                )
+
+            if layout.layout_type == _LAYOUT_FIGURE:
+                continue
+            if layout.children:
+                layout.bbox = _Box.enclosing(c.bbox for c in layout.children)
+            else:
+                to_remove.append(layout)
+
+        for layout in to_remove:
+            if layout in self.layouts:
+                self.layouts.remove(layout)
+        self.layouts.extend(table_layouts)
+        for key in split_order:
+            for part in split_tree[key]:
+                if part is not None and part not in to_remove:
+                    self.layouts.append(part)
+
+    def _split_around(
+        self,
+        layout: _Layout,
+        table_layout: _Layout,
+        i: int,
+        split_tree: Dict[int, List[Optional[_Layout]]],
+        split_order: List[int],
+        to_remove: List[_Layout],
+    ) -> None:
+        """Split a layout into the parts above and below a table it contains."""
+        target = layout
+        penalty = 0
+        while id(target) in split_tree:
+            above, below = split_tree[id(target)]
+            if below is not None:
+                target = below
+            else:
+                target = above
+                penalty = 0.001
+        table_top = table_layout.bbox.y
+        table_bottom = table_layout.bbox.y + table_layout.bbox.height
+        above_children = [
+            c for c in target.children if c.bbox.y + c.bbox.height < table_top
+        ]
+        below_children = [c for c in target.children if c.bbox.y > table_bottom]
+
+        above = None
+        if above_children:
+            above = _Layout(
+                _Box(
+                    target.bbox.x,
+                    target.bbox.y,
+                    target.bbox.width,
+                    table_top - target.bbox.y,
+                ),
+                target.reading_order,
+                target.layout_type,
+            )
+            above.children.extend(above_children)
+        table_layout.reading_order = target.reading_order + (i * 2 + 1) * 0.01 + penalty
+        below = None
+        if below_children:
+            below = _Layout(
+                _Box(
+                    target.bbox.x,
+                    table_bottom,
+                    target.bbox.width,
+                    target.bbox.y + target.bbox.height - table_bottom,
+                ),
+                target.reading_order + (i * 2 + 2) * 0.01,
+                target.layout_type,
+            )
+            below.children.extend(below_children)
+        if id(target) not in split_tree:
+            split_order.append(id(target))
+        split_tree[id(target)] = [above, below]
+        to_remove.append(target)
+
+    def _attach_key_values(self, key_values: List[_KeyValue], kv_added: set) -> None:
+        remaining = list(key_values)
+        for layout in sorted(self.layouts, key=_top):
+            if layout.layout_type == _LAYOUT_ENTITY:
+                continue
+            for kv in sorted(remaining, key=_top):
+                if (
+                    kv.id in kv_added
+                    or layout.bbox.intersection_area(kv.bbox)
+                    <= _THRESHOLD * kv.bbox.area
+                ):
+                    continue
+                kv_words = kv.words()
+                # Key-values overlapping a table or inside a list are dropped
+                if layout.layout_type == _LAYOUT_LIST or any(
+                    w.cell_id for w in kv_words
+                ):
+                    kv_added.add(kv.id)
+                    continue
+                for word in kv_words:
+                    layout.remove(word)
+                layout.children.append(kv)
+                kv_added.add(kv.id)
+                remaining.remove(kv)
+
+        self.layouts = [
+            layout
+            for layout in self.layouts
+            if layout.children or layout.layout_type == _LAYOUT_FIGURE
+        ]
+
+        kv_layouts = []
+        for kv in remaining:
+            if kv.id not in kv_added:
+                kv_added.add(kv.id)
+                layout = _Layout(kv.bbox, -1, _LAYOUT_KEY_VALUE)
+                layout.children.append(kv)
+                kv_layouts.append(layout)
+
+        intersecting: Dict[_Layout, List[_Layout]] = defaultdict(list)
+        for layout in self.layouts:
+            for kv_layout in kv_layouts:
+                if layout.bbox.intersection_area(kv_layout.bbox):
+                    intersecting[layout].append(kv_layout)
+
+        ignored = []
+        to_remove = []
+        for layout, kv_hits in intersecting.items():
+            moved_words = {}
+            for i, kv_layout in enumerate(sorted(kv_hits, key=_top_left)):
+                # A key-value overlapping several layouts is left to those layouts
+                if sum(kv_layout in hits for hits in intersecting.values()) > 1:
+                    ignored.append(kv_layout)
+                    continue
+                _bump_reading_order(kv_layout, layout.reading_order + (i + 1) * 0.1)
+                for word in kv_layout.children[0].words():
+                    moved_words[id(word)] = word
+            for word in moved_words.values():
+                layout.remove(word)
+            if not layout.children and layout.layout_type != _LAYOUT_FIGURE:
+                to_remove.append(layout)
+
+        for layout in to_remove:
+            self.layouts.remove(layout)
+        self.layouts.extend(kv for kv in kv_layouts if kv not in ignored)
+
+    def _attach_signatures(self) -> None:
+        signatures = {
+            block["Id"]: _Signature(block["Id"], _Box.from_block(block))
+            for block in self._page_blocks("SIGNATURE")
+        }
+        for layout in sorted(self.layouts, key=_top):
+            if layout.layout_type == _LAYOUT_ENTITY:
+                continue
+            for signature in sorted(signatures.values(), key=_top):
+                if (
+                    layout.bbox.intersection_area(signature.bbox)
+                    > _THRESHOLD * signature.bbox.area
+                ):
+                    layout.children.append(signature)
+                    del signatures[signature.id]
+
+        signature_layouts = []
+        for signature in signatures.values():
+            layout = _Layout(signature.bbox, -1, _LAYOUT_ENTITY)
+            layout.children.append(signature)
+            signature_layouts.append(layout)
+
+        for layout in self.layouts:
+            hits = [
+                s for s in signature_layouts if layout.bbox.intersection_area(s.bbox)
+            ]
+            for i, signature_layout in enumerate(sorted(hits, key=_top_left)):
+                _bump_reading_order(
+                    signature_layout, layout.reading_order + (i + 1) * 0.1
+                )
+        self.layouts.extend(signature_layouts)
+
+
+def _has_vertical_overlap(a: _Box, b: _Box) -> bool:
+    if a.y < b.y and a.y + a.height < b.y:
+        return False
+    if a.y > b.y and a.y > b.y + b.height:
+        return False
+    return True
+
+
+def _bump_reading_order(layout: _Layout, reading_order: float) -> None:
+    """Place a generated layout right after the layout it overlaps."""
+    if layout.reading_order == -1:
+        layout.reading_order = reading_order
+    else:
+        layout.reading_order = min(layout.reading_order, reading_order)
+
+
+def _confidence_row(block: Dict[str, Any]) -> str:
+    text = block.get("Text", "").replace("|", "\\|")
+    confidence = round(block.get("Confidence", 0.0), 1)
+    if block.get("TextType") == "HANDWRITING":
+        return f"| {text} (HANDWRITING) | {confidence} |"
+    return f"| {text} | {confidence} |"
+
+
+def text_confidence_table(blocks: Iterable[Dict[str, Any]]) -> str:
+    """
+    Build the text confidence markdown table from Textract blocks.
+
+    Args:
+        blocks: Textract ``Blocks``
+
+    Returns:
+        Markdown table with one row per LINE block (text and confidence)
+    """
+    rows = [CONFIDENCE_TABLE_HEADER]
+    for block in blocks:
+        if block.get("BlockType") == "LINE" and block.get("Text"):
+            rows.append(_confidence_row(block))
+    return "\n".join(rows)
+
+
+def convert_textract_response(response: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Convert a Textract response to markdown and a text confidence table.
+
+    Args:
+        response: Textract DetectDocumentText or AnalyzeDocument response
+
+    Returns:
+        Tuple of (markdown, text confidence table)
+
+    Raises:
+        ValueError: If the response has no PAGE blocks
+    """
+    blocks_by_id: Dict[str, Dict[str, Any]] = {}
+    blocks_by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    confidence_rows = [CONFIDENCE_TABLE_HEADER]
+    for block in response.get("Blocks", []):
+        block_type = block.get("BlockType", "")
+        blocks_by_id[block.get("Id")] = block
+        if block_type.startswith("LAYOUT"):
+            blocks_by_type["LAYOUT"].append(block)
+        else:
+            blocks_by_type[block_type].append(block)
+            if block_type == "LINE" and block.get("Text"):
+                confidence_rows.append(_confidence_row(block))
+
+    page_blocks = blocks_by_type.get("PAGE")
+    if not page_blocks:
+        raise ValueError("Textract response has no PAGE blocks")
+    if len(page_blocks) > 1:
+        page_blocks = sorted(page_blocks, key=lambda block: block.get("Page", 1))
+
+    words: Dict[str, _Word] = {}
+    markdown = _LAYOUT_ELEMENT_SEPARATOR.join(
+        _PageBuilder(page_block, blocks_by_id, blocks_by_type, words).build()
+        for page_block in page_blocks
+    )
+    return markdown, "\n".join(confidence_rows)
@@ -0,0 +1,164 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Asynchronous upload of OCR page artifacts.
+
+Page workers write ``image.jpg``, ``rawText.json``, ``textConfidence.json`` and
+``result.json`` for every page. Written synchronously, each worker waits on four
+S3 PUTs before it can rasterize or OCR its next page. ``ArtifactUploadQueue``
+hands the writes (including JSON serialization) to a separate thread pool with
+its own S3 connection pool, so uploads overlap with rasterization and OCR.
+
+The number of pending uploads is bounded: when the queue is full, ``put``
+blocks the calling worker until an upload finishes (backpressure), which also
+bounds the memory held by queued page images. Time spent blocked is recorded,
+and ``flush`` waits for every pending upload so results are complete before the
+document's pages are finalized.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from idp_common import s3
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UploadQueueStats:
+    """Upload counts and time spent waiting on the queue."""
+
+    uploads: int = 0
+    failed: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    flush_seconds: float = 0.0
+
+
+class ArtifactUploadQueue:
+    """
+    Bounded queue of S3 writes executed by a dedicated thread pool.
+
+    Use as a context manager; leaving the context waits for pending uploads and
+    stops the pool.
+    """
+
+    def __init__(self, client: Any, max_pending: int = 64, max_workers: int = 10):
+        """
+        Initialize the queue and start its upload threads.
+
+        Args:
+            client: boto3 S3 client used for uploads (sized for max_workers connections)
+            max_pending: Maximum number of queued or in-flight uploads before
+                ``put`` blocks
+            max_workers: Number of upload threads
+        """
+        self.client = client
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        self.stats = UploadQueueStats()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._futures: List[Tuple[str, concurrent.futures.Future]] = []
+        self._deferred: List[Tuple[str, Callable[[], None]]] = []
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ocr-upload"
+        )
+
+    def __enter__(self) -> "ArtifactUploadQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def put(
+        self,
+        content: Any,
+        bucket: str,
+        key: str,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a write to S3, blocking while the queue is full.
+
+        Args:
+            content: Content to write (as accepted by ``s3.write_content``); it
+                must not be modified after it is queued
+            bucket: S3 bucket
+            key: S3 key
+            content_type: Optional content type for the S3 object
+        """
+        start = time.perf_counter()
+        self._slots.acquire()
+        waited = time.perf_counter() - start
+        try:
+            future = self._executor.submit(
+                s3.write_content, content, bucket, key, content_type, self.client
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._futures.append((key, future))
+            self.stats.uploads += 1
+            self.stats.wait_seconds += waited
+            self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+
+    def defer(self, key_prefix: str, callback: Callable[[], None]) -> None:
+        """
+        Run a callback at the next flush, once all pending uploads are done.
+
+        The callback is skipped if any upload under ``key_prefix`` failed.
+
+        Args:
+            key_prefix: S3 key prefix of the uploads the callback depends on
+            callback: Function to run (errors are logged, not raised)
+        """
+        with self._lock:
+            self._deferred.append((key_prefix, callback))
+
+    def flush(self) -> Dict[str, Exception]:
+        """
+        Wait for all pending uploads, then run deferred callbacks.
+
+        Returns:
+            Dict of S3 key to exception for uploads that failed since the last flush
+        """
+        start = time.perf_counter()
+        with self._lock:
+            futures, self._futures = self._futures, []
+            deferred, self._deferred = self._deferred, []
+
+        failures: Dict[str, Exception] = {}
+        for key, future in futures:
+            error = future.exception()
+            if error is not None:
+                failures[key] = error
+
+        for key_prefix, callback in deferred:
+            if any(key.startswith(key_prefix) for key in failures):
+                continue
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Deferred upload callback failed for {key_prefix}: {e}")
+
+        with self._lock:
+            self.stats.failed += len(failures)
+            self.stats.flush_seconds += time.perf_counter() - start
+        return failures
+
+    def close(self) -> None:
+        """Wait for pending uploads and stop the upload threads."""
+        failures = self.flush()
+        if failures:
+            logger.error(f"{len(failures)} artifact uploads failed before close")
+        self._executor.shutdown(wait=True)
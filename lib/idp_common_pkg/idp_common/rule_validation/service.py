@@ -19,6 +19,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from idp_common import bedrock, s3, utils
+from idp_common.bedrock.token_estimator import estimate_text_tokens
 from idp_common.config.models import IDPConfig
 from idp_common.models import Document, RuleValidationResult, Status
 from idp_common.rule_validation.models import FactExtractionResponse
@@ -169,14 +170,14 @@ class RuleValidationService:
         Returns:
             List of text chunks
         """
-        # Simple token estimation
-        estimated_tokens = len(text) // token_size
+        estimated_tokens = estimate_text_tokens(text, token_size)
 
         if estimated_tokens <= max_chunk_size:
             return [text]
 
-        # Calculate chunk size in characters
-        chunk_size_chars = max_chunk_size * token_size
+        # Calculate chunk size in characters from this text's token density,
+        # which is well below token_size for tables and CJK text
+        chunk_size_chars = max(1, len(text) * max_chunk_size // estimated_tokens)
         overlap_chars = int(chunk_size_chars * (overlap_percentage / 100))
 
         chunks = []
@@ -230,7 +231,7 @@ class RuleValidationService:
             return []
 
         # Early return if entire text fits in one chunk
-        estimated_tokens = len(text) // token_size
+        estimated_tokens = estimate_text_tokens(text, token_size)
         if estimated_tokens <= max_chunk_size:
             logger.debug(
                 f"DEBUG:PAGE_CHUNK_SINGLE_CHUNK estimated_tokens={estimated_tokens}"
@@ -283,7 +284,7 @@ class RuleValidationService:
 
         def get_page_tokens(page_content: str) -> int:
             """Estimate tokens for a page."""
-            return len(page_content) // token_size
+            return estimate_text_tokens(page_content, token_size)
 
         def get_overlap_pages(
             prev_pages: List[Tuple[str, str]],
@@ -106,6 +106,7 @@ def write_content(
     bucket: str,
     key: str,
     content_type: Optional[str] = None,
+    client: Optional[Any] = None,
 ) -> None:
     """
     Write content to S3
@@ -115,9 +116,10 @@ def write_content(
         bucket: The S3 bucket
         key: The S3 key
         content_type: Optional content type for the S3 object
+        client: Optional boto3 S3 client to use instead of the shared one
     """
     try:
-        s3 = get_s3_client()
+        s3 = client or get_s3_client()
 
         # Handle different content types
         if isinstance(content, (dict, list)):
@@ -145,6 +147,38 @@ def write_content(
         raise
 
 
+def copy_content(
+    source_bucket: str,
+    source_key: str,
+    dest_bucket: str,
+    dest_key: str,
+) -> None:
+    """
+    Copy an object within S3 using a server-side copy (no download/upload)
+
+    Args:
+        source_bucket: The source S3 bucket
+        source_key: The source S3 key
+        dest_bucket: The destination S3 bucket
+        dest_key: The destination S3 key
+    """
+    try:
+        s3 = get_s3_client()
+        s3.copy_object(
+            Bucket=dest_bucket,
+            Key=dest_key,
+            CopySource={"Bucket": source_bucket, "Key": source_key},
+        )
+        logger.info(
+            f"Successfully copied s3://{source_bucket}/{source_key} to s3://{dest_bucket}/{dest_key}"
+        )
+    except Exception as e:
+        logger.error(
+            f"Error copying s3://{source_bucket}/{source_key} to s3://{dest_bucket}/{dest_key}: {e}"
+        )
+        raise
+
+
 def list_images_from_path(image_path: str) -> List[str]:
     """
     List all image files from an S3 prefix or local directory.
@@ -1050,6 +1050,10 @@ def check_token_limit(
     Returns:
         Error message based on the configured_max_tokens, None otherwise
     """
+    # Deferred: importing the estimator runs idp_common.bedrock's __init__, which
+    # creates the default BedrockClient, so this call (not utils) pays for it
+    from idp_common.bedrock.token_estimator import estimate_text_tokens
+
     # Information for logging and troubleshooting
     assessment_config = config.assessment
     logger.info(f"assessment_config: {assessment_config}")
@@ -1057,7 +1061,9 @@ def check_token_limit(
     logger.info(f"model_id: {model_id}")
     configured_max_tokens = assessment_config.max_tokens
     logger.info(f"configured_max_tokens: {configured_max_tokens}")
-    estimated_tokens = (len(document_text) + len(str(extraction_results))) / 4
+    estimated_tokens = estimate_text_tokens(document_text) + estimate_text_tokens(
+        str(extraction_results)
+    )
     logger.info(f"Estimated tokens: {estimated_tokens}")
     if configured_max_tokens and int(configured_max_tokens) < estimated_tokens:
         return f"The max_tokens value of {configured_max_tokens} is too low for this document."
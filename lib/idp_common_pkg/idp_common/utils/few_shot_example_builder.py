@@ -1,8 +1,31 @@
+"""
+Few-shot example content for classification and extraction prompts.
+
+Example images are listed and downloaded from S3 (or read from ROOT_DIR),
+which is slow to repeat for every page and section. Built content is kept in
+a process-wide LRU bounded by size, keyed by a hash of the class's example
+definitions and the image settings, so in a warm Lambda container each
+class's examples are loaded and resized once. Entries expire after a TTL so
+example images replaced in S3 under the same path are picked up.
+
+The cache is configured with environment variables:
+
+- ``FEW_SHOT_CACHE_MB``: cache size (default 64, 0 disables the cache)
+- ``FEW_SHOT_CACHE_TTL_SECONDS``: entry lifetime (default 900)
+"""
+
+import copy
+import hashlib
+import json
 import logging
-from idp_common import image, s3
-from typing import Any, Dict, List
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from idp_common.config.models import IDPConfig
+from idp_common import image, s3
+from idp_common.config.models import IDPConfig, ImageConfig
 from idp_common.config.schema_constants import (
     X_AWS_IDP_CLASSIFICATION,
     X_AWS_IDP_EXAMPLES,
@@ -10,6 +33,125 @@ from idp_common.config.schema_constants import (
 
 logger = logging.getLogger(__name__)
 
+CACHE_MB_ENV_VAR = "FEW_SHOT_CACHE_MB"
+CACHE_TTL_ENV_VAR = "FEW_SHOT_CACHE_TTL_SECONDS"
+
+DEFAULT_CACHE_MB = 64
+DEFAULT_CACHE_TTL_SECONDS = 900
+
+
+class FewShotExampleCache:
+    """
+    LRU of built example content, bounded by the size of its text and images.
+
+    Thread-safe. Returned content is a copy, so callers may modify it.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Size budget of the cached text and image bytes
+            ttl_seconds: Entry lifetime
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, int, List[Dict[str, Any]]]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached content for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._entries.pop(key)
+                self._bytes -= entry[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Image bytes are immutable and shared; only the containers are copied
+        return copy.deepcopy(entry[2])
+
+    def put(self, key: str, content: List[Dict[str, Any]]) -> None:
+        """Cache built content for a key."""
+        size = _content_size(content)
+        if size > self.max_bytes:
+            return
+        entry = (time.monotonic() + self.ttl_seconds, size, copy.deepcopy(content))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _content_size(content: List[Dict[str, Any]]) -> int:
+    size = 0
+    for item in content:
+        if "text" in item:
+            size += len(item["text"])
+        elif "image" in item:
+            size += len(item["image"]["source"]["bytes"])
+    return size
+
+
+def create_few_shot_cache_from_env() -> Optional[FewShotExampleCache]:
+    """
+    Create the example cache configured by the environment.
+
+    Returns:
+        FewShotExampleCache, or None if FEW_SHOT_CACHE_MB is 0
+    """
+    try:
+        max_mb = float(os.environ.get(CACHE_MB_ENV_VAR) or DEFAULT_CACHE_MB)
+        ttl_seconds = float(
+            os.environ.get(CACHE_TTL_ENV_VAR) or DEFAULT_CACHE_TTL_SECONDS
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid few-shot example cache setting, using defaults: {e}")
+        max_mb, ttl_seconds = DEFAULT_CACHE_MB, DEFAULT_CACHE_TTL_SECONDS
+    if max_mb <= 0:
+        return None
+    return FewShotExampleCache(int(max_mb * 1024 * 1024), ttl_seconds)
+
+
+_shared_cache: Optional[FewShotExampleCache] = None
+_shared_cache_loaded = False
+_shared_cache_lock = threading.Lock()
+
+
+def get_few_shot_cache() -> Optional[FewShotExampleCache]:
+    """Return the process-wide example cache, or None if disabled."""
+    global _shared_cache, _shared_cache_loaded
+    with _shared_cache_lock:
+        if not _shared_cache_loaded:
+            _shared_cache = create_few_shot_cache_from_env()
+            _shared_cache_loaded = True
+        return _shared_cache
+
 
 def _get_image_files_from_path(image_path: str) -> List[str]:
     """
@@ -75,101 +217,93 @@ def _get_image_files_from_path(image_path: str) -> List[str]:
             )
 
 
-def build_few_shot_examples_content(config: IDPConfig) -> List[Dict[str, Any]]:
-    """
-    Build content items for few-shot examples from the configuration.
-
-    Returns:
-        List of content items containing text and image content for examples
-    """
-    content = []
-    classes = config.classes or []
-
-    for schema in classes:
-        # Examples are stored directly on the schema object
-        examples = schema.get(X_AWS_IDP_EXAMPLES, [])
-        for example in examples:
-            class_prompt = example.get("classPrompt")
-
-            # Only process this example if it has a non-empty class_prompt
-            if not class_prompt or not class_prompt.strip():
-                logger.info(
-                    f"Skipping example with empty classPrompt: {example.get('name')}"
-                )
-                continue
-
-            content.append({"text": class_prompt})
-
-            image_path = example.get("imagePath")
-            if image_path:
-                try:
-                    # Load image content from the path
-
-                    # Get list of image files from the path (supports directories/prefixes)
-                    image_files = _get_image_files_from_path(image_path)
-
-                    # Process each image file
-                    for image_file_path in image_files:
-                        try:
-                            # Load image content
-                            if image_file_path.startswith("s3://"):
-                                # Direct S3 URI
-                                image_content = s3.get_binary_content(image_file_path)
-                            else:
-                                # Local file
-                                with open(image_file_path, "rb") as f:
-                                    image_content = f.read()
-
-                            # Prepare image content for Bedrock
-                            image_attachment = image.prepare_bedrock_image_attachment(
-                                image_content
-                            )
-                            content.append(image_attachment)
-
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to load image {image_file_path}: {e}"
-                            )
-                            continue
-
-                except Exception as e:
-                    raise ValueError(
-                        f"Failed to load example images from {image_path}: {e}"
-                    )
-
-    return content
-
-
-def build_few_shot_extraction_examples_content(
-    target_class: Dict[str, Any],
+def _examples_cache_key(
+    examples: List[Dict[str, Any]],
+    prompt_field: str,
+    image_config: Optional[ImageConfig],
+) -> str:
+    """Hash the example definitions, image settings and image location."""
+    canonical = json.dumps(
+        {
+            "examples": examples,
+            "prompt_field": prompt_field,
+            "image": image_config.model_dump() if image_config else None,
+            "bucket": os.environ.get("CONFIGURATION_BUCKET"),
+            "root_dir": os.environ.get("ROOT_DIR"),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _load_example_image(
+    image_file_path: str, image_config: Optional[ImageConfig]
+) -> Dict[str, Any]:
+    """Load an example image, apply the image settings and format it for Bedrock."""
+    if image_file_path.startswith("s3://"):
+        # Direct S3 URI
+        image_content = s3.get_binary_content(image_file_path)
+    else:
+        # Local file
+        with open(image_file_path, "rb") as f:
+            image_content = f.read()
+
+    if image_config is not None:
+        # Resize and encode examples like the document pages they precede
+        image_content = image.resize_image(
+            image_content,
+            image_config.target_width,
+            image_config.target_height,
+            image_format=image_config.format,
+            quality=image_config.quality,
+            color_mode=image_config.color_mode,
+        )
+
+    # Prepare image content for Bedrock
+    return image.prepare_bedrock_image_attachment(image_content)
+
+
+def _build_examples_content(
+    examples: List[Dict[str, Any]],
+    prompt_field: str,
+    image_config: Optional[ImageConfig] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Build content items for few-shot examples for extraction from a specific class schema.
-    Uses attributesPrompt from examples.
+    Build content items for a class's examples, using the example cache.
 
     Args:
-        target_class: The JSON Schema for the target document class
+        examples: Example definitions from the class schema
+        prompt_field: Example field holding the prompt text
+            ("classPrompt" or "attributesPrompt")
+        image_config: Image settings applied to example images
 
     Returns:
         List of content items containing text and image content for examples
     """
-    content = []
+    if not examples:
+        return []
 
-    # Get examples from the schema
-    examples = target_class.get(X_AWS_IDP_EXAMPLES, [])
+    cache = get_few_shot_cache()
+    key = _examples_cache_key(examples, prompt_field, image_config)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
 
+    content = []
+    complete = True
     for example in examples:
-        # For extraction, use attributesPrompt instead of classPrompt
-        attributes_prompt = example.get("attributesPrompt")
+        prompt = example.get(prompt_field)
 
-        # Only process this example if it has a non-empty attributesPrompt
-        if not attributes_prompt or not attributes_prompt.strip():
+        # Only process this example if it has a non-empty prompt
+        if not prompt or not prompt.strip():
             logger.info(
-                f"Skipping example with empty attributesPrompt: {example.get('name')}"
+                f"Skipping example with empty {prompt_field}: {example.get('name')}"
             )
             continue
 
-        content.append({"text": attributes_prompt})
+        content.append({"text": prompt})
 
         image_path = example.get("imagePath")
         if image_path:
@@ -180,23 +314,12 @@ def build_few_shot_extraction_examples_content(
                 # Process each image file
                 for image_file_path in image_files:
                     try:
-                        # Load image content
-                        if image_file_path.startswith("s3://"):
-                            # Direct S3 URI
-                            image_content = s3.get_binary_content(image_file_path)
-                        else:
-                            # Local file
-                            with open(image_file_path, "rb") as f:
-                                image_content = f.read()
-
-                        # Prepare image content for Bedrock
-                        image_attachment = image.prepare_bedrock_image_attachment(
-                            image_content
+                        content.append(
+                            _load_example_image(image_file_path, image_config)
                         )
-                        content.append(image_attachment)
-
                     except Exception as e:
                         logger.warning(f"Failed to load image {image_file_path}: {e}")
+                        complete = False
                         continue
 
             except Exception as e:
@@ -204,4 +327,50 @@ def build_few_shot_extraction_examples_content(
                     f"Failed to load example images from {image_path}: {e}"
                 )
 
+    # Retry incomplete examples on the next call rather than caching the gap
+    if cache is not None and complete:
+        cache.put(key, content)
     return content
+
+
+def build_few_shot_examples_content(config: IDPConfig) -> List[Dict[str, Any]]:
+    """
+    Build content items for few-shot examples from the configuration.
+
+    Example images are resized and encoded with the classification image
+    settings, and built content is cached per class (see FewShotExampleCache).
+
+    Returns:
+        List of content items containing text and image content for examples
+    """
+    content = []
+    classes = config.classes or []
+    image_config = config.classification.image
+
+    for schema in classes:
+        # Examples are stored directly on the schema object
+        examples = schema.get(X_AWS_IDP_EXAMPLES, [])
+        content.extend(_build_examples_content(examples, "classPrompt", image_config))
+
+    return content
+
+
+def build_few_shot_extraction_examples_content(
+    target_class: Dict[str, Any],
+    image_config: Optional[ImageConfig] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build content items for few-shot examples for extraction from a specific class schema.
+    Uses attributesPrompt from examples.
+
+    Args:
+        target_class: The JSON Schema for the target document class
+        image_config: Image settings applied to example images (None sends them
+            unchanged)
+
+    Returns:
+        List of content items containing text and image content for examples
+    """
+    # Get examples from the schema
+    examples = target_class.get(X_AWS_IDP_EXAMPLES, [])
+    return _build_examples_content(examples, "attributesPrompt", image_config)
@@ -11,13 +11,8 @@ Unit tests for the AssessmentService class.
 import pytest
 
 # Import standard library modules first
-import sys
 from textwrap import dedent
-from unittest.mock import MagicMock, patch
-
-# Mock PIL before importing any modules that might depend on it
-sys.modules["PIL"] = MagicMock()
-sys.modules["PIL.Image"] = MagicMock()
+from unittest.mock import patch
 
 # Now import third-party modules
 
@@ -14,13 +14,6 @@ properties, causing them to fall through to the simple_props list.
 """
 
 # ruff: noqa: E402, I001
-import sys
-from unittest.mock import MagicMock
-
-# Mock PIL before importing modules that depend on it
-sys.modules["PIL"] = MagicMock()
-sys.modules["PIL.Image"] = MagicMock()
-
 import pytest
 
 from idp_common.assessment.granular_service import GranularAssessmentService
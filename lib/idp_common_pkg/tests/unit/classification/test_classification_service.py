@@ -291,7 +291,14 @@ class TestClassificationService:
 
         # Verify calls
         mock_get_text.assert_called_once_with("s3://bucket/text.txt")
-        mock_prepare_image.assert_called_once_with("s3://bucket/image.jpg", None, None)
+        mock_prepare_image.assert_called_once_with(
+            "s3://bucket/image.jpg",
+            None,
+            None,
+            image_format=None,
+            quality=None,
+            color_mode=None,
+        )
         mock_prepare_bedrock_image.assert_called_once_with(b"image_data")
         mock_invoke.assert_called_once()
 
@@ -1342,3 +1349,71 @@ class TestClassificationService:
             assert result.sections[1].page_ids == ["2"]
             assert result.sections[0].classification == "invoice"
             assert result.sections[1].classification == "invoice"
+
+    @patch("idp_common.s3.get_text_content")
+    def test_classify_documents_batch(self, mock_get_text, service, tmp_path):
+        """Test batch classification maps job results back to each document."""
+        from idp_common.bedrock.batch import BedrockBatchRunner, LocalBatchJobService
+        from idp_common.bedrock.client import BedrockClient
+
+        texts = {
+            "s3://bucket/a1.txt": "Invoice number 1",
+            "s3://bucket/a2.txt": "Dear Sir, a letter",
+            "s3://bucket/b1.txt": "unreadable",
+        }
+        mock_get_text.side_effect = lambda uri: texts[uri]
+
+        def responder(model_id, model_input):
+            prompt = model_input["messages"][0]["content"][0]["text"]
+            if "unreadable" in prompt:
+                raise ValueError("Malformed input request")
+            doc_type = "invoice" if "Invoice number" in prompt else "letter"
+            text = json.dumps({"class": doc_type})
+            return {
+                "output": {"message": {"content": [{"text": text}]}},
+                "stopReason": "end_turn",
+                "usage": {"inputTokens": 10, "outputTokens": 2, "totalTokens": 12},
+            }
+
+        first = Document(id="doc-a", status=Status.CLASSIFYING)
+        first.pages["1"] = Page(page_id="1", parsed_text_uri="s3://bucket/a1.txt")
+        first.pages["2"] = Page(page_id="2", parsed_text_uri="s3://bucket/a2.txt")
+        second = Document(id="doc-b", status=Status.CLASSIFYING)
+        second.pages["1"] = Page(page_id="1", parsed_text_uri="s3://bucket/b1.txt")
+        runner = BedrockBatchRunner(
+            LocalBatchJobService(str(tmp_path), responder),
+            bedrock_client=BedrockClient(metrics_enabled=False),
+            min_records=1,
+        )
+
+        first, second = service.classify_documents_batch([first, second], runner)
+
+        assert first.pages["1"].classification == "invoice"
+        assert first.pages["2"].classification == "letter"
+        assert {s.classification for s in first.sections} == {"invoice", "letter"}
+        assert first.metering == {
+            "Classification/bedrock/anthropic.claude-3-sonnet-20240229-v1:0:batch": {
+                "inputTokens": 20,
+                "outputTokens": 4,
+                "totalTokens": 24,
+                "requests": 2,
+            }
+        }
+        assert second.pages["1"].classification == "unclassified"
+        assert "Malformed input request" in second.errors[0]
+
+    def test_classify_documents_batch_single_class(self, single_class_config):
+        """Test documents that need no model call are classified directly."""
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-west-2", config=single_class_config, backend="bedrock"
+            )
+        doc = Document(id="doc", status=Status.CLASSIFYING)
+        doc.pages["1"] = Page(page_id="1", parsed_text_uri="s3://bucket/text.txt")
+        runner = MagicMock()
+
+        (result,) = service.classify_documents_batch([doc], runner)
+
+        assert result.pages["1"].classification == "invoice"
+        runner.add.assert_not_called()
+        runner.run.assert_not_called()
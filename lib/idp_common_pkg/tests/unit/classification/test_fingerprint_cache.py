@@ -0,0 +1,267 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for the cross-document page fingerprint cache."""
+
+import io
+import json
+import random
+from unittest.mock import patch
+
+import pytest
+from idp_common.classification import fingerprint_cache
+from idp_common.classification.fingerprint_cache import (
+    PageFingerprint,
+    PageFingerprintIndex,
+    compute_image_hash,
+    compute_text_layout_signature,
+    hamming_distance,
+)
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page, Status
+from PIL import Image, ImageDraw
+
+FORM_BOXES = [
+    (20, 40, 360, 60),
+    (20, 140, 170, 60),
+    (210, 140, 170, 60),
+    (20, 240, 360, 200),
+]
+LETTER_BOXES = [
+    (20, 40, 170, 200),
+    (210, 40, 170, 120),
+    (20, 300, 360, 60),
+    (210, 400, 170, 100),
+]
+
+FORM_TEXT = "Application form\nName: {name}\nDate of birth: {dob}\nSignature:"
+
+
+def _page_image(boxes, filled_in=""):
+    img = Image.new("L", (400, 520), 255)
+    draw = ImageDraw.Draw(img)
+    for x, y, width, height in boxes:
+        draw.rectangle([x, y, x + width, y + height], outline=0, width=3)
+        if filled_in:
+            draw.text((x + 10, y + 10), filled_in, fill=0)
+    output = io.BytesIO()
+    img.save(output, format="JPEG")
+    return output.getvalue()
+
+
+class MemoryStore:
+    """Fingerprint store keeping entries in a dict."""
+
+    def __init__(self):
+        self.entries = {}
+        self.saves = 0
+
+    def load(self, config_key):
+        return list(self.entries.get(config_key, []))
+
+    def save(self, config_key, entries):
+        self.saves += 1
+        self.entries.setdefault(config_key, []).extend(entries)
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_index(monkeypatch):
+    monkeypatch.setattr(fingerprint_cache, "_shared_index", None)
+    monkeypatch.setattr(fingerprint_cache, "_shared_index_location", None)
+
+
+@pytest.mark.unit
+class TestPageFingerprints:
+    """Tests for the image hash and text layout signature."""
+
+    def test_filled_in_form_is_near_duplicate(self):
+        """Filling in a form changes the fingerprint much less than a new layout."""
+        blank = compute_image_hash(_page_image(FORM_BOXES))
+        filled = compute_image_hash(_page_image(FORM_BOXES, "John Smith 1234"))
+        other = compute_image_hash(_page_image(LETTER_BOXES))
+
+        assert hamming_distance(blank, filled) <= 4
+        assert hamming_distance(blank, other) > 8
+
+    def test_text_signature_ignores_field_values(self):
+        """Forms with the same labels get the same signature."""
+        first = compute_text_layout_signature(
+            FORM_TEXT.format(name="John Smith", dob="01/02/1980")
+        )
+        second = compute_text_layout_signature(
+            FORM_TEXT.format(name="Jane Doe", dob="11/12/1975")
+        )
+        invoice = compute_text_layout_signature(
+            "INVOICE\nInvoice number 5531\nBill to: ACME\nTotal due: $400"
+        )
+
+        assert first == second
+        assert hamming_distance(first, invoice) > 8
+        assert compute_text_layout_signature("") == 0
+
+
+@pytest.mark.unit
+class TestPageFingerprintIndex:
+    """Tests for the PageFingerprintIndex class."""
+
+    def test_lookup_returns_nearest_match_within_distances(self):
+        """The closest page within both distances wins."""
+        index = PageFingerprintIndex("config")
+        index.add(PageFingerprint(0b1111, 0), "letter", "start")
+        index.add(PageFingerprint(0b0001, 0), "invoice", "start")
+
+        match = index.lookup(PageFingerprint(0b0011, 0b1), 2, 1)
+
+        assert match.doc_type == "invoice"
+        assert (match.image_distance, match.text_distance) == (1, 1)
+        assert index.lookup(PageFingerprint(0, 0b111), 2, 1) is None
+        assert (index.hits, index.misses) == (1, 1)
+
+    def test_lookup_compares_only_shared_bands(self):
+        """Matches up to distance 7 are found without scanning the index."""
+        rng = random.Random(0)
+        index = PageFingerprintIndex("config")
+        for _ in range(5000):
+            index.add(PageFingerprint(rng.getrandbits(64), 0), "letter", "start")
+        image_hash = 0x0123456789ABCDEF
+        index.add(PageFingerprint(image_hash, 0), "form", "start")
+        # One differing bit in each of seven bytes, so one byte still matches
+        query = PageFingerprint(image_hash ^ 0x01010101010101, 0)
+
+        with patch.object(
+            fingerprint_cache, "hamming_distance", wraps=hamming_distance
+        ) as mock_distance:
+            match = index.lookup(query, 7, 0)
+
+        assert match.doc_type == "form"
+        assert match.image_distance == 7
+        assert mock_distance.call_count < 500
+        with pytest.raises(ValueError):
+            index.lookup(query, 8, 0)
+
+    def test_load_and_flush_use_store(self):
+        """Stored entries are loaded and only new entries are written back."""
+        store = MemoryStore()
+        store.entries["config"] = [(PageFingerprint(1, 2), "invoice", "start")]
+        index = PageFingerprintIndex("config", store, max_entries=2)
+        index.load()
+
+        index.add(PageFingerprint(1, 2), "invoice", "start")
+        index.add(PageFingerprint(3, 4), "letter", "continue")
+        index.add(PageFingerprint(5, 6), "letter", "continue")
+        index.flush()
+        index.flush()
+
+        assert len(index) == 2
+        assert store.saves == 1
+        assert store.entries["config"][1] == (
+            PageFingerprint(3, 4),
+            "letter",
+            "continue",
+        )
+
+    def test_config_change_replaces_shared_index(self):
+        """A new configuration key starts from the store entries of that key."""
+        store = MemoryStore()
+        store.entries["old"] = [(PageFingerprint(1, 2), "invoice", "start")]
+        with patch.object(
+            fingerprint_cache, "create_fingerprint_store", return_value=store
+        ):
+            old = fingerprint_cache.get_fingerprint_index("old", "dynamodb://t")
+            again = fingerprint_cache.get_fingerprint_index("old", "dynamodb://t")
+            new = fingerprint_cache.get_fingerprint_index("new", "dynamodb://t")
+
+        assert again is old
+        assert len(old) == 1
+        assert len(new) == 0
+
+
+@pytest.fixture
+def service_config():
+    return {
+        "classes": [
+            {"$id": "form", "x-aws-idp-document-type": "form"},
+            {"$id": "letter", "x-aws-idp-document-type": "letter"},
+        ],
+        "classification": {
+            "model": "us.amazon.nova-pro-v1:0",
+            "system_prompt": "You classify documents.",
+            "task_prompt": "{CLASS_NAMES_AND_DESCRIPTIONS}\n\n{DOCUMENT_TEXT}",
+            "fingerprintCache": {"enabled": True},
+        },
+    }
+
+
+def _document(doc_id, filled_in):
+    doc = Document(id=doc_id, input_key=f"{doc_id}.pdf", status=Status.CLASSIFYING)
+    doc.pages["1"] = Page(
+        page_id="1",
+        parsed_text_uri=f"s3://bucket/{doc_id}/{filled_in}.txt",
+        image_uri=f"s3://bucket/{doc_id}/{filled_in}.jpg",
+    )
+    return doc
+
+
+def _model_response(*args, **kwargs):
+    text = json.dumps({"class": "form", "document_boundary": "start"})
+    return {
+        "response": {"output": {"message": {"content": [{"text": text}]}}},
+        "metering": {"Classification/bedrock/model": {"inputTokens": 100}},
+    }
+
+
+@pytest.mark.unit
+@patch("idp_common.metrics.put_metric")
+@patch(
+    "idp_common.image.prepare_image",
+    side_effect=lambda uri, *args, **kwargs: _page_image(
+        FORM_BOXES, uri.rsplit("/", 1)[1]
+    ),
+)
+@patch(
+    "idp_common.s3.get_text_content",
+    side_effect=lambda uri: FORM_TEXT.format(name=uri, dob="01/01/2000"),
+)
+class TestFingerprintCachedClassification:
+    """Tests for ClassificationService with the fingerprint cache enabled."""
+
+    def test_near_duplicate_page_skips_model(
+        self, mock_get_text, mock_prepare_image, mock_put_metric, service_config
+    ):
+        """A filled-in copy of a classified form reuses its classification."""
+        service = ClassificationService(region="us-east-1", config=service_config)
+        with patch.object(
+            service, "_invoke_bedrock_model", side_effect=_model_response
+        ) as mock_invoke:
+            service.classify_document(_document("doc1", "John"))
+            result = service.classify_document(_document("doc2", "Jane"))
+
+        assert mock_invoke.call_count == 1
+        mock_put_metric.assert_any_call("ClassificationFingerprintCacheHits", 1)
+        page = result.pages["1"]
+        assert page.classification == "form"
+        assert "fingerprint_match" in page.metadata
+        assert result.metering == {
+            "Classification/fingerprint_cache/us.amazon.nova-pro-v1:0": {"hits": 1}
+        }
+
+    def test_class_change_invalidates_cache(
+        self, mock_get_text, mock_prepare_image, mock_put_metric, service_config
+    ):
+        """Pages classified under other classes are not reused."""
+        service = ClassificationService(region="us-east-1", config=service_config)
+        with patch.object(
+            service, "_invoke_bedrock_model", side_effect=_model_response
+        ):
+            service.classify_document(_document("doc1", "John"))
+
+        service_config["classes"].append(
+            {"$id": "invoice", "x-aws-idp-document-type": "invoice"}
+        )
+        changed = ClassificationService(region="us-east-1", config=service_config)
+        with patch.object(
+            changed, "_invoke_bedrock_model", side_effect=_model_response
+        ) as mock_invoke:
+            changed.classify_document(_document("doc2", "Jane"))
+
+        assert mock_invoke.call_count == 1
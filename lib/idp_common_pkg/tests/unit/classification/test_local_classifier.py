@@ -0,0 +1,188 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for the local page pre-classifier."""
+
+import io
+import json
+import random
+import sys
+from unittest.mock import patch
+
+import pytest
+from idp_common.classification.local_classifier import (
+    LocalPageClassifier,
+    calibrate_threshold,
+    fit_local_classifier,
+    hash_features,
+    load_reporting_examples,
+)
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page, Status
+
+VOCABULARY = {
+    "w2": "wage and tax statement employer identification number federal income",
+    "payslip": "earnings statement pay period net pay gross pay deductions",
+    "bank-statement": "account summary opening balance closing balance deposits",
+}
+
+
+def _examples(count, seed=0):
+    rng = random.Random(seed)
+    examples = []
+    for _ in range(count):
+        doc_type = rng.choice(sorted(VOCABULARY))
+        words = VOCABULARY[doc_type].split()
+        rng.shuffle(words)
+        text = " ".join(words[:6]) + f" {rng.randint(1000, 9999)}"
+        examples.append((text, doc_type, "start"))
+    return examples
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return fit_local_classifier(
+        _examples(300), num_features=2**12, epochs=5, min_accepted=5
+    )
+
+
+@pytest.mark.unit
+class TestLocalPageClassifier:
+    """Tests for fitting, calibrating and serializing the model."""
+
+    def test_features_mask_digits(self):
+        """Numbers map to the same features and vectors are normalized."""
+        first_indices, first_values = hash_features("Invoice 12345", 2**12)
+        second_indices, _ = hash_features("invoice 99999", 2**12)
+
+        assert sorted(first_indices) == sorted(second_indices)
+        assert abs(float((first_values**2).sum()) - 1.0) < 1e-5
+
+    def test_fit_predicts_and_calibrates(self, classifier):
+        """A fit model labels separable pages confidently."""
+        doc_type, boundary, confidence = classifier.predict(
+            "net pay gross pay earnings statement 2024"
+        )
+
+        assert (doc_type, boundary) == ("payslip", "start")
+        assert classifier.threshold is not None
+        assert confidence >= classifier.threshold
+        assert classifier.metadata["holdout_pages"] == 60
+
+    def test_round_trip(self, classifier):
+        """A saved model predicts like the original."""
+        loaded = LocalPageClassifier.from_bytes(classifier.to_bytes())
+        text = "opening balance deposits account summary"
+
+        assert loaded.labels == classifier.labels
+        assert loaded.threshold == classifier.threshold
+        assert loaded.predict(text) == pytest.approx(classifier.predict(text))
+
+    def test_load_without_numpy_names_extra(self, classifier):
+        """Loading a model without NumPy says which extra to install."""
+        data = classifier.to_bytes()
+        with patch.dict(sys.modules, {"numpy": None}):
+            with pytest.raises(ImportError, match="local_classifier"):
+                LocalPageClassifier.from_bytes(data)
+
+    def test_calibrate_threshold(self):
+        """The lowest threshold reaching the target precision is chosen."""
+        confidences = [0.99, 0.95, 0.9, 0.8, 0.7]
+        correct = [True, True, True, False, True]
+
+        assert calibrate_threshold(confidences, correct, 1.0, 1) == 0.9
+        assert calibrate_threshold(confidences, correct, 0.8, 1) == 0.7
+        assert calibrate_threshold(confidences, correct, 1.0, 4) is None
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.s3.get_s3_client")
+    def test_load_reporting_examples(self, mock_client, mock_get_text):
+        """Section records are expanded to labeled page texts."""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pa.Table.from_pylist(
+            [
+                {
+                    "document_id": "batch/doc.pdf",
+                    "section_id": "1",
+                    "section_classification": "payslip",
+                    "split_document.page_indices": json.dumps([1, 0]),
+                }
+            ]
+        )
+        body = io.BytesIO()
+        pq.write_table(table, body)
+        client = mock_client.return_value
+        client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "document_sections/payslip/date=x/a.parquet"}]}
+        ]
+        client.get_object.return_value = {"Body": io.BytesIO(body.getvalue())}
+        mock_get_text.side_effect = lambda uri: uri
+
+        examples = list(load_reporting_examples("reporting", "output"))
+
+        assert examples == [
+            ("s3://output/batch/doc.pdf/pages/1/result.json", "payslip", "start"),
+            ("s3://output/batch/doc.pdf/pages/2/result.json", "payslip", "continue"),
+        ]
+
+
+def _model_response(*args, **kwargs):
+    text = json.dumps({"class": "w2", "document_boundary": "start"})
+    return {
+        "response": {"output": {"message": {"content": [{"text": text}]}}},
+        "metering": {"Classification/bedrock/model": {"inputTokens": 100}},
+    }
+
+
+@pytest.mark.unit
+@patch("idp_common.metrics.put_metric")
+@patch("idp_common.s3.get_text_content")
+class TestLocalPreClassification:
+    """Tests for ClassificationService with the local classifier enabled."""
+
+    def test_confident_pages_skip_model(
+        self, mock_get_text, mock_put_metric, classifier
+    ):
+        """Only pages below the threshold are sent to Bedrock."""
+        mock_get_text.side_effect = {
+            "s3://bucket/1.json": "net pay gross pay earnings statement",
+            "s3://bucket/2.json": "handwritten note",
+        }.get
+        config = {
+            "classes": [
+                {"$id": name, "x-aws-idp-document-type": name} for name in VOCABULARY
+            ],
+            "classification": {
+                "model": "us.amazon.nova-pro-v1:0",
+                "system_prompt": "You classify documents.",
+                "task_prompt": "{CLASS_NAMES_AND_DESCRIPTIONS}\n\n{DOCUMENT_TEXT}",
+                "localClassifier": {
+                    "enabled": True,
+                    "model_uri": "s3://models/local.npz",
+                    "min_confidence": 0.8,
+                },
+            },
+        }
+        with patch(
+            "idp_common.classification.service.get_local_classifier",
+            return_value=classifier,
+        ):
+            service = ClassificationService(region="us-east-1", config=config)
+        doc = Document(id="doc", input_key="doc.pdf", status=Status.CLASSIFYING)
+        for page_id in ("1", "2"):
+            doc.pages[page_id] = Page(
+                page_id=page_id, parsed_text_uri=f"s3://bucket/{page_id}.json"
+            )
+
+        with patch.object(
+            service, "_invoke_bedrock_model", side_effect=_model_response
+        ) as mock_invoke:
+            result = service.classify_document(doc)
+
+        assert mock_invoke.call_count == 1
+        assert result.pages["1"].classification == "payslip"
+        assert result.pages["1"].metadata["local_classifier"]["threshold"] == 0.8
+        assert result.pages["2"].classification == "w2"
+        mock_put_metric.assert_any_call("ClassificationLocalClassifierHits", 1)
+        mock_put_metric.assert_any_call("ClassificationLocalClassifierFallthroughs", 1)
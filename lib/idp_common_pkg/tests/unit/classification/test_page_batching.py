@@ -0,0 +1,175 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for multi-page batched classification."""
+
+import json
+import re
+from unittest.mock import patch
+
+import pytest
+from idp_common.classification.page_batching import (
+    parse_batch_classification_response,
+    plan_page_batches,
+)
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page, Status
+
+PAGE_IDS_PATTERN = re.compile(r"these page numbers: ([\d, ]+)")
+
+
+def _document(page_count):
+    doc = Document(id="doc", input_key="doc.pdf", status=Status.CLASSIFYING)
+    for number in range(1, page_count + 1):
+        page_id = str(number)
+        doc.pages[page_id] = Page(
+            page_id=page_id, parsed_text_uri=f"s3://bucket/{page_id}.json"
+        )
+    return doc
+
+
+def _response(payload, tokens=100):
+    return {
+        "response": {
+            "output": {"message": {"content": [{"text": json.dumps(payload)}]}}
+        },
+        "metering": {"Classification/bedrock/model": {"inputTokens": tokens}},
+    }
+
+
+class FakeModel:
+    """Answers batch requests page by page; pages 1-2 are invoices, then letters."""
+
+    def __init__(self, fail_batches_larger_than=None, skip_pages=()):
+        self.requests = []
+        self.fail_batches_larger_than = fail_batches_larger_than
+        self.skip_pages = set(skip_pages)
+
+    def __call__(self, content, config):
+        match = PAGE_IDS_PATTERN.search(content[-1].get("text", ""))
+        if not match:
+            self.requests.append(["single"])
+            return _response({"class": "letter", "document_boundary": "continue"})
+        page_ids = match.group(1).split(", ")
+        self.requests.append(page_ids)
+        limit = self.fail_batches_larger_than
+        if limit and len(page_ids) > limit:
+            raise RuntimeError("Input is too long for requested model")
+        return _response(
+            {
+                "pages": [
+                    {
+                        "page": page_id,
+                        "class": "invoice" if int(page_id) <= 2 else "letter",
+                        "document_boundary": "start"
+                        if page_id in ("1", "3")
+                        else "continue",
+                    }
+                    for page_id in page_ids
+                    if page_id not in self.skip_pages
+                ]
+            }
+        )
+
+
+@pytest.fixture
+def service():
+    config = {
+        "classes": [
+            {"$id": "invoice", "x-aws-idp-document-type": "invoice"},
+            {"$id": "letter", "x-aws-idp-document-type": "letter"},
+        ],
+        "classification": {
+            "model": "us.amazon.nova-pro-v1:0",
+            "system_prompt": "You classify documents.",
+            "task_prompt": "{CLASS_NAMES_AND_DESCRIPTIONS}\n\n{DOCUMENT_TEXT}",
+            "pagesPerRequest": 3,
+        },
+    }
+    return ClassificationService(region="us-east-1", config=config)
+
+
+@pytest.mark.unit
+class TestPageBatchPlanning:
+    """Tests for batch planning and response parsing."""
+
+    def test_batches_respect_every_budget(self):
+        """A batch closes at the page, token or image limit."""
+        costs = [
+            ("1", 10, 1),
+            ("2", 10, 1),
+            ("3", 10, 1),
+            ("4", 80, 0),
+            ("5", 500, 0),
+            ("6", 10, 1),
+        ]
+
+        batches = list(
+            plan_page_batches(costs, max_pages=3, max_tokens=100, max_images=2)
+        )
+
+        assert batches == [["1", "2"], ["3", "4"], ["5"], ["6"]]
+
+    def test_parse_response_formats(self):
+        """Both an object with pages and a bare list are accepted."""
+        wrapped = parse_batch_classification_response(
+            '```json\n{"pages": [{"page": 1, "class": "invoice"}]}\n```'
+        )
+        bare = parse_batch_classification_response(
+            '[{"page": "2", "class": "letter", "document_boundary": "start"}]'
+        )
+
+        assert wrapped == {"1": {"page": 1, "class": "invoice"}}
+        assert bare["2"]["document_boundary"] == "start"
+        assert parse_batch_classification_response("no idea") == {}
+
+
+@pytest.mark.unit
+@patch("idp_common.s3.get_text_content", side_effect=lambda uri: f"text of {uri}")
+class TestBatchedClassification:
+    """Tests for ClassificationService with pagesPerRequest above 1."""
+
+    def test_pages_classified_in_batches(self, mock_get_text, service):
+        """Five pages take two requests and map back to page results."""
+        model = FakeModel()
+        with patch.object(service, "_invoke_bedrock_model", side_effect=model):
+            result = service.classify_document(_document(5))
+
+        assert model.requests == [["1", "2", "3"], ["4", "5"]]
+        assert result.status != Status.FAILED
+        assert [page.classification for page in result.pages.values()] == [
+            "invoice",
+            "invoice",
+            "letter",
+            "letter",
+            "letter",
+        ]
+        assert [section.page_ids for section in result.sections] == [
+            ["1", "2"],
+            ["3", "4", "5"],
+        ]
+        assert result.pages["2"].metadata["page_batch_size"] == 3
+        assert result.metering == {
+            "Classification/bedrock/model": {"inputTokens": 200}
+        }
+
+    def test_failed_batch_is_bisected(self, mock_get_text, service):
+        """A rejected batch is split until its parts succeed."""
+        model = FakeModel(fail_batches_larger_than=2)
+        with patch.object(service, "_invoke_bedrock_model", side_effect=model):
+            result = service.classify_document(_document(3))
+
+        assert model.requests == [["1", "2", "3"], ["1", "2"], ["single"]]
+        assert result.pages["1"].classification == "invoice"
+        assert result.pages["3"].classification == "letter"
+        assert not result.errors
+
+    def test_missing_pages_retried(self, mock_get_text, service):
+        """Pages without an answer in the response are classified again."""
+        model = FakeModel(skip_pages={"2"})
+        with patch.object(service, "_invoke_bedrock_model", side_effect=model):
+            result = service.classify_document(_document(3))
+
+        assert model.requests == [["1", "2", "3"], ["single"]]
+        assert result.pages["2"].classification == "letter"
+        assert "page_batch_size" not in result.pages["2"].metadata
@@ -0,0 +1,119 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for concurrent page content loading."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from idp_common.classification.models import (
+    DocumentClassification,
+    PageClassification,
+)
+from idp_common.classification.page_loader import PageContentLoader
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page, Status
+
+
+def _document(page_count):
+    doc = Document(id="doc", input_key="doc.pdf", status=Status.CLASSIFYING)
+    for number in range(1, page_count + 1):
+        page_id = str(number)
+        doc.pages[page_id] = Page(
+            page_id=page_id, parsed_text_uri=f"s3://bucket/{page_id}.json"
+        )
+    return doc
+
+
+@pytest.fixture
+def service():
+    config = {
+        "classes": [
+            {"$id": "invoice", "x-aws-idp-document-type": "invoice"},
+            {"$id": "letter", "x-aws-idp-document-type": "letter"},
+        ],
+        "classification": {
+            "model": "us.amazon.nova-pro-v1:0",
+            "contextPagesCount": 1,
+        },
+    }
+    return ClassificationService(region="us-east-1", config=config)
+
+
+@pytest.mark.unit
+class TestPageContentLoader:
+    """Tests for the PageContentLoader class."""
+
+    def test_pages_available_before_whole_document(self):
+        """A page can be read while later pages are still loading."""
+        release = threading.Event()
+
+        def load_page(page_id, page):
+            if page_id == "10":
+                release.wait(5)
+            return f"text {page_id}"
+
+        with PageContentLoader(_document(10).pages, load_page, max_workers=2) as loader:
+            assert loader.page_ids[:3] == ["1", "2", "3"]
+            assert loader["1"] == "text 1"
+            assert loader["2"] == "text 2"
+            assert not loader._futures["10"].done()
+            release.set()
+            assert loader.to_dict()["10"] == "text 10"
+
+    def test_load_errors_raised_for_that_page(self):
+        """An exception of a page load is raised only when the page is read."""
+
+        def load_page(page_id, page):
+            if page_id == "2":
+                raise RuntimeError("throttled")
+            return page_id
+
+        with PageContentLoader(_document(3).pages, load_page) as loader:
+            assert loader.get("1") == "1"
+            assert loader.get("missing") is None
+            with pytest.raises(RuntimeError):
+                loader["2"]
+
+
+@pytest.mark.unit
+class TestClassificationPageLoading:
+    """Tests for page loading in ClassificationService."""
+
+    @patch("idp_common.s3.get_text_content")
+    def test_context_pages_passed_to_each_page(self, mock_get_text, service):
+        """Each page is classified with the text of its neighbouring pages."""
+        mock_get_text.side_effect = lambda uri: uri.rsplit("/", 1)[1]
+        calls = {}
+
+        def classify(page_id, **kwargs):
+            calls[page_id] = kwargs
+            return PageClassification(
+                page_id=page_id,
+                classification=DocumentClassification(doc_type="invoice"),
+            )
+
+        with patch.object(service, "classify_page_bedrock", side_effect=classify):
+            result = service.classify_document(_document(3))
+
+        assert result.status != Status.FAILED
+        assert calls["1"]["before_texts"] == []
+        assert calls["1"]["after_texts"] == ["2.json"]
+        assert calls["2"]["before_texts"] == ["1.json"]
+        assert calls["2"]["after_texts"] == ["3.json"]
+        assert calls["3"]["after_texts"] == []
+
+    @patch("idp_common.s3.get_text_content")
+    def test_format_pages_placeholders(self, mock_get_text, service):
+        """Holistic page text marks missing and unreadable pages."""
+        mock_get_text.side_effect = [RuntimeError("denied")]
+        doc = _document(1)
+        doc.pages["2"] = Page(page_id="2")
+
+        pages = service._format_pages(doc)
+
+        assert pages == {
+            "1": "[Error loading page 1 content]",
+            "2": "[No text content for page 2]",
+        }
@@ -12,7 +12,7 @@ import pytest
 
 # Import standard library modules first
 from textwrap import dedent
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # PIL is now used directly - no mocking needed
 
@@ -358,6 +358,73 @@ class TestExtractionService:
         assert len(result.errors) == 1
         assert "Section 2 has no page IDs" in result.errors[0]
 
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.bedrock.invoke_model")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.metrics.put_metric")
+    def test_process_document_section_lazily_converted(
+        self,
+        mock_put_metric,
+        mock_write_content,
+        mock_invoke_model,
+        mock_prepare_image,
+        mock_get_text_content,
+        mock_config,
+    ):
+        """Test extraction of a converted document whose page images were skipped."""
+        from idp_common.ocr.service import OcrService
+
+        config = {
+            **mock_config,
+            "ocr": {"conversion": {"mode": "lazy"}},
+            "classification": {
+                "classificationMethod": "textbasedHolisticClassification",
+                "task_prompt": "Classify {DOCUMENT_TEXT}",
+            },
+            "extraction": {
+                **mock_config["extraction"],
+                "task_prompt": "Extract {ATTRIBUTE_NAMES_AND_DESCRIPTIONS} "
+                "from {DOCUMENT_TEXT}",
+            },
+        }
+        document = Document(
+            id="test-doc",
+            input_key="test-document.xlsx",
+            input_bucket="input-bucket",
+            output_bucket="output-bucket",
+            status=Status.OCR,
+        )
+        with patch("boto3.client"):
+            ocr_service = OcrService(config=config)
+        converted_pages = [MagicMock(text="INV-123"), MagicMock(text="Total 100")]
+        ocr_service._process_converted_pages(document, converted_pages)
+        document.sections.append(
+            Section(section_id="1", classification="invoice", page_ids=["1", "2"])
+        )
+
+        mock_get_text_content.side_effect = ["INV-123", "Total 100"]
+        mock_invoke_model.return_value = {
+            "response": {
+                "output": {
+                    "message": {"content": [{"text": '{"invoice_number": "INV-123"}'}]}
+                }
+            },
+            "metering": {},
+        }
+
+        service = ExtractionService(region="us-west-2", config=config)
+        result = service.process_document_section(document, "1")
+
+        assert all(page.image_uri is None for page in result.pages.values())
+        for converted_page in converted_pages:
+            converted_page.render_image.assert_not_called()
+        mock_prepare_image.assert_not_called()
+        mock_invoke_model.assert_called_once()
+        assert result.errors == []
+        written_content = mock_write_content.call_args[0][0]
+        assert written_content["inference_result"]["invoice_number"] == "INV-123"
+
     @pytest.mark.skip(reason="Temporarily disabled due to S3 credential issues")
     @patch("idp_common.s3.get_text_content")
     @patch("idp_common.image.prepare_image")
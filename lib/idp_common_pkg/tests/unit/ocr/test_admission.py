@@ -0,0 +1,148 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for OCR page memory admission.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from idp_common.ocr.admission import (
+    PAGE_OVERHEAD_MB,
+    MemoryBudget,
+    estimate_page_memory_mb,
+    lambda_memory_budget_mb,
+)
+
+
+@pytest.mark.unit
+class TestEstimatePageMemory:
+    """Tests for page memory estimation."""
+
+    def test_pdf_page_scales_with_dpi(self):
+        """A letter page at 300 DPI needs about four times the memory of 150 DPI."""
+        at_150 = estimate_page_memory_mb(612, 792, is_pdf=True, dpi=150)
+        at_300 = estimate_page_memory_mb(612, 792, is_pdf=True, dpi=300)
+
+        assert at_150 > PAGE_OVERHEAD_MB
+        assert at_300 - PAGE_OVERHEAD_MB == pytest.approx(
+            (at_150 - PAGE_OVERHEAD_MB) * 4
+        )
+
+    def test_pdf_page_capped_by_resize_target(self):
+        """PDF pages rendered at the resize target are sized at the target."""
+        resize_config = {"target_width": 951, "target_height": 1268}
+        poster = estimate_page_memory_mb(
+            2448, 3168, is_pdf=True, dpi=150, resize_config=resize_config
+        )
+
+        expected_pixels_mb = 951 * (951 * 3168 / 2448) * 3 / (1024 * 1024)
+        assert poster == pytest.approx(expected_pixels_mb * 4 + PAGE_OVERHEAD_MB)
+
+    def test_image_file_uses_full_pixel_size(self):
+        """Image files are decoded at full size, so the resize target is ignored."""
+        resize_config = {"target_width": 951, "target_height": 1268}
+        estimate = estimate_page_memory_mb(
+            10000, 10000, is_pdf=False, dpi=150, resize_config=resize_config
+        )
+
+        assert estimate > 1000
+
+
+@pytest.mark.unit
+class TestLambdaMemoryBudget:
+    """Tests for deriving the budget from the Lambda memory size."""
+
+    def test_budget_from_lambda_memory_size(self):
+        """The budget is a share of the function memory less the baseline."""
+        with patch.dict("os.environ", {"AWS_LAMBDA_FUNCTION_MEMORY_SIZE": "4096"}):
+            assert lambda_memory_budget_mb(0.5, baseline_mb=48.0) == 2000.0
+
+    def test_no_budget_outside_lambda(self):
+        """Without the Lambda memory size there is no budget."""
+        with patch.dict("os.environ", {}, clear=True):
+            assert lambda_memory_budget_mb(0.7) is None
+
+    def test_budget_never_below_one_page_overhead(self):
+        """A baseline above the memory share still leaves a minimal budget."""
+        with patch.dict("os.environ", {"AWS_LAMBDA_FUNCTION_MEMORY_SIZE": "512"}):
+            assert lambda_memory_budget_mb(0.5, baseline_mb=400.0) == PAGE_OVERHEAD_MB
+
+
+@pytest.mark.unit
+class TestMemoryBudget:
+    """Tests for the MemoryBudget admission gate."""
+
+    def test_small_pages_admitted_together(self):
+        """Pages that fit in the budget are admitted without waiting."""
+        budget = MemoryBudget(100)
+
+        for _ in range(4):
+            budget.acquire(20)
+
+        assert budget.in_use_mb == 80
+        assert budget.stats.max_in_flight == 4
+        assert budget.stats.waits == 0
+
+    def test_oversized_page_admitted_when_idle(self):
+        """A page larger than the budget runs once nothing else is in flight."""
+        budget = MemoryBudget(100)
+
+        budget.acquire(250)
+
+        assert budget.in_use_mb == 250
+        assert budget.stats.oversized_pages == 1
+        assert budget.stats.waits == 0
+
+    def test_acquire_waits_for_release(self):
+        """A page that does not fit waits until an admitted page is released."""
+        budget = MemoryBudget(100)
+        budget.acquire(80)
+        admitted = threading.Event()
+
+        def admit_large_page():
+            budget.acquire(50)
+            admitted.set()
+
+        thread = threading.Thread(target=admit_large_page)
+        thread.start()
+        time.sleep(0.05)
+        assert not admitted.is_set()
+
+        budget.release(80)
+        thread.join(timeout=2)
+
+        assert admitted.is_set()
+        assert budget.in_use_mb == 50
+        assert budget.stats.waits == 1
+        assert budget.stats.max_in_use_mb == 80
+
+    def test_concurrent_pages_stay_within_budget(self):
+        """Pages admitted from many threads never exceed the budget together."""
+        budget = MemoryBudget(100)
+        lock = threading.Lock()
+        in_use = [0]
+        observed = []
+
+        def run_page():
+            budget.acquire(30)
+            with lock:
+                in_use[0] += 30
+                observed.append(in_use[0])
+            time.sleep(0.01)
+            with lock:
+                in_use[0] -= 30
+            budget.release(30)
+
+        threads = [threading.Thread(target=run_page) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert max(observed) <= 90
+        assert budget.in_use_mb == 0
+        assert budget.stats.pages == 12
@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the OCR AIMD concurrency controller.
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.ocr.concurrency import AimdConcurrencyController
+
+
+def _throttle_error(code="ThrottlingException"):
+    return ClientError(
+        {"Error": {"Code": code, "Message": "Rate exceeded"}}, "AnalyzeDocument"
+    )
+
+
+@pytest.mark.unit
+class TestAimdConcurrencyController:
+    """Tests for the AimdConcurrencyController class."""
+
+    def test_additive_increase_up_to_max(self):
+        """Each round of successful requests adds one slot, capped at max_limit."""
+        controller = AimdConcurrencyController(2, max_limit=4)
+
+        for _ in range(2):
+            with controller.slot():
+                pass
+        assert controller.limit == 3
+
+        for _ in range(20):
+            with controller.slot():
+                pass
+        assert controller.limit == 4
+        assert controller.stats.max_limit_reached == 4
+        assert controller.stats.requests == 22
+
+    @pytest.mark.parametrize(
+        "code", ["ThrottlingException", "ProvisionedThroughputExceededException"]
+    )
+    def test_throttle_error_decreases_limit(self, code):
+        """A throttling ClientError halves the limit and is re-raised."""
+        controller = AimdConcurrencyController(8, max_limit=8)
+
+        with pytest.raises(ClientError):
+            with controller.slot():
+                raise _throttle_error(code)
+
+        assert controller.limit == 4
+        assert controller.in_flight == 0
+        assert controller.stats.throttles == 1
+        assert controller.stats.min_limit_reached == 4
+
+    def test_other_errors_do_not_change_limit(self):
+        """Non-throttling failures neither increase nor decrease the limit."""
+        controller = AimdConcurrencyController(4, max_limit=8)
+
+        with pytest.raises(ValueError):
+            with controller.slot():
+                raise ValueError("bad page")
+
+        assert controller.limit == 4
+        assert controller.stats.throttles == 0
+
+    def test_one_decrease_per_congestion_event(self):
+        """Throttles from requests started before a decrease do not decrease again."""
+        controller = AimdConcurrencyController(8, max_limit=8, min_limit=2)
+        first, second = controller._acquire(), controller._acquire()
+
+        controller._throttled(first)
+        controller._throttled(second)
+        assert controller.limit == 4
+        assert controller.stats.decreases == 1
+        assert controller.stats.throttles == 2
+
+        # A request started after the decrease reacts to new congestion
+        third = controller._acquire()
+        controller._throttled(third)
+        assert controller.limit == 2
+
+        # The limit never drops below min_limit
+        for slot in (first, second, third):
+            controller._release(slot, succeeded=False)
+        controller._throttled(controller._acquire())
+        assert controller.limit == 2
+
+    def test_acquire_blocks_at_limit(self):
+        """Requests wait for a free slot once the limit is reached."""
+        controller = AimdConcurrencyController(1, max_limit=1)
+        release = threading.Event()
+        started = []
+
+        def request():
+            with controller.slot():
+                started.append(True)
+                release.wait(5)
+
+        first = threading.Thread(target=request)
+        second = threading.Thread(target=request)
+        first.start()
+        second.start()
+        second.join(0.2)
+        assert started == [True]
+
+        release.set()
+        first.join(5)
+        second.join(5)
+        assert started == [True, True]
+        assert controller.stats.max_in_flight == 1
+        assert controller.stats.wait_seconds >= 0.2
+
+    def test_needs_retry_handler_attributes_throttles_to_slot(self):
+        """Throttled attempts retried by botocore count against the calling request."""
+        controller = AimdConcurrencyController(8, max_limit=8)
+        client = MagicMock()
+        controller.register_throttle_handler(client, "textract")
+        event_name, handler = client.meta.events.register.call_args.args
+        assert event_name == "needs-retry.textract"
+
+        throttled = (MagicMock(), {"Error": {"Code": "ThrottlingException"}})
+        with controller.slot():
+            assert handler(response=throttled, attempts=1) is None
+            assert handler(response=throttled, attempts=2) is None
+            assert handler(response=(MagicMock(), {}), attempts=3) is None
+
+        # The request eventually succeeded but was throttled: no increase
+        assert controller.limit == 4
+        assert controller.stats.throttles == 2
+        assert controller.stats.decreases == 1
+
+        controller.unregister_throttle_handler(client, "textract")
+        client.meta.events.unregister.assert_called_once()
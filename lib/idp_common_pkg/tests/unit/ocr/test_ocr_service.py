@@ -11,6 +11,7 @@ Unit tests for the OCR Service class.
 import pytest
 
 # Import standard library modules first
+import os
 import sys
 from io import BytesIO
 from unittest.mock import ANY, MagicMock, patch
@@ -21,7 +22,8 @@ sys.modules["textractor"] = MagicMock()
 sys.modules["textractor.parsers"] = MagicMock()
 sys.modules["textractor.parsers.response_parser"] = MagicMock()
 
-from idp_common.models import Document, Status
+from botocore.exceptions import ClientError
+from idp_common.models import Document, Page, Status
 from idp_common.ocr.service import OcrService
 
 
@@ -902,3 +904,731 @@ class TestOcrService:
 
                 mock_none.assert_called_once_with(0, ANY, "bucket", "prefix")
                 assert result == ("result", "metering")
+
+    def test_init_rasterization_engine_from_config(self):
+        """Test rasterization settings are read from config."""
+        with patch("boto3.client"):
+            service = OcrService(
+                config={
+                    "ocr": {"rasterization": {"engine": "process", "max_workers": "4"}}
+                }
+            )
+
+            assert service.rasterization_engine == "process"
+            assert service.rasterization_workers == 4
+            assert service._page_rasterizer is None
+
+    def test_render_page_uses_process_rasterizer(self):
+        """Test _render_page delegates to the process-pool rasterizer when active."""
+        with patch("boto3.client"):
+            service = OcrService()
+            service._page_rasterizer = MagicMock()
+            service._page_rasterizer.render.return_value = b"rendered"
+            mock_pdf_doc = MagicMock()
+
+            assert service._render_page(mock_pdf_doc, 3, 4) == b"rendered"
+            service._page_rasterizer.render.assert_called_once_with(3)
+            mock_pdf_doc.load_page.assert_not_called()
+
+    @patch("boto3.client")
+    @patch("idp_common.ocr.service.ProcessPoolRasterizer")
+    def test_start_page_rasterizer_falls_back_without_process_support(
+        self, mock_rasterizer_cls, mock_boto_client
+    ):
+        """Test process engine falls back to thread rendering when pools are unavailable."""
+        mock_rasterizer_cls.side_effect = OSError("Function not implemented")
+        service = OcrService(config={"ocr": {"rasterization": {"engine": "process"}}})
+
+        started = service._start_page_rasterizer("/tmp/document.pdf")
+
+        assert started is False
+        assert service._page_rasterizer is None
+        mock_rasterizer_cls.assert_called_once()
+
+    @patch("boto3.client")
+    @patch("idp_common.ocr.service.fitz.open")
+    @patch("idp_common.ocr.service.ProcessPoolRasterizer")
+    def test_process_document_with_process_engine(
+        self,
+        mock_rasterizer_cls,
+        mock_fitz_open,
+        mock_boto_client,
+        mock_document,
+        mock_pdf_content,
+    ):
+        """Test process engine starts a rasterizer for the document and shuts it down."""
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_object.return_value = {"Body": BytesIO(mock_pdf_content)}
+        mock_boto_client.return_value = mock_s3_client
+
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.__len__.return_value = 3
+        mock_pdf_doc.is_pdf = True
+        mock_fitz_open.return_value = mock_pdf_doc
+
+        service = OcrService(config={"ocr": {"rasterization": {"engine": "process"}}})
+
+        active_rasterizers = []
+
+        def process_page(page_index, *args):
+            active_rasterizers.append(service._page_rasterizer)
+            return (
+                {
+                    "raw_text_uri": "s3://output/raw.json",
+                    "parsed_text_uri": "s3://output/parsed.json",
+                    "text_confidence_uri": "s3://output/confidence.json",
+                    "image_uri": "s3://output/image.jpg",
+                },
+                {},
+            )
+
+        with patch.object(service, "_process_single_page", side_effect=process_page):
+            result = service.process_document(mock_document)
+
+        assert len(result.pages) == 3
+        assert all(r is mock_rasterizer_cls.return_value for r in active_rasterizers)
+        mock_rasterizer_cls.return_value.close.assert_called_once()
+        assert service._page_rasterizer is None
+        # The temp copy handed to the workers is cleaned up
+        assert not os.path.exists(mock_rasterizer_cls.call_args[0][0])
+
+    @patch("boto3.client")
+    @patch("idp_common.ocr.service.fitz.open")
+    def test_process_document_spool_ingestion(
+        self, mock_fitz_open, mock_boto_client, mock_document, tmp_path
+    ):
+        """Test spool mode streams the object to disk in chunks and opens it by path."""
+        pdf_content = b"%PDF-1.4\n" + b"x" * 2500
+        body = MagicMock(wraps=BytesIO(pdf_content))
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_object.return_value = {"Body": body}
+        mock_boto_client.return_value = mock_s3_client
+
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.__len__.return_value = 2
+        mock_pdf_doc.is_pdf = True
+        mock_fitz_open.return_value = mock_pdf_doc
+
+        service = OcrService(
+            config={"ocr": {"ingestion": {"mode": "spool", "spool_dir": str(tmp_path)}}}
+        )
+        service.ingestion_chunk_size = 1024
+
+        spooled = {}
+
+        def open_spooled(path, filetype):
+            with open(path, "rb") as f:
+                spooled["content"] = f.read()
+            return mock_pdf_doc
+
+        mock_fitz_open.side_effect = open_spooled
+
+        with patch.object(
+            service, "_process_pdf_pages", return_value=None
+        ) as mock_pages:
+            result = service.process_document(mock_document)
+
+        assert result.status != Status.FAILED
+        assert result.num_pages == 2
+        assert spooled["content"] == pdf_content
+        assert mock_fitz_open.call_args[1] == {"filetype": "pdf"}
+        # Whole object was never read in one call
+        assert all(c.args == (1024,) for c in body.read.call_args_list)
+        # PDF pages are processed without holding the file bytes in memory
+        assert mock_pages.call_args[0][2] is None
+        # Spooled file is removed once the document is done
+        assert list(tmp_path.iterdir()) == []
+
+    def test_spool_s3_body_keeps_file_head(self, tmp_path):
+        """Test spooling captures the leading bytes used for file type detection."""
+        from idp_common.ocr.service import FILE_TYPE_SNIFF_BYTES
+
+        with patch("boto3.client"):
+            service = OcrService()
+        service.spool_dir = str(tmp_path)
+        service.ingestion_chunk_size = 1000
+        content = b"PK" + b"word/" + b"z" * (FILE_TYPE_SNIFF_BYTES * 2)
+
+        spooled_path, head = service._spool_s3_body(BytesIO(content), "upload")
+
+        assert head == content[:FILE_TYPE_SNIFF_BYTES]
+        with open(spooled_path, "rb") as f:
+            assert f.read() == content
+        assert service._detect_file_type("upload", head, truncated=True) == "docx"
+        service._remove_spooled_file(spooled_path)
+        assert not os.path.exists(spooled_path)
+
+    def test_detect_file_type_truncated_utf8_head(self):
+        """Test a head cut mid-character is still detected as text."""
+        with patch("boto3.client"):
+            service = OcrService()
+        head = "résumé".encode("utf-8")[:-1]
+
+        assert service._detect_file_type("notes", head, truncated=True) == "txt"
+        assert service._detect_file_type("notes", head) == "pdf"
+
+    @patch("boto3.client")
+    def test_process_document_records_peak_memory(
+        self, mock_boto_client, mock_document
+    ):
+        """Test peak RSS is recorded for the document."""
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_object.side_effect = Exception("S3 error")
+        mock_boto_client.return_value = mock_s3_client
+        service = OcrService()
+
+        with patch("idp_common.ocr.service.get_rss_mb", return_value=123.0):
+            service.process_document(mock_document)
+
+        assert service.peak_memory_mb == 123.0
+
+    def test_init_ingestion_from_config(self):
+        """Test ingestion settings are read from config."""
+        with patch("boto3.client"):
+            default_service = OcrService()
+            service = OcrService(
+                config={
+                    "ocr": {
+                        "ingestion": {
+                            "mode": "SPOOL",
+                            "chunk_size_mb": "4",
+                            "spool_dir": "/mnt/spool",
+                        }
+                    }
+                }
+            )
+
+        assert default_service.ingestion_mode == "memory"
+        assert service.ingestion_mode == "spool"
+        assert service.ingestion_chunk_size == 4 * 1024 * 1024
+        assert service.spool_dir == "/mnt/spool"
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.ocr.service.OcrPageCache.restore", return_value=True)
+    def test_process_single_page_textract_cache_hit(
+        self, mock_restore, mock_write_content, mock_boto_client
+    ):
+        """Test a page cache hit skips Textract and is metered as a hit."""
+        mock_textract_client = MagicMock()
+        mock_boto_client.return_value = mock_textract_client
+
+        mock_page_obj = MagicMock()
+        mock_page_obj.get_pixmap.return_value.tobytes.return_value = b"image_data"
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.load_page.return_value = mock_page_obj
+        mock_pdf_doc.is_pdf = True
+
+        service = OcrService(config={"ocr": {"cache": {"enabled": True}}})
+        result, metering = service._process_single_page_textract(
+            0, mock_pdf_doc, "output-bucket", "test-prefix"
+        )
+
+        mock_textract_client.analyze_document.assert_not_called()
+        mock_textract_client.detect_document_text.assert_not_called()
+        mock_restore.assert_called_once_with(
+            ANY, "output-bucket", "test-prefix/pages/1"
+        )
+        # Only the page image is written; OCR artifacts come from the cache
+        assert mock_write_content.call_count == 1
+        assert metering == {"OCR/ocr_cache/textract/detect_document_text": {"hits": 1}}
+        assert (
+            result["parsed_text_uri"]
+            == "s3://output-bucket/test-prefix/pages/1/result.json"
+        )
+        assert result["image_uri"] == "s3://output-bucket/test-prefix/pages/1/image.jpg"
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.ocr.service.OcrPageCache.store")
+    @patch("idp_common.ocr.service.OcrPageCache.restore", return_value=False)
+    def test_process_single_page_textract_cache_miss(
+        self,
+        mock_restore,
+        mock_store,
+        mock_write_content,
+        mock_boto_client,
+        mock_textract_response,
+    ):
+        """Test a page cache miss calls Textract and stores the artifacts."""
+        mock_textract_client = MagicMock()
+        mock_textract_client.detect_document_text.return_value = mock_textract_response
+        mock_boto_client.return_value = mock_textract_client
+
+        mock_page_obj = MagicMock()
+        mock_page_obj.get_pixmap.return_value.tobytes.return_value = b"image_data"
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.load_page.return_value = mock_page_obj
+        mock_pdf_doc.is_pdf = True
+
+        service = OcrService(config={"ocr": {"cache": {"enabled": True}}})
+        _, metering = service._process_single_page_textract(
+            0, mock_pdf_doc, "output-bucket", "test-prefix"
+        )
+
+        mock_textract_client.detect_document_text.assert_called_once()
+        assert "OCR/textract/detect_document_text" in metering
+        cache_key = mock_restore.call_args[0][0]
+        mock_store.assert_called_once_with(
+            cache_key, "output-bucket", "test-prefix/pages/1"
+        )
+
+    def test_page_cache_key_covers_ocr_settings(self, mock_bedrock_config):
+        """Test cache keys differ by backend, features, model and preprocessing."""
+        with patch("boto3.client"):
+            layout = OcrService(config={"ocr": {"cache": {"enabled": True}}})
+            tables = OcrService(
+                config={
+                    "ocr": {
+                        "cache": {"enabled": True},
+                        "features": [{"name": "TABLES"}],
+                    }
+                }
+            )
+            bedrock_service = OcrService(
+                backend="bedrock", bedrock_config=mock_bedrock_config
+            )
+            disabled = OcrService()
+
+        bedrock_service.page_cache = layout.page_cache
+        keys = {
+            layout._page_cache_key(b"image"),
+            tables._page_cache_key(b"image"),
+            bedrock_service._page_cache_key(b"image"),
+        }
+        assert len(keys) == 3
+        assert layout._page_cache_key(b"image") == layout._page_cache_key(b"image")
+
+        layout.preprocessing_config = {"enabled": True}
+        assert layout._page_cache_key(b"image") not in keys
+        assert disabled._page_cache_key(b"image") is None
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.ocr.service.to_textract_response")
+    @patch("idp_common.ocr.service.extract_text_layer")
+    def test_process_single_page_uses_text_layer(
+        self,
+        mock_extract,
+        mock_to_textract,
+        mock_write_content,
+        mock_boto_client,
+        mock_textract_response,
+    ):
+        """Test born-digital pages skip OCR and use the embedded text layer."""
+        from idp_common.ocr.text_layer import TextLayerScore
+
+        mock_textract_client = MagicMock()
+        mock_boto_client.return_value = mock_textract_client
+        mock_extract.return_value = (
+            [{"text": "line"}],
+            TextLayerScore(char_count=500, garbage_ratio=0.0, coverage=1.0),
+        )
+        mock_to_textract.return_value = mock_textract_response
+
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.is_pdf = True
+        mock_pdf_doc.load_page.return_value.get_pixmap.return_value.tobytes.return_value = b"image_data"
+
+        service = OcrService(config={"ocr": {"text_layer": {"enabled": True}}})
+        result, metering = service._process_single_page(
+            0, mock_pdf_doc, "output-bucket", "test-prefix"
+        )
+
+        mock_textract_client.detect_document_text.assert_not_called()
+        assert metering == {"OCR/pdf_text_layer": {"pages": 1}}
+        assert mock_write_content.call_count == 4  # image, raw, confidence, parsed
+        raw_write = mock_write_content.call_args_list[1]
+        assert raw_write[0][0] is mock_textract_response
+        assert (
+            result["raw_text_uri"]
+            == "s3://output-bucket/test-prefix/pages/1/rawText.json"
+        )
+
+    @patch("boto3.client")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.ocr.service.extract_text_layer")
+    def test_process_single_page_text_layer_falls_back_to_ocr(
+        self, mock_extract, mock_write_content, mock_boto_client, mock_textract_response
+    ):
+        """Test pages with an unusable text layer are sent to the OCR backend."""
+        from idp_common.ocr.text_layer import TextLayerScore
+
+        mock_textract_client = MagicMock()
+        mock_textract_client.detect_document_text.return_value = mock_textract_response
+        mock_boto_client.return_value = mock_textract_client
+        mock_extract.return_value = (
+            [],
+            TextLayerScore(char_count=0, garbage_ratio=1.0, coverage=0.0),
+        )
+
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.is_pdf = True
+        mock_pdf_doc.load_page.return_value.get_pixmap.return_value.tobytes.return_value = b"image_data"
+
+        service = OcrService(config={"ocr": {"text_layer": {"enabled": True}}})
+        _, metering = service._process_single_page(
+            0, mock_pdf_doc, "output-bucket", "test-prefix"
+        )
+
+        mock_textract_client.detect_document_text.assert_called_once()
+        assert "OCR/textract/detect_document_text" in metering
+
+    def test_text_layer_disabled_by_default(self):
+        """Test the text layer fast path is opt-in."""
+        with patch("boto3.client"):
+            service = OcrService()
+        assert service.text_layer_config is None
+
+    @patch("idp_common.s3.write_content")
+    def test_upload_queue_disabled_by_default(self, mock_write_content):
+        """Test page artifacts are written synchronously unless async uploads are enabled."""
+        with patch("boto3.client"):
+            service = OcrService()
+        service._start_upload_queue()
+
+        service._write_content(b"jpeg", "bucket", "doc/pages/1/image.jpg", "image/jpeg")
+
+        assert service.upload_mode == "sync"
+        assert service._upload_queue is None
+        mock_write_content.assert_called_once_with(
+            b"jpeg", "bucket", "doc/pages/1/image.jpg", content_type="image/jpeg"
+        )
+
+    @patch("boto3.client")
+    @patch("idp_common.ocr.service.fitz.open")
+    def test_process_document_async_upload_flushes_before_pages_finalized(
+        self, mock_fitz_open, mock_boto_client, mock_document
+    ):
+        """Test queued uploads finish before pages are finalized; failed pages are dropped."""
+        mock_client = MagicMock()
+        mock_client.get_object.return_value = {"Body": BytesIO(b"%PDF-1.4\n")}
+        uploaded = []
+
+        def put_object(**kwargs):
+            if kwargs["Key"].startswith("test-document.pdf/pages/2/"):
+                raise RuntimeError("SlowDown")
+            uploaded.append(kwargs["Key"])
+
+        mock_client.put_object.side_effect = put_object
+        mock_boto_client.return_value = mock_client
+        mock_pdf_doc = MagicMock()
+        mock_pdf_doc.__len__.return_value = 2
+        mock_pdf_doc.is_pdf = True
+        mock_fitz_open.return_value = mock_pdf_doc
+
+        service = OcrService(
+            config={"ocr": {"upload": {"mode": "async", "max_workers": "2"}}}
+        )
+        cache_stored = []
+        service.page_cache = MagicMock()
+        service.page_cache.store.side_effect = lambda *args: cache_stored.append(
+            list(uploaded)
+        )
+
+        def process_pages(document, pdf_document, file_content):
+            for page_id in ("1", "2"):
+                page_prefix = f"{document.input_key}/pages/{page_id}"
+                service._write_content(
+                    b"jpeg", "output-bucket", f"{page_prefix}/image.jpg"
+                )
+                service._write_content(
+                    {"text": page_id}, "output-bucket", f"{page_prefix}/result.json"
+                )
+                service._store_cached_page("key", "output-bucket", page_prefix)
+                document.pages[page_id] = Page(page_id=page_id)
+
+        with patch.object(service, "_process_pdf_pages", side_effect=process_pages):
+            result = service.process_document(mock_document)
+
+        assert list(result.pages) == ["1"]
+        assert result.status == Status.FAILED
+        assert "Error uploading artifacts for page 2" in result.errors[0]
+        # The page cache copies artifacts only after they were uploaded
+        assert cache_stored == [
+            [
+                "test-document.pdf/pages/1/image.jpg",
+                "test-document.pdf/pages/1/result.json",
+            ]
+        ]
+        assert service.upload_wait_seconds is not None
+        assert service._upload_queue is None
+
+    def test_concurrency_fixed_by_default(self):
+        """Test Textract calls are not gated by a controller unless adaptive mode is set."""
+        with patch("boto3.client"):
+            service = OcrService()
+        service._start_concurrency_controller()
+
+        assert service.concurrency_config is None
+        assert service._concurrency is None
+        service.textract_client.detect_document_text.return_value = {"Blocks": []}
+        assert service._run_textract(b"image", 1) == {"Blocks": []}
+
+    @patch("idp_common.metrics.put_metric")
+    @patch("boto3.client")
+    def test_adaptive_concurrency_shared_by_pages(
+        self, mock_boto_client, mock_put_metric
+    ):
+        """Test adaptive mode sizes workers, throttles reduce the limit and metrics are published."""
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        service = OcrService(
+            config={
+                "ocr": {
+                    "max_workers": 20,
+                    "concurrency": {"mode": "adaptive", "max_limit": "8"},
+                }
+            }
+        )
+        assert service.max_workers == 8
+
+        service._start_concurrency_controller()
+        controller = service._concurrency
+        assert controller.limit == 4
+        mock_client.meta.events.register.assert_called_once()
+
+        mock_client.detect_document_text.side_effect = ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+            "DetectDocumentText",
+        )
+        with pytest.raises(ClientError):
+            service._run_textract(b"image", 1)
+        assert controller.limit == 2
+        assert controller.in_flight == 0
+
+        service._stop_concurrency_controller()
+        assert service._concurrency is None
+        assert service.concurrency_stats.throttles == 1
+        mock_client.meta.events.unregister.assert_called_once()
+        mock_put_metric.assert_any_call("OcrConcurrencyLimit", 2)
+        mock_put_metric.assert_any_call("OcrThrottles", 1)
+
+    def test_adaptive_concurrency_ignored_for_bedrock(self):
+        """Test adaptive concurrency only applies to the Textract backend."""
+        with patch("boto3.client"):
+            service = OcrService(
+                config={
+                    "ocr": {
+                        "backend": "bedrock",
+                        "concurrency": {"mode": "adaptive"},
+                        "model_id": "us.amazon.nova-pro-v1:0",
+                        "system_prompt": "OCR",
+                        "task_prompt": "Extract text",
+                    }
+                },
+            )
+        assert service.concurrency_config is None
+
+    @patch("idp_common.s3.write_content")
+    def test_lazy_conversion_skips_unused_page_images(
+        self, mock_write_content, mock_document
+    ):
+        """Test converted pages get no image when no later stage uses page images."""
+        text_only = {
+            "classificationMethod": "textbasedHolisticClassification",
+            "task_prompt": "Classify {DOCUMENT_TEXT}",
+        }
+        with patch("boto3.client"):
+            service = OcrService(
+                config={
+                    "ocr": {"conversion": {"mode": "lazy"}},
+                    "classification": text_only,
+                    "extraction": {"task_prompt": "Extract {DOCUMENT_TEXT}"},
+                }
+            )
+        converted_page = MagicMock(text="Hello\nWorld")
+
+        service._process_converted_pages(mock_document, [converted_page])
+
+        assert service.render_converted_images is False
+        converted_page.render_image.assert_not_called()
+        assert mock_document.pages["1"].image_uri is None
+        assert mock_document.pages["1"].parsed_text_uri.endswith("/1/result.json")
+        written_keys = [call.args[2] for call in mock_write_content.call_args_list]
+        assert "test-document.pdf/pages/1/image.jpg" not in written_keys
+
+    @pytest.mark.parametrize(
+        "classification_method,extraction,expected",
+        [
+            (
+                "multimodalPageLevelClassification",
+                {"task_prompt": "Extract {DOCUMENT_TEXT}"},
+                True,
+            ),
+            (
+                "textbasedHolisticClassification",
+                {"task_prompt": "Extract {DOCUMENT_TEXT}"},
+                False,
+            ),
+            (
+                "textbasedHolisticClassification",
+                {"task_prompt": "Extract {DOCUMENT_IMAGE}"},
+                True,
+            ),
+            # The default extraction prompt attaches every page image
+            ("textbasedHolisticClassification", {"task_prompt": ""}, True),
+            (
+                "textbasedHolisticClassification",
+                {
+                    "task_prompt": "Extract {DOCUMENT_TEXT}",
+                    "agentic": {"enabled": True},
+                },
+                True,
+            ),
+        ],
+    )
+    def test_lazy_conversion_renders_images_when_needed(
+        self, classification_method, extraction, expected
+    ):
+        """Test lazy conversion renders page images if a later stage uses them."""
+        config = {
+            "ocr": {"conversion": {"mode": "lazy"}},
+            "classification": {"classificationMethod": classification_method},
+            "extraction": extraction,
+        }
+        with patch("boto3.client"):
+            service = OcrService(config=config)
+            eager_service = OcrService(config={**config, "ocr": {}})
+
+        assert service.render_converted_images is expected
+        assert eager_service.render_converted_images is True
+
+    def test_page_image_encoding_config(self):
+        """Test OCR image quality and color mode reach the page renderer."""
+        with patch("boto3.client"):
+            default_service = OcrService()
+            service = OcrService(
+                config={"ocr": {"image": {"quality": "80", "color_mode": "Grayscale"}}}
+            )
+
+        assert default_service.encoding_config is None
+        assert service.encoding_config == {"quality": 80, "color_mode": "grayscale"}
+
+    @patch("idp_common.ocr.service.fitz.Pixmap")
+    def test_encode_page_pixmap(self, mock_pixmap):
+        """Test pixmaps are encoded with the configured quality and color mode."""
+        from idp_common.ocr.service import encode_page_pixmap
+
+        pix = MagicMock(n=3, alpha=0)
+        pix.tobytes.return_value = b"color"
+        gray_pix = mock_pixmap.return_value
+        gray_pix.tobytes.return_value = b"gray"
+
+        assert encode_page_pixmap(pix) == b"color"
+        pix.tobytes.assert_called_with("jpeg")
+
+        assert encode_page_pixmap(pix, {"quality": 70, "color_mode": None}) == b"color"
+        pix.tobytes.assert_called_with("jpeg", jpg_quality=70)
+
+        assert encode_page_pixmap(pix, {"color_mode": "grayscale"}) == b"gray"
+        gray_pix.tobytes.assert_called_with("jpeg", jpg_quality=95)
+
+    def test_memory_budget_from_config(self):
+        """Test the page memory budget comes from budget_mb or the Lambda memory size."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"memory": {"budget_mb": "100"}}})
+            default_service = OcrService()
+            off_service = OcrService(config={"ocr": {"memory": {"mode": "off"}}})
+
+        assert service._create_memory_budget().budget_mb == 100
+        assert off_service.memory_config is None
+        assert off_service._create_memory_budget() is None
+
+        with patch.dict(os.environ, {}, clear=True):
+            assert default_service._create_memory_budget() is None
+        with (
+            patch.dict(os.environ, {"AWS_LAMBDA_FUNCTION_MEMORY_SIZE": "4096"}),
+            patch("idp_common.ocr.service.get_rss_mb", return_value=96.0),
+        ):
+            assert default_service._create_memory_budget().budget_mb == pytest.approx(
+                4096 * 0.7 - 96.0
+            )
+
+    def test_estimate_page_memory_from_page_size(self):
+        """Test page memory is estimated from the PDF page box at the rendering DPI."""
+        with patch("boto3.client"):
+            service = OcrService(dpi=150)
+        pdf_document = MagicMock()
+        pdf_document.is_pdf = True
+        pdf_document.page_cropbox.return_value = MagicMock(width=612, height=792)
+
+        letter_mb = service._estimate_page_memory_mb(pdf_document, 0)
+        pdf_document.page_cropbox.return_value = MagicMock(width=2448, height=3168)
+        poster_mb = service._estimate_page_memory_mb(pdf_document, 1)
+
+        assert 8 < letter_mb < poster_mb
+        pdf_document.page_cropbox.side_effect = ValueError("bad page")
+        assert service._estimate_page_memory_mb(pdf_document, 2) == 8.0
+
+    def test_large_pages_admitted_one_at_a_time(self, mock_document):
+        """Test pages whose estimates do not fit the budget together run serially."""
+        import threading
+        import time
+
+        with patch("boto3.client"):
+            service = OcrService(
+                max_workers=4, config={"ocr": {"memory": {"budget_mb": 100}}}
+            )
+        pdf_document = MagicMock()
+        pdf_document.is_pdf = True
+        mock_document.num_pages = 3
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def process_page(page_index, *args):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            uri = f"s3://output-bucket/pages/{page_index + 1}"
+            result = {
+                "image_uri": f"{uri}/image.jpg",
+                "raw_text_uri": f"{uri}/rawText.json",
+                "parsed_text_uri": f"{uri}/result.json",
+                "text_confidence_uri": f"{uri}/textConfidence.json",
+            }
+            return result, {}
+
+        with (
+            patch.object(service, "_estimate_page_memory_mb", return_value=60.0),
+            patch.object(service, "_process_single_page", side_effect=process_page),
+        ):
+            service._process_pdf_pages(mock_document, pdf_document, b"pdf")
+
+        assert sorted(mock_document.pages) == ["1", "2", "3"]
+        assert in_flight[1] == 1
+        assert service.admission_stats.pages == 3
+        assert service.admission_stats.waits == 2
+
+    def test_peak_memory_sampled_per_page_without_budget(self, mock_document):
+        """Test RSS is sampled for every finished page when admission is off."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"memory": {"mode": "off"}}})
+        pdf_document = MagicMock()
+        pdf_document.is_pdf = True
+        mock_document.num_pages = 3
+
+        def process_page(page_index, *args):
+            uri = f"s3://output-bucket/pages/{page_index + 1}"
+            result = {
+                "image_uri": f"{uri}/image.jpg",
+                "raw_text_uri": f"{uri}/rawText.json",
+                "parsed_text_uri": f"{uri}/result.json",
+                "text_confidence_uri": f"{uri}/textConfidence.json",
+            }
+            return result, {}
+
+        with (
+            patch.object(service, "_process_single_page", side_effect=process_page),
+            patch(
+                "idp_common.ocr.service.get_rss_mb", side_effect=[50.0, 200.0, 80.0]
+            ) as mock_rss,
+        ):
+            service._process_pdf_pages(mock_document, pdf_document, b"pdf")
+
+        assert mock_rss.call_count == 3
+        assert service.peak_memory_mb == 200.0
+        assert service.admission_stats is None
@@ -0,0 +1,107 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the content-addressed OCR page cache.
+"""
+
+from unittest.mock import call, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.ocr.page_cache import OcrPageCache
+
+
+def _not_found():
+    return ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+
+
+@pytest.mark.unit
+class TestOcrPageCache:
+    """Tests for the OcrPageCache class."""
+
+    def test_compute_key_depends_on_image_and_settings(self):
+        """Keys change with the image bytes and with any OCR setting."""
+        key = OcrPageCache.compute_key(b"image", "textract", "detect_document_text")
+
+        assert key == OcrPageCache.compute_key(
+            b"image", "textract", "detect_document_text"
+        )
+        assert key != OcrPageCache.compute_key(
+            b"image2", "textract", "detect_document_text"
+        )
+        assert key != OcrPageCache.compute_key(
+            b"image", "textract", "analyze_document-Layout"
+        )
+        # Settings are delimited, so shifting bytes between parts changes the key
+        assert OcrPageCache.compute_key(b"a", "bc") != OcrPageCache.compute_key(
+            b"ab", "c"
+        )
+
+    @patch("idp_common.ocr.page_cache.s3")
+    def test_restore_miss(self, mock_s3):
+        """A missing entry is a miss and nothing is copied."""
+        mock_s3.get_s3_client.return_value.head_object.side_effect = _not_found()
+        cache = OcrPageCache()
+
+        assert cache.restore("abcdef", "output-bucket", "doc.pdf/pages/1") is False
+        mock_s3.copy_content.assert_not_called()
+
+    @patch("idp_common.ocr.page_cache.s3")
+    def test_restore_hit_copies_all_artifacts(self, mock_s3):
+        """A hit server-side copies every artifact into the page prefix."""
+        cache = OcrPageCache(bucket="cache-bucket", prefix="/ocr-cache/")
+
+        assert cache.restore("abcdef", "output-bucket", "doc.pdf/pages/1") is True
+        mock_s3.get_s3_client.return_value.head_object.assert_called_once_with(
+            Bucket="cache-bucket", Key="ocr-cache/ab/abcdef/result.json"
+        )
+        assert mock_s3.copy_content.call_args_list == [
+            call(
+                "cache-bucket",
+                f"ocr-cache/ab/abcdef/{artifact}",
+                "output-bucket",
+                f"doc.pdf/pages/1/{artifact}",
+            )
+            for artifact in ("rawText.json", "textConfidence.json", "result.json")
+        ]
+
+    @patch("idp_common.ocr.page_cache.s3")
+    def test_restore_copy_failure_is_miss(self, mock_s3):
+        """Copy errors are treated as a miss so the page is processed normally."""
+        mock_s3.copy_content.side_effect = Exception("AccessDenied")
+        cache = OcrPageCache()
+
+        assert cache.restore("abcdef", "output-bucket", "doc.pdf/pages/1") is False
+
+    @patch("idp_common.ocr.page_cache.s3")
+    def test_store_writes_result_last(self, mock_s3):
+        """result.json marks a complete entry, so it is stored last."""
+        cache = OcrPageCache()
+        cache.store("abcdef", "output-bucket", "doc.pdf/pages/2")
+
+        destinations = [c.args[3] for c in mock_s3.copy_content.call_args_list]
+        assert destinations == [
+            "ocr-cache/ab/abcdef/rawText.json",
+            "ocr-cache/ab/abcdef/textConfidence.json",
+            "ocr-cache/ab/abcdef/result.json",
+        ]
+        assert all(
+            c.args[2] == "output-bucket" for c in mock_s3.copy_content.call_args_list
+        )
+
+    @patch("idp_common.ocr.page_cache.s3")
+    def test_store_failure_is_ignored(self, mock_s3):
+        """Caching never fails the page."""
+        mock_s3.copy_content.side_effect = Exception("AccessDenied")
+
+        OcrPageCache().store("abcdef", "output-bucket", "doc.pdf/pages/2")
+
+    def test_restore_lookup_error_is_miss(self):
+        """Non-404 lookup errors are logged and treated as a miss."""
+        with patch("idp_common.ocr.page_cache.s3") as mock_s3:
+            mock_s3.get_s3_client.return_value.head_object.side_effect = ClientError(
+                {"Error": {"Code": "403", "Message": "Forbidden"}}, "HeadObject"
+            )
+            assert OcrPageCache().restore("abcdef", "b", "p") is False
+            mock_s3.copy_content.assert_not_called()
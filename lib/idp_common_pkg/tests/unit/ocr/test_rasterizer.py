@@ -0,0 +1,93 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the process-pool page rasterizer.
+
+Worker processes are spawned fresh, so they render with the real PyMuPDF even
+when other test modules replace ``fitz`` with a mock in this process.
+"""
+
+# ruff: noqa: E402, I001
+
+import pytest
+
+from io import BytesIO
+
+from PIL import Image
+
+from idp_common.ocr.rasterizer import ProcessPoolRasterizer
+
+# Minimal two-page PDF (blank US Letter pages); PyMuPDF repairs the xref table
+TWO_PAGE_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+    b"2 0 obj << /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >> endobj\n"
+    b"3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >> endobj\n"
+    b"4 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 792 612] >> endobj\n"
+    b"trailer << /Root 1 0 R >>\n%%EOF"
+)
+
+
+@pytest.fixture(scope="module")
+def rasterizer(tmp_path_factory):
+    """Rasterizer over the two-page PDF, rendering at 72 DPI."""
+    pdf_path = tmp_path_factory.mktemp("rasterizer") / "doc.pdf"
+    pdf_path.write_bytes(TWO_PAGE_PDF)
+    with ProcessPoolRasterizer(str(pdf_path), dpi=72, max_workers=2) as r:
+        yield r
+
+
+@pytest.mark.unit
+class TestProcessPoolRasterizer:
+    """Tests for the ProcessPoolRasterizer class."""
+
+    def test_render_returns_jpeg_at_dpi(self, rasterizer):
+        """Each page is rendered by a worker and returned as JPEG bytes."""
+        portrait = Image.open(BytesIO(rasterizer.render(0)))
+        landscape = Image.open(BytesIO(rasterizer.render(1)))
+
+        assert portrait.format == "JPEG"
+        assert portrait.size == (612, 792)
+        assert landscape.size == (792, 612)
+
+    def test_submit_returns_futures(self, rasterizer):
+        """Pages can be scheduled concurrently and collected later."""
+        futures = [rasterizer.submit(i) for i in (1, 0, 1)]
+        sizes = [Image.open(BytesIO(f.result())).size for f in futures]
+
+        assert sizes == [(792, 612), (612, 792), (792, 612)]
+
+    def test_render_invalid_page_raises(self, rasterizer):
+        """Worker errors are surfaced to the caller."""
+        with pytest.raises(Exception):
+            rasterizer.render(5)
+
+    def test_resize_config_applied_in_worker(self, tmp_path):
+        """Workers honour the resize configuration."""
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(TWO_PAGE_PDF)
+        with ProcessPoolRasterizer(
+            str(pdf_path),
+            dpi=144,
+            resize_config={"target_width": 306, "target_height": 396},
+            max_workers=1,
+        ) as rasterizer:
+            width, height = Image.open(BytesIO(rasterizer.render(0))).size
+
+        assert width <= 306 and height <= 396
+
+    def test_encoding_config_applied_in_worker(self, tmp_path):
+        """Workers honour the JPEG quality and color mode settings."""
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(TWO_PAGE_PDF)
+        with ProcessPoolRasterizer(
+            str(pdf_path),
+            dpi=72,
+            encoding_config={"quality": 60, "color_mode": "grayscale"},
+            max_workers=1,
+        ) as rasterizer:
+            page_image = Image.open(BytesIO(rasterizer.render(0)))
+
+        assert page_image.format == "JPEG"
+        assert page_image.mode == "L"
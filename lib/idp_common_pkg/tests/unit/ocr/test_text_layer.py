@@ -0,0 +1,161 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for born-digital PDF text layer extraction.
+
+Other OCR test modules replace ``fitz`` in ``sys.modules`` with a mock, so these
+tests use the ``pymupdf`` module (the same library) directly.
+"""
+
+import pymupdf
+import pytest
+from idp_common.ocr import text_layer
+from idp_common.ocr.text_layer import TextLayerScore
+
+SENTENCE = "The quick brown fox jumps over the lazy dog 0123456789"
+
+
+@pytest.fixture(autouse=True)
+def real_pymupdf(monkeypatch):
+    """Make sure the module under test uses the real PyMuPDF."""
+    monkeypatch.setattr(text_layer, "fitz", pymupdf)
+
+
+@pytest.fixture
+def document():
+    doc = pymupdf.open()
+    yield doc
+    doc.close()
+
+
+def _text_page(document, lines=3, **kwargs):
+    page = document.new_page(width=600, height=800)
+    for i in range(lines):
+        page.insert_text((50, 100 + i * 20), SENTENCE, fontsize=11, **kwargs)
+    return page
+
+
+@pytest.mark.unit
+class TestExtractTextLayer:
+    """Tests for extract_text_layer."""
+
+    def test_born_digital_page_passes(self, document):
+        """Visible text with no images scores full coverage and no garbage."""
+        lines, score = text_layer.extract_text_layer(_text_page(document))
+
+        assert len(lines) == 3
+        assert lines[0]["text"] == SENTENCE
+        assert [w["text"] for w in lines[0]["words"]] == SENTENCE.split()
+        assert score.char_count == 3 * len(SENTENCE.replace(" ", ""))
+        assert score.garbage_ratio == 0.0
+        assert score.coverage == 1.0
+        assert score.passes(min_chars=50, max_garbage_ratio=0.05, min_coverage=0.5)
+
+    def test_empty_page_fails(self, document):
+        """Pages without a text layer fail."""
+        _, score = text_layer.extract_text_layer(document.new_page())
+
+        assert score == TextLayerScore(char_count=0, garbage_ratio=1.0, coverage=0.0)
+        assert not score.passes(min_chars=0, max_garbage_ratio=0.05, min_coverage=0.0)
+
+    def test_invisible_ocr_layer_counts_as_garbage(self, document):
+        """Invisible text (OCR layer on a scan) is not trusted."""
+        _, score = text_layer.extract_text_layer(_text_page(document, render_mode=3))
+
+        assert score.garbage_ratio == 1.0
+
+    def test_image_without_text_lowers_coverage(self, document):
+        """A scanned region without a text layer reduces coverage."""
+        page = _text_page(document, lines=1)
+        pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 10, 10), False)
+        page.insert_image(pymupdf.Rect(0, 300, 600, 800), pixmap=pixmap)
+
+        _, score = text_layer.extract_text_layer(page)
+
+        assert score.coverage < 0.1
+        assert not score.passes(min_chars=0, max_garbage_ratio=1.0, min_coverage=0.5)
+
+    def test_background_image_is_ignored(self, document):
+        """Images with text drawn over them are treated as backgrounds."""
+        page = document.new_page(width=600, height=800)
+        pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 10, 10), False)
+        page.insert_image(page.rect, pixmap=pixmap)
+        page.insert_text((50, 100), SENTENCE, fontsize=11)
+
+        _, score = text_layer.extract_text_layer(page)
+
+        assert score.coverage == 1.0
+
+    def test_garbage_characters(self):
+        """Replacement, private-use and control characters are garbage."""
+        assert text_layer._is_garbage_char("\ufffd")
+        assert text_layer._is_garbage_char("\ue000")
+        assert text_layer._is_garbage_char("\x07")
+        assert not text_layer._is_garbage_char("a")
+        assert not text_layer._is_garbage_char("é")
+
+
+@pytest.mark.unit
+class TestToTextractResponse:
+    """Tests for to_textract_response."""
+
+    def test_block_structure(self, document):
+        """Blocks follow Textract's PAGE -> LINE -> WORD hierarchy."""
+        page = _text_page(document, lines=2)
+        lines, _ = text_layer.extract_text_layer(page)
+
+        response = text_layer.to_textract_response(lines, page)
+        blocks = {block["Id"]: block for block in response["Blocks"]}
+        page_block = response["Blocks"][0]
+
+        assert response["DocumentMetadata"] == {"Pages": 1}
+        assert page_block["BlockType"] == "PAGE"
+        line_ids = page_block["Relationships"][0]["Ids"]
+        assert [blocks[i]["Text"] for i in line_ids] == [SENTENCE, SENTENCE]
+
+        line = blocks[line_ids[0]]
+        words = [blocks[i] for i in line["Relationships"][0]["Ids"]]
+        assert [w["Text"] for w in words] == SENTENCE.split()
+        assert all(w["BlockType"] == "WORD" for w in words)
+        assert all(w["TextType"] == "PRINTED" for w in words)
+        assert line["Confidence"] == text_layer.TEXT_LAYER_CONFIDENCE
+
+    def test_geometry_is_normalized(self, document):
+        """Bounding boxes are normalized to the page and consistent with polygons."""
+        page = _text_page(document, lines=1)
+        lines, _ = text_layer.extract_text_layer(page)
+
+        response = text_layer.to_textract_response(lines, page)
+        line = response["Blocks"][1]
+        box = line["Geometry"]["BoundingBox"]
+        polygon = line["Geometry"]["Polygon"]
+
+        assert box["Left"] == pytest.approx(50 / 600, abs=0.01)
+        assert box["Top"] == pytest.approx(88 / 800, abs=0.01)
+        assert 0 < box["Width"] < 1 and 0 < box["Height"] < 0.05
+        assert polygon[0] == {"X": box["Left"], "Y": box["Top"]}
+        assert polygon[2]["X"] == pytest.approx(box["Left"] + box["Width"])
+
+    def test_geometry_follows_page_rotation(self, document):
+        """Geometry matches the rotated page as rendered."""
+        page = _text_page(document, lines=1)
+        page.set_rotation(90)
+        lines, _ = text_layer.extract_text_layer(page)
+
+        box = text_layer.to_textract_response(lines, page)["Blocks"][1]["Geometry"][
+            "BoundingBox"
+        ]
+
+        # Horizontal text on a page rotated by 90 degrees becomes vertical
+        assert box["Height"] > box["Width"]
+        assert 0 <= box["Left"] <= 1 and 0 <= box["Top"] <= 1
+
+    def test_block_ids_are_deterministic(self, document):
+        """Identical pages produce identical responses."""
+        page = _text_page(document, lines=1)
+        lines, _ = text_layer.extract_text_layer(page)
+
+        assert text_layer.to_textract_response(
+            lines, page
+        ) == text_layer.to_textract_response(lines, page)
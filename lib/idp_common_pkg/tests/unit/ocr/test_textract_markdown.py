@@ -0,0 +1,167 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for direct Textract response to markdown conversion.
+
+Golden files in tests/resources/textract were produced with textractor 1.9.2
+(``response_parser.parse(response).to_markdown()``) by
+benchmarks/textract_markdown_benchmark.py --write-golden, from a synthetic form
+page with title, section header, key-value, checkbox, list, table, signature and
+page number content.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from idp_common.ocr.textract_markdown import (
+    convert_textract_response,
+    text_confidence_table,
+)
+
+RESOURCES = Path(__file__).parents[2] / "resources" / "textract"
+
+
+def _box(left, top, width, height):
+    return {"BoundingBox": {"Left": left, "Top": top, "Width": width, "Height": height}}
+
+
+def _line_response(lines, layout_type=None):
+    """Response with one word per line, optionally grouped into one layout block."""
+    line_ids = [f"line-{i}" for i in range(len(lines))]
+    page = {
+        "BlockType": "PAGE",
+        "Id": "page",
+        "Geometry": _box(0, 0, 1, 1),
+        "Relationships": [{"Type": "CHILD", "Ids": list(line_ids)}],
+    }
+    blocks = [page]
+    for i, (text, box) in enumerate(lines):
+        blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": f"line-{i}",
+                "Text": text,
+                "Confidence": 99.44,
+                "Geometry": box,
+                "Relationships": [{"Type": "CHILD", "Ids": [f"word-{i}"]}],
+            }
+        )
+        blocks.append(
+            {
+                "BlockType": "WORD",
+                "Id": f"word-{i}",
+                "Text": text,
+                "TextType": "PRINTED",
+                "Confidence": 99.44,
+                "Geometry": box,
+            }
+        )
+    if layout_type:
+        blocks.append(
+            {
+                "BlockType": layout_type,
+                "Id": "layout",
+                "Confidence": 90.0,
+                "Geometry": _box(0.05, 0.05, 0.9, 0.5),
+                "Relationships": [{"Type": "CHILD", "Ids": line_ids}],
+            }
+        )
+        page["Relationships"][0]["Ids"].append("layout")
+    return {"DocumentMetadata": {"Pages": 1}, "Blocks": blocks}
+
+
+@pytest.mark.unit
+class TestConvertTextractResponse:
+    """Tests for convert_textract_response."""
+
+    @pytest.mark.parametrize(
+        "name", ["form_analyze_document", "form_detect_document_text"]
+    )
+    def test_matches_textractor_golden_output(self, name):
+        """Markdown is identical to textractor's to_markdown()."""
+        response = json.loads((RESOURCES / f"{name}.json").read_text())
+        expected = (RESOURCES / f"{name}.md").read_text()
+
+        markdown, _ = convert_textract_response(response)
+
+        assert markdown == expected
+
+    def test_confidence_table_built_in_same_pass(self):
+        """The confidence table matches the standalone helper."""
+        response = json.loads((RESOURCES / "form_analyze_document.json").read_text())
+
+        _, confidence_table = convert_textract_response(response)
+
+        assert confidence_table == text_confidence_table(response["Blocks"])
+        assert "| Employer: Acme \\| Corp | 100.0 |" in confidence_table.split("\n")
+
+    def test_lines_without_layout_keep_response_order(self):
+        """DetectDocumentText lines each become a layout element, in response order."""
+        response = _line_response(
+            [
+                ("right", _box(0.5, 0.1, 0.1, 0.02)),
+                ("left", _box(0.1, 0.1, 0.1, 0.02)),
+            ]
+        )
+
+        markdown, _ = convert_textract_response(response)
+
+        assert markdown == "right\n\n\nleft\n"
+
+    @pytest.mark.parametrize(
+        "lines, expected",
+        [
+            (
+                [
+                    ("right", _box(0.5, 0.1, 0.1, 0.02)),
+                    ("left", _box(0.1, 0.1, 0.1, 0.02)),
+                    ("below", _box(0.1, 0.3, 0.1, 0.02)),
+                ],
+                "left\nright\n\nbelow\n",
+            ),
+            (
+                [
+                    ("first line", _box(0.1, 0.1, 0.5, 0.02)),
+                    ("continues", _box(0.1, 0.125, 0.4, 0.02)),
+                    ("new paragraph", _box(0.1, 0.3, 0.4, 0.02)),
+                ],
+                "first line\n continues\n\nnew paragraph\n",
+            ),
+        ],
+        ids=["rows", "paragraphs"],
+    )
+    def test_layout_reading_order(self, lines, expected):
+        """Lines in a layout are ordered by row, then left to right."""
+        response = _line_response(lines, layout_type="LAYOUT_FIGURE")
+
+        markdown, _ = convert_textract_response(response)
+
+        assert markdown == expected
+
+    def test_no_page_blocks_raises(self):
+        """Responses without PAGE blocks cannot be converted."""
+        with pytest.raises(ValueError):
+            convert_textract_response({"Blocks": [{"BlockType": "LINE"}]})
+
+
+@pytest.mark.unit
+class TestTextConfidenceTable:
+    """Tests for text_confidence_table."""
+
+    def test_rows(self):
+        """LINE blocks become rows; pipes are escaped and handwriting is marked."""
+        blocks = [
+            {"BlockType": "LINE", "Text": "a | b", "Confidence": 98.54},
+            {"BlockType": "LINE", "Text": "note", "TextType": "HANDWRITING"},
+            {"BlockType": "WORD", "Text": "a", "Confidence": 98.0},
+            {"BlockType": "LINE", "Text": ""},
+        ]
+
+        assert text_confidence_table(blocks).split("\n") == [
+            "| Text | Confidence |",
+            "|:-----|:-----------|",
+            "| a \\| b | 98.5 |",
+            "| note (HANDWRITING) | 0.0 |",
+        ]
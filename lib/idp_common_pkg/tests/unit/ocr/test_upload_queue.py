@@ -0,0 +1,85 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the OCR artifact upload queue.
+"""
+
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.ocr.upload_queue import ArtifactUploadQueue
+
+
+@pytest.mark.unit
+class TestArtifactUploadQueue:
+    """Tests for the ArtifactUploadQueue class."""
+
+    def test_uploads_with_own_client(self):
+        """Content is serialized and written with the queue's client."""
+        client = MagicMock()
+        with ArtifactUploadQueue(client, max_pending=4, max_workers=2) as queue:
+            queue.put({"text": "hello"}, "bucket", "doc/pages/1/result.json")
+            queue.put(b"jpeg", "bucket", "doc/pages/1/image.jpg", "image/jpeg")
+            assert queue.flush() == {}
+
+        calls = {c.kwargs["Key"]: c.kwargs for c in client.put_object.call_args_list}
+        assert json.loads(calls["doc/pages/1/result.json"]["Body"]) == {"text": "hello"}
+        assert calls["doc/pages/1/result.json"]["ContentType"] == "application/json"
+        assert calls["doc/pages/1/image.jpg"]["ContentType"] == "image/jpeg"
+        assert queue.stats.uploads == 2
+
+    def test_put_blocks_when_full(self):
+        """Workers wait for a free slot once max_pending uploads are in flight."""
+        release = threading.Event()
+        client = MagicMock()
+        client.put_object.side_effect = lambda **kwargs: release.wait(5)
+        queue = ArtifactUploadQueue(client, max_pending=1, max_workers=1)
+        queue.put(b"1", "bucket", "doc/pages/1/image.jpg")
+
+        second = threading.Thread(
+            target=queue.put, args=(b"2", "bucket", "doc/pages/2/image.jpg")
+        )
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()
+
+        release.set()
+        second.join(5)
+        queue.close()
+
+        assert client.put_object.call_count == 2
+        assert queue.stats.max_wait_seconds >= 0.2
+        assert queue.stats.wait_seconds >= queue.stats.max_wait_seconds
+
+    def test_flush_reports_failures_and_skips_dependent_callbacks(self):
+        """Failed keys are returned; callbacks depending on them do not run."""
+        client = MagicMock()
+
+        def put_object(**kwargs):
+            if kwargs["Key"].startswith("doc/pages/2/"):
+                raise RuntimeError("SlowDown")
+
+        client.put_object.side_effect = put_object
+        ran = []
+        with ArtifactUploadQueue(client, max_pending=8, max_workers=2) as queue:
+            for page in (1, 2):
+                queue.put(b"x", "bucket", f"doc/pages/{page}/image.jpg")
+                queue.defer(f"doc/pages/{page}/", lambda page=page: ran.append(page))
+
+            failures = queue.flush()
+
+            assert list(failures) == ["doc/pages/2/image.jpg"]
+            assert ran == [1]
+            assert queue.stats.failed == 1
+            # Flushed uploads and callbacks are not reported again
+            assert queue.flush() == {}
+            assert ran == [1]
+
+    def test_deferred_callback_errors_are_logged(self):
+        """A failing callback does not fail the flush."""
+        with ArtifactUploadQueue(MagicMock()) as queue:
+            queue.defer("doc/pages/1/", MagicMock(side_effect=RuntimeError("boom")))
+            assert queue.flush() == {}
@@ -6,7 +6,10 @@ Unit tests for configuration-based pricing functionality in SaveReportingData.
 Tests that pricing is loaded exclusively from configuration dictionary.
 """
 
+from pathlib import Path
+
 import pytest
+import yaml
 from idp_common.config.models import IDPConfig
 from idp_common.reporting.save_reporting_data import SaveReportingData
 
@@ -182,3 +185,41 @@ def test_pricing_with_invalid_price_values():
     assert invalid_cost == 0.0, f"Expected 0.0 for invalid price, got {invalid_cost}"
     # Valid price returns the actual value
     assert valid_cost == 0.002, f"Expected 0.002, got {valid_cost}"
+
+
+@pytest.mark.unit
+def test_default_pricing_prices_batch_usage_at_discount():
+    """Test that batch inference usage is priced at half the on-demand rate"""
+
+    pricing_path = Path(__file__).parents[5] / "config_library" / "pricing.yaml"
+    if not pricing_path.exists():
+        pytest.skip(f"Pricing file not found: {pricing_path}")
+    with open(pricing_path, "r") as f:
+        idp_config = IDPConfig.model_validate(yaml.safe_load(f))
+    reporter = SaveReportingData("test-bucket", config=idp_config)
+
+    for model_id in (
+        "us.amazon.nova-pro-v1:0",
+        "us.anthropic.claude-sonnet-4-5-20250929-v1:0",
+    ):
+        for unit in ("inputTokens", "outputTokens"):
+            on_demand = reporter._get_unit_cost(f"bedrock/{model_id}", unit)
+            batch = reporter._get_unit_cost(f"bedrock/{model_id}:batch", unit)
+
+            assert batch == pytest.approx(on_demand / 2)
+
+
+@pytest.mark.unit
+def test_default_pricing_does_not_price_route_counts():
+    """Test that routed request counts are not priced as model usage"""
+
+    pricing_path = Path(__file__).parents[5] / "config_library" / "pricing.yaml"
+    if not pricing_path.exists():
+        pytest.skip(f"Pricing file not found: {pricing_path}")
+    with open(pricing_path, "r") as f:
+        idp_config = IDPConfig.model_validate(yaml.safe_load(f))
+    reporter = SaveReportingData("test-bucket", config=idp_config)
+
+    model_id = "us.amazon.nova-pro-v1:0"
+    assert reporter._get_unit_cost(f"bedrock/{model_id}", "inputTokens") > 0
+    assert reporter._get_unit_cost(f"bedrock_route/{model_id}@eu", "requests") == 0.0
@@ -0,0 +1,273 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for Bedrock batch inference."""
+
+import base64
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.bedrock.batch import (
+    BatchJob,
+    BedrockBatchJobService,
+    ON_DEMAND_JOB_ID,
+    BedrockBatchRunner,
+    LocalBatchJobService,
+    parse_batch_output,
+    to_batch_record,
+)
+from idp_common.bedrock.client import BedrockClient
+
+MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+
+def _converse_response(text="ok"):
+    return {
+        "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+        "stopReason": "end_turn",
+        "usage": {"inputTokens": 10, "outputTokens": 2, "totalTokens": 12},
+    }
+
+
+def _echo_responder(model_id, model_input):
+    text = model_input["messages"][0]["content"][0]["text"]
+    if text == "fail":
+        raise ValueError("Malformed input request")
+    return _converse_response(text.upper())
+
+
+@pytest.fixture
+def bedrock_client():
+    return BedrockClient(region="us-west-2", metrics_enabled=False)
+
+
+@pytest.mark.unit
+class TestBatchRecords:
+    """Tests for job input and output records."""
+
+    def test_input_record_is_json_converse_request(self, bedrock_client):
+        """Records drop job-level settings and base64 encode image bytes."""
+        params = bedrock_client.build_converse_params(
+            model_id=f"{MODEL_ID}:flex",
+            system_prompt="Classify",
+            content=[
+                {"text": "page"},
+                {"image": {"format": "png", "source": {"bytes": b"\x89PNG"}}},
+            ],
+        )
+
+        record = to_batch_record("r1", params)
+
+        assert record["recordId"] == "r1"
+        assert "modelId" not in record["modelInput"]
+        assert "serviceTier" not in record["modelInput"]
+        assert "additionalModelRequestFields" in record["modelInput"]
+        image = record["modelInput"]["messages"][0]["content"][1]["image"]
+        assert image["source"]["bytes"] == base64.b64encode(b"\x89PNG").decode()
+        json.dumps(record)
+
+    def test_output_record_errors(self):
+        """Error records are reported with their code and message."""
+        assert parse_batch_output(
+            {"recordId": "r1", "modelOutput": _converse_response()}
+        ) == ("r1", _converse_response(), None)
+        assert parse_batch_output(
+            {"recordId": "r2", "error": {"errorCode": 400, "errorMessage": "Bad"}}
+        ) == ("r2", None, "400: Bad")
+
+    def test_job_round_trips_through_dict(self):
+        """Jobs serialize so results can be collected in a later step."""
+        job = BatchJob("arn:job/abc", MODEL_ID, {"r1": "Extraction"}, "InProgress")
+
+        assert BatchJob.from_dict(json.loads(json.dumps(job.to_dict()))) == job
+
+
+@pytest.mark.unit
+class TestBedrockBatchRunner:
+    """Tests for the batch runner with the file-based job service."""
+
+    def test_run_returns_invoke_model_shaped_results(self, bedrock_client, tmp_path):
+        """Results are keyed by record ID and metered with the batch suffix."""
+        runner = BedrockBatchRunner(
+            LocalBatchJobService(str(tmp_path), _echo_responder),
+            bedrock_client=bedrock_client,
+            min_records=2,
+        )
+        for record_id, text in (("a", "first"), ("b", "second"), ("c", "fail")):
+            runner.add(
+                record_id, MODEL_ID, "system", [{"text": text}], context="Extraction"
+            )
+
+        results = runner.run()
+
+        assert results["a"]["response"]["output"]["message"]["content"][0] == {
+            "text": "FIRST"
+        }
+        assert results["b"]["metering"] == {
+            f"Extraction/bedrock/{MODEL_ID}:batch": {
+                "inputTokens": 10,
+                "outputTokens": 2,
+                "totalTokens": 12,
+                "requests": 1,
+            }
+        }
+        assert "Malformed input request" in results["c"]["error"]
+
+    def test_small_groups_invoked_on_demand(self, bedrock_client, tmp_path):
+        """Groups below the minimum job size are sent with invoke_model."""
+        service = MagicMock()
+        bedrock_client.invoke_model = MagicMock(
+            return_value={"response": _converse_response(), "metering": {}}
+        )
+        runner = BedrockBatchRunner(service, bedrock_client=bedrock_client)
+        runner.add("a", MODEL_ID, "system", [{"text": "only"}])
+
+        jobs = runner.submit()
+        results = runner.collect(jobs)
+
+        assert [(job.job_id, job.status) for job in jobs] == [
+            (ON_DEMAND_JOB_ID, "Completed")
+        ]
+        service.submit.assert_not_called()
+        bedrock_client.invoke_model.assert_called_once()
+        assert results["a"]["response"] == _converse_response()
+
+    def test_on_demand_results_collected_by_another_runner(self, bedrock_client):
+        """On-demand results survive serializing the jobs between runners."""
+        service = MagicMock()
+        bedrock_client.invoke_model = MagicMock(
+            return_value={"response": _converse_response(), "metering": {}}
+        )
+        runner = BedrockBatchRunner(service, bedrock_client=bedrock_client)
+        runner.add("a", MODEL_ID, "system", [{"text": "only"}])
+        saved = json.dumps([job.to_dict() for job in runner.submit()])
+
+        other_runner = BedrockBatchRunner(service, bedrock_client=bedrock_client)
+        jobs = [BatchJob.from_dict(data) for data in json.loads(saved)]
+
+        assert other_runner.poll(jobs)
+        results = other_runner.collect(jobs)
+
+        assert results["a"]["response"] == _converse_response()
+        service.get_status.assert_not_called()
+
+    def test_large_groups_split_into_jobs(self, bedrock_client):
+        """Groups are split into jobs of at most max_records."""
+        service = MagicMock()
+        service.submit.side_effect = ["job-1", "job-2"]
+        runner = BedrockBatchRunner(
+            service, bedrock_client=bedrock_client, min_records=1, max_records=2
+        )
+        for record_id in ("a", "b", "c"):
+            runner.add(record_id, MODEL_ID, "system", [{"text": record_id}])
+
+        jobs = runner.submit()
+
+        assert [job.job_id for job in jobs] == ["job-1", "job-2"]
+        assert [len(call.args[2]) for call in service.submit.call_args_list] == [2, 1]
+
+    @pytest.mark.parametrize(
+        "count,min_records,max_records,job_sizes,on_demand",
+        [
+            (1001, 100, 1000, [501, 500], 0),
+            (2000, 100, 1000, [1000, 1000], 0),
+            (250, 100, 150, [125, 125], 0),
+            (160, 100, 150, [150], 10),
+        ],
+    )
+    def test_jobs_split_evenly(
+        self, bedrock_client, count, min_records, max_records, job_sizes, on_demand
+    ):
+        """Jobs are balanced, and a remainder too small for a job runs on demand."""
+        service = MagicMock()
+        service.submit.side_effect = lambda name, model_id, records: name
+        bedrock_client.invoke_model = MagicMock(
+            return_value={"response": _converse_response(), "metering": {}}
+        )
+        runner = BedrockBatchRunner(
+            service,
+            bedrock_client=bedrock_client,
+            min_records=min_records,
+            max_records=max_records,
+        )
+        for index in range(count):
+            runner.add(f"r{index}", MODEL_ID, "system", [{"text": "page"}])
+
+        jobs = runner.submit()
+
+        sizes = [len(call.args[2]) for call in service.submit.call_args_list]
+        assert sizes == job_sizes
+        assert bedrock_client.invoke_model.call_count == on_demand
+        assert sum(len(job.record_contexts) for job in jobs) == count
+
+    def test_failed_job_reports_every_record(self, bedrock_client):
+        """Records of a failed job are returned as errors."""
+        service = MagicMock()
+        service.submit.return_value = "job-1"
+        service.get_status.return_value = "Failed"
+        runner = BedrockBatchRunner(
+            service, bedrock_client=bedrock_client, min_records=1
+        )
+        runner.add("a", MODEL_ID, "system", [{"text": "a"}])
+
+        results = runner.run()
+
+        assert results == {"a": {"error": "Batch job ended as Failed"}}
+        service.get_output_records.assert_not_called()
+
+    def test_wait_times_out(self, bedrock_client):
+        """Waiting stops with TimeoutError after the timeout."""
+        service = MagicMock()
+        service.get_status.return_value = "InProgress"
+        runner = BedrockBatchRunner(
+            service, bedrock_client=bedrock_client, timeout=0, sleep=lambda s: None
+        )
+
+        with pytest.raises(TimeoutError):
+            runner.wait([BatchJob("job-1", MODEL_ID)])
+
+
+@pytest.mark.unit
+class TestBedrockBatchJobService:
+    """Tests for Bedrock model invocation jobs."""
+
+    def test_submit_and_read_output(self):
+        """Input is written to S3 and output read from the job's output prefix."""
+        bedrock = MagicMock()
+        s3 = MagicMock()
+        bedrock.create_model_invocation_job.return_value = {
+            "jobArn": "arn:aws:bedrock:us-west-2:123:model-invocation-job/abc123"
+        }
+        service = BedrockBatchJobService(
+            "arn:aws:iam::123:role/batch",
+            "s3://bucket/batch/input",
+            "s3://bucket/batch/output",
+            bedrock_client=bedrock,
+            s3_client=s3,
+        )
+
+        job_id = service.submit("job", MODEL_ID, [{"recordId": "a"}])
+
+        kwargs = bedrock.create_model_invocation_job.call_args.kwargs
+        assert kwargs["modelId"] == MODEL_ID
+        assert kwargs["inputDataConfig"]["s3InputDataConfig"]["s3Uri"] == (
+            "s3://bucket/batch/input/job.jsonl"
+        )
+        s3.put_object.assert_called_once()
+
+        bedrock.get_model_invocation_job.return_value = {
+            "status": "Completed",
+            "inputDataConfig": kwargs["inputDataConfig"],
+            "outputDataConfig": kwargs["outputDataConfig"],
+        }
+        output = {"recordId": "a", "modelOutput": _converse_response()}
+        s3.get_object.return_value = {
+            "Body": io.BytesIO(json.dumps(output).encode("utf-8"))
+        }
+
+        assert service.get_output_records(job_id) == [output]
+        s3.get_object.assert_called_once_with(
+            Bucket="bucket", Key="batch/output/abc123/job.jsonl.out"
+        )
@@ -0,0 +1,131 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for the shared Bedrock connection pool."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.connection_pool import (
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    BedrockConnectionPool,
+)
+
+
+@pytest.mark.unit
+class TestBedrockConnectionPool:
+    """Tests for the BedrockConnectionPool class."""
+
+    def test_client_shared_per_region(self):
+        """One client is created per region and sized to the pool."""
+        factory = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+        pool = BedrockConnectionPool(client_factory=factory)
+
+        first = pool.get_client("us-east-1")
+
+        assert pool.get_client("us-east-1") is first
+        assert pool.get_client("us-west-2") is not first
+        assert factory.call_count == 2
+        config = factory.call_args.kwargs["config"]
+        assert config.max_pool_connections == DEFAULT_MAX_POOL_CONNECTIONS
+        assert config.read_timeout == 300
+
+    def test_reserve_grows_pool_and_rebuilds_client(self):
+        """Reserving more concurrency replaces the client with a larger pool."""
+        factory = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+        pool = BedrockConnectionPool(max_pool_connections=10, client_factory=factory)
+        small = pool.get_client("us-east-1")
+
+        pool.reserve(8)
+        assert pool.get_client("us-east-1") is small
+
+        pool.reserve(40)
+        large = pool.get_client("us-east-1")
+        assert large is not small
+        assert pool.size == 40
+        assert factory.call_args.kwargs["config"].max_pool_connections == 40
+
+    def test_connection_waits_when_all_slots_in_use(self):
+        """Calls beyond the pool size wait for a slot and report the wait."""
+        pool = BedrockConnectionPool(max_pool_connections=1)
+        waits = []
+
+        with pool.connection() as waited:
+            assert waited == 0.0
+
+            def second_call():
+                with pool.connection() as second_waited:
+                    waits.append(second_waited)
+
+            thread = threading.Thread(target=second_call)
+            thread.start()
+            time.sleep(0.05)
+            assert not waits
+
+        thread.join(timeout=2)
+
+        assert waits and waits[0] > 0
+        assert pool.stats.calls == 2
+        assert pool.stats.waits == 1
+        assert pool.stats.max_in_use == 1
+
+    def test_reserve_releases_waiting_calls(self):
+        """Growing the pool admits calls that were waiting for a slot."""
+        pool = BedrockConnectionPool(max_pool_connections=1)
+        admitted = threading.Event()
+
+        with pool.connection():
+
+            def second_call():
+                with pool.connection():
+                    admitted.set()
+
+            thread = threading.Thread(target=second_call)
+            thread.start()
+            time.sleep(0.05)
+            pool.reserve(2)
+            assert admitted.wait(timeout=2)
+
+        thread.join(timeout=2)
+
+
+@pytest.mark.unit
+class TestBedrockClientConnectionPool:
+    """Tests for BedrockClient use of the connection pool."""
+
+    def test_client_from_pool_and_concurrency_hint(self):
+        """The client comes from the pool, which is grown by max_concurrency."""
+        factory = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+        pool = BedrockConnectionPool(max_pool_connections=10, client_factory=factory)
+
+        first = BedrockClient(region="us-east-1", connection_pool=pool)
+        second = BedrockClient(
+            region="us-east-1", connection_pool=pool, max_concurrency=32
+        )
+
+        assert first.client is second.client
+        assert pool.size == 32
+
+    def test_invoke_model_holds_connection_slot(self):
+        """Each converse call runs inside a connection slot."""
+        factory = MagicMock()
+        factory.return_value.converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"totalTokens": 10},
+        }
+        pool = BedrockConnectionPool(client_factory=factory)
+        client = BedrockClient(
+            region="us-east-1", metrics_enabled=False, connection_pool=pool
+        )
+
+        client.invoke_model(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="test",
+            content=[{"text": "test"}],
+        )
+
+        assert pool.stats.calls == 1
+        factory.return_value.converse.assert_called_once()
@@ -0,0 +1,150 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for batched, cached embeddings and vectorized similarity."""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.connection_pool import BedrockConnectionPool
+from idp_common.bedrock.embeddings import (
+    EmbeddingCache,
+    compute_embedding_key,
+    cosine_similarity_matrix,
+    most_similar,
+)
+
+try:
+    import numpy  # noqa: F401
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+MODEL_ID = "amazon.titan-embed-text-v2:0"
+
+# Vectors exactly representable as float32
+VECTORS = {
+    "alpha": [1.0, 0.0, 0.0],
+    "beta": [0.0, 1.0, 0.0],
+    "gamma": [0.5, 0.5, 0.0],
+}
+
+
+def _client(cache):
+    factory = MagicMock()
+    runtime = factory.return_value
+
+    def invoke_model(modelId, contentType, accept, body):
+        text = json.loads(body)["inputText"]
+        payload = {"embedding": VECTORS[text], "inputTextTokenCount": 1}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+    runtime.invoke_model.side_effect = invoke_model
+    client = BedrockClient(
+        region="us-east-1",
+        metrics_enabled=False,
+        connection_pool=BedrockConnectionPool(client_factory=factory),
+        embedding_cache=cache,
+    )
+    return client, runtime
+
+
+@pytest.mark.unit
+class TestEmbeddingCache:
+    """Tests for the EmbeddingCache class."""
+
+    def test_memory_lru_evicts_oldest(self):
+        """The least recently used vector is evicted first."""
+        cache = EmbeddingCache(max_entries=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+        cache.put("c", [3.0])
+
+        assert cache.get("a") == [1.0]
+        assert cache.get("b") is None
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_disk_tier_shared_across_instances(self, tmp_path):
+        """Vectors written to the directory are found by a new cache."""
+        key = compute_embedding_key(MODEL_ID, "alpha")
+        EmbeddingCache(cache_dir=str(tmp_path)).put(key, [0.25, 0.5])
+
+        assert EmbeddingCache(cache_dir=str(tmp_path)).get(key) == [0.25, 0.5]
+
+    def test_key_depends_on_model(self):
+        """The same text embedded by another model has another key."""
+        assert compute_embedding_key(MODEL_ID, "x") != compute_embedding_key(
+            "amazon.titan-embed-text-v1", "x"
+        )
+
+
+@pytest.mark.unit
+class TestGenerateEmbeddings:
+    """Tests for BedrockClient.generate_embeddings."""
+
+    def test_batch_deduplicates_and_caches(self):
+        """Each distinct text is embedded once and reused from the cache."""
+        client, runtime = _client(EmbeddingCache())
+
+        vectors = client.generate_embeddings(
+            ["alpha", " alpha ", "beta", "", "gamma"], MODEL_ID
+        )
+
+        assert vectors == [
+            VECTORS["alpha"],
+            VECTORS["alpha"],
+            VECTORS["beta"],
+            [],
+            VECTORS["gamma"],
+        ]
+        assert runtime.invoke_model.call_count == 3
+
+        assert client.generate_embedding("beta", MODEL_ID) == VECTORS["beta"]
+        assert runtime.invoke_model.call_count == 3
+
+    def test_single_embedding_without_cache(self, monkeypatch):
+        """With the cache disabled every call reaches Bedrock."""
+        monkeypatch.setenv("BEDROCK_EMBEDDING_CACHE_ENTRIES", "0")
+        monkeypatch.setattr(
+            "idp_common.bedrock.embeddings._shared_cache_loaded", False
+        )
+        client, runtime = _client(None)
+
+        client.generate_embedding("alpha", MODEL_ID)
+        client.generate_embedding("alpha", MODEL_ID)
+
+        assert client.embedding_cache is None
+        assert runtime.invoke_model.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not available")
+class TestSimilarity:
+    """Tests for the vectorized similarity helpers."""
+
+    def test_cosine_similarity_matrix(self):
+        """Every pair is scored and zero or empty vectors score 0."""
+        matrix = cosine_similarity_matrix(
+            [VECTORS["alpha"], [0.0, 0.0, 0.0]],
+            [VECTORS["alpha"], VECTORS["beta"], VECTORS["gamma"], []],
+        )
+
+        assert matrix.shape == (2, 4)
+        assert matrix[0].tolist() == pytest.approx([1.0, 0.0, 0.7071068, 0.0])
+        assert matrix[1].tolist() == [0.0, 0.0, 0.0, 0.0]
+
+    def test_most_similar(self):
+        """Candidates are ranked by similarity per query."""
+        candidates = [VECTORS["beta"], VECTORS["gamma"], VECTORS["alpha"]]
+
+        result = most_similar([VECTORS["alpha"], VECTORS["beta"]], candidates, 2)
+
+        assert [index for index, _ in result[0]] == [2, 1]
+        assert [index for index, _ in result[1]] == [0, 1]
+        assert result[0][0][1] == pytest.approx(1.0)
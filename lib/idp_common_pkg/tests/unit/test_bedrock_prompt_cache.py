@@ -0,0 +1,185 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for automatic prompt-cache checkpoint placement."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.prompt_cache import (
+    CACHE_POINT,
+    PromptCacheTracker,
+    auto_cachepoint_enabled,
+)
+
+PREAMBLE = "Extract the fields below.\n" + "Follow rule number one.\n" * 60
+INVOICE = PREAMBLE + "Invoice schema:\n" + "invoice_field: string\n" * 80
+LETTER = PREAMBLE + "Letter schema:\n" + "letter_field: string\n" * 80
+
+
+def _params(prompt, document_text):
+    return {
+        "system": [{"text": "You extract data."}],
+        "messages": [
+            {
+                "role": "user",
+                "content": [{"text": f"{prompt}<document>{document_text}</document>"}],
+            }
+        ],
+    }
+
+
+def _content(params):
+    return params["messages"][0]["content"]
+
+
+@pytest.mark.unit
+class TestPromptCacheTracker:
+    """Tests for learning stable prefixes and placing checkpoints."""
+
+    @pytest.fixture
+    def tracker(self):
+        return PromptCacheTracker(min_prefix_tokens=100)
+
+    def test_first_request_not_checkpointed(self, tracker):
+        """A context's first request has nothing to compare with."""
+        params = _params(INVOICE, "doc 1")
+
+        assert not tracker.apply("Extraction", "model", params)
+        assert _content(params) == _params(INVOICE, "doc 1")["messages"][0]["content"]
+
+    def test_checkpoint_after_shared_prefix(self, tracker):
+        """The shared prefix is split off at a line break and checkpointed."""
+        tracker.apply("Extraction", "model", _params(INVOICE, "doc 1"))
+        params = _params(INVOICE, "doc 2")
+
+        assert tracker.apply("Extraction", "model", params)
+
+        content = _content(params)
+        assert content[0] == {"text": INVOICE}
+        assert content[1] == CACHE_POINT
+        assert content[2] == {"text": "<document>doc 2</document>"}
+
+    def test_checkpoint_position_is_stable(self, tracker):
+        """Later requests reuse the confirmed prefix."""
+        for doc in ("doc 1", "doc 2"):
+            tracker.apply("Extraction", "model", _params(INVOICE, doc))
+        params = _params(INVOICE, "doc 3 with more text")
+
+        assert tracker.apply("Extraction", "model", params)
+        assert _content(params)[0] == {"text": INVOICE}
+
+    def test_class_specific_prefix_learned_after_shared_preamble(self, tracker):
+        """A longer per-class prefix replaces the preamble shared by all classes."""
+        tracker.apply("Extraction", "model", _params(LETTER, "letter 1"))
+        first_invoice = _params(INVOICE, "invoice 1")
+        tracker.apply("Extraction", "model", first_invoice)
+        assert _content(first_invoice)[0] == {"text": PREAMBLE}
+
+        tracker.apply("Extraction", "model", _params(INVOICE, "invoice 2"))
+        params = _params(INVOICE, "invoice 3")
+        tracker.apply("Extraction", "model", params)
+
+        assert _content(params)[0] == {"text": INVOICE}
+
+    def test_short_prefixes_and_other_contexts_ignored(self, tracker):
+        """Prefixes below the minimum and other contexts get no checkpoint."""
+        tracker.apply("Extraction", "model", _params("Short prompt\n", "doc 1"))
+
+        assert not tracker.apply("Extraction", "model", _params("Short prompt\n", "2"))
+        assert not tracker.apply("Assessment", "model", _params(INVOICE, "doc 1"))
+
+    def test_existing_cachepoints_respected(self, tracker):
+        """Requests with a cachePoint from <<CACHEPOINT>> tags are unchanged."""
+        tracker.apply("Extraction", "model", _params(INVOICE, "doc 1"))
+        params = _params(INVOICE, "doc 2")
+        _content(params).append(dict(CACHE_POINT))
+
+        assert not tracker.apply("Extraction", "model", params)
+        assert len(_content(params)) == 2
+
+    def test_checkpoint_after_system_prompt(self, tracker):
+        """A prefix ending with the system prompt is checkpointed in the system."""
+        for text in ("first", "second"):
+            params = {
+                "system": [{"text": PREAMBLE}],
+                "messages": [{"role": "user", "content": [{"text": text}]}],
+            }
+            tracker.apply("Summarization", "model", params)
+
+        assert params["system"] == [{"text": PREAMBLE}, CACHE_POINT]
+        assert _content(params) == [{"text": "second"}]
+
+    def test_cache_ratios_per_context(self, tracker):
+        """Cache read and write ratios are reported per context."""
+        tracker.record_usage(
+            "Extraction", {"inputTokens": 100, "cacheWriteInputTokens": 900}
+        )
+        tracker.record_usage(
+            "Extraction", {"inputTokens": 100, "cacheReadInputTokens": 900}
+        )
+
+        stats = tracker.stats()["Extraction"]
+        assert stats["requests"] == 2
+        assert stats["cache_read_ratio"] == 0.45
+        assert stats["cache_write_ratio"] == 0.45
+
+    def test_disabled_by_environment(self):
+        """BEDROCK_AUTO_CACHEPOINT=false disables automatic checkpoints."""
+        with patch.dict("os.environ", {"BEDROCK_AUTO_CACHEPOINT": "false"}):
+            assert not auto_cachepoint_enabled()
+        with patch.dict("os.environ", {}, clear=True):
+            assert auto_cachepoint_enabled()
+
+
+@pytest.mark.unit
+class TestBedrockClientAutoCachePoint:
+    """Tests for automatic checkpoints in BedrockClient.invoke_model."""
+
+    def _client(self, **kwargs):
+        client = BedrockClient(
+            region="us-west-2",
+            metrics_enabled=False,
+            prompt_cache_tracker=PromptCacheTracker(min_prefix_tokens=100),
+            **kwargs,
+        )
+        client._client = MagicMock()
+        client._client.converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"inputTokens": 50, "cacheReadInputTokens": 500},
+        }
+        return client
+
+    def _invoke(self, client, model_id, document_text):
+        client.invoke_model(
+            model_id=model_id,
+            system_prompt="You extract data.",
+            content=[{"text": f"{INVOICE}<document>{document_text}</document>"}],
+            context="Extraction",
+        )
+        return client._client.converse.call_args.kwargs["messages"][0]["content"]
+
+    def test_supported_model_gets_checkpoint(self):
+        """Repeated requests on a supported model are checkpointed and reported."""
+        client = self._client()
+        self._invoke(client, "us.amazon.nova-pro-v1:0", "doc 1")
+
+        content = self._invoke(client, "us.amazon.nova-pro-v1:0", "doc 2")
+
+        assert content[1] == CACHE_POINT
+        stats = client.prompt_cache_stats()["Extraction"]
+        assert stats["checkpoints"] == 1
+        assert stats["cache_read_ratio"] == pytest.approx(500 / 550, abs=1e-4)
+
+    def test_unsupported_model_or_disabled_not_checkpointed(self):
+        """Unsupported models and auto_cachepoint=False send content unchanged."""
+        client = self._client()
+        for doc in ("doc 1", "doc 2"):
+            content = self._invoke(client, "us.amazon.nova-micro-v1:0", doc)
+        assert CACHE_POINT not in content
+
+        client = self._client(auto_cachepoint=False)
+        for doc in ("doc 1", "doc 2"):
+            content = self._invoke(client, "us.amazon.nova-pro-v1:0", doc)
+        assert CACHE_POINT not in content
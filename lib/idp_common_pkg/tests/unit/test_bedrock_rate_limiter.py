@@ -0,0 +1,243 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for the process-wide Bedrock rate limiter."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.rate_limiter import (
+    DEFAULT_OUTPUT_TOKENS,
+    BedrockRateLimiter,
+    ModelRateLimit,
+    estimate_request_tokens,
+    load_rate_limits_from_env,
+)
+from idp_common.bedrock.token_estimator import IMAGE_TOKENS, TokenEstimator
+
+
+class FakeClock:
+    """Monotonic clock advanced by the limiter's sleep calls."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.unit
+class TestEstimateRequestTokens:
+    """Tests for request token estimation."""
+
+    def test_counts_text_images_and_output_reserve(self):
+        """Input is estimated by the token estimator, plus max tokens."""
+        params = {
+            "modelId": "us.amazon.nova-pro-v1:0",
+            "system": [{"text": "s" * 400}],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [{"text": "t" * 800}, {"image": {"format": "jpeg"}}],
+                }
+            ],
+            "inferenceConfig": {"temperature": 0.0},
+            "additionalModelRequestFields": {"max_tokens": 500},
+        }
+
+        estimator = TokenEstimator()
+
+        assert estimate_request_tokens(params, estimator) == (
+            100 + 200 + IMAGE_TOKENS + 500
+        )
+
+        # Reservations follow the model's calibration
+        raw_input = 100 + 200 + IMAGE_TOKENS
+        estimator.record_usage(
+            "us.amazon.nova-pro-v1:0", raw_input, {"inputTokens": 2 * raw_input}
+        )
+        assert estimate_request_tokens(params, estimator) == 2 * raw_input + 500
+
+    def test_default_output_reserve(self):
+        """Requests without max tokens reserve the default output size."""
+        params = {"system": [], "messages": [{"role": "user", "content": []}]}
+
+        assert estimate_request_tokens(params) == DEFAULT_OUTPUT_TOKENS
+
+
+@pytest.mark.unit
+class TestModelRateLimit:
+    """Tests for per-model RPM/TPM token buckets."""
+
+    def test_requests_per_minute_spaces_calls(self):
+        """Once the minute's requests are used, calls wait for the refill."""
+        clock = FakeClock()
+        limit = ModelRateLimit(requests_per_minute=60, clock=clock, sleep=clock.sleep)
+
+        for _ in range(60):
+            assert limit.acquire(0) == 0.0
+        waited = limit.acquire(0)
+
+        assert waited == pytest.approx(1.0)
+        assert limit.stats.requests == 61
+        assert limit.stats.waits == 1
+
+    def test_tokens_per_minute_waits_for_token_capacity(self):
+        """A call waits until its estimated tokens fit the token budget."""
+        clock = FakeClock()
+        limit = ModelRateLimit(tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+
+        limit.acquire(6000)
+        waited = limit.acquire(600)
+
+        assert waited == pytest.approx(6.0)
+        assert all(s <= 1.0 for s in clock.sleeps)
+
+    def test_refund_returns_unused_tokens(self):
+        """Over-estimated reservations are refunded from the actual usage."""
+        clock = FakeClock()
+        limit = ModelRateLimit(tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+
+        limit.acquire(6000)
+        limit.refund(6000, 1000)
+
+        assert limit.acquire(5000) == 0.0
+        assert limit.stats.tokens_used == 1000
+
+    def test_under_estimate_is_charged_on_refund(self):
+        """Usage above the reservation is taken from the bucket."""
+        clock = FakeClock()
+        limit = ModelRateLimit(tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+
+        limit.acquire(1000)
+        limit.refund(1000, 4000)
+
+        assert limit.tokens.available == pytest.approx(2000)
+
+    def test_reservation_capped_at_budget(self):
+        """A call larger than the token budget is admitted once the bucket is full."""
+        clock = FakeClock()
+        limit = ModelRateLimit(tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+
+        assert limit.acquire(50000) == 0.0
+
+
+@pytest.mark.unit
+class TestBedrockRateLimiter:
+    """Tests for the per-model limit registry."""
+
+    def test_lookup_by_model_base_id_and_default(self):
+        """Limits match the model ID, its base ID without suffix, then '*'."""
+        limiter = BedrockRateLimiter(
+            {
+                "us.amazon.nova-2-lite-v1:0": {"requests_per_minute": 100},
+                "*": {"tokens_per_minute": 1000},
+            }
+        )
+
+        nova = limiter.get("us.amazon.nova-2-lite-v1:0:flex")
+        assert nova is limiter.get("us.amazon.nova-2-lite-v1:0")
+        assert nova.requests.capacity == 100
+        assert limiter.get("us.anthropic.claude-sonnet-4-20250514-v1:0").tokens
+
+    def test_unconfigured_models_not_limited(self):
+        """Without limits every model is unlimited."""
+        assert BedrockRateLimiter().get("us.amazon.nova-pro-v1:0") is None
+
+    def test_limits_from_env(self):
+        """Limits are parsed from BEDROCK_RATE_LIMITS and invalid JSON is ignored."""
+        with patch.dict(
+            "os.environ",
+            {"BEDROCK_RATE_LIMITS": '{"model-a": {"requests_per_minute": 10}}'},
+        ):
+            assert load_rate_limits_from_env() == {
+                "model-a": {"requests_per_minute": 10}
+            }
+        with patch.dict("os.environ", {"BEDROCK_RATE_LIMITS": "not json"}):
+            assert load_rate_limits_from_env() == {}
+
+
+@pytest.mark.unit
+class TestBedrockClientRateLimit:
+    """Tests for rate limiting in BedrockClient."""
+
+    @pytest.fixture
+    def limiter(self):
+        return BedrockRateLimiter(
+            {"us.amazon.nova-pro-v1:0": {"tokens_per_minute": 100000}}
+        )
+
+    @pytest.fixture
+    def bedrock_client(self, limiter):
+        client = BedrockClient(
+            region="us-west-2", metrics_enabled=False, rate_limiter=limiter
+        )
+        client._client = MagicMock()
+        return client
+
+    def test_invoke_model_reserves_and_refunds_tokens(self, bedrock_client, limiter):
+        """A call reserves its estimate and is charged its actual usage."""
+        bedrock_client._client.converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"inputTokens": 100, "outputTokens": 50, "totalTokens": 150},
+        }
+
+        bedrock_client.invoke_model(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="test",
+            content=[{"text": "test"}],
+        )
+
+        limit = limiter.get("us.amazon.nova-pro-v1:0")
+        assert limit.stats.requests == 1
+        assert limit.stats.tokens_reserved > 150
+        assert limit.stats.tokens_used == 150
+        assert limit.tokens.available == pytest.approx(100000 - 150, abs=5)
+
+    @patch("time.sleep")
+    def test_failed_attempts_refund_tokens(self, mock_sleep, bedrock_client, limiter):
+        """Each attempt is admitted by the limiter and failed attempts use no tokens."""
+        throttle = ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+            "Converse",
+        )
+        bedrock_client._client.converse.side_effect = [
+            throttle,
+            {
+                "output": {"message": {"content": [{"text": "ok"}]}},
+                "usage": {"totalTokens": 10},
+            },
+        ]
+
+        bedrock_client.invoke_model(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="test",
+            content=[{"text": "test"}],
+        )
+
+        limit = limiter.get("us.amazon.nova-pro-v1:0")
+        assert limit.stats.requests == 2
+        assert limit.stats.tokens_used == 10
+
+    def test_unlimited_model_not_gated(self, bedrock_client, limiter):
+        """Models without a limit are invoked without reservations."""
+        bedrock_client._client.converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"totalTokens": 10},
+        }
+
+        bedrock_client.invoke_model(
+            model_id="us.anthropic.claude-sonnet-4-20250514-v1:0",
+            system_prompt="test",
+            content=[{"text": "test"}],
+        )
+
+        assert limiter.get("us.anthropic.claude-sonnet-4-20250514-v1:0") is None
+        assert limiter.get("us.amazon.nova-pro-v1:0").stats.requests == 0
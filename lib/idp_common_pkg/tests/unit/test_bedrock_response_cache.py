@@ -0,0 +1,278 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for the deterministic Bedrock response cache."""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common import bedrock
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.response_cache import (
+    DynamoDBResponseCacheStore,
+    LlmResponseCache,
+    compute_cache_key,
+    create_response_cache_from_env,
+    is_cacheable_request,
+)
+from idp_common.classification.service import ClassificationService
+from idp_common.config.models import IDPConfig
+from idp_common.models import Document, Page, Status
+
+
+def _params(image_bytes=b"page-1", temperature=0.0):
+    return {
+        "modelId": "us.amazon.nova-pro-v1:0",
+        "system": [{"text": "Classify the page"}],
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"text": "Page:"},
+                    {"image": {"format": "jpeg", "source": {"bytes": image_bytes}}},
+                ],
+            }
+        ],
+        "inferenceConfig": {"temperature": temperature},
+        "additionalModelRequestFields": None,
+    }
+
+
+def _response(text="invoice"):
+    return {
+        "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+        "stopReason": "end_turn",
+        "usage": {"inputTokens": 100, "outputTokens": 5, "totalTokens": 105},
+        "ResponseMetadata": {"RequestId": "abc"},
+    }
+
+
+@pytest.mark.unit
+class TestCacheKey:
+    """Tests for request keys and cacheability."""
+
+    def test_key_depends_on_image_bytes(self):
+        """Identical requests share a key; different image bytes do not."""
+        assert compute_cache_key(_params()) == compute_cache_key(_params())
+        assert compute_cache_key(_params()) != compute_cache_key(_params(b"page-2"))
+
+    def test_key_ignores_dict_order(self):
+        """Keys are computed from canonical JSON."""
+        reordered = dict(reversed(list(_params().items())))
+
+        assert compute_cache_key(reordered) == compute_cache_key(_params())
+
+    def test_only_non_sampling_requests_cacheable(self):
+        """Requests with temperature 0 or a small top_p are cached."""
+        assert is_cacheable_request(_params())
+        assert is_cacheable_request({"inferenceConfig": {"topP": 0.1}})
+        assert not is_cacheable_request({"inferenceConfig": {"topP": 0.9}})
+        assert not is_cacheable_request(_params(temperature=0.7))
+
+
+@pytest.mark.unit
+class TestLlmResponseCache:
+    """Tests for the two-tier response cache."""
+
+    def test_memory_hit_drops_response_metadata(self):
+        """Cached responses round-trip without ResponseMetadata."""
+        cache = LlmResponseCache()
+        cache.put("key", _response())
+
+        cached = cache.get("key")
+
+        assert cached["output"] == _response()["output"]
+        assert "ResponseMetadata" not in cached
+        assert cache.hits == 1
+
+    def test_lru_evicts_to_byte_budget(self):
+        """The least recently used entries are evicted beyond the byte budget."""
+        entry_size = len(json.dumps({"text": "x" * 100}))
+        cache = LlmResponseCache(max_memory_bytes=entry_size * 2)
+        cache.put("a", {"text": "x" * 100})
+        cache.put("b", {"text": "x" * 100})
+        cache.get("a")
+        cache.put("c", {"text": "x" * 100})
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_store_hit_promoted_to_memory(self):
+        """A persistent hit is kept in memory for the next lookup."""
+        store = MagicMock()
+        store.get.return_value = json.dumps({"stopReason": "end_turn"})
+        cache = LlmResponseCache(store=store)
+
+        assert cache.get("key") == {"stopReason": "end_turn"}
+        assert cache.get("key") == {"stopReason": "end_turn"}
+        store.get.assert_called_once_with("key")
+
+    def test_store_errors_are_misses(self):
+        """Store failures never fail the lookup or the write."""
+        store = MagicMock()
+        store.get.side_effect = Exception("unavailable")
+        store.put.side_effect = Exception("unavailable")
+        cache = LlmResponseCache(max_memory_bytes=0, store=store)
+
+        cache.put("key", _response())
+        assert cache.get("key") is None
+        assert cache.misses == 1
+
+    def test_dynamodb_store_expiry(self):
+        """Expired DynamoDB items are ignored even before TTL deletes them."""
+        table = MagicMock()
+        store = DynamoDBResponseCacheStore("tracking", ttl_seconds=60, table=table)
+        store.put("key", "{}")
+
+        item = table.put_item.call_args.kwargs["Item"]
+        assert item["PK"] == "llmcache#key"
+        assert item["ExpiresAfter"] >= int(time.time()) + 59
+
+        table.get_item.return_value = {"Item": {**item, "ExpiresAfter": 1}}
+        assert store.get("key") is None
+
+    def test_cache_from_env(self):
+        """The cache is enabled and configured by environment variables."""
+        with patch.dict("os.environ", {}, clear=True):
+            assert create_response_cache_from_env() is None
+        with patch.dict(
+            "os.environ",
+            {
+                "BEDROCK_RESPONSE_CACHE": "memory",
+                "BEDROCK_RESPONSE_CACHE_MEMORY_MB": "1",
+            },
+        ):
+            cache = create_response_cache_from_env()
+            assert cache.max_memory_bytes == 1024 * 1024
+            assert cache.store is None
+
+
+@pytest.mark.unit
+class TestBedrockClientResponseCache:
+    """Tests for response caching in BedrockClient.invoke_model."""
+
+    @pytest.fixture
+    def bedrock_client(self):
+        client = BedrockClient(
+            region="us-west-2",
+            metrics_enabled=False,
+            response_cache=LlmResponseCache(),
+        )
+        client._client = MagicMock()
+        client._client.converse.return_value = _response()
+        return client
+
+    def _invoke(self, client, image_bytes=b"page-1", temperature=0.0):
+        return client.invoke_model(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="Classify the page",
+            content=[
+                {"image": {"format": "jpeg", "source": {"bytes": image_bytes}}},
+            ],
+            temperature=temperature,
+            top_p=None,
+            context="Classification",
+        )
+
+    def test_repeat_request_served_from_cache(self, bedrock_client):
+        """An identical request returns the cached response with cached metering."""
+        first = self._invoke(bedrock_client)
+        second = self._invoke(bedrock_client)
+
+        assert bedrock_client._client.converse.call_count == 1
+        assert second["response"]["output"] == first["response"]["output"]
+        assert first["metering"] == {
+            "Classification/bedrock/us.amazon.nova-pro-v1:0": {
+                "inputTokens": 100,
+                "outputTokens": 5,
+                "totalTokens": 105,
+                "requests": 1,
+            }
+        }
+        assert second["metering"] == {
+            "Classification/bedrock_cache/us.amazon.nova-pro-v1:0": {"hits": 1}
+        }
+
+    def test_different_image_not_served_from_cache(self, bedrock_client):
+        """Requests with different image bytes call the model."""
+        self._invoke(bedrock_client)
+        self._invoke(bedrock_client, image_bytes=b"page-2")
+
+        assert bedrock_client._client.converse.call_count == 2
+
+    def test_sampling_requests_not_cached(self, bedrock_client):
+        """Requests with temperature above 0 always call the model."""
+        self._invoke(bedrock_client, temperature=0.5)
+        self._invoke(bedrock_client, temperature=0.5)
+
+        assert bedrock_client._client.converse.call_count == 2
+
+    def test_default_config_sampling_cached(self, bedrock_client):
+        """Requests with the default top_p of each step are cached."""
+        config = IDPConfig()
+        for step in (config.classification, config.extraction, config.assessment):
+            for _ in range(2):
+                bedrock_client.invoke_model(
+                    model_id="us.amazon.nova-pro-v1:0",
+                    system_prompt="Classify the page",
+                    content=[{"text": "Page 1"}],
+                    temperature=step.temperature,
+                    top_k=step.top_k,
+                    top_p=step.top_p,
+                )
+
+        assert bedrock_client._client.converse.call_count == 1
+
+    @patch("idp_common.metrics.put_metric")
+    @patch("idp_common.s3.get_text_content", return_value="Invoice number 42")
+    def test_classification_rerun_served_from_cache(
+        self, mock_get_text, mock_put_metric
+    ):
+        """Classifying a document again with a default config reuses responses."""
+        service = ClassificationService(
+            region="us-east-1",
+            config={
+                "classes": [
+                    {"$id": "invoice", "x-aws-idp-document-type": "invoice"},
+                    {"$id": "letter", "x-aws-idp-document-type": "letter"},
+                ],
+                "classification": {
+                    "model": "us.amazon.nova-pro-v1:0",
+                    "system_prompt": "You classify documents.",
+                    "task_prompt": "{CLASS_NAMES_AND_DESCRIPTIONS}\n\n{DOCUMENT_TEXT}",
+                },
+            },
+        )
+        boto_client = MagicMock()
+        boto_client.converse.return_value = _response(
+            json.dumps({"class": "invoice"})
+        )
+
+        with (
+            patch.object(bedrock.default_client, "_client", boto_client),
+            patch.object(
+                bedrock.default_client, "_response_cache", LlmResponseCache()
+            ),
+        ):
+            for _ in range(2):
+                doc = Document(id="doc", input_key="doc.pdf", status=Status.CLASSIFYING)
+                doc.pages["1"] = Page(page_id="1", parsed_text_uri="s3://b/1.json")
+                result = service.classify_document(doc)
+
+        assert boto_client.converse.call_count == 1
+        assert result.pages["1"].classification == "invoice"
+
+    def test_guardrail_interventions_not_cached(self, bedrock_client):
+        """Responses blocked by a guardrail are not reused."""
+        bedrock_client._client.converse.return_value = {
+            **_response(),
+            "stopReason": "guardrail_intervened",
+        }
+
+        self._invoke(bedrock_client)
+        self._invoke(bedrock_client)
+
+        assert bedrock_client._client.converse.call_count == 2
@@ -0,0 +1,203 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for latency-aware Bedrock region routing."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.connection_pool import BedrockConnectionPool
+from idp_common.bedrock.router import (
+    COOLDOWN_SECONDS,
+    ERROR,
+    MIN_SAMPLES,
+    ROUTES_ENV_VAR,
+    SUCCESS,
+    THROTTLE,
+    BedrockRouter,
+    RouteTarget,
+    load_routes_from_env,
+)
+
+MODEL_ID = "us.amazon.nova-pro-v1:0"
+EAST = RouteTarget("us-east-1")
+WEST = RouteTarget("us-west-2")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def router(clock):
+    return BedrockRouter({MODEL_ID: ["us-east-1", "us-west-2"]}, clock=clock)
+
+
+@pytest.mark.unit
+class TestBedrockRouter:
+    """Tests for the BedrockRouter class."""
+
+    def test_primary_preferred_when_healthy(self, router):
+        """The first target takes traffic while it is healthy."""
+        for _ in range(MIN_SAMPLES):
+            router.record(EAST, SUCCESS, 1.0)
+            router.record(WEST, SUCCESS, 0.9)
+
+        assert router.choose(MODEL_ID) == EAST
+        assert router.choose("us.amazon.nova-lite-v1:0") is None
+
+    def test_sheds_to_secondary_when_error_budget_exhausted(self, router, clock):
+        """A throttling primary cools down and traffic moves to the secondary."""
+        for _ in range(MIN_SAMPLES):
+            router.record(EAST, THROTTLE)
+
+        assert router.choose(MODEL_ID) == WEST
+        assert router.health()["us-east-1"]["cooling_down"]
+
+        clock.now += COOLDOWN_SECONDS + 1
+        assert router.choose(MODEL_ID) == EAST
+
+    def test_clearly_faster_secondary_takes_traffic(self, router):
+        """A secondary with a much lower p95 latency is chosen."""
+        for _ in range(MIN_SAMPLES):
+            router.record(EAST, SUCCESS, 6.0)
+            router.record(WEST, SUCCESS, 1.0)
+
+        assert router.choose(MODEL_ID) == WEST
+        health = router.health()
+        assert health["us-east-1"]["p95_ms"] == 6000
+        assert health["us-west-2"]["p50_ms"] == 1000
+
+    def test_retry_avoids_failed_target(self, router):
+        """A retry goes to another target unless none is available."""
+        assert router.choose(MODEL_ID, avoid=EAST) == WEST
+
+        single = BedrockRouter({MODEL_ID: ["us-east-1"]})
+        assert single.choose(MODEL_ID, avoid=EAST) == EAST
+
+    def test_stale_outcomes_expire(self, router, clock):
+        """Outcomes older than the window no longer count."""
+        for _ in range(MIN_SAMPLES - 1):
+            router.record(EAST, ERROR)
+        clock.now += 3600
+        router.record(EAST, ERROR)
+
+        assert router.choose(MODEL_ID) == EAST
+        assert router.health()["us-east-1"]["attempts"] == 1
+
+    def test_inference_profile_target_and_default_route(self):
+        """Targets may name a model ID and "*" routes every other model."""
+        router = BedrockRouter(
+            {"*": [{"region": "eu-west-1", "model_id": "profile-arn", "name": "eu"}]}
+        )
+
+        target = router.choose(MODEL_ID)
+
+        assert target.region == "eu-west-1"
+        assert target.model_id == "profile-arn"
+        assert target.label == "eu"
+
+    def test_routes_from_env(self):
+        """Routes are read from BEDROCK_ROUTES; invalid JSON is ignored."""
+        routes = {MODEL_ID: ["us-east-1", {"region": "us-west-2"}]}
+        with patch.dict("os.environ", {ROUTES_ENV_VAR: json.dumps(routes)}):
+            assert load_routes_from_env() == routes
+        with patch.dict("os.environ", {ROUTES_ENV_VAR: "[1, 2]"}):
+            assert load_routes_from_env() == {}
+
+
+@pytest.mark.unit
+class TestBedrockClientRouting:
+    """Tests for BedrockClient use of the router."""
+
+    @patch("time.sleep")
+    def test_throttled_attempt_retried_in_other_region(self, mock_sleep):
+        """A throttle in the primary region is retried in the secondary."""
+        clients = {"us-east-1": MagicMock(), "us-west-2": MagicMock()}
+        clients["us-east-1"].converse.side_effect = ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+            "Converse",
+        )
+        clients["us-west-2"].converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"inputTokens": 10, "outputTokens": 2, "totalTokens": 12},
+        }
+        pool = BedrockConnectionPool(
+            client_factory=lambda service, region_name, config: clients[region_name]
+        )
+        router = BedrockRouter({MODEL_ID: ["us-east-1", "us-west-2"]})
+        client = BedrockClient(
+            region="us-east-1",
+            metrics_enabled=False,
+            connection_pool=pool,
+            auto_cachepoint=False,
+            router=router,
+        )
+
+        result = client.invoke_model(
+            model_id=MODEL_ID,
+            system_prompt="test",
+            content=[{"text": "test"}],
+            context="Extraction",
+        )
+
+        clients["us-east-1"].converse.assert_called_once()
+        clients["us-west-2"].converse.assert_called_once()
+        assert result["metering"] == {
+            f"Extraction/bedrock/{MODEL_ID}": {
+                "inputTokens": 10,
+                "outputTokens": 2,
+                "totalTokens": 12,
+                "requests": 1,
+            },
+            f"Extraction/bedrock_route/{MODEL_ID}@us-west-2": {"requests": 1},
+        }
+        assert router.health()["us-east-1"]["throttle_rate"] == 1.0
+
+    def test_request_log_names_routed_model_and_region(self, caplog):
+        """Attempt logs show the model ID and region the router chose."""
+        runtime = MagicMock()
+        runtime.converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"inputTokens": 10, "outputTokens": 2, "totalTokens": 12},
+        }
+        pool = BedrockConnectionPool(
+            client_factory=lambda service, region_name, config: runtime
+        )
+        target = {"region": "eu-west-1", "model_id": "eu-profile", "name": "eu"}
+        router = BedrockRouter({MODEL_ID: [target]})
+        client = BedrockClient(
+            region="us-east-1",
+            metrics_enabled=False,
+            connection_pool=pool,
+            auto_cachepoint=False,
+            router=router,
+        )
+
+        with caplog.at_level("INFO", logger="idp_common.bedrock.client"):
+            result = client.invoke_model(
+                model_id=MODEL_ID,
+                system_prompt="test",
+                content=[{"text": "test"}],
+                context="Extraction",
+            )
+
+        assert "  - model: eu-profile" in caplog.messages
+        assert "  - region: eu-west-1" in caplog.messages
+        assert f"  - route: {MODEL_ID}@eu" in caplog.messages
+        assert list(result["metering"]) == [
+            f"Extraction/bedrock/{MODEL_ID}",
+            f"Extraction/bedrock_route/{MODEL_ID}@eu",
+        ]
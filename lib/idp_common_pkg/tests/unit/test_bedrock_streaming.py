@@ -0,0 +1,192 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for streamed Bedrock responses and incremental JSON parsing."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.connection_pool import BedrockConnectionPool
+from idp_common.bedrock.streaming import (
+    IncrementalJsonParser,
+    StreamingJsonHandler,
+    validate_field,
+)
+
+
+def _chunks(text, size=7):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _stream_events(chunks, usage=None):
+    events = [{"messageStart": {"role": "assistant"}}]
+    events.extend({"contentBlockDelta": {"delta": {"text": c}}} for c in chunks)
+    events.append({"messageStop": {"stopReason": "end_turn"}})
+    if usage is not None:
+        events.append({"metadata": {"usage": usage, "metrics": {"latencyMs": 5}}})
+    return events
+
+
+def _client_with_stream(*streams):
+    factory = MagicMock()
+    factory.return_value.converse_stream.side_effect = [
+        s if isinstance(s, Exception) else {"stream": s} for s in streams
+    ]
+    pool = BedrockConnectionPool(client_factory=factory)
+    client = BedrockClient(
+        region="us-east-1",
+        metrics_enabled=False,
+        connection_pool=pool,
+        auto_cachepoint=False,
+    )
+    return client, factory.return_value
+
+
+@pytest.mark.unit
+class TestIncrementalJsonParser:
+    """Tests for the IncrementalJsonParser class."""
+
+    def test_members_emitted_as_they_complete(self):
+        """Each top-level member is returned once its value is complete."""
+        parser = IncrementalJsonParser()
+        text = 'Here you go: {"a": 1, "b": {"c": [1, 2]}, "d": "x, }"} trailing'
+
+        members = []
+        for chunk in _chunks(text, 3):
+            members.extend(parser.feed(chunk))
+
+        assert members == [("a", 1), ("b", {"c": [1, 2]}), ("d", "x, }")]
+        assert parser.complete
+        assert json.loads(parser.json_text) == {"a": 1, "b": {"c": [1, 2]}, "d": "x, }"}
+
+    def test_escaped_quotes_in_strings(self):
+        """Escaped quotes do not end a string."""
+        parser = IncrementalJsonParser()
+
+        members = parser.feed('{"a": "say \\"hi\\", {ok}"}')
+
+        assert members == [("a", 'say "hi", {ok}')]
+        assert parser.complete
+
+    def test_incomplete_object(self):
+        """An unterminated object is not complete and keeps its finished members."""
+        parser = IncrementalJsonParser()
+
+        members = parser.feed('```json\n{"a": 1, "b": "trunc')
+
+        assert members == [("a", 1)]
+        assert not parser.complete
+
+
+@pytest.mark.unit
+class TestStreamingJsonHandler:
+    """Tests for the StreamingJsonHandler class."""
+
+    def test_validates_fields_against_schema(self):
+        """Fields are checked against the declared types as they arrive."""
+        schema = {
+            "properties": {"total": {"type": "number"}, "name": {"type": "string"}},
+            "additionalProperties": False,
+        }
+        seen = []
+        handler = StreamingJsonHandler(
+            schema=schema, on_field=lambda key, value: seen.append(key)
+        )
+
+        stop = handler.feed('{"total": "12", "name": "ACME", "extra": true}')
+
+        assert stop
+        assert seen == ["total", "name", "extra"]
+        assert handler.fields["name"] == "ACME"
+        assert len(handler.field_errors) == 2
+
+    def test_validate_field_types(self):
+        """Union types, bool-vs-number and undeclared fields are handled."""
+        schema = {"properties": {"n": {"type": ["number", "null"]}}}
+
+        assert validate_field("n", None, schema) is None
+        assert validate_field("n", 1.5, schema) is None
+        assert validate_field("n", True, schema) is not None
+        assert validate_field("other", 1, schema) is None
+
+    def test_no_stop_when_disabled(self):
+        """stop_when_complete=False never asks to stop."""
+        handler = StreamingJsonHandler(stop_when_complete=False)
+
+        assert not handler.feed('{"a": 1}')
+        assert handler.complete
+
+
+@pytest.mark.unit
+class TestBedrockClientStreaming:
+    """Tests for BedrockClient.invoke_model with a stream handler."""
+
+    def test_stream_stops_when_json_complete(self):
+        """The stream is closed once the JSON object closes and usage estimated."""
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(
+            _stream_events(_chunks('{"a": 1, "b": 2}') + [" and more text"])
+        )
+        client, runtime = _client_with_stream(stream)
+        handler = StreamingJsonHandler()
+
+        result = client.invoke_model(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="Respond with JSON",
+            content=[{"text": "x" * 400}],
+            context="Extraction",
+            stream_handler=handler,
+        )
+
+        runtime.converse.assert_not_called()
+        stream.close.assert_called_once()
+        response = result["response"]
+        assert response["stopReason"] == "json_complete"
+        assert "and more text" not in client.extract_text_from_response(result)
+        assert "timeToFirstTokenMs" in response["metrics"]
+        assert response["usage"]["inputTokens"] > 0
+        assert handler.fields == {"a": 1, "b": 2}
+        metering = result["metering"]["Extraction/bedrock/us.amazon.nova-pro-v1:0"]
+        assert metering["requests"] == 1
+
+    def test_stream_uses_reported_usage(self):
+        """Without early termination the reported usage and stop reason are kept."""
+        usage = {"inputTokens": 10, "outputTokens": 3, "totalTokens": 13}
+        client, _ = _client_with_stream(_stream_events(["not json"], usage))
+
+        result = client.invoke_model(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="test",
+            content=[{"text": "test"}],
+            stream_handler=StreamingJsonHandler(),
+        )
+
+        assert result["response"]["usage"] == usage
+        assert result["response"]["stopReason"] == "end_turn"
+        assert result["response"]["output"]["message"]["content"][0]["text"] == (
+            "not json"
+        )
+
+    def test_stream_retry_resets_handler(self, monkeypatch):
+        """A throttled stream is retried and the handler starts over."""
+        monkeypatch.setattr("time.sleep", lambda seconds: None)
+        error = ClientError(
+            {"Error": {"Code": "throttlingException", "Message": "slow down"}},
+            "ConverseStream",
+        )
+        client, runtime = _client_with_stream(error, _stream_events(['{"a": 2}']))
+        handler = StreamingJsonHandler()
+
+        client.invoke_model(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="test",
+            content=[{"text": "test"}],
+            max_retries=2,
+            stream_handler=handler,
+        )
+
+        assert runtime.converse_stream.call_count == 2
+        assert handler.fields == {"a": 2}
@@ -0,0 +1,180 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for token estimation and context-window planning."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.connection_pool import BedrockConnectionPool
+from idp_common.bedrock.token_estimator import (
+    IMAGE_TOKENS,
+    MIN_OUTPUT_TOKENS,
+    ContextWindowExceededError,
+    TokenEstimator,
+    estimate_content_tokens,
+    estimate_image_tokens,
+    estimate_text_tokens,
+    get_context_window,
+    get_long_context_variant,
+)
+
+SONNET = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
+
+
+@pytest.mark.unit
+class TestTokenEstimates:
+    """Tests for the text, image and request estimates."""
+
+    def test_prose_close_to_four_chars_per_token(self):
+        """Plain English text stays near the usual ratio."""
+        text = "The invoice lists the services provided during the month. " * 20
+
+        tokens = estimate_text_tokens(text)
+
+        assert len(text) / 6 < tokens < len(text) / 3
+
+    def test_tables_and_cjk_denser_than_prose(self):
+        """Table separators and CJK characters cost more tokens per character."""
+        table = "| 12 | 3.50 | 42.00 |\n" * 50
+        cjk = "請求書の合計金額" * 50
+
+        assert estimate_text_tokens(table) > len(table) / 4
+        assert estimate_text_tokens(cjk) >= len(cjk)
+
+    def test_image_fallback_without_size(self):
+        """Images whose size cannot be read use the fixed estimate."""
+        assert estimate_image_tokens(b"not an image") == IMAGE_TOKENS
+        assert estimate_image_tokens(None) == IMAGE_TOKENS
+
+    def test_request_blocks(self):
+        """System and message text, images and documents are all counted."""
+        params = {
+            "system": [{"text": "abcd" * 10}],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"text": "efgh" * 10},
+                        {"image": {"format": "png", "source": {"bytes": b"x"}}},
+                    ],
+                }
+            ],
+        }
+
+        assert estimate_content_tokens(params) == 20 + IMAGE_TOKENS
+
+
+@pytest.mark.unit
+class TestTokenEstimator:
+    """Tests for calibration and planning."""
+
+    def test_calibration_follows_reported_usage(self):
+        """Reported input tokens scale later estimates for the same model."""
+        estimator = TokenEstimator()
+
+        estimator.record_usage(SONNET, 1000, {"inputTokens": 1500})
+        estimator.record_usage(SONNET, 1000, {"inputTokens": 1500})
+
+        assert estimator.calibrate(SONNET, 100) == 150
+        assert estimator.calibration("us.amazon.nova-pro-v1:0") == 1.0
+
+    def test_cached_tokens_count_as_input(self):
+        """Cache reads and writes are part of the input size."""
+        estimator = TokenEstimator()
+
+        estimator.record_usage(
+            SONNET,
+            1000,
+            {"inputTokens": 100, "cacheReadInputTokens": 900},
+        )
+
+        assert estimator.calibration(SONNET) == 1.0
+
+    def test_plan_lowers_max_tokens(self):
+        """max_tokens is lowered to the room the input leaves."""
+        plan = TokenEstimator().plan(SONNET, 180_000, 64_000)
+
+        assert plan.model_id == SONNET
+        assert plan.max_tokens == 20_000
+        assert plan.fits
+
+    def test_plan_routes_to_long_context_variant(self):
+        """Inputs that only fit the 1M-token variant are routed to it."""
+        plan = TokenEstimator().plan(SONNET, 200_000 - MIN_OUTPUT_TOKENS + 1, 4096)
+
+        assert plan.model_id == SONNET + ":1m"
+        assert plan.max_tokens == 4096
+
+    def test_plan_rejects_clear_overflow(self):
+        """Requests far beyond any window are rejected."""
+        with pytest.raises(ContextWindowExceededError):
+            TokenEstimator().plan("us.amazon.nova-pro-v1:0", 500_000, 4096)
+
+    def test_plan_unknown_model_unchanged(self):
+        """Models without a known window are not planned."""
+        plan = TokenEstimator().plan("us.meta.llama3-70b", 10_000_000, 100)
+
+        assert plan.context_window is None
+        assert plan.max_tokens == 100
+
+    def test_model_windows(self):
+        """Windows and long-context variants are resolved from the model ID."""
+        assert get_context_window(SONNET) == 200_000
+        assert get_context_window(SONNET + ":1m") == 1_000_000
+        assert get_long_context_variant("us.amazon.nova-pro-v1:0") is None
+        assert get_long_context_variant(SONNET + ":1m") is None
+
+
+@pytest.mark.unit
+class TestBedrockClientTokenPlanning:
+    """Tests for BedrockClient use of the token estimator."""
+
+    def _client(self, estimator, context_routing=True):
+        factory = MagicMock()
+        factory.return_value.converse.return_value = {
+            "output": {"message": {"content": [{"text": "ok"}]}},
+            "usage": {"inputTokens": 20, "outputTokens": 1, "totalTokens": 21},
+        }
+        client = BedrockClient(
+            region="us-east-1",
+            metrics_enabled=False,
+            connection_pool=BedrockConnectionPool(client_factory=factory),
+            auto_cachepoint=False,
+            context_routing=context_routing,
+            token_estimator=estimator,
+        )
+        return client, factory.return_value
+
+    def test_routes_and_records_usage(self):
+        """Oversized requests go to the 1M variant and usage calibrates it."""
+        estimator = TokenEstimator()
+        client, runtime = self._client(estimator)
+
+        result = client.invoke_model(
+            model_id=SONNET,
+            system_prompt="test",
+            content=[{"text": "word " * 200_000}],
+            max_tokens=4096,
+            context="Extraction",
+        )
+
+        params = runtime.converse.call_args.kwargs
+        assert params["modelId"] == SONNET
+        assert params["additionalModelRequestFields"]["anthropic_beta"]
+        assert f"Extraction/bedrock/{SONNET}:1m" in result["metering"]
+        assert estimator.calibration(SONNET + ":1m") < 1.0
+
+    def test_overflow_not_sent(self):
+        """Requests that cannot fit any window fail before calling Bedrock."""
+        client, runtime = self._client(TokenEstimator())
+
+        with pytest.raises(ContextWindowExceededError):
+            client.invoke_model(
+                model_id="us.amazon.nova-pro-v1:0",
+                system_prompt="test",
+                content=[{"text": "word " * 400_000}],
+            )
+
+        runtime.converse.assert_not_called()
@@ -1,6 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
+from unittest.mock import patch
+
 import pytest
 from idp_common.ocr.document_converter import DocumentConverter
 
@@ -65,3 +67,34 @@ def test_create_empty_page():
     empty_page = converter._create_empty_page()
     assert isinstance(empty_page, bytes)
     assert len(empty_page) > 0
+
+
+@pytest.mark.unit
+def test_layout_text_pages_renders_lazily():
+    """Test page text is available before any page image is rendered."""
+    converter = DocumentConverter(dpi=72)
+    text = "\n".join(f"line {i}" for i in range(100))
+
+    with patch.object(converter, "_render_text_page", return_value=b"jpeg") as render:
+        pages = converter.layout_text_pages(text)
+
+        assert len(pages) > 1
+        assert pages[0].text.startswith("line 0\nline 1")
+        render.assert_not_called()
+
+        assert pages[1].render_image() == b"jpeg"
+        render.assert_called_once_with(pages[1].text.split("\n"), 16)
+
+
+@pytest.mark.unit
+def test_render_pages_parallel_preserves_order():
+    """Test pages rendered on several threads keep their order."""
+    converter = DocumentConverter(dpi=72, max_workers=4)
+    text = "\n".join(f"line {i}" for i in range(200))
+
+    pages = converter.layout_text_pages(text)
+    rendered = converter.convert_text_to_pages(text)
+
+    assert len(pages) > 2
+    assert [page_text for _, page_text in rendered] == [page.text for page in pages]
+    assert all(image[:2] == b"\xff\xd8" for image, _ in rendered)
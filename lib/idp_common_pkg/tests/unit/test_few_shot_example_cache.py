@@ -0,0 +1,121 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for the few-shot example content cache."""
+
+import io
+from unittest.mock import patch
+
+import pytest
+from idp_common.config.models import ImageConfig
+from idp_common.utils import few_shot_example_builder
+from idp_common.utils.few_shot_example_builder import (
+    FewShotExampleCache,
+    build_few_shot_extraction_examples_content,
+)
+from PIL import Image
+
+EXAMPLE_URI = "s3://config-bucket/examples/invoice.png"
+
+
+def _png(width=400, height=200):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _invoice_class(prompt="Vendor is ACME"):
+    return {
+        "$id": "Invoice",
+        "x-aws-idp-examples": [
+            {"name": "invoice-1", "attributesPrompt": prompt, "imagePath": EXAMPLE_URI}
+        ],
+    }
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FewShotExampleCache()
+    monkeypatch.setattr(few_shot_example_builder, "get_few_shot_cache", lambda: cache)
+    return cache
+
+
+@pytest.mark.unit
+class TestFewShotExampleCache:
+    """Tests for the FewShotExampleCache class."""
+
+    def test_lru_bounded_by_bytes(self):
+        """The least recently used entries are evicted past the size budget."""
+        cache = FewShotExampleCache(max_bytes=10)
+        cache.put("a", [{"text": "12345"}])
+        cache.put("b", [{"text": "12345"}])
+        cache.get("a")
+        cache.put("c", [{"text": "12345"}])
+
+        assert cache.get("a") == [{"text": "12345"}]
+        assert cache.get("b") is None
+
+    def test_entries_expire(self):
+        """Entries older than the TTL are misses."""
+        cache = FewShotExampleCache(ttl_seconds=0)
+        cache.put("a", [{"text": "x"}])
+
+        assert cache.get("a") is None
+
+    def test_returned_content_is_a_copy(self):
+        """Changing returned content does not change the cached entry."""
+        cache = FewShotExampleCache()
+        cache.put("a", [{"text": "x"}])
+
+        cache.get("a").append({"text": "y"})
+
+        assert cache.get("a") == [{"text": "x"}]
+
+
+@pytest.mark.unit
+class TestFewShotExampleBuilder:
+    """Tests for cached example content building."""
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_images_loaded_once_and_resized(self, mock_get, cache):
+        """Repeated builds reuse the cached, resized example images."""
+        mock_get.return_value = _png()
+        image_config = ImageConfig(target_width=200, target_height=200)
+
+        first = build_few_shot_extraction_examples_content(
+            _invoice_class(), image_config
+        )
+        second = build_few_shot_extraction_examples_content(
+            _invoice_class(), image_config
+        )
+
+        mock_get.assert_called_once_with(EXAMPLE_URI)
+        assert first == second
+        assert first[0] == {"text": "Vendor is ACME"}
+        resized = Image.open(io.BytesIO(first[1]["image"]["source"]["bytes"]))
+        assert resized.size == (200, 100)
+        assert cache.hits == 1
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_changed_examples_rebuilt(self, mock_get, cache):
+        """Editing an example's definition produces a new cache entry."""
+        mock_get.return_value = _png()
+
+        build_few_shot_extraction_examples_content(_invoice_class())
+        content = build_few_shot_extraction_examples_content(
+            _invoice_class("Vendor is Example Corp")
+        )
+
+        assert mock_get.call_count == 2
+        assert content[0] == {"text": "Vendor is Example Corp"}
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_failed_images_not_cached(self, mock_get, cache):
+        """A build with an unreadable image is retried on the next call."""
+        mock_get.side_effect = [RuntimeError("throttled"), _png()]
+
+        first = build_few_shot_extraction_examples_content(_invoice_class())
+        second = build_few_shot_extraction_examples_content(_invoice_class())
+
+        assert len(first) == 1
+        assert len(second) == 2
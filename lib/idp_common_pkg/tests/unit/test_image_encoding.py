@@ -0,0 +1,81 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for image encoding profiles in idp_common.image.
+"""
+
+import io
+
+import pytest
+from idp_common import image
+from PIL import Image, ImageDraw
+
+
+def _page(color: bool = False, image_format: str = "JPEG", size=(600, 800)) -> bytes:
+    """Draw a text-like page, optionally with a colored logo."""
+    page = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(page)
+    for line in range(40):
+        draw.text((30, 20 + line * 18), f"Line {line} of a sample page", fill="black")
+    if color:
+        draw.rectangle((400, 20, 560, 120), fill=(200, 30, 30))
+    buffer = io.BytesIO()
+    page.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestImageEncoding:
+    """Tests for encode_image, is_monochrome and resize_image encoding options."""
+
+    def test_is_monochrome(self):
+        """Text pages are monochrome; a colored area is detected."""
+        assert image.is_monochrome(Image.open(io.BytesIO(_page())))
+        assert not image.is_monochrome(Image.open(io.BytesIO(_page(color=True))))
+        assert image.is_monochrome(Image.new("L", (10, 10)))
+
+    @pytest.mark.parametrize(
+        "image_format,pil_format", [("png", "PNG"), ("webp", "WEBP")]
+    )
+    def test_encode_image_format(self, image_format, pil_format):
+        """The requested format is produced."""
+        encoded = image.encode_image(_page(), image_format=image_format)
+        assert Image.open(io.BytesIO(encoded)).format == pil_format
+
+    def test_encode_image_auto_color_mode(self):
+        """Auto color mode converts monochrome pages to grayscale only."""
+        gray = image.encode_image(_page(image_format="PNG"), color_mode="auto")
+        color = image.encode_image(
+            _page(color=True, image_format="PNG"), color_mode="auto"
+        )
+        assert Image.open(io.BytesIO(gray)).mode == "L"
+        assert Image.open(io.BytesIO(color)).mode == "RGB"
+
+    def test_encode_image_keeps_smaller_original(self):
+        """Re-encoding at a higher quality does not grow an image in that format."""
+        original = image.encode_image(_page(), quality=40)
+        assert image.encode_image(original, image_format="jpeg", quality=95) is original
+
+    def test_encode_image_invalid_format(self):
+        """Unsupported formats raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported image format"):
+            image.encode_image(_page(), image_format="tiff")
+
+    def test_resize_image_applies_encoding(self):
+        """Encoding options apply after resizing, and without any resize."""
+        resized = image.resize_image(
+            _page(color=True), 300, 400, image_format="png", color_mode="grayscale"
+        )
+        resized_image = Image.open(io.BytesIO(resized))
+        assert resized_image.format == "PNG"
+        assert resized_image.mode == "L"
+        assert resized_image.size == (300, 400)
+
+        not_resized = image.resize_image(_page(), None, None, quality=50)
+        assert len(not_resized) < len(_page())
+
+    def test_resize_image_without_encoding_returns_original(self):
+        """Without encoding options unresized images are returned unchanged."""
+        original = _page()
+        assert image.resize_image(original, 1000, 1000) is original
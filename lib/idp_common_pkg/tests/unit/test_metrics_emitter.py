@@ -0,0 +1,140 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Unit tests for buffered metric emission."""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common import metrics
+from idp_common.metrics.emitter import (
+    BATCH,
+    EMF,
+    MAX_EMF_VALUES,
+    MetricsBuffer,
+    build_emf_records,
+    build_metric_data,
+    get_backend,
+)
+
+
+def _buffer(backend, **kwargs):
+    return MetricsBuffer(backend, start_flusher=False, **kwargs)
+
+
+@pytest.mark.unit
+class TestMetricsBuffer:
+    """Tests for the MetricsBuffer class."""
+
+    def test_batch_backend_collapses_repeated_values(self):
+        """Repeated values are sent as Values/Counts in one call per namespace."""
+        cloudwatch = MagicMock()
+        buffer = _buffer(BATCH, client_factory=lambda: cloudwatch)
+        for _ in range(3):
+            buffer.add("BedrockRequestsTotal", 1, namespace="IDP")
+        buffer.add("BedrockRequestLatency", 120.0, "Milliseconds", namespace="IDP")
+
+        assert buffer.flush() == 4
+        assert buffer.pending() == 0
+        cloudwatch.put_metric_data.assert_called_once()
+        datums = cloudwatch.put_metric_data.call_args.kwargs["MetricData"]
+        assert datums[0] == {
+            "MetricName": "BedrockRequestsTotal",
+            "Unit": "Count",
+            "Dimensions": [],
+            "Values": [1.0],
+            "Counts": [3.0],
+        }
+        assert datums[1]["Unit"] == "Milliseconds"
+
+    def test_emf_backend_writes_log_lines(self):
+        """Datapoints are written as one EMF record per namespace and dimensions."""
+        stream = io.StringIO()
+        buffer = _buffer(EMF, stream=stream)
+        buffer.add("InputDocuments", 1, namespace="IDP")
+        buffer.add("InputDocumentPages", 3, namespace="IDP")
+        buffer.add("InputDocuments", 1, namespace="IDP")
+        buffer.add("OcrThrottles", 2, dimensions=[{"Name": "Stage", "Value": "OCR"}])
+
+        buffer.flush()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert len(records) == 2
+        assert records[0]["InputDocuments"] == [1.0, 1.0]
+        assert records[0]["InputDocumentPages"] == 3.0
+        directive = records[0]["_aws"]["CloudWatchMetrics"][0]
+        assert directive["Namespace"] == "IDP"
+        assert directive["Dimensions"] == [[]]
+        assert records[1]["Stage"] == "OCR"
+        assert records[1]["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Stage"]]
+
+    def test_publish_errors_do_not_raise(self):
+        """A failing CloudWatch call drops the batch without raising."""
+        cloudwatch = MagicMock()
+        cloudwatch.put_metric_data.side_effect = RuntimeError("denied")
+        buffer = _buffer(BATCH, client_factory=lambda: cloudwatch)
+        buffer.add("Metric", 1)
+
+        assert buffer.flush() == 1
+        assert buffer.pending() == 0
+
+
+@pytest.mark.unit
+class TestMetricRecords:
+    """Tests for the datum and EMF record builders."""
+
+    def test_emf_splits_long_value_arrays(self):
+        """Value arrays over the EMF limit continue in another record."""
+        buffer = _buffer(EMF)
+        for value in range(MAX_EMF_VALUES + 1):
+            buffer.add("Latency", value, "Milliseconds")
+
+        records = build_emf_records(buffer._points, timestamp=0)
+
+        assert len(records) == 2
+        assert len(records[0]["Latency"]) == MAX_EMF_VALUES
+        assert records[1]["Latency"] == float(MAX_EMF_VALUES)
+
+    def test_datums_grouped_by_namespace(self):
+        """Each namespace gets its own datums."""
+        buffer = _buffer(BATCH)
+        buffer.add("A", 1, namespace="one")
+        buffer.add("A", 2, namespace="two")
+
+        data = build_metric_data(buffer._points)
+
+        assert set(data) == {"one", "two"}
+        assert data["two"][0]["Values"] == [2.0]
+
+
+@pytest.mark.unit
+class TestMetricsBackend:
+    """Tests for backend selection and the public helpers."""
+
+    def test_default_backend(self, monkeypatch):
+        """EMF is the default in Lambda and batch elsewhere."""
+        monkeypatch.delenv("METRICS_BACKEND", raising=False)
+        monkeypatch.delenv("AWS_LAMBDA_FUNCTION_NAME", raising=False)
+        assert get_backend() == BATCH
+
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "extraction")
+        assert get_backend() == EMF
+
+        monkeypatch.setenv("METRICS_BACKEND", "bogus")
+        assert get_backend() == EMF
+
+    def test_put_metric_buffers_and_handler_flushes(self, monkeypatch):
+        """put_metric only buffers; the decorated handler flushes on return."""
+        buffer = _buffer(EMF, stream=io.StringIO())
+        monkeypatch.setattr(metrics, "get_metrics_buffer", lambda: buffer)
+
+        @metrics.flush_metrics_after
+        def handler(event, context):
+            metrics.put_metric("InputDocuments", 1)
+            assert buffer.pending() == 1
+            return "done"
+
+        assert handler({}, None) == "done"
+        assert buffer.pending() == 0
@@ -125,6 +125,7 @@ def track_task_token(object_key: str, task_token: str) -> None:
         logger.error(f"Error recording tasktoken record: {e}")
         raise
 
+@metrics.flush_metrics_after
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
         logger.info(f"Received event: {json.dumps(event)}")
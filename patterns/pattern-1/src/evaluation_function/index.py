@@ -16,7 +16,7 @@ import boto3
 from enum import Enum
 from typing import Dict, Any, Optional
 
-from idp_common import get_config, evaluation
+from idp_common import get_config, evaluation, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 
@@ -144,6 +144,7 @@ def create_response(status_code: int, message: str, additional_data: Dict[str, A
     }
     return response
 
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Lambda function handler
@@ -1021,6 +1021,7 @@ def handle_skip_bda(event, config):
     return response
 
 
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Process the BDA results and build a Document object with pages and sections.
@@ -6,7 +6,7 @@ import json
 import time
 import logging
 
-from idp_common import get_config, assessment
+from idp_common import get_config, assessment, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common import s3
@@ -92,6 +92,7 @@ def check_document_for_throttling_errors(document):
     return False, None
 
 @xray_recorder.capture('assessment_function')
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Lambda handler for document assessment.
@@ -24,6 +24,7 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
 @xray_recorder.capture('extraction_function')
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Process a single section of a document for information extraction
@@ -11,7 +11,7 @@ import logging
 import os
 import time
 
-from idp_common import get_config, ocr
+from idp_common import get_config, ocr, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
@@ -31,6 +31,7 @@ METRIC_NAMESPACE = os.environ.get('METRIC_NAMESPACE')
 MAX_WORKERS = int(os.environ.get('MAX_WORKERS', 20))
 
 @xray_recorder.capture('ocr_function')
+@metrics.flush_metrics_after
 def handler(event, context): 
     """
     Lambda handler for OCR processing.
@@ -8,7 +8,7 @@ import os
 from urllib.parse import urlparse
 
 import boto3
-from idp_common import s3, utils
+from idp_common import s3, utils, metrics
 from idp_common.config import get_config
 from idp_common.docs_service import create_document_service
 from idp_common.models import Document, HitlMetadata, Status
@@ -33,6 +33,7 @@ def is_hitl_enabled():
         return False  # Default to disabled if config unavailable
 
 
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Consolidates the results from multiple extraction steps into a single output.
@@ -10,7 +10,7 @@ import logging
 import time
 
 # Import the RuleValidationOrchestratorService from idp_common
-from idp_common import get_config, rule_validation
+from idp_common import get_config, rule_validation, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
@@ -22,6 +22,7 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
 @xray_recorder.capture("rule_validation_orchestrator_handler")
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Lambda handler for rule validation consolidation.
@@ -10,7 +10,7 @@ import logging
 import time
 
 # Import the SummarizationService from idp_common
-from idp_common import get_config, summarization
+from idp_common import get_config, summarization, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
@@ -21,6 +21,7 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Lambda handler for document summarization using the SummarizationService.
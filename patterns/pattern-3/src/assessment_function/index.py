@@ -6,7 +6,7 @@ import json
 import time
 import logging
 
-from idp_common import get_config, assessment, s3
+from idp_common import get_config, assessment, s3, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
@@ -21,6 +21,7 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
 @xray_recorder.capture('assessment_function')
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Lambda handler for document assessment.
@@ -27,6 +27,7 @@ logging.getLogger("idp_common.bedrock.client").setLevel(
 )
 
 
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Lambda handler for document classification using SageMaker UDOP model.
@@ -25,6 +25,7 @@ logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_
 
 
 @xray_recorder.capture('extraction_function')
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Process a single section of a document for information extraction
@@ -11,7 +11,7 @@ import logging
 import os
 import time
 
-from idp_common import get_config, ocr
+from idp_common import get_config, ocr, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
@@ -27,6 +27,7 @@ region = os.environ['AWS_REGION']
 METRIC_NAMESPACE = os.environ.get('METRIC_NAMESPACE')
 MAX_WORKERS = int(os.environ.get('MAX_WORKERS', 20))
 
+@metrics.flush_metrics_after
 def handler(event, context): 
     """
     Lambda handler for OCR processing.
@@ -13,6 +13,7 @@ import boto3
 import requests
 from aws_requests_auth.aws_auth import AWSRequestsAuth
 from botocore.exceptions import ClientError
+from idp_common import metrics
 from idp_common.discovery.classes_discovery import ClassesDiscovery
 
 logger = logging.getLogger()
@@ -31,6 +32,7 @@ APPSYNC_API_URL = os.environ.get("APPSYNC_API_URL")
 
 
 
+@metrics.flush_metrics_after
 def handler(event, context):
     """
     Processes discovery jobs from SQS queue.